@@ -23,30 +23,17 @@ def main():
         layout="wide"
     )
     
-    # Run database migrations once on startup (silent check)
+    # Apply pending database migrations once per session (version check only
+    # once the schema is current)
     if 'migrations_checked' not in st.session_state:
         try:
-            from migrations.run_migrations import run_all_migrations
-            import io
-            import sys
-            
-            # Suppress all migration output (including errors)
-            old_stdout = sys.stdout
-            old_stderr = sys.stderr
-            sys.stdout = io.StringIO()
-            sys.stderr = io.StringIO()
-            
-            try:
-                run_all_migrations()
-            finally:
-                sys.stdout = old_stdout
-                sys.stderr = old_stderr
-            
-            st.session_state['migrations_checked'] = True
+            from src.schema_migrations import ensure_schema
+            ensure_schema()
         except Exception:
-            # Silent fail - migrations may already be complete
-            # Database tables will be created on first use if missing
-            st.session_state['migrations_checked'] = True
+            # Silent fail - a failed migration is rolled back and retried on
+            # the next session; tables are created on first use if missing
+            pass
+        st.session_state['migrations_checked'] = True
     
     # Initialize session state with persistence
     if 'page' not in st.session_state:
@@ -0,0 +1,46 @@
+-- Migration 009: Persistent Player Identity Index
+-- Created: 2025-10-26
+-- Purpose: Canonical player identities shared across weeks and data sources
+-- Reason: Name matching (DK ↔ season files ↔ ESPN/MySportsFeeds ↔ contest results)
+--         was redone with fuzzy matching on every upload
+
+-- ============================================================================
+-- PLAYER IDENTITIES (one row per real player, DraftKings name is canonical)
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS player_identities (
+    identity_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    canonical_name TEXT NOT NULL,       -- DraftKings display name
+    normalized_name TEXT NOT NULL,      -- normalize_name(canonical_name)
+    team TEXT,
+    position TEXT,
+
+    -- Per-source identifiers
+    dk_id TEXT,                         -- DraftKings player ID
+    msf_id TEXT,                        -- MySportsFeeds player ID
+    espn_name TEXT,                     -- Name as it appears in ESPN injury reports
+    season_file_name TEXT,              -- Name as it appears in seasonStats files
+    season_match_score REAL,            -- Fuzzy score of the season file match
+
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_player_identities_normalized ON player_identities(normalized_name, team);
+CREATE INDEX IF NOT EXISTS idx_player_identities_dk_id ON player_identities(dk_id);
+
+-- ============================================================================
+-- PLAYER ALIASES (normalized name as seen in a source → identity)
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS player_aliases (
+    source TEXT NOT NULL,               -- 'dk', 'season', 'espn', 'msf', 'results'
+    alias TEXT NOT NULL,                -- normalize_name(source_name)
+    team TEXT NOT NULL DEFAULT '',      -- '' when the source has no team
+    identity_id INTEGER NOT NULL REFERENCES player_identities(identity_id),
+    source_name TEXT NOT NULL,          -- Raw name as it appears in the source
+    match_score REAL DEFAULT 100.0,     -- 100 for exact, fuzzy score otherwise
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    PRIMARY KEY (source, alias, team)
+);
+
+CREATE INDEX IF NOT EXISTS idx_player_aliases_identity ON player_aliases(identity_id);
@@ -0,0 +1,16 @@
+-- Migration 010: Week-Leading Indexes for Advanced Stats
+-- Created: 2025-10-27
+-- Purpose: Serve multi-week range reads (query_advanced_stats) from one index scan
+-- Reason: UNIQUE(player_name, team, position, week) leads with the player, so
+--         "weeks 3-7 for everyone" could only use the week-only index and then
+--         sort; these indexes return rows already in (week, player) order and
+--         cover every key column
+-- Note: key-only on purpose. A fully covering index (key + every metric
+--       column) was rejected: it would roughly double each table on disk, and
+--       a week-range read only does one rowid lookup per matched row for the
+--       metric columns
+
+CREATE INDEX IF NOT EXISTS idx_pass_stats_week_player ON pass_stats(week, player_name, team, position);
+CREATE INDEX IF NOT EXISTS idx_rush_stats_week_player ON rush_stats(week, player_name, team, position);
+CREATE INDEX IF NOT EXISTS idx_receiving_stats_week_player ON receiving_stats(week, player_name, team, position);
+CREATE INDEX IF NOT EXISTS idx_snap_stats_week_player ON snap_stats(week, player_name, team, position);
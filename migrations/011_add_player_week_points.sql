@@ -0,0 +1,161 @@
+-- Migration 011: Materialized Weekly DraftKings Points
+-- Created: 2025-10-28
+-- Purpose: One row per player per game with week, season and DraftKings points
+--          precomputed, so regression (80/20) checks and results-page score
+--          lookups are index seeks
+-- Reason: Those lookups joined player_game_stats to game_boxscores for every
+--         call, matched on LOWER(player_name) (no index can serve that) and
+--         scored rows without fantasy_points_draftkings in Python
+--
+-- The table is kept in sync by triggers on player_game_stats and
+-- game_boxscores, so every ingest path (boxscore API, import scripts, manual
+-- fixes) maintains it.
+
+-- Table: player_week_points
+CREATE TABLE IF NOT EXISTS player_week_points (
+    stat_id INTEGER NOT NULL,           -- player_game_stats.id
+    game_id TEXT NOT NULL,
+    player_name TEXT NOT NULL,
+    team TEXT NOT NULL,
+    player_key TEXT NOT NULL,           -- MySportsFeeds player ID, else normalized_name|team
+    normalized_name TEXT NOT NULL,      -- LOWER(TRIM(player_name))
+    position TEXT NOT NULL,
+    season TEXT NOT NULL,
+    week INTEGER,
+    dk_points REAL NOT NULL,            -- fantasy_points_draftkings, else standard DK scoring
+    PRIMARY KEY (game_id, player_name, team)
+);
+
+CREATE INDEX IF NOT EXISTS idx_player_week_points_week_name
+ON player_week_points(week, normalized_name);
+
+CREATE INDEX IF NOT EXISTS idx_player_week_points_week_points
+ON player_week_points(week, dk_points);
+
+CREATE INDEX IF NOT EXISTS idx_player_week_points_player
+ON player_week_points(player_key, season, week);
+
+
+-- View: player_week_points_source
+-- The row player_week_points holds for each player_game_stats row.
+-- DK scoring matches regression_analyzer.calculate_dk_fantasy_points.
+CREATE VIEW IF NOT EXISTS player_week_points_source AS
+SELECT
+    p.id AS stat_id,
+    p.game_id,
+    p.player_name,
+    p.team,
+    COALESCE(NULLIF(p.player_id, ''), LOWER(TRIM(p.player_name)) || '|' || p.team) AS player_key,
+    LOWER(TRIM(p.player_name)) AS normalized_name,
+    p.position,
+    g.season,
+    g.week,
+    COALESCE(
+        p.fantasy_points_draftkings,
+        ROUND(
+            IFNULL(p.pass_yards, 0) * 0.04
+            + IFNULL(p.pass_touchdowns, 0) * 4
+            - IFNULL(p.pass_interceptions, 0)
+            + IFNULL(p.rush_yards, 0) * 0.1
+            + IFNULL(p.rush_touchdowns, 0) * 6
+            + IFNULL(p.receptions, 0)
+            + IFNULL(p.receiving_yards, 0) * 0.1
+            + IFNULL(p.receiving_touchdowns, 0) * 6,
+            2
+        )
+    ) AS dk_points
+FROM player_game_stats p
+JOIN game_boxscores g ON g.game_id = p.game_id;
+
+
+-- Triggers: player_game_stats
+-- INSERT OR REPLACE deletes the old row without firing delete triggers; the
+-- insert trigger's upsert on (game_id, player_name, team) covers it
+CREATE TRIGGER IF NOT EXISTS trg_player_week_points_stats_insert
+AFTER INSERT ON player_game_stats
+BEGIN
+    INSERT INTO player_week_points
+        (stat_id, game_id, player_name, team, player_key, normalized_name, position, season, week, dk_points)
+    SELECT stat_id, game_id, player_name, team, player_key, normalized_name, position, season, week, dk_points
+    FROM player_week_points_source
+    WHERE stat_id = NEW.id
+    ON CONFLICT(game_id, player_name, team) DO UPDATE SET
+        stat_id = excluded.stat_id,
+        player_key = excluded.player_key,
+        normalized_name = excluded.normalized_name,
+        position = excluded.position,
+        season = excluded.season,
+        week = excluded.week,
+        dk_points = excluded.dk_points;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_player_week_points_stats_update
+AFTER UPDATE ON player_game_stats
+BEGIN
+    DELETE FROM player_week_points
+    WHERE game_id = OLD.game_id AND player_name = OLD.player_name AND team = OLD.team;
+
+    INSERT INTO player_week_points
+        (stat_id, game_id, player_name, team, player_key, normalized_name, position, season, week, dk_points)
+    SELECT stat_id, game_id, player_name, team, player_key, normalized_name, position, season, week, dk_points
+    FROM player_week_points_source
+    WHERE stat_id = NEW.id
+    ON CONFLICT(game_id, player_name, team) DO UPDATE SET
+        stat_id = excluded.stat_id,
+        player_key = excluded.player_key,
+        normalized_name = excluded.normalized_name,
+        position = excluded.position,
+        season = excluded.season,
+        week = excluded.week,
+        dk_points = excluded.dk_points;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_player_week_points_stats_delete
+AFTER DELETE ON player_game_stats
+BEGIN
+    DELETE FROM player_week_points
+    WHERE game_id = OLD.game_id AND player_name = OLD.player_name AND team = OLD.team;
+END;
+
+
+-- Triggers: game_boxscores (week/season live on the game)
+-- Also picks up player rows stored before their game row
+CREATE TRIGGER IF NOT EXISTS trg_player_week_points_game_insert
+AFTER INSERT ON game_boxscores
+BEGIN
+    INSERT INTO player_week_points
+        (stat_id, game_id, player_name, team, player_key, normalized_name, position, season, week, dk_points)
+    SELECT stat_id, game_id, player_name, team, player_key, normalized_name, position, season, week, dk_points
+    FROM player_week_points_source
+    WHERE game_id = NEW.game_id
+    ON CONFLICT(game_id, player_name, team) DO UPDATE SET
+        stat_id = excluded.stat_id,
+        season = excluded.season,
+        week = excluded.week;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_player_week_points_game_update
+AFTER UPDATE OF game_id, season, week ON game_boxscores
+BEGIN
+    DELETE FROM player_week_points WHERE game_id = OLD.game_id;
+
+    INSERT INTO player_week_points
+        (stat_id, game_id, player_name, team, player_key, normalized_name, position, season, week, dk_points)
+    SELECT stat_id, game_id, player_name, team, player_key, normalized_name, position, season, week, dk_points
+    FROM player_week_points_source
+    WHERE game_id = NEW.game_id
+    ON CONFLICT(game_id, player_name, team) DO NOTHING;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_player_week_points_game_delete
+AFTER DELETE ON game_boxscores
+BEGIN
+    DELETE FROM player_week_points WHERE game_id = OLD.game_id;
+END;
+
+
+-- Backfill rows stored before this migration (no-op once populated)
+INSERT OR IGNORE INTO player_week_points
+    (stat_id, game_id, player_name, team, player_key, normalized_name, position, season, week, dk_points)
+SELECT stat_id, game_id, player_name, team, player_key, normalized_name, position, season, week, dk_points
+FROM player_week_points_source;
@@ -0,0 +1,31 @@
+-- Migration 012: Indexes for Registered Hot Queries
+-- Created: 2025-10-29
+-- Purpose: Fix the queries db_maintenance.check_query_plans reports as a full
+--          scan, a sort or a seek on only part of their WHERE clause
+-- Reason: These tables grow every week of the season; without these indexes
+--         the affected queries slow down as they grow
+
+-- api_call_log: rate-limit count (api_name = ? AND called_at >= ?)
+-- Migration 005 rebuilt the table and dropped idx_api_calls_name_date; this
+-- covering index answers the count from the index alone
+CREATE INDEX IF NOT EXISTS idx_api_call_log_name_called_at
+ON api_call_log(api_name, called_at);
+
+-- narrative_flags: pruning by age (created_at < ?)
+CREATE INDEX IF NOT EXISTS idx_flags_created_at
+ON narrative_flags(created_at);
+
+-- injury_reports: weekly report in (team, player_name) order without a sort
+CREATE INDEX IF NOT EXISTS idx_injury_week_team_player
+ON injury_reports(week, team, player_name);
+
+-- historical_player_pool: actual points are matched on (slate_id, trimmed
+-- name); expression index so the planner can seek a player instead of
+-- scanning the slate when only a few names are updated
+CREATE INDEX IF NOT EXISTS idx_hpp_slate_trimmed_name
+ON historical_player_pool(slate_id, TRIM(player_name));
+
+-- player_week_points: one player's week (regression checks) seeks on both
+-- columns instead of scanning the week
+CREATE INDEX IF NOT EXISTS idx_player_week_points_name_week
+ON player_week_points(normalized_name, week);
@@ -0,0 +1,273 @@
+-- Migration 013: Point-in-Time Versions of Vegas Lines and Injury Reports
+-- Created: 2025-10-30
+-- Purpose: Keep every observed line move and injury update so backtests and
+--          late swap can read vegas_lines / injury_reports "as of" any time
+-- Reason: Writers overwrite (or delete and reinsert) a week's rows, so
+--         intra-week changes were lost
+--
+-- vegas_lines and injury_reports stay the current state; triggers append a
+-- version row to *_versions on every change, so every write path is
+-- recorded. Versions are delta encoded:
+-- - a write that changes nothing appends nothing
+-- - change_mask has one bit per tracked column; only those columns are
+--   stored, the others are NULL and carry over from earlier versions
+-- - change_mask = 0 marks a deleted row
+-- valid_from is the UTC time the version was written, clamped to be no
+-- earlier than the key's latest version, so each key's history is in write
+-- order even when a writer replays older rows (db_init restores the week
+-- cache on every start). The writer's fetched_at/updated_at is kept as
+-- observed_at (NULL on deletes). point_in_time.py rebuilds the state as of a
+-- timestamp.
+--
+-- vegas_lines bits: 1 home_team, 2 away_team, 4 home_spread, 8 away_spread,
+--                   16 total, 32 home_itt, 64 away_itt
+-- injury_reports bits: 1 position, 2 injury_status, 4 practice_status,
+--                      8 body_part, 16 description
+
+-- Table: vegas_line_versions
+CREATE TABLE IF NOT EXISTS vegas_line_versions (
+    version_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    week INTEGER NOT NULL,
+    game_id TEXT NOT NULL,
+    valid_from TEXT NOT NULL,           -- 'YYYY-MM-DD HH:MM:SS.SSS' (UTC)
+    change_mask INTEGER NOT NULL,
+    observed_at TEXT,                   -- writer's fetched_at/updated_at
+    home_team TEXT,
+    away_team TEXT,
+    home_spread REAL,
+    away_spread REAL,
+    total REAL,
+    home_itt REAL,
+    away_itt REAL,
+    recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_vegas_line_versions_week
+ON vegas_line_versions(week, valid_from, game_id);
+
+-- Latest version of one key (the valid_from clamp in the triggers)
+CREATE INDEX IF NOT EXISTS idx_vegas_line_versions_key
+ON vegas_line_versions(week, game_id, valid_from);
+
+-- Table: injury_report_versions
+CREATE TABLE IF NOT EXISTS injury_report_versions (
+    version_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    week INTEGER NOT NULL,
+    player_name TEXT NOT NULL,
+    team TEXT NOT NULL,
+    valid_from TEXT NOT NULL,           -- 'YYYY-MM-DD HH:MM:SS.SSS' (UTC)
+    change_mask INTEGER NOT NULL,
+    observed_at TEXT,                   -- writer's fetched_at/updated_at
+    position TEXT,
+    injury_status TEXT,
+    practice_status TEXT,
+    body_part TEXT,
+    description TEXT,
+    recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_injury_report_versions_week
+ON injury_report_versions(week, valid_from, player_name, team);
+
+CREATE INDEX IF NOT EXISTS idx_injury_report_versions_key
+ON injury_report_versions(week, player_name, team, valid_from);
+
+CREATE INDEX IF NOT EXISTS idx_injury_report_versions_valid_from
+ON injury_report_versions(valid_from);
+
+
+-- Versions are never rewritten (old ones may be archived and deleted)
+CREATE TRIGGER IF NOT EXISTS trg_vegas_line_versions_append_only
+BEFORE UPDATE ON vegas_line_versions
+BEGIN
+    SELECT RAISE(ABORT, 'vegas_line_versions is append-only');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_injury_report_versions_append_only
+BEFORE UPDATE ON injury_report_versions
+BEGIN
+    SELECT RAISE(ABORT, 'injury_report_versions is append-only');
+END;
+
+
+-- Triggers: vegas_lines
+CREATE TRIGGER IF NOT EXISTS trg_vegas_line_versions_insert
+AFTER INSERT ON vegas_lines
+BEGIN
+    INSERT INTO vegas_line_versions
+        (week, game_id, valid_from, change_mask, observed_at,
+         home_team, away_team, home_spread, away_spread, total, home_itt, away_itt)
+    VALUES
+        (NEW.week, NEW.game_id,
+         MAX(strftime('%Y-%m-%d %H:%M:%f', 'now'), COALESCE((
+             SELECT MAX(valid_from) FROM vegas_line_versions
+             WHERE week = NEW.week AND game_id = NEW.game_id), '')),
+         127, NEW.fetched_at,
+         NEW.home_team, NEW.away_team, NEW.home_spread, NEW.away_spread, NEW.total, NEW.home_itt, NEW.away_itt);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_vegas_line_versions_update
+AFTER UPDATE ON vegas_lines
+WHEN OLD.week = NEW.week AND OLD.game_id = NEW.game_id
+ AND (OLD.home_team IS NOT NEW.home_team OR OLD.away_team IS NOT NEW.away_team
+      OR OLD.home_spread IS NOT NEW.home_spread OR OLD.away_spread IS NOT NEW.away_spread
+      OR OLD.total IS NOT NEW.total OR OLD.home_itt IS NOT NEW.home_itt OR OLD.away_itt IS NOT NEW.away_itt)
+BEGIN
+    INSERT INTO vegas_line_versions
+        (week, game_id, valid_from, change_mask, observed_at,
+         home_team, away_team, home_spread, away_spread, total, home_itt, away_itt)
+    VALUES
+        (NEW.week, NEW.game_id,
+         MAX(strftime('%Y-%m-%d %H:%M:%f', 'now'), COALESCE((
+             SELECT MAX(valid_from) FROM vegas_line_versions
+             WHERE week = NEW.week AND game_id = NEW.game_id), '')),
+         (OLD.home_team IS NOT NEW.home_team) * 1
+         + (OLD.away_team IS NOT NEW.away_team) * 2
+         + (OLD.home_spread IS NOT NEW.home_spread) * 4
+         + (OLD.away_spread IS NOT NEW.away_spread) * 8
+         + (OLD.total IS NOT NEW.total) * 16
+         + (OLD.home_itt IS NOT NEW.home_itt) * 32
+         + (OLD.away_itt IS NOT NEW.away_itt) * 64,
+         NEW.fetched_at,
+         CASE WHEN OLD.home_team IS NOT NEW.home_team THEN NEW.home_team END,
+         CASE WHEN OLD.away_team IS NOT NEW.away_team THEN NEW.away_team END,
+         CASE WHEN OLD.home_spread IS NOT NEW.home_spread THEN NEW.home_spread END,
+         CASE WHEN OLD.away_spread IS NOT NEW.away_spread THEN NEW.away_spread END,
+         CASE WHEN OLD.total IS NOT NEW.total THEN NEW.total END,
+         CASE WHEN OLD.home_itt IS NOT NEW.home_itt THEN NEW.home_itt END,
+         CASE WHEN OLD.away_itt IS NOT NEW.away_itt THEN NEW.away_itt END);
+END;
+
+-- An update that changes the key is a delete of the old key plus an insert
+CREATE TRIGGER IF NOT EXISTS trg_vegas_line_versions_rekey
+AFTER UPDATE OF week, game_id ON vegas_lines
+WHEN OLD.week IS NOT NEW.week OR OLD.game_id IS NOT NEW.game_id
+BEGIN
+    INSERT INTO vegas_line_versions (week, game_id, valid_from, change_mask)
+    VALUES (OLD.week, OLD.game_id,
+            MAX(strftime('%Y-%m-%d %H:%M:%f', 'now'), COALESCE((
+                SELECT MAX(valid_from) FROM vegas_line_versions
+                WHERE week = OLD.week AND game_id = OLD.game_id), '')),
+            0);
+
+    INSERT INTO vegas_line_versions
+        (week, game_id, valid_from, change_mask, observed_at,
+         home_team, away_team, home_spread, away_spread, total, home_itt, away_itt)
+    VALUES
+        (NEW.week, NEW.game_id,
+         MAX(strftime('%Y-%m-%d %H:%M:%f', 'now'), COALESCE((
+             SELECT MAX(valid_from) FROM vegas_line_versions
+             WHERE week = NEW.week AND game_id = NEW.game_id), '')),
+         127, NEW.fetched_at,
+         NEW.home_team, NEW.away_team, NEW.home_spread, NEW.away_spread, NEW.total, NEW.home_itt, NEW.away_itt);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_vegas_line_versions_delete
+AFTER DELETE ON vegas_lines
+BEGIN
+    INSERT INTO vegas_line_versions (week, game_id, valid_from, change_mask)
+    VALUES (OLD.week, OLD.game_id,
+            MAX(strftime('%Y-%m-%d %H:%M:%f', 'now'), COALESCE((
+                SELECT MAX(valid_from) FROM vegas_line_versions
+                WHERE week = OLD.week AND game_id = OLD.game_id), '')),
+            0);
+END;
+
+
+-- Triggers: injury_reports
+CREATE TRIGGER IF NOT EXISTS trg_injury_report_versions_insert
+AFTER INSERT ON injury_reports
+BEGIN
+    INSERT INTO injury_report_versions
+        (week, player_name, team, valid_from, change_mask, observed_at,
+         position, injury_status, practice_status, body_part, description)
+    VALUES
+        (NEW.week, NEW.player_name, NEW.team,
+         MAX(strftime('%Y-%m-%d %H:%M:%f', 'now'), COALESCE((
+             SELECT MAX(valid_from) FROM injury_report_versions
+             WHERE week = NEW.week AND player_name = NEW.player_name AND team = NEW.team), '')),
+         31, NEW.updated_at,
+         NEW.position, NEW.injury_status, NEW.practice_status, NEW.body_part, NEW.description);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_injury_report_versions_update
+AFTER UPDATE ON injury_reports
+WHEN OLD.week = NEW.week AND OLD.player_name = NEW.player_name AND OLD.team = NEW.team
+ AND (OLD.position IS NOT NEW.position OR OLD.injury_status IS NOT NEW.injury_status
+      OR OLD.practice_status IS NOT NEW.practice_status OR OLD.body_part IS NOT NEW.body_part
+      OR OLD.description IS NOT NEW.description)
+BEGIN
+    INSERT INTO injury_report_versions
+        (week, player_name, team, valid_from, change_mask, observed_at,
+         position, injury_status, practice_status, body_part, description)
+    VALUES
+        (NEW.week, NEW.player_name, NEW.team,
+         MAX(strftime('%Y-%m-%d %H:%M:%f', 'now'), COALESCE((
+             SELECT MAX(valid_from) FROM injury_report_versions
+             WHERE week = NEW.week AND player_name = NEW.player_name AND team = NEW.team), '')),
+         (OLD.position IS NOT NEW.position) * 1
+         + (OLD.injury_status IS NOT NEW.injury_status) * 2
+         + (OLD.practice_status IS NOT NEW.practice_status) * 4
+         + (OLD.body_part IS NOT NEW.body_part) * 8
+         + (OLD.description IS NOT NEW.description) * 16,
+         NEW.updated_at,
+         CASE WHEN OLD.position IS NOT NEW.position THEN NEW.position END,
+         CASE WHEN OLD.injury_status IS NOT NEW.injury_status THEN NEW.injury_status END,
+         CASE WHEN OLD.practice_status IS NOT NEW.practice_status THEN NEW.practice_status END,
+         CASE WHEN OLD.body_part IS NOT NEW.body_part THEN NEW.body_part END,
+         CASE WHEN OLD.description IS NOT NEW.description THEN NEW.description END);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_injury_report_versions_rekey
+AFTER UPDATE OF week, player_name, team ON injury_reports
+WHEN OLD.week IS NOT NEW.week OR OLD.player_name IS NOT NEW.player_name OR OLD.team IS NOT NEW.team
+BEGIN
+    INSERT INTO injury_report_versions (week, player_name, team, valid_from, change_mask)
+    VALUES (OLD.week, OLD.player_name, OLD.team,
+            MAX(strftime('%Y-%m-%d %H:%M:%f', 'now'), COALESCE((
+                SELECT MAX(valid_from) FROM injury_report_versions
+                WHERE week = OLD.week AND player_name = OLD.player_name AND team = OLD.team), '')),
+            0);
+
+    INSERT INTO injury_report_versions
+        (week, player_name, team, valid_from, change_mask, observed_at,
+         position, injury_status, practice_status, body_part, description)
+    VALUES
+        (NEW.week, NEW.player_name, NEW.team,
+         MAX(strftime('%Y-%m-%d %H:%M:%f', 'now'), COALESCE((
+             SELECT MAX(valid_from) FROM injury_report_versions
+             WHERE week = NEW.week AND player_name = NEW.player_name AND team = NEW.team), '')),
+         31, NEW.updated_at,
+         NEW.position, NEW.injury_status, NEW.practice_status, NEW.body_part, NEW.description);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_injury_report_versions_delete
+AFTER DELETE ON injury_reports
+BEGIN
+    INSERT INTO injury_report_versions (week, player_name, team, valid_from, change_mask)
+    VALUES (OLD.week, OLD.player_name, OLD.team,
+            MAX(strftime('%Y-%m-%d %H:%M:%f', 'now'), COALESCE((
+                SELECT MAX(valid_from) FROM injury_report_versions
+                WHERE week = OLD.week AND player_name = OLD.player_name AND team = OLD.team), '')),
+            0);
+END;
+
+
+-- Backfill: one full version per current row, dated when it was observed
+INSERT INTO vegas_line_versions
+    (week, game_id, valid_from, change_mask, observed_at,
+     home_team, away_team, home_spread, away_spread, total, home_itt, away_itt)
+SELECT week, game_id,
+       COALESCE(strftime('%Y-%m-%d %H:%M:%f', fetched_at), strftime('%Y-%m-%d %H:%M:%f', 'now')),
+       127, fetched_at, home_team, away_team, home_spread, away_spread, total, home_itt, away_itt
+FROM vegas_lines
+WHERE NOT EXISTS (SELECT 1 FROM vegas_line_versions);
+
+INSERT INTO injury_report_versions
+    (week, player_name, team, valid_from, change_mask, observed_at,
+     position, injury_status, practice_status, body_part, description)
+SELECT week, player_name, team,
+       COALESCE(strftime('%Y-%m-%d %H:%M:%f', updated_at), strftime('%Y-%m-%d %H:%M:%f', 'now')),
+       31, updated_at, position, injury_status, practice_status, body_part, description
+FROM injury_reports
+WHERE NOT EXISTS (SELECT 1 FROM injury_report_versions);
@@ -162,7 +162,11 @@ def verify_migration(db_path: str = "dfs_optimizer.db") -> bool:
 
 def run_all_migrations(db_path: str = "dfs_optimizer.db") -> bool:
     """
-    Run all migrations in order.
+    Apply all pending migrations in order.
+    
+    Migrations already recorded in the schema_version table are skipped;
+    each pending one is applied in its own transaction (see
+    src/schema_migrations.py).
     
     Args:
         db_path: Path to SQLite database file
@@ -170,26 +174,25 @@ def run_all_migrations(db_path: str = "dfs_optimizer.db") -> bool:
     Returns:
         bool: True if all migrations successful, False otherwise
     """
-    migration_files = get_migration_files()
+    from schema_migrations import MigrationError, migrate, pending_migrations
     
-    if not migration_files:
+    if not get_migration_files():
         print("❌ No migration files found")
         return False
     
-    print(f"📁 Found {len(migration_files)} migration(s):")
-    for file in migration_files:
-        print(f"   - {file}")
+    pending = pending_migrations(db_path)
+    print(f"📁 {len(pending)} pending migration(s):")
+    for migration in pending:
+        print(f"   - {migration.name}")
     print()
     
-    for migration_file in migration_files:
-        print(f"\n{'='*60}")
-        success = run_sqlite_migration(db_path, migration_file)
-        if not success:
-            print(f"\n❌ Migration {migration_file} failed. Stopping.")
-            return False
+    try:
+        applied = migrate(db_path)
+    except MigrationError as e:
+        print(f"\n❌ {e}. Stopping.")
+        return False
     
-    print(f"\n{'='*60}")
-    print(f"\n✅ All {len(migration_files)} migrations completed successfully!")
+    print(f"\n✅ Applied {len(applied)} migration(s); schema is up to date!")
     return True
 
 
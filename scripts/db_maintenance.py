@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Database Maintenance Script
+
+Keeps the SQLite database fast as it grows over the season.
+
+Purpose:
+- Report slow query patterns (EXPLAIN QUERY PLAN over the app's hot queries)
+- Create missing indexes (pending migrations)
+- Prune (and optionally archive) old api_call_log and narrative_flags rows
+- Refresh planner statistics (ANALYZE, PRAGMA optimize) and VACUUM
+
+Usage:
+    # Report only
+    python db_maintenance.py --report
+
+    # Full weekly maintenance
+    python db_maintenance.py --all --prune-days 60 --archive-dir archive --vacuum
+
+Schedule:
+    Run every Tuesday at 6 AM ET (after Monday results capture, while idle)
+
+    Cron: 0 6 * * 2 /path/to/python db_maintenance.py --all --prune-days 60 --archive-dir archive
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from db_maintenance import check_query_plans, ensure_indexes, prune_old_rows, optimize_database
+
+
+def print_report(db_path: str) -> int:
+    """Print every registered query plan; returns the number of problem queries."""
+    problems = 0
+    print(f"🔍 Query plans: {db_path}")
+    for row in check_query_plans(db_path):
+        if row['error']:
+            print(f"   ⚠️ {row['name']}: {row['error']}")
+            continue
+        issues = [label for label, flag in (('full scan', row['full_scan']), ('temp sort', row['temp_sort'])) if flag]
+        problems += bool(issues)
+        print(f"   {'❌' if issues else '✅'} {row['name']}{' (' + ', '.join(issues) + ')' if issues else ''}")
+        for detail in row['plan']:
+            print(f"        {detail}")
+    return problems
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Database Maintenance - query plans, indexes, pruning, ANALYZE/VACUUM",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Report slow query patterns
+  python db_maintenance.py --report
+
+  # Prune API logs and flags older than 60 days, archiving them first
+  python db_maintenance.py --prune-days 60 --archive-dir archive
+
+  # Everything, then VACUUM
+  python db_maintenance.py --all --prune-days 60 --vacuum
+        """
+    )
+
+    parser.add_argument('--db', type=str, default='dfs_optimizer.db',
+                        help='Database path (default: dfs_optimizer.db)')
+    parser.add_argument('--report', action='store_true',
+                        help='Report query plans for registered queries')
+    parser.add_argument('--indexes', action='store_true',
+                        help='Create missing indexes (apply pending migrations)')
+    parser.add_argument('--prune-days', type=int,
+                        help='Delete api_call_log/narrative_flags rows older than N days')
+    parser.add_argument('--archive-dir', type=str,
+                        help='Write pruned rows to gzip CSV files in this directory first')
+    parser.add_argument('--analyze', action='store_true',
+                        help='Run ANALYZE and PRAGMA optimize')
+    parser.add_argument('--vacuum', action='store_true',
+                        help='VACUUM after analyzing (run while the app is idle)')
+    parser.add_argument('--all', action='store_true',
+                        help='Indexes, prune (with --prune-days), analyze and report')
+
+    args = parser.parse_args()
+
+    if not Path(args.db).exists():
+        print(f"❌ Error: database not found: {args.db}")
+        sys.exit(1)
+
+    if not (args.all or args.report or args.indexes or args.prune_days or args.analyze or args.vacuum):
+        parser.print_help()
+        sys.exit(1)
+
+    if args.all or args.indexes:
+        applied = ensure_indexes(args.db)
+        print(f"🗂️  Applied {len(applied)} pending migration(s)")
+
+    if args.prune_days:
+        deleted = prune_old_rows(args.db, days=args.prune_days, archive_dir=args.archive_dir)
+        for table, count in deleted.items():
+            print(f"🧹 {table}: deleted {count} row(s) older than {args.prune_days} days")
+
+    if args.all or args.analyze or args.vacuum:
+        sizes = optimize_database(args.db, vacuum=args.vacuum)
+        print(f"📊 Optimized: {sizes['size_before']:,} → {sizes['size_after']:,} bytes")
+
+    if args.all or args.report:
+        problems = print_report(args.db)
+        print(f"\n{'✅ No slow query patterns' if not problems else f'⚠️ {problems} query(ies) scan or sort'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -15,6 +15,10 @@ Usage:
     # Manual mode: Provide CSV file from DFS site
     python monday_results_capture.py --week 6 --season 2024 --csv contest-standings.csv
     
+    # Batch mode: Many slates/seasons in one pass (CSV with columns
+    # week, season, csv and optional site, contest_type)
+    python monday_results_capture.py --batch captures.csv
+    
     # Interactive mode: Prompt for inputs
     python monday_results_capture.py --interactive
     
@@ -41,8 +45,9 @@ import logging
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from historical_data_manager import HistoricalDataManager
+from historical_data_manager import HistoricalDataManager, name_match_keys
 from database_models import create_session
+from player_identity import PlayerIdentityIndex
 
 # Setup logging
 logging.basicConfig(
@@ -72,6 +77,7 @@ class MondayResultsCapture:
         """
         self.db_path = db_path
         self.manager = HistoricalDataManager(db_path=db_path)
+        self.identity_index = PlayerIdentityIndex(db_path=db_path)
         
     def parse_csv_results(self, csv_path: str) -> pd.DataFrame:
         """
@@ -152,6 +158,8 @@ class MondayResultsCapture:
         Match player names from results to historical player pool.
         
         Handles common name variations (Jr., Sr., etc.) and reports unmatched players.
+        Results names matched in earlier weeks are resolved from the player
+        identity index; new variant matches are persisted to it.
         
         Args:
             results_df: DataFrame with player_name and actual_points
@@ -168,34 +176,44 @@ class MondayResultsCapture:
             include_actuals=False
         )
         
-        slate_players = set(historical_snapshot['player_name'].str.strip())
+        slate_names = historical_snapshot['player_name'].str.strip()
+        slate_players = set(slate_names)
+        slate_teams = dict(zip(slate_names, historical_snapshot['team']))
+        
+        # Suffix-stripped key (Jr., Sr., III, II) → slate player, built once
+        slate_by_key = {}
+        for key, slate_player in zip(name_match_keys(slate_names), slate_names):
+            slate_by_key.setdefault(key, slate_player)
         
         # Match players
         matched = {}
         unmatched = []
         
-        for idx, row in results_df.iterrows():
-            player_name = row['player_name']
-            actual_points = row['actual_points']
-            
+        result_keys = name_match_keys(results_df['player_name'])
+        for player_name, key, actual_points in zip(
+            results_df['player_name'], result_keys, results_df['actual_points']
+        ):
             # Exact match
             if player_name in slate_players:
                 matched[player_name] = actual_points
+                continue
+            
+            # Persisted match from an earlier week
+            identity = self.identity_index.lookup(player_name, source='results')
+            if identity is not None and identity.canonical_name in slate_players:
+                matched[identity.canonical_name] = actual_points
+                continue
+            
+            # Name variant (handle Jr., Sr., III, etc.)
+            slate_player = slate_by_key.get(key)
+            if slate_player is not None:
+                matched[slate_player] = actual_points
+                identity = self.identity_index.get_or_create(slate_player, slate_teams.get(slate_player))
+                self.identity_index.link(identity, 'results', player_name)
             else:
-                # Try fuzzy match (handle Jr., Sr., III, etc.)
-                base_name = player_name.replace(' Jr.', '').replace(' Sr.', '').replace(' III', '').replace(' II', '').strip()
-                
-                found = False
-                for slate_player in slate_players:
-                    slate_base = slate_player.replace(' Jr.', '').replace(' Sr.', '').replace(' III', '').replace(' II', '').strip()
-                    
-                    if base_name == slate_base:
-                        matched[slate_player] = actual_points
-                        found = True
-                        break
-                
-                if not found:
-                    unmatched.append(player_name)
+                unmatched.append(player_name)
+        
+        self.identity_index.commit()
         
         logger.info(f"Matched {len(matched)}/{len(results_df)} players")
         
@@ -204,31 +222,71 @@ class MondayResultsCapture:
         
         return matched
     
-    def update_slate_actuals(
-        self,
-        slate_id: str,
-        actuals: dict
-    ) -> int:
+    def update_slate_actuals(self, actuals: pd.DataFrame) -> dict:
         """
-        Update actual fantasy points for a slate.
+        Update actual fantasy points for any number of slates at once.
         
         Args:
-            slate_id: Slate identifier
-            actuals: Dict mapping player_name to actual_points
+            actuals: DataFrame with slate_id, player_name, actual_points
             
         Returns:
-            Number of players updated
+            Dict mapping slate_id to number of players updated
         """
-        logger.info(f"Updating {len(actuals)} players in slate {slate_id}")
+        logger.info(f"Updating {len(actuals)} players in {actuals['slate_id'].nunique()} slate(s)")
         
-        count = self.manager.update_actual_points(
-            slate_id=slate_id,
-            actuals=actuals
+        counts = self.manager.update_actual_points_bulk(actuals)
+        
+        logger.info(f"Successfully updated {sum(counts.values())} players")
+        
+        return counts
+    
+    def _match_capture(self, capture: dict) -> dict:
+        """
+        Resolve one capture's slate and match its CSV results.
+        
+        Returns:
+            Slate summary; on success also holds the matched actuals
+        """
+        week, season = capture['week'], capture['season']
+        site = capture.get('site', 'DraftKings')
+        contest_type = capture.get('contest_type', 'Classic')
+        
+        slate_id = self.manager._generate_slate_id(
+            week=week,
+            season=season,
+            site=site,
+            contest_type=contest_type
         )
+        summary = {'success': False, 'slate_id': slate_id, 'week': week, 'season': season, 'site': site}
+        
+        # Verify slate exists
+        metadata = self.manager.get_slate_metadata(slate_id)
+        if not metadata:
+            logger.error(f"Slate {slate_id} not found. Create slate first!")
+            summary['error'] = f"Slate {slate_id} not found"
+            return summary
+        
+        logger.info(f"Found slate: {slate_id} ({metadata['player_count']} players)")
+        summary['players_in_slate'] = metadata['player_count']
+        
+        # Parse CSV results
+        try:
+            results_df = self.parse_csv_results(capture['csv_path'])
+        except Exception as e:
+            logger.error(f"Failed to parse CSV: {e}")
+            summary['error'] = f"CSV parse error: {e}"
+            return summary
         
-        logger.info(f"Successfully updated {count} players")
+        # Match players
+        actuals = self.match_players_to_slate(results_df, slate_id)
         
-        return count
+        if not actuals:
+            logger.error("No players matched. Check player names in CSV.")
+            summary['error'] = "No players matched"
+            return summary
+        
+        summary['actuals'] = actuals
+        return summary
     
     def process_results(
         self,
@@ -241,6 +299,8 @@ class MondayResultsCapture:
         """
         Complete results capture workflow.
         
+        Single-slate form of process_batch.
+        
         Args:
             week: Week number
             season: Season year
@@ -251,88 +311,122 @@ class MondayResultsCapture:
         Returns:
             Dict with capture summary
         """
-        start_time = datetime.now()
-        
-        logger.info("="*60)
-        logger.info(f"Monday Results Capture - Week {week}, {season} {site}")
-        logger.info("="*60)
-        
-        # Generate slate ID
-        slate_id = self.manager._generate_slate_id(
-            week=week,
-            season=season,
-            site=site,
-            contest_type=contest_type
-        )
+        batch = self.process_batch([{
+            'week': week,
+            'season': season,
+            'csv_path': csv_path,
+            'site': site,
+            'contest_type': contest_type
+        }])
+        slate = batch['slates'][0]
         
-        # Verify slate exists
-        metadata = self.manager.get_slate_metadata(slate_id)
-        if not metadata:
-            logger.error(f"Slate {slate_id} not found. Create slate first!")
+        if not batch['success']:
             return {
                 'success': False,
-                'error': f"Slate {slate_id} not found"
+                'error': slate.get('error', batch['error'])
             }
         
-        logger.info(f"Found slate: {slate_id} ({metadata['player_count']} players)")
+        return {
+            'success': True,
+            'slate_id': slate['slate_id'],
+            'week': week,
+            'season': season,
+            'site': site,
+            'players_in_slate': slate['players_in_slate'],
+            'players_updated': slate['players_updated'],
+            'total_points': slate['total_points'],
+            'avg_points': slate['avg_points'],
+            'elapsed_seconds': batch['elapsed_seconds'],
+            'timestamp': batch['timestamp']
+        }
+    
+    def process_batch(self, captures: list) -> dict:
+        """
+        Complete results capture workflow for one or more slates.
         
-        # Parse CSV results
-        try:
-            results_df = self.parse_csv_results(csv_path)
-        except Exception as e:
-            logger.error(f"Failed to parse CSV: {e}")
-            return {
-                'success': False,
-                'error': f"CSV parse error: {e}"
-            }
+        Every slate is matched first; the matched actuals of all slates are
+        then written with a single bulk update.
         
-        # Match players
-        actuals = self.match_players_to_slate(results_df, slate_id)
+        Args:
+            captures: List of dicts with week, season, csv_path and optional
+                site (default DraftKings) and contest_type (default Classic)
+            
+        Returns:
+            Dict with capture summary (success only if every slate was
+            updated) and a per-slate summary under 'slates'
+        """
+        start_time = datetime.now()
         
-        if not actuals:
-            logger.error("No players matched. Check player names in CSV.")
+        logger.info("="*60)
+        logger.info(f"Monday Results Capture - {len(captures)} slate(s)")
+        logger.info("="*60)
+        
+        slates = [self._match_capture(capture) for capture in captures]
+        matched = [slate for slate in slates if 'actuals' in slate]
+        
+        if not matched:
             return {
                 'success': False,
-                'error': "No players matched"
+                'error': '; '.join(f"{slate['slate_id']}: {slate['error']}" for slate in slates) or "No slates given",
+                'slates': slates
             }
         
-        # Update database
+        # Update database (one statement for every slate)
+        actuals_df = pd.concat([
+            pd.DataFrame({
+                'slate_id': slate['slate_id'],
+                'player_name': list(slate['actuals'].keys()),
+                'actual_points': list(slate['actuals'].values())
+            })
+            for slate in matched
+        ], ignore_index=True)
         try:
-            count = self.update_slate_actuals(slate_id, actuals)
+            counts = self.update_slate_actuals(actuals_df)
         except Exception as e:
             logger.error(f"Failed to update database: {e}")
             return {
                 'success': False,
-                'error': f"Database update error: {e}"
+                'error': f"Database update error: {e}",
+                'slates': slates
             }
         
         # Calculate summary stats
-        total_points = sum(actuals.values())
-        avg_points = total_points / len(actuals) if actuals else 0
+        for slate in matched:
+            actuals = slate.pop('actuals')
+            total_points = sum(actuals.values())
+            slate.update({
+                'success': True,
+                'players_updated': counts.get(slate['slate_id'], 0),
+                'total_points': round(total_points, 2),
+                'avg_points': round(total_points / len(actuals), 2)
+            })
         
         elapsed = (datetime.now() - start_time).total_seconds()
         
         summary = {
-            'success': True,
-            'slate_id': slate_id,
-            'week': week,
-            'season': season,
-            'site': site,
-            'players_in_slate': metadata['player_count'],
-            'players_updated': count,
-            'total_points': round(total_points, 2),
-            'avg_points': round(avg_points, 2),
+            'success': all(slate['success'] for slate in slates),
+            'slates': slates,
+            'players_updated': sum(counts.values()),
             'elapsed_seconds': round(elapsed, 2),
             'timestamp': datetime.now().isoformat()
         }
+        if not summary['success']:
+            summary['error'] = '; '.join(
+                f"{slate['slate_id']}: {slate['error']}" for slate in slates if not slate['success']
+            )
         
         logger.info("="*60)
         logger.info("RESULTS CAPTURE SUMMARY")
         logger.info("="*60)
-        logger.info(f"Slate ID: {summary['slate_id']}")
-        logger.info(f"Players Updated: {summary['players_updated']}/{summary['players_in_slate']}")
-        logger.info(f"Total Points: {summary['total_points']}")
-        logger.info(f"Average Points: {summary['avg_points']}")
+        for slate in slates:
+            if slate['success']:
+                logger.info(
+                    f"{slate['slate_id']}: {slate['players_updated']}/{slate['players_in_slate']} players, "
+                    f"total {slate['total_points']}, avg {slate['avg_points']}"
+                )
+            else:
+                logger.info(f"{slate['slate_id']}: FAILED ({slate['error']})")
+        logger.info(f"Players Updated: {summary['players_updated']}")
         logger.info(f"Time Elapsed: {summary['elapsed_seconds']}s")
         logger.info("="*60)
         
@@ -344,6 +438,10 @@ class MondayResultsCapture:
             self.manager.close()
         except Exception as e:
             logger.error(f"Error closing manager: {e}")
+        try:
+            self.identity_index.close()
+        except Exception as e:
+            logger.error(f"Error closing identity index: {e}")
 
 
 def interactive_mode():
@@ -421,6 +519,9 @@ Examples:
   # Specify DFS site
   python monday_results_capture.py --week 6 --season 2024 --csv results.csv --site FanDuel
   
+  # Many slates/seasons in one pass
+  python monday_results_capture.py --batch captures.csv
+  
   # Automated mode (Phase 2 feature)
   python monday_results_capture.py --week 6 --season 2024 --auto
         """
@@ -439,6 +540,8 @@ Examples:
                         help='DFS site (default: DraftKings)')
     parser.add_argument('--contest-type', type=str, default='Classic',
                         help='Contest type (default: Classic)')
+    parser.add_argument('--batch', '-b', type=str,
+                        help='CSV of captures (week, season, csv[, site, contest_type]) to update in one pass')
     parser.add_argument('--auto', '-a', action='store_true',
                         help='Automated mode - fetch from DFS API (Phase 2)')
     parser.add_argument('--db', type=str, default='dfs_optimizer.db',
@@ -458,27 +561,44 @@ Examples:
         print(f"  python {sys.argv[0]} --week {args.week or 'N'} --season {args.season} --csv /path/to/results.csv")
         sys.exit(1)
     
-    # Manual CSV mode
-    if not args.week or not args.csv:
-        parser.print_help()
-        print("\n❌ Error: --week and --csv are required for manual mode")
-        print("Or use --interactive for guided setup")
-        sys.exit(1)
+    # Batch mode
+    if args.batch:
+        if not os.path.exists(args.batch):
+            print(f"❌ Error: Batch file not found: {args.batch}")
+            sys.exit(1)
+        batch = pd.read_csv(args.batch).rename(columns={'csv': 'csv_path'})
+        batch = batch.astype(object).where(batch.notna(), None)
+        captures = [
+            {key: value for key, value in row.items() if value is not None}
+            for row in batch.to_dict('records')
+        ]
+        for capture in captures:
+            capture['week'], capture['season'] = int(capture['week']), int(capture['season'])
     
-    if not os.path.exists(args.csv):
-        print(f"❌ Error: CSV file not found: {args.csv}")
-        sys.exit(1)
+    # Manual CSV mode
+    else:
+        if not args.week or not args.csv:
+            parser.print_help()
+            print("\n❌ Error: --week and --csv are required for manual mode")
+            print("Or use --batch or --interactive")
+            sys.exit(1)
+        
+        if not os.path.exists(args.csv):
+            print(f"❌ Error: CSV file not found: {args.csv}")
+            sys.exit(1)
+        
+        captures = [{
+            'week': args.week,
+            'season': args.season,
+            'csv_path': args.csv,
+            'site': args.site,
+            'contest_type': args.contest_type
+        }]
     
     # Process results
     capture = MondayResultsCapture(db_path=args.db)
     try:
-        summary = capture.process_results(
-            week=args.week,
-            season=args.season,
-            csv_path=args.csv,
-            site=args.site,
-            contest_type=args.contest_type
-        )
+        summary = capture.process_batch(captures)
         
         if summary['success']:
             print("\n✅ Results capture successful!")
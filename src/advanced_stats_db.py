@@ -3,15 +3,31 @@ Advanced Stats Database Operations - 4 Separate Tables
 
 Lightweight module for saving/loading advanced stats to/from database.
 Uses 4 separate tables to avoid INSERT OR REPLACE conflicts.
+
+Saves are bulk upserts: each file is turned into insert tuples in one
+vectorized pass and written with executemany, all four tables in one
+transaction.
+
+Multi-week history comes from query_advanced_stats: one indexed query per
+stat table for a whole week range, returned long (player, week, metric,
+value) or as a wide pivot, with recent results kept in an LRU cache.
 """
 
 import sqlite3
 import pandas as pd
-from typing import Dict, Optional
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 from pathlib import Path
 import sys
 import os
 
+try:
+    from .db_access import db_connection
+    from .schema_migrations import ensure_schema
+except ImportError:
+    from db_access import db_connection
+    from schema_migrations import ensure_schema
+
 # Robust config import with multiple fallback strategies
 def _get_default_db_path():
     """Get database path with fallback if config import fails."""
@@ -54,30 +70,108 @@ def _normalize_column_name(col: str) -> str:
     return normalized
 
 
-def _get_player_name(row: pd.Series) -> str:
-    """Extract player name from row, handling different column names."""
-    for col in ['Name', 'name', 'Player', 'player']:
-        if col in row.index:
-            return row[col]
-    return None
+# Candidate source columns for the identity fields (first present wins)
+NAME_COLUMNS = ['Name', 'name', 'Player', 'player']
+TEAM_COLUMNS = ['Team', 'team']
+POSITION_COLUMNS = ['POS', 'pos', 'Position', 'position']
 
+# File type → (table, [(db column, candidate source columns)])
+STAT_TABLES = {
+    'pass': ('pass_stats', [
+        ('cpoe', ['CPOE']), ('adot', ['aDOT']), ('deep_throw_pct', ['Deep Throw %']),
+        ('att', ['ATT']), ('cmp', ['CMP']), ('cmp_pct', ['CMP %']),
+        ('yds', ['YDS']), ('ypa', ['YPA']), ('td', ['TD']), ('int', ['INT']),
+        ('rate', ['RATE']), ('sack', ['SACK']), ('sack_pct', ['SACK %']),
+        ('any_a', ['ANY/A']), ('read1_pct', ['1Read %']), ('acc_pct', ['ACC %']), ('press_pct', ['PRESS %']),
+    ]),
+    'rush': ('rush_stats', [
+        ('yaco_att', ['YACO/ATT']), ('success_rate', ['Success Rate']), ('mtf_att', ['MTF/ATT']),
+        ('att', ['ATT']), ('yds', ['YDS']), ('ypc', ['YPC']), ('td', ['TD']),
+        ('fum', ['FUM']), ('first_downs', ['1D']), ('stuff_pct', ['STUFF %']),
+        ('mtf', ['MTF']), ('yaco', ['YACO']), ('yaco_pct', ['YACO %']),
+    ]),
+    'receiving': ('receiving_stats', [
+        ('tprr', ['TPRR']), ('yprr', ['YPRR']), ('rte_pct', ['RTE %']),
+        ('rte', ['RTE']), ('tgt', ['TGT']), ('tgt_pct', ['TGT %']),
+        ('rec', ['REC']), ('cr_pct', ['CR %']), ('yds', ['YDS']), ('ypr', ['YPR']),
+        ('yac', ['YAC']), ('yac_rec', ['YAC/REC']), ('td', ['TD']), ('read1_pct', ['1READ %']),
+        ('mtf', ['MTF']), ('mtf_rec', ['MTF/REC']), ('first_downs', ['1D']),
+        ('drops', ['DRP']), ('drop_pct', ['DRP %']), ('adot', ['aDOT']),
+    ]),
+    # Handles both the Week 7 and Week 8 snap file formats
+    'snaps': ('snap_stats', [
+        ('snaps', ['Snaps', 'snaps']), ('snap_pct', ['Snap %', 'snap_pct']),
+        ('tm_snaps', ['TM Snaps']), ('snaps_per_gp', ['snaps_per_gp']),
+        ('rush_per_snap', ['rush_per_snap']), ('rush_share', ['rush_share']),
+        ('tgt_per_snap', ['tgt_per_snap']), ('tgt_share', ['tgt_share']),
+        ('touch_per_snap', ['touch_per_snap']), ('util_per_snap', ['util_per_snap']),
+    ]),
+}
 
-def _get_team(row: pd.Series) -> str:
-    """Extract team from row, handling different column names."""
-    for col in ['Team', 'team']:
-        if col in row.index:
-            return row[col]
-    return None
+KEY_COLUMNS = ['player_name', 'team', 'position', 'week']
+
+# Number of query_advanced_stats results kept in memory
+QUERY_CACHE_SIZE = 32
 
 
-def _get_position(row: pd.Series) -> str:
-    """Extract position from row, handling different column names."""
-    for col in ['POS', 'pos', 'Position', 'position']:
-        if col in row.index:
-            return row[col]
+def _first_column(df: pd.DataFrame, candidates: List[str]) -> Optional[str]:
+    """First candidate column present in df, or None."""
+    for col in candidates:
+        if col in df.columns:
+            return col
     return None
 
 
+def _stat_rows(df: pd.DataFrame, columns: List[Tuple[str, List[str]]], week: int) -> List[tuple]:
+    """
+    Build insert tuples for one stat file in a single vectorized pass.
+
+    Rows without a name, team or position are skipped. When a player appears
+    more than once, the last row wins (as with row-by-row INSERT OR REPLACE).
+    Missing values become NULL.
+
+    Args:
+        df: Stat file DataFrame
+        columns: (db column, candidate source columns) pairs for the table
+        week: Week number stored on every row
+
+    Returns:
+        Tuples in KEY_COLUMNS + db column order
+    """
+    identity = [_first_column(df, c) for c in (NAME_COLUMNS, TEAM_COLUMNS, POSITION_COLUMNS)]
+    if None in identity or df.empty:
+        return []
+
+    frame = pd.DataFrame({
+        'player_name': df[identity[0]].to_numpy(),
+        'team': df[identity[1]].to_numpy(),
+        'position': df[identity[2]].to_numpy(),
+        'week': week,
+    })
+    for db_col, candidates in columns:
+        source = _first_column(df, candidates)
+        frame[db_col] = df[source].to_numpy() if source else None
+
+    present = frame[KEY_COLUMNS[:3]].notna() & (frame[KEY_COLUMNS[:3]] != '')
+    frame = frame[present.all(axis=1)].drop_duplicates(subset=KEY_COLUMNS, keep='last')
+
+    # object dtype turns NumPy scalars into Python values sqlite3 can bind
+    frame = frame.astype(object).where(frame.notna(), None)
+    return list(frame.itertuples(index=False, name=None))
+
+
+def _upsert_sql(table: str, columns: List[str]) -> str:
+    """INSERT ... ON CONFLICT upsert keyed on UNIQUE(player_name, team, position, week)."""
+    all_columns = KEY_COLUMNS + columns
+    updates = ', '.join(f"{col} = excluded.{col}" for col in columns)
+    return f"""
+        INSERT INTO {table} ({', '.join(all_columns)})
+        VALUES ({', '.join('?' for _ in all_columns)})
+        ON CONFLICT(player_name, team, position, week) DO UPDATE SET
+        {updates}, updated_at = CURRENT_TIMESTAMP
+    """
+
+
 def save_advanced_stats_to_database(
     season_files: Dict[str, Optional[pd.DataFrame]],
     week: int,
@@ -103,207 +197,22 @@ def save_advanced_stats_to_database(
     print(f"   Files to save: {list(season_files.keys())}")
     
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        # Create tables inline (simpler and more reliable than migration file)
-        print("📝 Creating tables...")
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS pass_stats (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    player_name TEXT NOT NULL,
-                    team TEXT NOT NULL,
-                    position TEXT NOT NULL,
-                    week INTEGER NOT NULL,
-                    cpoe REAL, adot REAL, deep_throw_pct REAL,
-                    att INTEGER, cmp INTEGER, cmp_pct REAL, yds INTEGER,
-                    ypa REAL, td INTEGER, int INTEGER, rate REAL,
-                    sack INTEGER, sack_pct REAL, any_a REAL,
-                    read1_pct REAL, acc_pct REAL, press_pct REAL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(player_name, team, position, week)
-            )
-        """)
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS rush_stats (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    player_name TEXT NOT NULL,
-                    team TEXT NOT NULL,
-                    position TEXT NOT NULL,
-                    week INTEGER NOT NULL,
-                    yaco_att REAL, success_rate REAL, mtf_att REAL,
-                    att INTEGER, yds INTEGER, ypc REAL, td INTEGER,
-                    fum INTEGER, first_downs INTEGER, stuff_pct REAL,
-                    mtf INTEGER, yaco INTEGER, yaco_pct REAL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(player_name, team, position, week)
-            )
-        """)
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS receiving_stats (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    player_name TEXT NOT NULL,
-                    team TEXT NOT NULL,
-                    position TEXT NOT NULL,
-                    week INTEGER NOT NULL,
-                    tprr REAL, yprr REAL, rte_pct REAL,
-                    rte INTEGER, tgt INTEGER, tgt_pct REAL, rec INTEGER,
-                    cr_pct REAL, yds INTEGER, ypr REAL, yac INTEGER,
-                    yac_rec REAL, td INTEGER, read1_pct REAL, mtf INTEGER,
-                    mtf_rec REAL, first_downs INTEGER, drops INTEGER,
-                    drop_pct REAL, adot REAL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(player_name, team, position, week)
-            )
-        """)
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS snap_stats (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    player_name TEXT NOT NULL,
-                    team TEXT NOT NULL,
-                    position TEXT NOT NULL,
-                    week INTEGER NOT NULL,
-                    snaps INTEGER, snap_pct REAL, tm_snaps INTEGER,
-                    snaps_per_gp REAL, rush_per_snap REAL, rush_share REAL,
-                    tgt_per_snap REAL, tgt_share REAL, touch_per_snap REAL,
-                    util_per_snap REAL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(player_name, team, position, week)
-                )
-        """)
-        print("✅ Tables created")
-        
+        # Stat tables and their indexes come from migrations 008 and 010
+        ensure_schema(db_path)
         records_saved = 0
         
-        # ====================================================================
-        # PASS STATS
-        # ====================================================================
-        if season_files.get('pass') is not None:
-            pass_df = season_files['pass']
-            
-            for _, row in pass_df.iterrows():
-                player_name = _get_player_name(row)
-                team = _get_team(row)
-                position = _get_position(row)
-                
-                if not player_name or not team or not position:
-                    continue
-                
-                cursor.execute("""
-                    INSERT OR REPLACE INTO pass_stats 
-                    (player_name, team, position, week, cpoe, adot, deep_throw_pct,
-                     att, cmp, cmp_pct, yds, ypa, td, int, rate, sack, sack_pct,
-                     any_a, read1_pct, acc_pct, press_pct)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    player_name, team, position, week,
-                    row.get('CPOE'), row.get('aDOT'), row.get('Deep Throw %'),
-                    row.get('ATT'), row.get('CMP'), row.get('CMP %'),
-                    row.get('YDS'), row.get('YPA'), row.get('TD'), row.get('INT'),
-                    row.get('RATE'), row.get('SACK'), row.get('SACK %'),
-                    row.get('ANY/A'), row.get('1Read %'), row.get('ACC %'), row.get('PRESS %')
-                ))
-                records_saved += 1
-        
-        # ====================================================================
-        # RUSH STATS
-        # ====================================================================
-        if season_files.get('rush') is not None:
-            rush_df = season_files['rush']
-            
-            for _, row in rush_df.iterrows():
-                player_name = _get_player_name(row)
-                team = _get_team(row)
-                position = _get_position(row)
-                
-                if not player_name or not team or not position:
-                    continue
-                
-                cursor.execute("""
-                    INSERT OR REPLACE INTO rush_stats 
-                    (player_name, team, position, week, yaco_att, success_rate, mtf_att,
-                     att, yds, ypc, td, fum, first_downs, stuff_pct, mtf, yaco, yaco_pct)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    player_name, team, position, week,
-                    row.get('YACO/ATT'), row.get('Success Rate'), row.get('MTF/ATT'),
-                    row.get('ATT'), row.get('YDS'), row.get('YPC'), row.get('TD'),
-                    row.get('FUM'), row.get('1D'), row.get('STUFF %'),
-                    row.get('MTF'), row.get('YACO'), row.get('YACO %')
-                ))
-                records_saved += 1
-        
-        # ====================================================================
-        # RECEIVING STATS
-        # ====================================================================
-        if season_files.get('receiving') is not None:
-            rec_df = season_files['receiving']
-            
-            for _, row in rec_df.iterrows():
-                player_name = _get_player_name(row)
-                team = _get_team(row)
-                position = _get_position(row)
-                
-                if not player_name or not team or not position:
-                    continue
-                
-                cursor.execute("""
-                    INSERT OR REPLACE INTO receiving_stats 
-                    (player_name, team, position, week, tprr, yprr, rte_pct,
-                     rte, tgt, tgt_pct, rec, cr_pct, yds, ypr, yac, yac_rec,
-                     td, read1_pct, mtf, mtf_rec, first_downs, drops, drop_pct, adot)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    player_name, team, position, week,
-                    row.get('TPRR'), row.get('YPRR'), row.get('RTE %'),
-                    row.get('RTE'), row.get('TGT'), row.get('TGT %'),
-                    row.get('REC'), row.get('CR %'), row.get('YDS'), row.get('YPR'),
-                    row.get('YAC'), row.get('YAC/REC'), row.get('TD'), row.get('1READ %'),
-                    row.get('MTF'), row.get('MTF/REC'), row.get('1D'),
-                    row.get('DRP'), row.get('DRP %'), row.get('aDOT')
-                ))
-                records_saved += 1
-        
-        # ====================================================================
-        # SNAP STATS (Handle both Week 7 and Week 8 formats)
-        # ====================================================================
-        if season_files.get('snaps') is not None:
-            snaps_df = season_files['snaps']
-            
-            for _, row in snaps_df.iterrows():
-                player_name = _get_player_name(row)
-                team = _get_team(row)
-                position = _get_position(row)
-                
-                if not player_name or not team or not position:
+        # One transaction for all four tables; one executemany per table
+        with db_connection(db_path) as conn:
+            cursor = conn.cursor()
+            for file_type, (table, columns) in STAT_TABLES.items():
+                if season_files.get(file_type) is None:
                     continue
-                
-                # Handle different column formats
-                snaps = row.get('Snaps') or row.get('snaps')
-                snap_pct = row.get('Snap %') or row.get('snap_pct')
-                
-                cursor.execute("""
-                    INSERT OR REPLACE INTO snap_stats 
-                    (player_name, team, position, week, snaps, snap_pct,
-                     tm_snaps, snaps_per_gp, rush_per_snap, rush_share,
-                     tgt_per_snap, tgt_share, touch_per_snap, util_per_snap)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    player_name, team, position, week,
-                    snaps, snap_pct,
-                    row.get('TM Snaps'), row.get('snaps_per_gp'),
-                    row.get('rush_per_snap'), row.get('rush_share'),
-                    row.get('tgt_per_snap'), row.get('tgt_share'),
-                    row.get('touch_per_snap'), row.get('util_per_snap')
-                ))
-                records_saved += 1
+                rows = _stat_rows(season_files[file_type], columns, week)
+                if rows:
+                    cursor.executemany(_upsert_sql(table, [col for col, _ in columns]), rows)
+                    records_saved += len(rows)
         
-        conn.commit()
-        conn.close()
+        clear_query_cache()
         
         return records_saved > 0
         
@@ -336,121 +245,118 @@ def load_advanced_stats_from_database(
     print(f"   Week: {week}")
     
     try:
-        conn = sqlite3.connect(db_path)
-        
-        result = {}
-        
-        # Load from SEPARATE tables (migration 008)
-        # Pass stats
-        try:
-            query_pass = "SELECT * FROM pass_stats WHERE week = ?"
-            df_pass = pd.read_sql_query(query_pass, conn, params=(week,))
-            if len(df_pass) > 0:
-                # Rename to match expected column names from Excel files
-                df_pass = df_pass.rename(columns={
-                    'player_name': 'Name',
-                    'team': 'Team',
-                    'position': 'POS',
-                    'week': 'W',
-                    'cpoe': 'CPOE',
-                    'adot': 'aDOT',
-                    'deep_throw_pct': 'Deep Throw %',
-                    'read1_pct': '1Read %',
-                    'acc_pct': 'ACC %',
-                    'press_pct': 'PRESS %'
-                })
-                result['pass'] = df_pass
-                print(f"   Loaded {len(df_pass)} pass stats")
-            else:
+        with db_connection(db_path) as conn:
+            result = {}
+            
+            # Load from SEPARATE tables (migration 008)
+            # Pass stats
+            try:
+                query_pass = "SELECT * FROM pass_stats WHERE week = ?"
+                df_pass = pd.read_sql_query(query_pass, conn, params=(week,))
+                if len(df_pass) > 0:
+                    # Rename to match expected column names from Excel files
+                    df_pass = df_pass.rename(columns={
+                        'player_name': 'Name',
+                        'team': 'Team',
+                        'position': 'POS',
+                        'week': 'W',
+                        'cpoe': 'CPOE',
+                        'adot': 'aDOT',
+                        'deep_throw_pct': 'Deep Throw %',
+                        'read1_pct': '1Read %',
+                        'acc_pct': 'ACC %',
+                        'press_pct': 'PRESS %'
+                    })
+                    result['pass'] = df_pass
+                    print(f"   Loaded {len(df_pass)} pass stats")
+                else:
+                    result['pass'] = None
+            except Exception as e:
+                print(f"   No pass stats found: {e}")
                 result['pass'] = None
-        except Exception as e:
-            print(f"   No pass stats found: {e}")
-            result['pass'] = None
-        
-        # Rush stats
-        try:
-            query_rush = "SELECT * FROM rush_stats WHERE week = ?"
-            df_rush = pd.read_sql_query(query_rush, conn, params=(week,))
-            if len(df_rush) > 0:
-                # Rename to match expected column names from Excel files
-                df_rush = df_rush.rename(columns={
-                    'player_name': 'Name',
-                    'team': 'Team',
-                    'position': 'POS',
-                    'week': 'W',
-                    'yaco_att': 'YACO/ATT',
-                    'success_rate': 'Success Rate',
-                    'mtf_att': 'MTF/ATT',
-                    'stuff_pct': 'STUFF %',
-                    'yaco_pct': 'YACO %'
-                })
-                result['rush'] = df_rush
-                print(f"   Loaded {len(df_rush)} rush stats")
-            else:
+            
+            # Rush stats
+            try:
+                query_rush = "SELECT * FROM rush_stats WHERE week = ?"
+                df_rush = pd.read_sql_query(query_rush, conn, params=(week,))
+                if len(df_rush) > 0:
+                    # Rename to match expected column names from Excel files
+                    df_rush = df_rush.rename(columns={
+                        'player_name': 'Name',
+                        'team': 'Team',
+                        'position': 'POS',
+                        'week': 'W',
+                        'yaco_att': 'YACO/ATT',
+                        'success_rate': 'Success Rate',
+                        'mtf_att': 'MTF/ATT',
+                        'stuff_pct': 'STUFF %',
+                        'yaco_pct': 'YACO %'
+                    })
+                    result['rush'] = df_rush
+                    print(f"   Loaded {len(df_rush)} rush stats")
+                else:
+                    result['rush'] = None
+            except Exception as e:
+                print(f"   No rush stats found: {e}")
                 result['rush'] = None
-        except Exception as e:
-            print(f"   No rush stats found: {e}")
-            result['rush'] = None
-        
-        # Receiving stats
-        try:
-            query_receiving = "SELECT * FROM receiving_stats WHERE week = ?"
-            df_receiving = pd.read_sql_query(query_receiving, conn, params=(week,))
-            if len(df_receiving) > 0:
-                # Rename to match expected column names from Excel files
-                df_receiving = df_receiving.rename(columns={
-                    'player_name': 'Name',
-                    'team': 'Team',
-                    'position': 'POS',
-                    'week': 'W',
-                    'tprr': 'TPRR',
-                    'yprr': 'YPRR',
-                    'rte_pct': 'RTE %',
-                    'tgt_pct': 'TGT %',
-                    'cr_pct': 'CR %',
-                    'yac_rec': 'YAC/REC',
-                    'read1_pct': '1READ %',
-                    'mtf_rec': 'MTF/REC',
-                    'drop_pct': 'DRP %',
-                    'adot': 'aDOT'
-                })
-                result['receiving'] = df_receiving
-                print(f"   Loaded {len(df_receiving)} receiving stats")
-            else:
+            
+            # Receiving stats
+            try:
+                query_receiving = "SELECT * FROM receiving_stats WHERE week = ?"
+                df_receiving = pd.read_sql_query(query_receiving, conn, params=(week,))
+                if len(df_receiving) > 0:
+                    # Rename to match expected column names from Excel files
+                    df_receiving = df_receiving.rename(columns={
+                        'player_name': 'Name',
+                        'team': 'Team',
+                        'position': 'POS',
+                        'week': 'W',
+                        'tprr': 'TPRR',
+                        'yprr': 'YPRR',
+                        'rte_pct': 'RTE %',
+                        'tgt_pct': 'TGT %',
+                        'cr_pct': 'CR %',
+                        'yac_rec': 'YAC/REC',
+                        'read1_pct': '1READ %',
+                        'mtf_rec': 'MTF/REC',
+                        'drop_pct': 'DRP %',
+                        'adot': 'aDOT'
+                    })
+                    result['receiving'] = df_receiving
+                    print(f"   Loaded {len(df_receiving)} receiving stats")
+                else:
+                    result['receiving'] = None
+            except Exception as e:
+                print(f"   No receiving stats found: {e}")
                 result['receiving'] = None
-        except Exception as e:
-            print(f"   No receiving stats found: {e}")
-            result['receiving'] = None
-        
-        # Snap stats
-        try:
-            query_snaps = "SELECT * FROM snap_stats WHERE week = ?"
-            df_snaps = pd.read_sql_query(query_snaps, conn, params=(week,))
-            if len(df_snaps) > 0:
-                # Rename to match expected column names from Excel files
-                df_snaps = df_snaps.rename(columns={
-                    'player_name': 'Name',
-                    'team': 'Team',
-                    'position': 'POS',
-                    'week': 'W',
-                    'snap_pct': 'Snap %',
-                    'snaps_per_gp': 'snaps_per_gp',
-                    'rush_per_snap': 'rush_per_snap',
-                    'rush_share': 'rush_share',
-                    'tgt_per_snap': 'tgt_per_snap',
-                    'tgt_share': 'tgt_share',
-                    'touch_per_snap': 'touch_per_snap',
-                    'util_per_snap': 'util_per_snap'
-                })
-                result['snaps'] = df_snaps
-                print(f"   Loaded {len(df_snaps)} snap stats")
-            else:
+            
+            # Snap stats
+            try:
+                query_snaps = "SELECT * FROM snap_stats WHERE week = ?"
+                df_snaps = pd.read_sql_query(query_snaps, conn, params=(week,))
+                if len(df_snaps) > 0:
+                    # Rename to match expected column names from Excel files
+                    df_snaps = df_snaps.rename(columns={
+                        'player_name': 'Name',
+                        'team': 'Team',
+                        'position': 'POS',
+                        'week': 'W',
+                        'snap_pct': 'Snap %',
+                        'snaps_per_gp': 'snaps_per_gp',
+                        'rush_per_snap': 'rush_per_snap',
+                        'rush_share': 'rush_share',
+                        'tgt_per_snap': 'tgt_per_snap',
+                        'tgt_share': 'tgt_share',
+                        'touch_per_snap': 'touch_per_snap',
+                        'util_per_snap': 'util_per_snap'
+                    })
+                    result['snaps'] = df_snaps
+                    print(f"   Loaded {len(df_snaps)} snap stats")
+                else:
+                    result['snaps'] = None
+            except Exception as e:
+                print(f"   No snap stats found: {e}")
                 result['snaps'] = None
-        except Exception as e:
-            print(f"   No snap stats found: {e}")
-            result['snaps'] = None
-        
-        conn.close()
         
         files_loaded = sum(1 for v in result.values() if v is not None)
         print(f"   Total: {files_loaded} stat types loaded")
@@ -462,3 +368,118 @@ def load_advanced_stats_from_database(
         import traceback
         traceback.print_exc()
         return {'pass': None, 'rush': None, 'receiving': None, 'snaps': None}
+
+
+_query_cache: "OrderedDict[tuple, pd.DataFrame]" = OrderedDict()
+
+
+def clear_query_cache() -> None:
+    """Clear cached query_advanced_stats results (done after every save)."""
+    _query_cache.clear()
+
+
+def _db_version(db_path: str) -> tuple:
+    """
+    Cheap change marker for a database file.
+
+    mtime/size of the database and its WAL file, so results cached before a
+    write from any connection (or process) are not served afterwards.
+    """
+    version = []
+    for path in (db_path, f"{db_path}-wal"):
+        try:
+            stat = os.stat(path)
+            version.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            version.append(None)
+    return tuple(version)
+
+
+def _normalize_weeks(weeks: Union[int, Iterable[int]]) -> Tuple[int, ...]:
+    """Sorted, de-duplicated week tuple from a week or iterable of weeks."""
+    if isinstance(weeks, (int, float)) and not isinstance(weeks, bool):
+        weeks = [weeks]
+    normalized = tuple(sorted({int(w) for w in weeks}))
+    if not normalized:
+        raise ValueError("weeks must contain at least one week")
+    return normalized
+
+
+def _read_stat_weeks(db_path: str, table: str, weeks: Tuple[int, ...], metrics: List[str]) -> pd.DataFrame:
+    """One row per (player, week) for the requested weeks, in index order."""
+    columns = KEY_COLUMNS + metrics
+    query = f"""
+        SELECT {', '.join(columns)} FROM {table}
+        WHERE week IN ({', '.join('?' for _ in weeks)})
+        ORDER BY week, player_name, team, position
+    """
+    ensure_schema(db_path)
+    with db_connection(db_path) as conn:
+        try:
+            return pd.read_sql_query(query, conn, params=weeks)
+        except (sqlite3.OperationalError, pd.errors.DatabaseError) as e:
+            if 'no such table' not in str(e):
+                raise
+            return pd.DataFrame(columns=columns)
+
+
+def query_advanced_stats(
+    stat_type: str,
+    weeks: Union[int, Iterable[int]],
+    metrics: Optional[List[str]] = None,
+    layout: str = 'long',
+    db_path: str = None
+) -> pd.DataFrame:
+    """
+    Advanced stats for several weeks in one indexed query.
+
+    Args:
+        stat_type: 'pass', 'rush', 'receiving' or 'snaps'
+        weeks: Week number, range or iterable of weeks (e.g. range(3, 8))
+        metrics: Table columns to return (default: all stat columns)
+        layout: 'long' → player_name, team, position, week, metric, value
+                (one row per non-null value);
+                'wide' → one row per (player_name, team, position) with
+                (metric, week) columns
+        db_path: Path to SQLite database (defaults to config.DEFAULT_DB_PATH)
+
+    Returns:
+        DataFrame in the requested layout (empty if nothing is stored).
+        Callers get their own copy; cached results are not affected by edits.
+
+    Raises:
+        ValueError: Unknown stat_type, metric or layout, or no weeks
+    """
+    if db_path is None:
+        db_path = _DEFAULT_DB_PATH
+    if stat_type not in STAT_TABLES:
+        raise ValueError(f"Unknown stat type '{stat_type}' (expected one of {list(STAT_TABLES)})")
+    if layout not in ('long', 'wide'):
+        raise ValueError(f"Unknown layout '{layout}' (expected 'long' or 'wide')")
+
+    table, columns = STAT_TABLES[stat_type]
+    available = [col for col, _ in columns]
+    metrics = list(metrics) if metrics is not None else available
+    unknown = [m for m in metrics if m not in available]
+    if unknown:
+        raise ValueError(f"Unknown {stat_type} metrics: {unknown}")
+    weeks = _normalize_weeks(weeks)
+
+    key = (os.path.abspath(db_path), _db_version(db_path), table, weeks, tuple(metrics), layout)
+    cached = _query_cache.get(key)
+    if cached is not None:
+        _query_cache.move_to_end(key)
+        return cached.copy()
+
+    frame = _read_stat_weeks(db_path, table, weeks, metrics)
+    if layout == 'long':
+        result = frame.melt(id_vars=KEY_COLUMNS, value_vars=metrics, var_name='metric', value_name='value')
+        result = result.dropna(subset=['value'])
+        result = result.sort_values(KEY_COLUMNS, kind='stable').reset_index(drop=True)
+    else:
+        result = frame.pivot(index=KEY_COLUMNS[:3], columns='week', values=metrics)
+
+    _query_cache[key] = result
+    while len(_query_cache) > QUERY_CACHE_SIZE:
+        _query_cache.popitem(last=False)
+    return result.copy()
@@ -24,10 +24,12 @@ import pandas as pd
 try:
     from .team_normalizer import TeamNormalizer
     from .player_name_mapper import PlayerNameMapper, PlayerMapping, normalize_name
+    from .excel_cache import read_excel_many
 except ImportError:
     # Fallback for direct execution
     from team_normalizer import TeamNormalizer
     from player_name_mapper import PlayerNameMapper, PlayerMapping, normalize_name
+    from excel_cache import read_excel_many
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -67,6 +69,9 @@ class FileLoader:
     - Validates schema (required columns)
     - Graceful degradation: continues if 1-2 files missing
     - Automatic team normalization
+    - Arrow cache of parsed workbooks (see excel_cache), so unchanged files
+      skip Excel parsing after the first load; cold files are parsed
+      concurrently in a process pool
     - Performance optimized: <2 seconds for all 4 files
 
     Usage:
@@ -75,17 +80,26 @@ class FileLoader:
         report = loader.get_load_report()
     """
 
-    def __init__(self, season_stats_dir: str = "DFS/seasonStats/"):
+    def __init__(
+        self,
+        season_stats_dir: str = "DFS/seasonStats/",
+        use_cache: bool = True,
+        cache_dir: Optional[str] = None
+    ):
         """
         Initialize FileLoader.
 
         Args:
             season_stats_dir: Directory containing the 4 Excel files
+            use_cache: Serve unchanged workbooks from the Arrow cache
+            cache_dir: Cache directory (default: .excel_cache in season_stats_dir)
 
         Raises:
             FileNotFoundError: If season_stats_dir doesn't exist
         """
         self.season_stats_dir = os.path.abspath(season_stats_dir)
+        self.use_cache = use_cache
+        self.cache_dir = cache_dir
         self.loaded_files: Dict[str, Optional[pd.DataFrame]] = {}
         self.load_errors: Dict[str, str] = {}
         self.load_warnings: List[str] = []
@@ -112,21 +126,41 @@ class FileLoader:
         start_time = time.time()
         logger.info(f"Loading season stats files from {self.season_stats_dir}")
 
+        # Step 1: Check file validity
+        file_paths = {}
         for file_key, file_pattern in FILE_PATTERNS.items():
-            file_start = time.time()
             file_path = os.path.join(self.season_stats_dir, file_pattern)
-
             try:
-                # Step 1: Check file validity
-                if not self._check_file_valid(file_path, file_key):
-                    self.loaded_files[file_key] = None
-                    continue
+                if self._check_file_valid(file_path, file_key):
+                    file_paths[file_key] = file_path
+            except Exception as e:
+                error_msg = f"ERR-ADV-002: Failed to load {file_pattern}: {str(e)}"
+                logger.error(error_msg)
+                self.load_errors[file_key] = error_msg
 
-                # Step 2: Load Excel file
-                logger.info(f"Loading {file_pattern}...")
-                df = pd.read_excel(file_path)
+        # Step 2: Load Excel files (cached reads, cold files parsed concurrently)
+        logger.info(f"Loading {', '.join(FILE_PATTERNS[key] for key in file_paths)}...")
+        if self.use_cache:
+            results = read_excel_many(file_paths, cache_dir=self.cache_dir)
+        else:
+            sources = {}
+            for file_key, file_path in file_paths.items():
+                with open(file_path, 'rb') as f:
+                    sources[file_key] = f.read()
+            results = read_excel_many(sources)
+
+        for file_key, file_pattern in FILE_PATTERNS.items():
+            result = results.get(file_key)
+            if result is None:
+                self.loaded_files[file_key] = None
+                continue
+
+            try:
+                if result.error is not None:
+                    raise ValueError(result.error)
+                df = result.df
 
-                load_time = time.time() - file_start
+                load_time = result.seconds
                 self.load_times[file_key] = load_time
 
                 logger.info(
@@ -442,7 +476,8 @@ def load_season_stats_files(
 def create_player_mapper(
     player_df: pd.DataFrame,
     season_files: Dict[str, Optional[pd.DataFrame]],
-    threshold: int = 85
+    threshold: int = 85,
+    identity_index=None
 ) -> PlayerNameMapper:
     """
     Convenience function to create player name mappings.
@@ -451,13 +486,15 @@ def create_player_mapper(
         player_df: Main player DataFrame
         season_files: Loaded season stat files
         threshold: Minimum fuzzy match score
+        identity_index: Optional PlayerIdentityIndex to resolve known players
+            and persist new matches
 
     Returns:
         PlayerNameMapper with cached mappings
 
     Performance: <2 seconds for 500 players
     """
-    mapper = PlayerNameMapper(threshold=threshold)
+    mapper = PlayerNameMapper(threshold=threshold, identity_index=identity_index)
     mapper.create_mappings(player_df, season_files)
 
     # Log match report
@@ -7,13 +7,11 @@ import logging
 from typing import Optional, Dict, Any
 from datetime import datetime, timedelta
 import requests
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 
 try:
-    from ..database_models import APICallLog
+    from ..database_models import APICallLog, create_session
 except ImportError:
-    from database_models import APICallLog
+    from database_models import APICallLog, create_session
 
 # Custom exceptions
 class APIError(Exception):
@@ -72,10 +70,8 @@ class BaseAPIClient:
         self.max_retries = max_retries
         self.retry_delay = retry_delay
         
-        # Setup database session
-        engine = create_engine(f'sqlite:///{db_path}')
-        Session = sessionmaker(bind=engine)
-        self.session = Session()
+        # Setup database session (shared connection pool)
+        self.session = create_session(db_path)
         
         # Setup logging
         self.logger = logging.getLogger(f"{__name__}.{api_name}")
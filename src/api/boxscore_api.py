@@ -10,8 +10,6 @@ Endpoint: /pull/nfl/{season}/games/{game}/boxscore.json
 
 from typing import List, Dict, Any, Optional
 from datetime import datetime
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 import requests
 from requests.auth import HTTPBasicAuth
 
@@ -19,8 +17,10 @@ from .base_client import BaseAPIClient, APIError
 
 try:
     from ..database_models import create_session
+    from ..db_access import db_connection
 except ImportError:
     from database_models import create_session
+    from db_access import db_connection
 
 
 class BoxscoreAPIClient(BaseAPIClient):
@@ -367,58 +367,54 @@ class BoxscoreAPIClient(BaseAPIClient):
             bool: True if successful
         """
         try:
-            import sqlite3
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Store game info
-            cursor.execute("""
-                INSERT OR REPLACE INTO game_boxscores 
-                (game_id, season, week, game_date, home_team, away_team, home_score, away_score, game_status, fetched_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'final', CURRENT_TIMESTAMP)
-            """, (
-                boxscore_data['game_id'],
-                boxscore_data['season'],
-                boxscore_data['week'],
-                boxscore_data['game_date'],
-                boxscore_data['home_team'],
-                boxscore_data['away_team'],
-                boxscore_data['home_score'],
-                boxscore_data['away_score']
-            ))
-            
-            # Store player stats
-            for player in boxscore_data['player_stats']:
+            with db_connection(self.db_path) as conn:
+                cursor = conn.cursor()
+                
+                # Store game info
                 cursor.execute("""
-                    INSERT OR REPLACE INTO player_game_stats
-                    (game_id, player_id, player_name, team, position,
-                     pass_attempts, pass_completions, pass_yards, pass_touchdowns, pass_interceptions,
-                     rush_attempts, rush_yards, rush_touchdowns,
-                     targets, receptions, receiving_yards, receiving_touchdowns,
-                     fetched_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                    INSERT OR REPLACE INTO game_boxscores 
+                    (game_id, season, week, game_date, home_team, away_team, home_score, away_score, game_status, fetched_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'final', CURRENT_TIMESTAMP)
                 """, (
-                    player['game_id'],
-                    player['player_id'],
-                    player['player_name'],
-                    player['team'],
-                    player['position'],
-                    player['pass_attempts'],
-                    player['pass_completions'],
-                    player['pass_yards'],
-                    player['pass_touchdowns'],
-                    player['pass_interceptions'],
-                    player['rush_attempts'],
-                    player['rush_yards'],
-                    player['rush_touchdowns'],
-                    player['targets'],
-                    player['receptions'],
-                    player['receiving_yards'],
-                    player['receiving_touchdowns']
+                    boxscore_data['game_id'],
+                    boxscore_data['season'],
+                    boxscore_data['week'],
+                    boxscore_data['game_date'],
+                    boxscore_data['home_team'],
+                    boxscore_data['away_team'],
+                    boxscore_data['home_score'],
+                    boxscore_data['away_score']
                 ))
-            
-            conn.commit()
-            conn.close()
+                
+                # Store player stats
+                for player in boxscore_data['player_stats']:
+                    cursor.execute("""
+                        INSERT OR REPLACE INTO player_game_stats
+                        (game_id, player_id, player_name, team, position,
+                         pass_attempts, pass_completions, pass_yards, pass_touchdowns, pass_interceptions,
+                         rush_attempts, rush_yards, rush_touchdowns,
+                         targets, receptions, receiving_yards, receiving_touchdowns,
+                         fetched_at)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                    """, (
+                        player['game_id'],
+                        player['player_id'],
+                        player['player_name'],
+                        player['team'],
+                        player['position'],
+                        player['pass_attempts'],
+                        player['pass_completions'],
+                        player['pass_yards'],
+                        player['pass_touchdowns'],
+                        player['pass_interceptions'],
+                        player['rush_attempts'],
+                        player['rush_yards'],
+                        player['rush_touchdowns'],
+                        player['targets'],
+                        player['receptions'],
+                        player['receiving_yards'],
+                        player['receiving_touchdowns']
+                    ))
             
             self.logger.info(f"Stored {len(boxscore_data['player_stats'])} player stats for game {boxscore_data['game_id']}")
             return True
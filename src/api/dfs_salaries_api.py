@@ -14,13 +14,16 @@ REQUIREMENTS:
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 import pandas as pd
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 import requests
 from requests.auth import HTTPBasicAuth
 
 from .base_client import BaseAPIClient, APIError, RateLimitError, TimeoutError
 
+try:
+    from ..database_models import create_session
+except ImportError:
+    from database_models import create_session
+
 
 class DFSSalariesAPIClient(BaseAPIClient):
     """
@@ -64,9 +67,7 @@ class DFSSalariesAPIClient(BaseAPIClient):
         )
         
         # Setup database session
-        engine = create_engine(f'sqlite:///{db_path}')
-        Session = sessionmaker(bind=engine)
-        self.db_session = Session()
+        self.db_session = create_session(db_path)
         
         # Cache for API responses
         self._cache = {}
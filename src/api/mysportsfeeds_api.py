@@ -6,17 +6,15 @@ API Documentation: https://www.mysportsfeeds.com/data-feeds/api-docs/
 
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 import requests
 from requests.auth import HTTPBasicAuth
 
 from .base_client import BaseAPIClient, APIError
 
 try:
-    from ..database_models import InjuryReport
+    from ..database_models import InjuryReport, create_session
 except ImportError:
-    from database_models import InjuryReport
+    from database_models import InjuryReport, create_session
 
 
 class MySportsFeedsClient(BaseAPIClient):
@@ -56,9 +54,7 @@ class MySportsFeedsClient(BaseAPIClient):
         )
         
         # Setup database session for InjuryReport table
-        engine = create_engine(f'sqlite:///{db_path}')
-        Session = sessionmaker(bind=engine)
-        self.db_session = Session()
+        self.db_session = create_session(db_path)
     
     def _make_request(
         self,
@@ -377,7 +373,7 @@ class MySportsFeedsClient(BaseAPIClient):
                     existing.practice_status = injury['practice_status']
                     existing.body_part = injury['body_part']
                     existing.description = injury['injury_description']
-                    existing.updated_at = datetime.now()
+                    existing.updated_at = datetime.utcnow()
                 else:
                     # Insert new record
                     injury_report = InjuryReport(
@@ -389,7 +385,7 @@ class MySportsFeedsClient(BaseAPIClient):
                         practice_status=injury['practice_status'],
                         body_part=injury['body_part'],
                         description=injury['injury_description'],
-                        updated_at=datetime.now()
+                        updated_at=datetime.utcnow()
                     )
                     self.db_session.add(injury_report)
             
@@ -412,7 +408,7 @@ class MySportsFeedsClient(BaseAPIClient):
             List of cached injury reports, or None if cache expired/empty
         """
         try:
-            cutoff = datetime.now() - timedelta(hours=cache_ttl_hours)
+            cutoff = datetime.utcnow() - timedelta(hours=cache_ttl_hours)
             
             cached_reports = self.db_session.query(InjuryReport).filter(
                 InjuryReport.updated_at >= cutoff
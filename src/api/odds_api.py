@@ -6,15 +6,13 @@ API Documentation: https://the-odds-api.com/liveapi/guides/v4/
 
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 
 from .base_client import BaseAPIClient, APIError
 
 try:
-    from ..database_models import VegasLine
+    from ..database_models import VegasLine, create_session
 except ImportError:
-    from database_models import VegasLine
+    from database_models import VegasLine, create_session
 
 
 class OddsAPIClient(BaseAPIClient):
@@ -47,9 +45,7 @@ class OddsAPIClient(BaseAPIClient):
         )
         
         # Setup database session for VegasLine table
-        engine = create_engine(f'sqlite:///{db_path}')
-        Session = sessionmaker(bind=engine)
-        self.db_session = Session()
+        self.db_session = create_session(db_path)
     
     def fetch_nfl_odds(
         self,
@@ -297,7 +293,7 @@ class OddsAPIClient(BaseAPIClient):
                     existing.total = game['total']
                     existing.home_itt = game['itt_home']
                     existing.away_itt = game['itt_away']
-                    existing.fetched_at = datetime.now()
+                    existing.fetched_at = datetime.utcnow()
                 else:
                     # Insert new record
                     vegas_line = VegasLine(
@@ -310,7 +306,7 @@ class OddsAPIClient(BaseAPIClient):
                         total=game['total'],
                         home_itt=game['itt_home'],
                         away_itt=game['itt_away'],
-                        fetched_at=datetime.now()
+                        fetched_at=datetime.utcnow()
                     )
                     self.db_session.add(vegas_line)
             
@@ -333,7 +329,7 @@ class OddsAPIClient(BaseAPIClient):
             List of cached game odds, or None if cache expired/empty
         """
         try:
-            cutoff = datetime.now() - timedelta(hours=cache_ttl_hours)
+            cutoff = datetime.utcnow() - timedelta(hours=cache_ttl_hours)
             
             cached_lines = self.db_session.query(VegasLine).filter(
                 VegasLine.fetched_at >= cutoff
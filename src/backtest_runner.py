@@ -0,0 +1,374 @@
+"""
+Backtest Runner
+
+Replays stored slates (historical_player_pool) over a grid of
+weeks x Smart Value profiles x optimizer configs and records one
+BacktestResult per (profile, config).
+
+For every grid cell the runner:
+1. loads the slate snapshot
+2. computes Smart Value for the profile and applies the config's
+   smart_threshold filter
+3. generates lineups with the regular optimizer
+4. scores each lineup against actual points
+
+Each slate is also solved once with perfect hindsight (maximize actual
+points under the same roster rules); that is overall_optimal_score. The
+hindsight solve uses the full snapshot (every player with a salary and
+position), not the optimizer's filtered pool, so the gap includes players
+the pool filters left out.
+
+Cells are spread over a process pool. Tasks for the same slate are sent to
+a worker together, and every worker keeps the snapshots (and hindsight
+scores) it has already loaded, so each slate is read and solved at most
+once per worker. All result rows are written in one bulk insert.
+
+optimizer imports its siblings by plain module name (from models import
+...), so src/ must be on sys.path to import this module, as for optimizer.
+
+Usage:
+    results = run_backtests(
+        season=2024,
+        weeks=range(6, 10),
+        profiles=['balanced', 'gpp'],
+        configs={
+            'single': {'lineup_count': 1},
+            'sv60': {'lineup_count': 5, 'smart_threshold': 60},
+        }
+    )
+    results[['profile_name', 'config', 'overall_avg_score', 'avg_gap_from_optimal']]
+"""
+
+import os
+import json
+import uuid
+import logging
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import pulp
+from sqlalchemy import insert
+
+try:
+    from .database_models import BacktestResult, create_session
+    from .historical_data_manager import HistoricalDataManager
+    from .smart_value_calculator_enhanced import WEIGHT_PROFILES, calculate_smart_value_batch
+    from .optimizer import generate_lineups
+except ImportError:
+    from database_models import BacktestResult, create_session
+    from historical_data_manager import HistoricalDataManager
+    from smart_value_calculator_enhanced import WEIGHT_PROFILES, calculate_smart_value_batch
+    from optimizer import generate_lineups
+
+logger = logging.getLogger(__name__)
+
+# Settings used for anything a config leaves out
+DEFAULT_BACKTEST_CONFIG = {
+    'lineup_count': 3,
+    'uniqueness_pct': 0.55,
+    'stacking_enabled': True,
+    'stacking_penalty_weight': 0.0,
+    'smart_threshold': 0,
+}
+
+# Config keys passed straight through to generate_lineups
+OPTIMIZER_OPTIONS = (
+    'lineup_count', 'uniqueness_pct', 'max_exposure_pct', 'max_ownership_enabled',
+    'max_ownership_pct', 'stacking_enabled', 'stacking_penalty_weight',
+    'max_high_own_wrs_enabled', 'max_high_own_wrs'
+)
+
+# DraftKings Classic roster: position → (min, max) including FLEX
+ROSTER_LIMITS = {'QB': (1, 1), 'RB': (2, 3), 'WR': (3, 4), 'TE': (1, 2), 'DST': (1, 1)}
+ROSTER_SIZE = 9
+SALARY_CAP = 50000
+DST_POSITIONS = ('DST', 'D/ST', 'DEF')
+
+# Prepared slates kept per worker process
+SNAPSHOT_CACHE_SIZE = 64
+
+# (db_path, slate_id) → (player pool, hindsight optimal score)
+_worker_snapshots: "OrderedDict[Tuple[str, str], Tuple[pd.DataFrame, Optional[float]]]" = OrderedDict()
+
+
+def hindsight_optimal_score(pool: pd.DataFrame) -> Optional[float]:
+    """
+    Best possible lineup score given actual points (perfect hindsight).
+
+    Players at positions outside ROSTER_LIMITS (after DST normalization)
+    are never picked, so FLEX is always an RB, WR or TE.
+
+    Args:
+        pool: Player pool with position, salary and actual_points
+            (missing actual points count as 0)
+
+    Returns:
+        Optimal total actual points, or None if no valid lineup exists
+    """
+    positions = pool['position'].where(~pool['position'].isin(DST_POSITIONS), 'DST')
+    eligible = positions.isin(list(ROSTER_LIMITS)).to_numpy()
+    pool, positions = pool[eligible], positions[eligible].to_numpy()
+    salaries = pool['salary'].to_numpy(dtype=float)
+    points = pool['actual_points'].fillna(0).to_numpy(dtype=float)
+
+    prob = pulp.LpProblem("Hindsight_Optimal", pulp.LpMaximize)
+    picks = [pulp.LpVariable(f"p{i}", cat='Binary') for i in range(len(pool))]
+
+    prob += pulp.lpSum(points[i] * picks[i] for i in range(len(picks)))
+    prob += pulp.lpSum(salaries[i] * picks[i] for i in range(len(picks))) <= SALARY_CAP
+    prob += pulp.lpSum(picks) == ROSTER_SIZE
+    for position, (minimum, maximum) in ROSTER_LIMITS.items():
+        selected = pulp.lpSum(picks[i] for i in np.flatnonzero(positions == position))
+        prob += selected >= minimum
+        prob += selected <= maximum
+
+    if prob.solve(pulp.PULP_CBC_CMD(msg=0)) != pulp.LpStatusOptimal:
+        return None
+    return round(float(sum(points[i] for i, pick in enumerate(picks) if pick.varValue > 0.5)), 2)
+
+
+def _prepare_pool(snapshot: pd.DataFrame) -> pd.DataFrame:
+    """Snapshot rows the optimizer accepts, with optimizer column names."""
+    pool = snapshot.rename(columns={'player_name': 'name'})
+    pool = pool[
+        pool['salary'].between(2000, 10000)
+        & (pd.to_numeric(pool['projection'], errors='coerce') > 0)
+    ]
+    # The optimizer keys its LP variables by name
+    return pool.drop_duplicates(subset='name', keep='first').reset_index(drop=True)
+
+
+def _load_slate(db_path: str, slate_id: str) -> Tuple[pd.DataFrame, Optional[float]]:
+    """Prepared pool and hindsight score for a slate (cached per process)."""
+    key = (os.path.abspath(db_path), slate_id)
+    if key in _worker_snapshots:
+        _worker_snapshots.move_to_end(key)
+        return _worker_snapshots[key]
+
+    manager = HistoricalDataManager(db_path)
+    try:
+        snapshot = manager.load_historical_snapshot(slate_id)
+    finally:
+        manager.close()
+    pool = _prepare_pool(snapshot)
+
+    optimal = None
+    if snapshot['actual_points'].notna().any():
+        optimal = hindsight_optimal_score(snapshot.dropna(subset=['salary', 'position']))
+    _worker_snapshots[key] = (pool, optimal)
+    while len(_worker_snapshots) > SNAPSHOT_CACHE_SIZE:
+        _worker_snapshots.popitem(last=False)
+    return pool, optimal
+
+
+def _run_cell(task: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Backtest one (slate, profile) pair under every config.
+
+    Returns one week result per config; failures are reported in 'error'
+    instead of raised so one bad slate does not stop the grid.
+    """
+    results = []
+    try:
+        pool, optimal = _load_slate(task['db_path'], task['slate_id'])
+        if optimal is None:
+            raise ValueError("No actual points for slate")
+
+        smart_value = calculate_smart_value_batch(
+            pool, {task['profile']: task['weights']}, week=task['week']
+        )[task['profile']]
+        pool = pool.assign(smart_value=smart_value)
+        actual_by_name = pool.set_index('name')['actual_points'].fillna(0)
+    except Exception as e:
+        return [_week_result(task, label, [], None, str(e)) for label in task['configs']]
+
+    for label, config in task['configs'].items():
+        try:
+            config_pool = pool[pool['smart_value'] >= config['smart_threshold']]
+            lineups, error = generate_lineups(
+                config_pool, **{key: config[key] for key in OPTIMIZER_OPTIONS if key in config}
+            )
+            scores = [
+                round(float(actual_by_name.reindex([p.name for p in lineup.players]).sum()), 2)
+                for lineup in lineups
+            ]
+            results.append(_week_result(task, label, scores, optimal, error))
+        except Exception as e:
+            results.append(_week_result(task, label, [], optimal, str(e)))
+    return results
+
+
+def _week_result(
+    task: Dict[str, Any],
+    config: str,
+    scores: List[float],
+    optimal: Optional[float],
+    error: Optional[str]
+) -> Dict[str, Any]:
+    return {
+        'profile': task['profile'],
+        'config': config,
+        'week': task['week'],
+        'slate_id': task['slate_id'],
+        'lineup_scores': scores,
+        'avg_score': round(float(np.mean(scores)), 2) if scores else None,
+        'top_score': max(scores) if scores else None,
+        'optimal_score': optimal,
+        'error': error,
+    }
+
+
+def _resolve_profiles(profiles) -> Dict[str, Dict[str, Any]]:
+    """Label → weights (or profile_manager config), as calculate_smart_value_batch accepts."""
+    if profiles is None:
+        profiles = list(WEIGHT_PROFILES.keys())
+    if isinstance(profiles, dict):
+        return dict(profiles)
+
+    missing = [name for name in profiles if name not in WEIGHT_PROFILES]
+    if missing:
+        raise ValueError(f"Profile(s) {missing} not found. Available: {list(WEIGHT_PROFILES.keys())}")
+    return {name: WEIGHT_PROFILES[name] for name in profiles}
+
+
+def _summarize(week_results: List[Dict[str, Any]]) -> Dict[str, Optional[float]]:
+    """Overall scores for one (profile, config) across its weeks."""
+    scores = [score for result in week_results for score in result['lineup_scores']]
+    optimal = [result['optimal_score'] for result in week_results if result['optimal_score']]
+    gaps = [
+        (result['optimal_score'] - result['avg_score']) / result['optimal_score'] * 100
+        for result in week_results
+        if result['optimal_score'] and result['avg_score'] is not None
+    ]
+    return {
+        'overall_avg_score': round(float(np.mean(scores)), 2) if scores else None,
+        'overall_top_score': max(scores) if scores else None,
+        'overall_optimal_score': round(float(np.mean(optimal)), 2) if optimal else None,
+        'avg_gap_from_optimal': round(float(np.mean(gaps)), 2) if gaps else None,
+    }
+
+
+def run_backtests(
+    season: int,
+    weeks: Optional[Iterable[int]] = None,
+    profiles: Union[None, List[str], Dict[str, Dict[str, Any]]] = None,
+    configs: Optional[Dict[str, Dict[str, Any]]] = None,
+    site: str = 'DraftKings',
+    contest_type: str = 'Classic',
+    db_path: str = "dfs_optimizer.db",
+    max_workers: Optional[int] = None,
+    notes: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Backtest every (week, profile, config) combination and store the results.
+
+    Args:
+        season: Season to replay
+        weeks: Weeks to include (default: every stored week)
+        profiles: WEIGHT_PROFILES names, or label → weights / profile_manager
+            config (default: all WEIGHT_PROFILES)
+        configs: Label → optimizer settings (generate_lineups options plus
+            smart_threshold); missing settings come from DEFAULT_BACKTEST_CONFIG
+        site: DFS site of the slates
+        contest_type: Contest type of the slates
+        db_path: Path to SQLite database
+        max_workers: Process pool size (default: CPU count; 1 runs in-process)
+        notes: Optional note stored with every result
+
+    Returns:
+        DataFrame with one row per (profile, config): backtest_id, profile_name,
+        config, weeks_tested, the overall scores and week_results
+
+    Raises:
+        ValueError: If a named profile does not exist or no slates match
+    """
+    profiles = _resolve_profiles(profiles)
+    configs = {
+        label: {**DEFAULT_BACKTEST_CONFIG, **config}
+        for label, config in (configs or {'default': {}}).items()
+    }
+
+    manager = HistoricalDataManager(db_path)
+    try:
+        slates = [
+            slate for slate in manager.get_available_weeks(season=season, site=site)
+            if slate['contest_type'] == contest_type and slate['player_count']
+        ]
+    finally:
+        manager.close()
+    if weeks is not None:
+        weeks = set(weeks)
+        slates = [slate for slate in slates if slate['week'] in weeks]
+    if not slates:
+        raise ValueError(f"No {site} {contest_type} slates stored for season {season}")
+
+    # Slate-major order: consecutive tasks share a snapshot
+    tasks = [
+        {
+            'db_path': db_path,
+            'slate_id': slate['slate_id'],
+            'week': slate['week'],
+            'profile': label,
+            'weights': weights,
+            'configs': configs,
+        }
+        for slate in slates
+        for label, weights in profiles.items()
+    ]
+
+    cells = None
+    workers = max_workers or os.cpu_count() or 1
+    if len(tasks) > 1 and workers > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                cells = list(pool.map(_run_cell, tasks, chunksize=max(1, len(profiles))))
+        except Exception as e:
+            logger.warning(f"Parallel backtest unavailable ({e}); running sequentially")
+    if cells is None:
+        cells = [_run_cell(task) for task in tasks]
+
+    grouped: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+    for cell in cells:
+        for result in cell:
+            grouped.setdefault((result['profile'], result['config']), []).append(result)
+
+    run_timestamp = datetime.utcnow()
+    rows = []
+    for (profile, config), week_results in grouped.items():
+        week_results.sort(key=lambda result: result['week'])
+        for result in week_results:
+            if result['error']:
+                logger.warning(f"Backtest {profile}/{config} week {result['week']}: {result['error']}")
+        note = f"config {config}: {json.dumps(configs[config], sort_keys=True)}"
+        rows.append({
+            'backtest_id': str(uuid.uuid4()),
+            'run_timestamp': run_timestamp,
+            'weeks_tested': json.dumps(sorted({result['week'] for result in week_results})),
+            'profile_name': profile,
+            'profile_weights': json.dumps(profiles[profile], sort_keys=True),
+            'week_results': json.dumps(
+                [{k: v for k, v in result.items() if k not in ('profile', 'config')} for result in week_results]
+            ),
+            **_summarize(week_results),
+            'notes': f"{note}\n{notes}" if notes else note,
+        })
+
+    session = create_session(db_path)
+    try:
+        session.execute(insert(BacktestResult.__table__), rows)
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        raise ValueError(f"Failed to store backtest results: {e}")
+    finally:
+        session.close()
+
+    summary = pd.DataFrame(rows)
+    summary.insert(summary.columns.get_loc('profile_name') + 1, 'config', [config for _, config in grouped])
+    summary['weeks_tested'] = summary['weeks_tested'].map(json.loads)
+    summary['week_results'] = summary['week_results'].map(json.loads)
+    return summary.drop(columns=['profile_weights', 'notes'])
@@ -2,31 +2,202 @@
 Server-side data caching for API responses.
 
 This module provides persistent caching for Vegas lines and injury reports,
-storing data as JSON files that survive app restarts and can be shared across users.
+storing data as cache files that survive app restarts and can be shared across users.
+
+Cache file layout ({data_type}_week{N}.dfscache):
+- CACHE_MAGIC, then a 4-byte little-endian header length
+- a compact JSON header (week, cached_at, record_count, columns)
+- an Arrow IPC stream of the rows, zstd-compressed
+
+The header can be read without touching the payload, so get_cache_status()
+and list_cached_weeks() cost a few bytes per file. Restores decode the
+columnar body in one pass and bulk-load it with executemany.
+
+Legacy {data_type}_week{N}.json caches are still read when no .dfscache
+file exists for the week; the next save writes the binary format.
 """
 
 import os
 import json
-import sqlite3
+import struct
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Any, Tuple
 import streamlit as st
 
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+try:
+    from .db_access import db_connection
+    from .point_in_time import sync_vegas_lines, sync_injury_reports
+except ImportError:
+    from db_access import db_connection
+    from point_in_time import sync_vegas_lines, sync_injury_reports
+
 
 # Cache directory for persistent data storage
 CACHE_DIR = Path(__file__).parent.parent / "data" / "cache"
 CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
+# Bump when the header or body layout changes
+CACHE_FORMAT_VERSION = 1
+CACHE_MAGIC = b'DFSCACHE'
+CACHE_SUFFIX = '.dfscache'
+LEGACY_CACHE_SUFFIX = '.json'
+
+_HEADER_LENGTH = struct.Struct('<I')
+
 
 def get_cache_file_path(data_type: str, week: int) -> Path:
     """Get the path to a cache file."""
-    return CACHE_DIR / f"{data_type}_week{week}.json"
+    return CACHE_DIR / f"{data_type}_week{week}{CACHE_SUFFIX}"
+
+
+def _legacy_cache_file_path(data_type: str, week: int) -> Path:
+    return CACHE_DIR / f"{data_type}_week{week}{LEGACY_CACHE_SUFFIX}"
+
+
+def find_cache_file(data_type: str, week: int) -> Optional[Path]:
+    """Existing cache file for a week (binary preferred over legacy JSON), or None."""
+    for path in (get_cache_file_path(data_type, week), _legacy_cache_file_path(data_type, week)):
+        if path.exists():
+            return path
+    return None
+
+
+def write_cache_file(path: Path, header: Dict[str, Any], columns: List[str], rows: List[tuple]):
+    """
+    Atomically write a cache file.
+
+    Args:
+        path: Destination (.dfscache, or .json when pyarrow is unavailable)
+        header: Metadata stored ahead of the payload
+        columns: Column names
+        rows: Row tuples in columns order
+    """
+    header = dict(header, format_version=CACHE_FORMAT_VERSION, columns=columns)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            if path.suffix == LEGACY_CACHE_SUFFIX:
+                header['data'] = [dict(zip(columns, row)) for row in rows]
+                f.write(json.dumps(header, separators=(',', ':')).encode())
+            else:
+                header_bytes = json.dumps(header, separators=(',', ':')).encode()
+                f.write(CACHE_MAGIC + _HEADER_LENGTH.pack(len(header_bytes)) + header_bytes)
+                table = pa.table({column: [row[i] for row in rows] for i, column in enumerate(columns)})
+                options = pa_ipc.IpcWriteOptions(compression='zstd')
+                with pa_ipc.new_stream(f, table.schema, options=options) as writer:
+                    writer.write_table(table)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            os.remove(tmp_path)
+
+
+def _read_header(f) -> Optional[Dict[str, Any]]:
+    """Header of an open binary cache file (positioned at the payload), or None."""
+    prefix = f.read(len(CACHE_MAGIC) + _HEADER_LENGTH.size)
+    if not prefix.startswith(CACHE_MAGIC) or len(prefix) < len(CACHE_MAGIC) + _HEADER_LENGTH.size:
+        return None
+    length, = _HEADER_LENGTH.unpack(prefix[len(CACHE_MAGIC):])
+    return json.loads(f.read(length))
+
+
+def read_cache_header(path: Path) -> Optional[Dict[str, Any]]:
+    """
+    Cache metadata without decoding the payload.
+
+    Legacy JSON caches have to be parsed in full.
+
+    Returns:
+        Header dict (week, cached_at, record_count, ...) or None if the file
+        is not a cache file
+    """
+    if path.suffix == LEGACY_CACHE_SUFFIX:
+        with open(path, 'r') as f:
+            data = json.load(f)
+        data.pop('data', None)
+        return data
+    with open(path, 'rb') as f:
+        return _read_header(f)
+
+
+def read_cache_file(path: Path) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Read a cache file.
+
+    Returns:
+        (header, rows as dicts)
+
+    Raises:
+        ValueError: If the file is not a cache file
+        ImportError: If the file is binary and pyarrow is not installed
+    """
+    if path.suffix == LEGACY_CACHE_SUFFIX:
+        with open(path, 'r') as f:
+            data = json.load(f)
+        return data, data.pop('data')
+
+    if not ARROW_AVAILABLE:
+        raise ImportError("pyarrow is required to read binary cache files")
+    with open(path, 'rb') as f:
+        header = _read_header(f)
+        if header is None:
+            raise ValueError(f"{path} is not a cache file")
+        table = pa_ipc.open_stream(f).read_all()
+    return header, table.to_pylist()
+
+
+def _save_to_cache(data_type: str, week: int, query: str, db_path: str) -> bool:
+    """Export a week of a table to its cache file."""
+    with db_connection(db_path) as conn:
+        cursor = conn.execute(query, (week,))
+        columns = [description[0] for description in cursor.description]
+        rows = cursor.fetchall()
+
+    if not rows:
+        return False
+
+    path = get_cache_file_path(data_type, week)
+    if not ARROW_AVAILABLE:
+        path = _legacy_cache_file_path(data_type, week)
+    write_cache_file(path, {
+        'week': week,
+        'cached_at': datetime.utcnow().isoformat(),
+        'record_count': len(rows)
+    }, columns, rows)
+    return True
+
+
+def _load_from_cache(data_type: str, week: int, sync, db_path: str) -> Optional[Dict]:
+    """Load a week's cache file into the database."""
+    cache_file = find_cache_file(data_type, week)
+    if cache_file is None:
+        return None
+
+    header, rows = read_cache_file(cache_file)
+
+    # Bring the database in line with the cache (unchanged rows are not
+    # rewritten, so the point-in-time history only records real changes)
+    with db_connection(db_path) as conn:
+        sync(conn, week, rows)
+
+    return {
+        'week': header['week'],
+        'cached_at': header['cached_at'],
+        'record_count': header['record_count']
+    }
 
 
 def save_vegas_lines_to_cache(week: int, db_path: str = "dfs_optimizer.db") -> bool:
     """
-    Export Vegas lines from database to JSON cache file.
+    Export Vegas lines from database to cache file.
     
     Args:
         week: NFL week number
@@ -36,50 +207,13 @@ def save_vegas_lines_to_cache(week: int, db_path: str = "dfs_optimizer.db") -> b
         True if successful, False otherwise
     """
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        # Fetch all Vegas lines for this week
-        cursor.execute("""
+        return _save_to_cache('vegas_lines', week, """
             SELECT game_id, home_team, away_team, home_spread, away_spread, 
                    total, home_itt, away_itt, fetched_at
             FROM vegas_lines
             WHERE week = ?
             ORDER BY game_id
-        """, (week,))
-        
-        rows = cursor.fetchall()
-        conn.close()
-        
-        if not rows:
-            return False
-        
-        # Convert to list of dicts
-        data = []
-        for row in rows:
-            data.append({
-                'game_id': row[0],
-                'home_team': row[1],
-                'away_team': row[2],
-                'home_spread': row[3],
-                'away_spread': row[4],
-                'total': row[5],
-                'home_itt': row[6],
-                'away_itt': row[7],
-                'fetched_at': row[8]
-            })
-        
-        # Save to cache file
-        cache_file = get_cache_file_path('vegas_lines', week)
-        with open(cache_file, 'w') as f:
-            json.dump({
-                'week': week,
-                'cached_at': datetime.now().isoformat(),
-                'record_count': len(data),
-                'data': data
-            }, f, indent=2)
-        
-        return True
+        """, db_path)
         
     except Exception as e:
         st.error(f"Error saving Vegas lines to cache: {e}")
@@ -88,7 +222,7 @@ def save_vegas_lines_to_cache(week: int, db_path: str = "dfs_optimizer.db") -> b
 
 def save_injury_reports_to_cache(week: int, db_path: str = "dfs_optimizer.db") -> bool:
     """
-    Export injury reports from database to JSON cache file.
+    Export injury reports from database to cache file.
     
     Args:
         week: NFL week number
@@ -98,49 +232,13 @@ def save_injury_reports_to_cache(week: int, db_path: str = "dfs_optimizer.db") -
         True if successful, False otherwise
     """
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        # Fetch all injury reports for this week
-        cursor.execute("""
+        return _save_to_cache('injury_reports', week, """
             SELECT player_name, team, position, injury_status, practice_status,
                    body_part, description, updated_at
             FROM injury_reports
             WHERE week = ?
             ORDER BY team, player_name
-        """, (week,))
-        
-        rows = cursor.fetchall()
-        conn.close()
-        
-        if not rows:
-            return False
-        
-        # Convert to list of dicts
-        data = []
-        for row in rows:
-            data.append({
-                'player_name': row[0],
-                'team': row[1],
-                'position': row[2],
-                'injury_status': row[3],
-                'practice_status': row[4],
-                'body_part': row[5],
-                'description': row[6],
-                'updated_at': row[7]
-            })
-        
-        # Save to cache file
-        cache_file = get_cache_file_path('injury_reports', week)
-        with open(cache_file, 'w') as f:
-            json.dump({
-                'week': week,
-                'cached_at': datetime.now().isoformat(),
-                'record_count': len(data),
-                'data': data
-            }, f, indent=2)
-        
-        return True
+        """, db_path)
         
     except Exception as e:
         st.error(f"Error saving injury reports to cache: {e}")
@@ -149,7 +247,7 @@ def save_injury_reports_to_cache(week: int, db_path: str = "dfs_optimizer.db") -
 
 def load_vegas_lines_from_cache(week: int, db_path: str = "dfs_optimizer.db") -> Optional[Dict]:
     """
-    Load Vegas lines from JSON cache file into database.
+    Load Vegas lines from cache file into database.
     
     Args:
         week: NFL week number
@@ -159,43 +257,7 @@ def load_vegas_lines_from_cache(week: int, db_path: str = "dfs_optimizer.db") ->
         Dict with cache metadata if successful, None otherwise
     """
     try:
-        cache_file = get_cache_file_path('vegas_lines', week)
-        
-        if not cache_file.exists():
-            return None
-        
-        # Load from cache file
-        with open(cache_file, 'r') as f:
-            cache_data = json.load(f)
-        
-        # Insert into database
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        # Clear existing data for this week
-        cursor.execute("DELETE FROM vegas_lines WHERE week = ?", (week,))
-        
-        # Insert cached data
-        for row in cache_data['data']:
-            cursor.execute("""
-                INSERT INTO vegas_lines 
-                (week, game_id, home_team, away_team, home_spread, away_spread, 
-                 total, home_itt, away_itt, fetched_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                week, row['game_id'], row['home_team'], row['away_team'],
-                row['home_spread'], row['away_spread'], row['total'],
-                row['home_itt'], row['away_itt'], row['fetched_at']
-            ))
-        
-        conn.commit()
-        conn.close()
-        
-        return {
-            'week': cache_data['week'],
-            'cached_at': cache_data['cached_at'],
-            'record_count': cache_data['record_count']
-        }
+        return _load_from_cache('vegas_lines', week, sync_vegas_lines, db_path)
         
     except Exception as e:
         st.error(f"Error loading Vegas lines from cache: {e}")
@@ -204,7 +266,7 @@ def load_vegas_lines_from_cache(week: int, db_path: str = "dfs_optimizer.db") ->
 
 def load_injury_reports_from_cache(week: int, db_path: str = "dfs_optimizer.db") -> Optional[Dict]:
     """
-    Load injury reports from JSON cache file into database.
+    Load injury reports from cache file into database.
     
     Args:
         week: NFL week number
@@ -214,43 +276,7 @@ def load_injury_reports_from_cache(week: int, db_path: str = "dfs_optimizer.db")
         Dict with cache metadata if successful, None otherwise
     """
     try:
-        cache_file = get_cache_file_path('injury_reports', week)
-        
-        if not cache_file.exists():
-            return None
-        
-        # Load from cache file
-        with open(cache_file, 'r') as f:
-            cache_data = json.load(f)
-        
-        # Insert into database
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        # Clear existing data for this week
-        cursor.execute("DELETE FROM injury_reports WHERE week = ?", (week,))
-        
-        # Insert cached data
-        for row in cache_data['data']:
-            cursor.execute("""
-                INSERT INTO injury_reports 
-                (week, player_name, team, position, injury_status, practice_status,
-                 body_part, description, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                week, row['player_name'], row['team'], row['position'],
-                row['injury_status'], row['practice_status'],
-                row['body_part'], row['description'], row['updated_at']
-            ))
-        
-        conn.commit()
-        conn.close()
-        
-        return {
-            'week': cache_data['week'],
-            'cached_at': cache_data['cached_at'],
-            'record_count': cache_data['record_count']
-        }
+        return _load_from_cache('injury_reports', week, sync_injury_reports, db_path)
         
     except Exception as e:
         st.error(f"Error loading injury reports from cache: {e}")
@@ -261,44 +287,31 @@ def get_cache_status(week: int) -> Dict:
     """
     Check if cache files exist for a given week.
     
+    Only file headers are read.
+    
     Args:
         week: NFL week number
     
     Returns:
         Dict with cache status for each data type
     """
-    vegas_file = get_cache_file_path('vegas_lines', week)
-    injury_file = get_cache_file_path('injury_reports', week)
+    status = {}
     
-    status = {
-        'vegas_lines': {
-            'exists': vegas_file.exists(),
-            'path': str(vegas_file)
-        },
-        'injury_reports': {
-            'exists': injury_file.exists(),
-            'path': str(injury_file)
+    for data_type in ('vegas_lines', 'injury_reports'):
+        cache_file = find_cache_file(data_type, week)
+        status[data_type] = {
+            'exists': cache_file is not None,
+            'path': str(cache_file or get_cache_file_path(data_type, week))
         }
-    }
-    
-    # Get file metadata if exists
-    if vegas_file.exists():
-        try:
-            with open(vegas_file, 'r') as f:
-                data = json.load(f)
-                status['vegas_lines']['cached_at'] = data.get('cached_at')
-                status['vegas_lines']['record_count'] = data.get('record_count', 0)
-        except:
-            pass
-    
-    if injury_file.exists():
-        try:
-            with open(injury_file, 'r') as f:
-                data = json.load(f)
-                status['injury_reports']['cached_at'] = data.get('cached_at')
-                status['injury_reports']['record_count'] = data.get('record_count', 0)
-        except:
-            pass
+        
+        # Get file metadata if exists
+        if cache_file is not None:
+            try:
+                header = read_cache_header(cache_file) or {}
+                status[data_type]['cached_at'] = header.get('cached_at')
+                status[data_type]['record_count'] = header.get('record_count', 0)
+            except Exception:
+                pass
     
     return status
 
@@ -312,14 +325,14 @@ def list_cached_weeks() -> List[int]:
     """
     weeks = set()
     
-    for file in CACHE_DIR.glob("*.json"):
-        # Extract week number from filename (e.g., "vegas_lines_week6.json" -> 6)
-        if "_week" in file.stem:
-            try:
-                week_str = file.stem.split("_week")[1]
-                weeks.add(int(week_str))
-            except:
-                pass
+    for suffix in (CACHE_SUFFIX, LEGACY_CACHE_SUFFIX):
+        for file in CACHE_DIR.glob(f"*{suffix}"):
+            # Extract week number from filename (e.g., "vegas_lines_week6.dfscache" -> 6)
+            if "_week" in file.stem:
+                try:
+                    week_str = file.stem.split("_week")[1]
+                    weeks.add(int(week_str))
+                except ValueError:
+                    pass
     
     return sorted(list(weeks))
-
@@ -17,10 +17,14 @@ from datetime import datetime
 from typing import Optional
 from sqlalchemy import (
     Column, Integer, String, Float, DateTime, Text,
-    CheckConstraint, UniqueConstraint, create_engine
+    CheckConstraint, UniqueConstraint
 )
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+
+try:
+    from . import db_access
+except ImportError:
+    import db_access
 
 Base = declarative_base()
 
@@ -556,15 +560,15 @@ def create_session(db_path: str = "dfs_optimizer.db"):
     """
     Create a SQLAlchemy session for database operations.
     
+    The session uses the shared, pooled engine for db_path (see db_access).
+    
     Args:
         db_path: Path to SQLite database file
         
     Returns:
         Session: SQLAlchemy session object
     """
-    engine = create_engine(f'sqlite:///{db_path}')
-    Session = sessionmaker(bind=engine)
-    return Session()
+    return db_access.create_session(db_path)
 
 
 # Helper functions for common queries
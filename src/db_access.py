@@ -0,0 +1,259 @@
+"""
+Database Access Module
+
+Process-wide access layer for the SQLite database.
+
+Modules used to build their own SQLAlchemy engine per object (API clients,
+HistoricalDataManager, SmartRulesEngine, PlayerContextBuilder) or open a
+fresh sqlite3 connection per function call (data_cache, regression_analyzer,
+opponent_lookup, results page). Every one of those paid connection setup and
+held its own file handles, and concurrent writers contended for the
+rollback-journal lock.
+
+This module keeps one pooled engine per database file. Every pooled
+connection is configured once with DB_PRAGMAS:
+- WAL journal: readers never block the writer and vice versa
+- synchronous=NORMAL: fsync at checkpoints instead of every commit
+  (safe with WAL)
+- a larger page cache, memory-mapped reads and in-memory temp tables
+- busy_timeout: writers wait for a lock instead of failing immediately
+
+Usage:
+    # ORM (one session per object or per unit of work)
+    session = create_session("dfs_optimizer.db")
+    with session_scope("dfs_optimizer.db") as session:
+        session.add(flag)
+
+    # Thread-local session (Streamlit reruns, worker threads)
+    Session = get_scoped_session("dfs_optimizer.db")
+    Session().query(VegasLine).all()
+
+    # Raw sqlite3 (commits on success, rolls back on error, returns to pool)
+    with db_connection("dfs_optimizer.db") as conn:
+        conn.execute("DELETE FROM vegas_lines WHERE week = ?", (week,))
+"""
+
+import os
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, scoped_session, sessionmaker
+
+logger = logging.getLogger(__name__)
+
+# Applied to every new pooled connection, in order
+DB_PRAGMAS = (
+    ('journal_mode', 'WAL'),
+    ('synchronous', 'NORMAL'),
+    ('cache_size', -20000),         # KiB (negative) → ~20 MB page cache
+    ('mmap_size', 268435456),       # 256 MB memory-mapped reads
+    ('temp_store', 'MEMORY'),
+    ('busy_timeout', 30000),        # ms
+)
+
+# Connections kept open per database; extra checkouts beyond this are
+# allowed (never block) and closed when returned
+POOL_SIZE = 5
+
+_lock = threading.RLock()
+# db key → (engine, file identity when the engine was created)
+_engines: Dict[str, Tuple[Engine, Optional[Tuple[int, int]]]] = {}
+_sessionmakers: Dict[str, sessionmaker] = {}
+_scoped_sessions: Dict[str, scoped_session] = {}
+
+
+def _is_memory(db_path: str) -> bool:
+    return db_path in ('', ':memory:')
+
+
+def _db_key(db_path: str) -> str:
+    return os.path.abspath(db_path)
+
+
+def file_identity(db_path: str) -> Optional[Tuple[int, int]]:
+    """(device, inode) of the database file, or None if it does not exist."""
+    try:
+        stat = os.stat(db_path)
+        return (stat.st_dev, stat.st_ino)
+    except OSError:
+        return None
+
+
+def _apply_pragmas(dbapi_connection, connection_record):
+    """Configure a new pooled sqlite3 connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in DB_PRAGMAS:
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def _create_engine(db_path: str) -> Engine:
+    if _is_memory(db_path):
+        # Every engine gets its own private in-memory database (as before)
+        engine = create_engine('sqlite:///:memory:')
+    else:
+        engine = create_engine(
+            f'sqlite:///{db_path}',
+            pool_size=POOL_SIZE,
+            max_overflow=-1,
+            connect_args={'check_same_thread': False},
+        )
+    event.listen(engine, 'connect', _apply_pragmas)
+    return engine
+
+
+def _forget(key: str):
+    """Drop (and dispose) everything cached for a database key."""
+    engine, _ = _engines.pop(key, (None, None))
+    _sessionmakers.pop(key, None)
+    scoped = _scoped_sessions.pop(key, None)
+    if scoped is not None:
+        scoped.remove()
+    if engine is not None:
+        engine.dispose()
+
+
+def get_engine(db_path: str = "dfs_optimizer.db") -> Engine:
+    """
+    Shared engine for a database file (created on first use).
+
+    If the file has been deleted or replaced since the engine was created,
+    the old pool (which still points at the old file) is disposed and a new
+    engine is created.
+
+    Args:
+        db_path: Path to SQLite database (':memory:' gets a new private engine)
+
+    Returns:
+        SQLAlchemy Engine
+    """
+    if _is_memory(db_path):
+        return _create_engine(db_path)
+
+    key = _db_key(db_path)
+    identity = file_identity(key)
+    with _lock:
+        cached = _engines.get(key)
+        if cached is not None:
+            engine, known_identity = cached
+            if known_identity is None or known_identity == identity:
+                if known_identity is None and identity is not None:
+                    _engines[key] = (engine, identity)
+                return engine
+            logger.info(f"Database file {db_path} was replaced; recreating its connection pool")
+            _forget(key)
+
+        engine = _create_engine(key)
+        _engines[key] = (engine, identity)
+        return engine
+
+
+def get_sessionmaker(db_path: str = "dfs_optimizer.db") -> sessionmaker:
+    """Session factory bound to the shared engine for db_path."""
+    if _is_memory(db_path):
+        return sessionmaker(bind=get_engine(db_path))
+
+    engine = get_engine(db_path)
+    key = _db_key(db_path)
+    with _lock:
+        factory = _sessionmakers.get(key)
+        if factory is None or factory.kw.get('bind') is not engine:
+            factory = sessionmaker(bind=engine)
+            _sessionmakers[key] = factory
+        return factory
+
+
+def create_session(db_path: str = "dfs_optimizer.db") -> Session:
+    """
+    New ORM session on the shared engine.
+
+    Sessions are cheap; the pooled connections behind them are shared. Each
+    session must only be used by one thread at a time.
+
+    Args:
+        db_path: Path to SQLite database
+
+    Returns:
+        Session (caller closes it)
+    """
+    return get_sessionmaker(db_path)()
+
+
+def get_scoped_session(db_path: str = "dfs_optimizer.db") -> scoped_session:
+    """
+    Thread-local session registry for db_path.
+
+    Calling the returned registry gives each thread its own session; call
+    .remove() at the end of a thread's unit of work (e.g. a Streamlit rerun).
+    """
+    factory = get_sessionmaker(db_path)
+    key = _db_key(db_path)
+    with _lock:
+        scoped = _scoped_sessions.get(key)
+        if scoped is None or scoped.session_factory is not factory:
+            scoped = scoped_session(factory)
+            _scoped_sessions[key] = scoped
+        return scoped
+
+
+@contextmanager
+def session_scope(db_path: str = "dfs_optimizer.db") -> Iterator[Session]:
+    """Session for one unit of work: commit on success, rollback on error, then close."""
+    session = create_session(db_path)
+    try:
+        yield session
+        session.commit()
+    except BaseException:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+@contextmanager
+def db_connection(db_path: str = "dfs_optimizer.db", row_factory=None) -> Iterator[sqlite3.Connection]:
+    """
+    Pooled raw sqlite3 connection.
+
+    Commits on success and rolls back on error. The connection goes back to
+    the pool afterwards, so callers must not close it.
+
+    Args:
+        db_path: Path to SQLite database
+        row_factory: Optional row factory for this checkout (e.g. sqlite3.Row)
+
+    Yields:
+        sqlite3.Connection
+    """
+    pooled = get_engine(db_path).raw_connection()
+    conn = pooled.driver_connection
+    conn.row_factory = row_factory
+    try:
+        yield conn
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        conn.row_factory = None
+        pooled.close()
+
+
+def dispose_engine(db_path: str = "dfs_optimizer.db"):
+    """Close all pooled connections for db_path (e.g. before deleting the file)."""
+    with _lock:
+        _forget(_db_key(db_path))
+
+
+def dispose_all():
+    """Close every pooled connection in the process."""
+    with _lock:
+        for key in list(_engines):
+            _forget(key)
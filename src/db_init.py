@@ -9,14 +9,13 @@ This module handles:
 
 import os
 import sqlite3
-from pathlib import Path
 from typing import Optional
 import streamlit as st
 
 
 def run_migrations(db_path: str = "dfs_optimizer.db", silent: bool = False) -> bool:
     """
-    Run all database migrations to create tables.
+    Apply pending database migrations (see schema_migrations).
     
     Args:
         db_path: Path to SQLite database
@@ -26,21 +25,10 @@ def run_migrations(db_path: str = "dfs_optimizer.db", silent: bool = False) -> b
         True if successful, False otherwise
     """
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        # Get migration files
-        migrations_dir = Path(__file__).parent.parent / "migrations"
-        migration_files = sorted([f for f in migrations_dir.glob("*.sql")])
+        from src.schema_migrations import ensure_schema
         
-        for migration_file in migration_files:
-            with open(migration_file, 'r') as f:
-                sql_script = f.read()
-                # Execute the entire migration script
-                cursor.executescript(sql_script)
-        
-        conn.commit()
-        conn.close()
+        # Only migrations not yet recorded in schema_version are applied
+        ensure_schema(db_path)
         return True
         
     except Exception as e:
@@ -115,9 +103,8 @@ def fetch_injury_reports(week: int, api_key: Optional[str] = None) -> bool:
     """
     try:
         from src.api.espn_api import ESPNAPIClient
-        from sqlalchemy import create_engine
-        from sqlalchemy.orm import sessionmaker
-        from src.database_models import InjuryReport
+        from src.db_access import db_connection
+        from src.point_in_time import sync_injury_reports
         
         # Fetch from ESPN
         with st.spinner("📡 Fetching injury reports from ESPN (fast, detailed context)..."):
@@ -136,32 +123,21 @@ def fetch_injury_reports(week: int, api_key: Optional[str] = None) -> bool:
         ]
         ir_count = len(injuries) - len(active_injuries)
         
-        # Store directly in database
-        engine = create_engine('sqlite:///dfs_optimizer.db')
-        Session = sessionmaker(bind=engine)
-        session = Session()
-        
-        try:
-            # Clear existing injuries for this week
-            session.query(InjuryReport).filter_by(week=week).delete()
-            
-            # Store ESPN injuries
-            for injury in active_injuries:
-                injury_report = InjuryReport(
-                    week=week,
-                    player_name=injury['player_name'],
-                    team=injury['team'],
-                    position=injury.get('position', ''),
-                    injury_status=injury['injury_status'],
-                    practice_status='',  # ESPN doesn't provide this
-                    body_part=injury.get('body_part', ''),
-                    description=injury.get('long_comment') or injury.get('short_comment', '')
-                )
-                session.add(injury_report)
-            
-            session.commit()
-        finally:
-            session.close()
+        # Store directly in database (only changed reports are rewritten;
+        # players no longer listed are removed, and both are versioned)
+        with db_connection("dfs_optimizer.db") as conn:
+            sync_injury_reports(conn, week, [
+                {
+                    'player_name': injury['player_name'],
+                    'team': injury['team'],
+                    'position': injury.get('position', ''),
+                    'injury_status': injury['injury_status'],
+                    'practice_status': '',  # ESPN doesn't provide this
+                    'body_part': injury.get('body_part', ''),
+                    'description': injury.get('long_comment') or injury.get('short_comment', '')
+                }
+                for injury in active_injuries
+            ])
         
         # Count statistics
         status_counts = {}
@@ -0,0 +1,267 @@
+"""
+Database Maintenance Module
+
+Keeps query latency flat as the SQLite file grows over a season.
+
+- QUERY_REGISTRY lists the app's hot queries with sample parameters;
+  check_query_plans() runs EXPLAIN QUERY PLAN on each one and reports full
+  table scans and temp B-tree sorts. Indexes that fix a reported query are
+  added as a migration (see migrations/012_add_maintenance_indexes.sql), so
+  ensure_indexes() is just ensure_schema().
+- prune_old_rows() deletes api_call_log and narrative_flags rows older than
+  a cutoff, optionally archiving them to gzip CSV first.
+- optimize_database() runs ANALYZE and PRAGMA optimize, checkpoints the WAL
+  and (optionally) VACUUMs.
+
+Run weekly via scripts/db_maintenance.py.
+
+Usage:
+    for row in check_query_plans("dfs_optimizer.db"):
+        if row['full_scan']:
+            print(row['name'], row['plan'])
+
+    prune_old_rows("dfs_optimizer.db", days=60, archive_dir="archive")
+    optimize_database("dfs_optimizer.db", vacuum=True)
+"""
+
+import os
+import logging
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+try:
+    from .db_access import db_connection, dispose_engine
+    from .schema_migrations import ensure_schema
+except ImportError:
+    from db_access import db_connection, dispose_engine
+    from schema_migrations import ensure_schema
+
+logger = logging.getLogger(__name__)
+
+# name → (SQL, sample parameters) for every query the app runs per page load
+# or per ingest; values only need the right types for EXPLAIN QUERY PLAN
+QUERY_REGISTRY: Dict[str, Tuple[str, tuple]] = {
+    'vegas_lines_by_week': (
+        "SELECT game_id, home_team, away_team, home_spread, away_spread, total, home_itt, away_itt "
+        "FROM vegas_lines WHERE week = ? ORDER BY game_id",
+        (7,)
+    ),
+    'itt_for_team': (
+        "SELECT home_itt, away_itt FROM vegas_lines WHERE week = ? AND (home_team = ? OR away_team = ?)",
+        (7, 'KC', 'KC')
+    ),
+    'vegas_weeks': (
+        "SELECT DISTINCT week FROM vegas_lines",
+        ()
+    ),
+    'injury_reports_by_week': (
+        "SELECT player_name, team, position, injury_status, practice_status, body_part, description "
+        "FROM injury_reports WHERE week = ? ORDER BY team, player_name",
+        (7,)
+    ),
+    'active_injuries_by_week': (
+        "SELECT player_name, team, injury_status FROM injury_reports "
+        "WHERE week = ? AND injury_status IN ('Q', 'D', 'O')",
+        (7,)
+    ),
+    'injury_weeks': (
+        "SELECT DISTINCT week FROM injury_reports",
+        ()
+    ),
+    'flags_for_player': (
+        "SELECT flag_type, flag_category, message, severity FROM narrative_flags "
+        "WHERE week = ? AND player_name = ? AND team = ?",
+        (7, 'Patrick Mahomes', 'KC')
+    ),
+    'flags_delete_week': (
+        "DELETE FROM narrative_flags WHERE week = ?",
+        (7,)
+    ),
+    'api_call_count': (
+        "SELECT COUNT(*) FROM api_call_log WHERE api_name = ? AND called_at >= ?",
+        ('the_odds_api', '2025-10-01 00:00:00')
+    ),
+    'api_log_prune': (
+        "DELETE FROM api_call_log WHERE called_at < ?",
+        ('2025-08-01 00:00:00',)
+    ),
+    'flags_prune': (
+        "DELETE FROM narrative_flags WHERE created_at < ?",
+        ('2025-08-01 00:00:00',)
+    ),
+    'week_points': (
+        "SELECT normalized_name, dk_points FROM player_week_points WHERE week = ?",
+        (7,)
+    ),
+    'week_high_scorers': (
+        "SELECT player_name, team, position, dk_points FROM player_week_points "
+        "WHERE week = ? AND dk_points >= ? ORDER BY dk_points DESC",
+        (7, 20.0)
+    ),
+    'regression_player_week': (
+        "SELECT w.player_name, w.dk_points FROM player_week_points w "
+        "JOIN player_game_stats p ON p.id = w.stat_id WHERE w.week = ? AND w.normalized_name = ?",
+        (7, 'patrick mahomes')
+    ),
+    'advanced_pass_stats_by_week': (
+        "SELECT * FROM pass_stats WHERE week = ?",
+        (7,)
+    ),
+    'slate_lookup': (
+        "SELECT slate_id FROM slates WHERE week = ? AND season = ? AND site = ? AND contest_type = ?",
+        (7, 2025, 'DraftKings', 'Classic')
+    ),
+    'snapshot_by_slate': (
+        "SELECT player_id, player_name, salary, projection FROM historical_player_pool "
+        "WHERE slate_id = ? ORDER BY player_id",
+        ('2025-W7-DK-CLASSIC',)
+    ),
+    'actual_points_match': (
+        "SELECT player_id FROM historical_player_pool WHERE slate_id = ? AND TRIM(player_name) = ?",
+        ('2025-W7-DK-CLASSIC', 'Patrick Mahomes')
+    ),
+}
+
+# Tables pruned by age: table → timestamp column
+PRUNABLE_TABLES = {
+    'api_call_log': 'called_at',
+    'narrative_flags': 'created_at',
+}
+
+
+def explain_query(conn: sqlite3.Connection, sql: str, params: tuple = ()) -> List[str]:
+    """EXPLAIN QUERY PLAN detail lines for one query."""
+    return [row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+
+def _is_full_scan(detail: str) -> bool:
+    # "SCAN t" reads every row; "SCAN t USING [COVERING] INDEX" walks an index
+    return detail.startswith('SCAN ') and 'INDEX' not in detail and 'CONSTANT ROW' not in detail
+
+
+def check_query_plans(
+    db_path: str = "dfs_optimizer.db",
+    registry: Optional[Dict[str, Tuple[str, tuple]]] = None
+) -> List[Dict[str, Any]]:
+    """
+    EXPLAIN QUERY PLAN for every registered query.
+
+    Queries on tables that do not exist in db_path are reported with an
+    error instead of a plan. After ANALYZE the planner may scan a table that
+    holds only a few rows (or one week that is most of the table); that
+    scan is the cheaper plan, not a missing index.
+
+    Args:
+        db_path: Path to SQLite database
+        registry: Queries to check (default: QUERY_REGISTRY)
+
+    Returns:
+        One dict per query: name, plan (list of detail lines), full_scan,
+        temp_sort and error
+    """
+    registry = QUERY_REGISTRY if registry is None else registry
+    report = []
+    with db_connection(db_path) as conn:
+        for name, (sql, params) in registry.items():
+            try:
+                plan = explain_query(conn, sql, params)
+                error = None
+            except sqlite3.Error as e:
+                plan, error = [], str(e)
+            report.append({
+                'name': name,
+                'plan': plan,
+                'full_scan': any(_is_full_scan(detail) for detail in plan),
+                'temp_sort': any('TEMP B-TREE' in detail for detail in plan),
+                'error': error,
+            })
+    return report
+
+
+def ensure_indexes(db_path: str = "dfs_optimizer.db") -> List[int]:
+    """Create the indexes the query registry relies on (pending migrations)."""
+    return ensure_schema(db_path)
+
+
+def prune_old_rows(
+    db_path: str = "dfs_optimizer.db",
+    days: int = 60,
+    archive_dir: Optional[str] = None,
+    now: Optional[datetime] = None
+) -> Dict[str, int]:
+    """
+    Delete api_call_log and narrative_flags rows older than a cutoff.
+
+    Args:
+        db_path: Path to SQLite database
+        days: Keep rows newer than this many days
+        archive_dir: If set, pruned rows are first written to
+            <archive_dir>/<table>_<timestamp>.csv.gz
+        now: Reference time (default: current UTC time)
+
+    Returns:
+        Dict mapping table name to rows deleted
+    """
+    now = now or datetime.utcnow()
+    cutoff = (now - timedelta(days=days)).strftime('%Y-%m-%d %H:%M:%S')
+
+    deleted = {}
+    with db_connection(db_path) as conn:
+        existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        for table, column in PRUNABLE_TABLES.items():
+            if table not in existing:
+                continue
+            if archive_dir:
+                old_rows = pd.read_sql(f"SELECT * FROM {table} WHERE {column} < ?", conn, params=(cutoff,))
+                if not old_rows.empty:
+                    os.makedirs(archive_dir, exist_ok=True)
+                    archive = Path(archive_dir) / f"{table}_{now.strftime('%Y%m%d_%H%M%S')}.csv.gz"
+                    old_rows.to_csv(archive, index=False, compression='gzip')
+            deleted[table] = conn.execute(f"DELETE FROM {table} WHERE {column} < ?", (cutoff,)).rowcount
+
+    logger.info(f"Pruned rows older than {cutoff}: {deleted}")
+    return deleted
+
+
+def _file_size(db_path: str) -> int:
+    """Database size on disk, including the WAL file."""
+    return sum(os.path.getsize(path) for path in (db_path, f"{db_path}-wal") if os.path.exists(path))
+
+
+def optimize_database(db_path: str = "dfs_optimizer.db", vacuum: bool = False) -> Dict[str, int]:
+    """
+    Refresh planner statistics and reclaim space.
+
+    ANALYZE and PRAGMA optimize keep the planner choosing the new indexes as
+    tables grow; the WAL is checkpointed and truncated. VACUUM rewrites the
+    whole file, so it closes the pooled connections first and should run
+    while the app is idle.
+
+    Args:
+        db_path: Path to SQLite database
+        vacuum: Also VACUUM the database
+
+    Returns:
+        Dict with size on disk (database + WAL) in bytes before and after
+    """
+    size_before = _file_size(db_path)
+
+    with db_connection(db_path) as conn:
+        conn.execute("ANALYZE")
+        conn.execute("PRAGMA optimize")
+
+    # VACUUM and checkpoints need a connection outside any transaction
+    dispose_engine(db_path)
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        if vacuum:
+            conn.execute("VACUUM")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    finally:
+        conn.close()
+
+    return {'size_before': size_before, 'size_after': _file_size(db_path)}
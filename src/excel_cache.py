@@ -0,0 +1,259 @@
+"""
+Excel Cache Module
+
+Transparent Arrow (Feather) cache for Excel workbook sheets.
+
+openpyxl parsing is the slowest I/O in the app, and the seasonStats workbooks
+are re-read on every session. The first read of a sheet converts it to an
+uncompressed Feather file; later reads of the same, unchanged workbook are
+served from that file through a memory-mapped Arrow read.
+
+Cache entries are keyed by:
+- workbook path, sheet and read options (which entry)
+- workbook mtime + size and CACHE_SCHEMA_VERSION (whether it is current)
+
+Editing or replacing a workbook changes its mtime/size, so the stale entry is
+ignored and replaced on the next read. Anything that cannot be cached (a
+read-only directory, columns Arrow cannot represent) falls back to a plain
+pd.read_excel.
+
+Cold reads of several independent workbooks (paths or uploaded bytes) can be
+parsed concurrently in a process pool with read_excel_many, so loading them
+takes about as long as the slowest single file.
+
+Usage:
+    df = read_excel_cached("seasonStats/Snaps 2025.xlsx")
+    rec_df = read_excel_cached("2025 Stats thru week 5.xlsx", sheet_name='Rec')
+
+    results = read_excel_many({'pass': "seasonStats/Pass 2025.xlsx", 'snaps': snaps_bytes})
+    snaps_df = results['snaps'].df
+"""
+
+import io
+import os
+import glob
+import time
+import hashlib
+import json
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Optional, Union
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Bump when the cached representation changes to invalidate every entry
+CACHE_SCHEMA_VERSION = 1
+
+# Cache directory name, created next to the workbook unless cache_dir is given
+CACHE_DIR_NAME = ".excel_cache"
+
+
+def _entry_prefix(path: str, sheet_name: Union[str, int], read_kwargs: dict) -> str:
+    """Cache file prefix identifying (workbook, sheet, read options)."""
+    stem = os.path.splitext(os.path.basename(path))[0].replace(' ', '_')
+    identity = json.dumps([path, sheet_name, read_kwargs], sort_keys=True, default=str)
+    return f"{stem}__{hashlib.sha1(identity.encode()).hexdigest()[:12]}"
+
+
+def _entry_version(path: str) -> str:
+    """Cache file suffix identifying the workbook version."""
+    stat = os.stat(path)
+    version = f"{stat.st_mtime_ns}:{stat.st_size}:{CACHE_SCHEMA_VERSION}"
+    return hashlib.sha1(version.encode()).hexdigest()[:12]
+
+
+def cache_path_for(
+    path: str,
+    sheet_name: Union[str, int] = 0,
+    cache_dir: Optional[str] = None,
+    **read_kwargs
+) -> str:
+    """
+    Path of the cache entry for the current version of a workbook sheet.
+
+    Args:
+        path: Excel workbook path
+        sheet_name: Sheet name or index (as for pd.read_excel)
+        cache_dir: Cache directory (default: .excel_cache next to the workbook)
+        **read_kwargs: Other pd.read_excel options that affect the result
+
+    Returns:
+        Absolute path of the .feather cache file (which may not exist yet)
+    """
+    path = os.path.abspath(path)
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(path), CACHE_DIR_NAME)
+    prefix = _entry_prefix(path, sheet_name, read_kwargs)
+    return os.path.join(os.path.abspath(cache_dir), f"{prefix}__{_entry_version(path)}.feather")
+
+
+def _restore_missing_values(df: pd.DataFrame) -> pd.DataFrame:
+    """Arrow returns nulls in object columns as None; read_excel uses NaN."""
+    for column in df.columns:
+        if df[column].dtype == object and df[column].isna().any():
+            df[column] = df[column].where(df[column].notna(), float('nan'))
+    return df
+
+
+def _read_entry(entry_path: str) -> pd.DataFrame:
+    """Memory-mapped read of a cache entry."""
+    table = feather.read_table(entry_path, memory_map=True)
+    return _restore_missing_values(table.to_pandas())
+
+
+def _write_entry(entry_path: str, df: pd.DataFrame):
+    """
+    Atomically write a cache entry and remove older versions of it.
+
+    Raises:
+        Exception: If the DataFrame cannot be represented in Arrow or the
+            cache directory is not writable
+    """
+    if not all(isinstance(column, str) for column in df.columns) or not df.columns.is_unique:
+        raise ValueError("column names must be unique strings")
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+    tmp_path = f"{entry_path}.{os.getpid()}.tmp"
+    try:
+        # Uncompressed so reads can be memory-mapped without decoding
+        feather.write_feather(table, tmp_path, compression='uncompressed')
+        os.replace(tmp_path, entry_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    prefix = os.path.basename(entry_path).rsplit('__', 1)[0]
+    for stale in glob.glob(os.path.join(glob.escape(os.path.dirname(entry_path)), f"{glob.escape(prefix)}__*.feather")):
+        if stale != entry_path:
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+
+
+def read_excel_cached(
+    path: str,
+    sheet_name: Union[str, int] = 0,
+    cache_dir: Optional[str] = None,
+    **read_kwargs
+) -> pd.DataFrame:
+    """
+    pd.read_excel with a transparent Arrow cache per workbook sheet.
+
+    Args:
+        path: Excel workbook path
+        sheet_name: Sheet name or index (as for pd.read_excel)
+        cache_dir: Cache directory (default: .excel_cache next to the workbook)
+        **read_kwargs: Passed to pd.read_excel (part of the cache key)
+
+    Returns:
+        DataFrame equal to pd.read_excel(path, sheet_name=sheet_name, **read_kwargs)
+    """
+    if not ARROW_AVAILABLE:
+        return pd.read_excel(path, sheet_name=sheet_name, **read_kwargs)
+
+    entry_path = cache_path_for(path, sheet_name, cache_dir, **read_kwargs)
+
+    if os.path.exists(entry_path):
+        try:
+            df = _read_entry(entry_path)
+            logger.debug(f"Excel cache hit: {path} [{sheet_name}]")
+            return df
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable Excel cache entry {entry_path}: {e}")
+
+    df = pd.read_excel(path, sheet_name=sheet_name, **read_kwargs)
+
+    try:
+        _write_entry(entry_path, df)
+        logger.debug(f"Excel cache stored: {path} [{sheet_name}] → {entry_path}")
+    except Exception as e:
+        logger.warning(f"Could not cache {path} [{sheet_name}]: {e}")
+
+    return df
+
+
+@dataclass
+class ExcelReadResult:
+    """Outcome of reading one workbook in read_excel_many."""
+    df: Optional[pd.DataFrame] = None
+    error: Optional[str] = None
+    seconds: float = 0.0
+
+
+def _read_source(source: Union[str, bytes], cache_dir: Optional[str]) -> ExcelReadResult:
+    """Read one workbook (path via the cache, bytes directly); never raises."""
+    start = time.time()
+    try:
+        if isinstance(source, bytes):
+            df = pd.read_excel(io.BytesIO(source))
+        else:
+            df = read_excel_cached(source, cache_dir=cache_dir)
+        return ExcelReadResult(df=df, seconds=time.time() - start)
+    except Exception as e:
+        return ExcelReadResult(error=str(e), seconds=time.time() - start)
+
+
+def read_excel_many(
+    sources: Dict[str, Union[str, bytes]],
+    cache_dir: Optional[str] = None,
+    max_workers: Optional[int] = None
+) -> Dict[str, ExcelReadResult]:
+    """
+    Read the first sheet of several independent workbooks.
+
+    Paths already in the cache are read in-process (memory-mapped, cheap).
+    Everything that needs Excel parsing is parsed concurrently in a process
+    pool when there is more than one such file and more than one CPU; if a
+    pool cannot be started the files are parsed sequentially instead.
+    Workers are spawned, not forked: Streamlit runs scripts in threads, and
+    forking a threaded process can deadlock the child on a held lock.
+
+    Args:
+        sources: Key → workbook path or raw workbook bytes (uploads)
+        cache_dir: Cache directory for path sources (see read_excel_cached)
+        max_workers: Pool size (default: one worker per file, capped at CPU count)
+
+    Returns:
+        Key → ExcelReadResult (df on success, error message on failure)
+    """
+    results: Dict[str, ExcelReadResult] = {}
+    to_parse: Dict[str, Union[str, bytes]] = {}
+
+    for key, source in sources.items():
+        if ARROW_AVAILABLE and not isinstance(source, bytes) and os.path.exists(source) \
+                and os.path.exists(cache_path_for(source, cache_dir=cache_dir)):
+            results[key] = _read_source(source, cache_dir)
+        else:
+            to_parse[key] = source
+
+    workers = max_workers or min(len(to_parse), os.cpu_count() or 1)
+    if len(to_parse) > 1 and workers > 1:
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context('spawn')
+            ) as pool:
+                futures = {key: pool.submit(_read_source, source, cache_dir) for key, source in to_parse.items()}
+                for key, future in futures.items():
+                    results[key] = future.result()
+            to_parse = {}
+        except Exception as e:
+            logger.warning(f"Parallel Excel parsing unavailable ({e}); parsing sequentially")
+            to_parse = {key: source for key, source in to_parse.items() if key not in results}
+
+    for key, source in to_parse.items():
+        results[key] = _read_source(source, cache_dir)
+
+    return {key: results[key] for key in sources}
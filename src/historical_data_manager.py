@@ -8,7 +8,8 @@ Key Features:
 - Create slate records (multi-site, multi-contest support)
 - Store complete player pool snapshots per week
 - Update actual results (Monday automation)
-- Load exact historical snapshots for backtesting
+- Load exact historical snapshots for backtesting (one slate or a season)
+- Optional Parquet mirror partitioned by season/week/site
 - Query available weeks for UI
 
 Usage:
@@ -31,26 +32,141 @@ Usage:
     
     # Later: Load for backtesting
     df = manager.load_historical_snapshot(slate_id='2024-W6-DK-CLASSIC')
+    season_df = manager.load_historical_snapshots(season=2024, site='DraftKings')
+    
+    # Parquet mirror for backtests (or pass parquet_dir= to keep it in sync)
+    manager.export_parquet_mirror('backtest_store', season=2024)
+    weeks_df = read_parquet_mirror('backtest_store', season=2024, weeks=range(6, 10))
 """
 
-from typing import List, Dict, Any, Optional
+import os
+import shutil
+from typing import List, Dict, Any, Iterable, Optional
 from datetime import datetime, date
+from urllib.parse import quote
+import numpy as np
 import pandas as pd
 import json
-from sqlalchemy import create_engine, and_
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import and_, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import IntegrityError
 
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as pa_dataset
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
 try:
     from .database_models import (
         Slate, HistoricalPlayerPool, SmartValueProfileHistory,
         create_session
     )
+    from .schema_migrations import schema_task_done, mark_schema_task_done
 except ImportError:
     from database_models import (
         Slate, HistoricalPlayerPool, SmartValueProfileHistory,
         create_session
     )
+    from schema_migrations import schema_task_done, mark_schema_task_done
+
+
+# schema_task_done key for the opponent-nullable check below
+OPPONENT_NULLABLE_TASK = 'historical_player_pool:opponent_nullable'
+
+# Columns an upsert of an existing snapshot row leaves untouched
+SNAPSHOT_KEEP_ON_RESTORE = ('slate_id', 'player_id', 'actual_points')
+
+# historical_player_pool columns returned by snapshot loads (actual_points optional)
+SNAPSHOT_COLUMNS = (
+    'player_id', 'player_name', 'position', 'team', 'opponent', 'salary',
+    'projection', 'ceiling', 'ownership', 'smart_value', 'smart_value_profile',
+    'projection_source', 'ownership_source', 'data_source'
+)
+
+# Hive partition keys of the Parquet mirror (root/season=2024/week=6/site=DraftKings/)
+PARQUET_PARTITIONS = ('season', 'week', 'site')
+
+# Name suffixes ignored when matching results names to slate names
+NAME_SUFFIXES = (' Jr.', ' Sr.', ' III', ' II')
+
+
+def name_match_keys(names: pd.Series) -> pd.Series:
+    """
+    Suffix-stripped player names used to match name variants.
+    
+    "Marvin Harrison Jr." and "Marvin Harrison" share the key
+    "Marvin Harrison". Computed column-wise, once per name list.
+    """
+    keys = names.astype(str)
+    for suffix in NAME_SUFFIXES:
+        keys = keys.str.replace(suffix, '', regex=False)
+    return keys.str.strip()
+
+
+def _parquet_partitioning():
+    return pa_dataset.partitioning(
+        pa.schema([('season', pa.int64()), ('week', pa.int64()), ('site', pa.string())]),
+        flavor='hive'
+    )
+
+
+def _partition_path(root: str, season: int, week: int, site: str) -> str:
+    return os.path.join(root, f"season={season}", f"week={week}", f"site={quote(site, safe='')}")
+
+
+def read_parquet_mirror(
+    root: str,
+    season: Optional[int] = None,
+    weeks: Optional[Iterable[int]] = None,
+    site: Optional[str] = None,
+    columns: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """
+    Scan the Parquet mirror written by HistoricalDataManager.export_parquet_mirror.
+    
+    Filters on the partition keys are pushed down, so only the matching
+    season/week/site directories are read.
+    
+    Args:
+        root: Dataset directory
+        season: Optional season filter
+        weeks: Optional week filter
+        site: Optional site filter
+        columns: Optional subset of columns to read
+        
+    Returns:
+        DataFrame in the load_historical_snapshots layout (empty if the
+        mirror does not exist or nothing matches)
+        
+    Raises:
+        ImportError: If pyarrow is not installed
+    """
+    if not ARROW_AVAILABLE:
+        raise ImportError("pyarrow is required for the Parquet mirror")
+    if not os.path.isdir(root):
+        return pd.DataFrame(columns=columns)
+    
+    conditions = []
+    if season is not None:
+        conditions.append(pa_dataset.field('season') == int(season))
+    if weeks is not None:
+        conditions.append(pa_dataset.field('week').isin([int(week) for week in weeks]))
+    if site is not None:
+        conditions.append(pa_dataset.field('site') == site)
+    predicate = None
+    for condition in conditions:
+        predicate = condition if predicate is None else predicate & condition
+    
+    dataset = pa_dataset.dataset(root, format='parquet', partitioning=_parquet_partitioning())
+    df = dataset.to_table(columns=columns, filter=predicate).to_pandas()
+    if columns is None:
+        # Partition keys come back last; restore the load_historical_snapshots order
+        leading = [col for col in ('slate_id', 'season', 'week', 'site', 'contest_type') if col in df.columns]
+        df = df[leading + [col for col in df.columns if col not in leading]]
+    sort_keys = [col for col in ('season', 'week', 'slate_id', 'player_id') if col in df.columns]
+    return df.sort_values(sort_keys, ignore_index=True) if sort_keys else df
 
 
 class HistoricalDataManager:
@@ -71,19 +187,20 @@ class HistoricalDataManager:
     - "Time travel" to any past week
     """
     
-    def __init__(self, db_path: str = "dfs_optimizer.db"):
+    def __init__(self, db_path: str = "dfs_optimizer.db", parquet_dir: Optional[str] = None):
         """
         Initialize Historical Data Manager.
         
         Args:
             db_path: Path to SQLite database
+            parquet_dir: Optional Parquet mirror directory, kept in sync with
+                every snapshot, actual points update and slate delete
         """
         self.db_path = db_path
+        self.parquet_dir = parquet_dir
         
-        # Setup database session
-        engine = create_engine(f'sqlite:///{db_path}')
-        Session = sessionmaker(bind=engine)
-        self.session = Session()
+        # Setup database session (shared connection pool)
+        self.session = create_session(db_path)
         
         # Auto-repair schema if needed (ensures opponent column is nullable)
         self._ensure_schema_compatibility()
@@ -96,8 +213,12 @@ class HistoricalDataManager:
         may be NOT NULL on Streamlit Cloud but should be nullable.
         
         This provides runtime self-healing for databases where migrations
-        didn't apply correctly.
+        didn't apply correctly. Once the column is known to be nullable the
+        check is skipped for the rest of the process.
         """
+        if schema_task_done(self.db_path, OPPONENT_NULLABLE_TASK):
+            return
+        
         try:
             # Get raw database connection
             conn = self.session.connection().connection
@@ -126,6 +247,7 @@ class HistoricalDataManager:
             
             if not opponent_is_not_null:
                 # Schema is already correct
+                mark_schema_task_done(self.db_path, OPPONENT_NULLABLE_TASK)
                 return
             
             # Schema needs fixing - run migration 006 inline
@@ -190,6 +312,8 @@ class HistoricalDataManager:
                 conn.commit()
                 
                 print("✅ Manual schema fix applied successfully!")
+            
+            mark_schema_task_done(self.db_path, OPPONENT_NULLABLE_TASK)
                 
         except Exception as e:
             # Non-fatal error - database may already be correct or migration not needed
@@ -296,58 +420,106 @@ class HistoricalDataManager:
         if missing_cols:
             raise ValueError(f"Missing required columns: {missing_cols}")
         
-        # Prepare player records
-        players_stored = 0
+        rows = self._snapshot_rows(
+            slate_id, player_data, smart_value_profile, projection_source, ownership_source
+        )
+        if not rows:
+            return 0
+        
+        # One executemany upsert; re-storing a slate replaces its rows but keeps
+        # actual points already filled in on Monday
+        stmt = sqlite_insert(HistoricalPlayerPool.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['slate_id', 'player_id'],
+            set_={col: stmt.excluded[col] for col in rows[0] if col not in SNAPSHOT_KEEP_ON_RESTORE}
+        )
         
-        for idx, row in player_data.iterrows():
-            # Generate player_id if not provided or is nan
-            raw_player_id = row.get('player_id')
-            if pd.isna(raw_player_id) or raw_player_id is None or str(raw_player_id).lower() == 'nan':
-                # Use player_name_team as unique identifier (for DST and players without IDs)
-                player_id = f"{row['player_name']}_{row['team']}"
-            else:
-                player_id = str(raw_player_id)
-            
-            # Create player record
-            # Handle opponent field (can be None/NaN for some players)
-            opponent_value = row.get('opponent')
-            if pd.isna(opponent_value) or opponent_value is None or opponent_value == '':
-                opponent_value = None
-            
-            player = HistoricalPlayerPool(
-                slate_id=slate_id,
-                player_id=player_id,
-                player_name=row['player_name'],
-                position=row['position'],
-                team=row['team'],
-                opponent=opponent_value,
-                salary=int(row['salary']),
-                projection=float(row['projection']),
-                ceiling=float(row['ceiling']) if pd.notna(row.get('ceiling')) else None,
-                ownership=float(row['ownership']) if pd.notna(row.get('ownership')) else None,
-                actual_points=None,  # Filled in Monday
-                smart_value=float(row['smart_value']) if pd.notna(row.get('smart_value')) else None,
-                smart_value_profile=smart_value_profile,
-                projection_source=projection_source,
-                ownership_source=ownership_source,
-                data_source='mysportsfeeds_dfs' if 'mysportsfeeds' in projection_source else 'manual_upload',
-                fetched_at=datetime.now()
-            )
-            
-            try:
-                self.session.add(player)
-                players_stored += 1
-            except Exception as e:
-                print(f"Warning: Failed to store player {row['player_name']}: {e}")
-                continue
-        
-        # Commit all players
         try:
+            self.session.execute(stmt, rows)
             self.session.commit()
-            return players_stored
         except Exception as e:
             self.session.rollback()
             raise ValueError(f"Failed to store player pool: {e}")
+        
+        self._refresh_parquet_mirror(self._slate_partitions([slate_id]))
+        return len(rows)
+    
+    @staticmethod
+    def _snapshot_rows(
+        slate_id: str,
+        player_data: pd.DataFrame,
+        smart_value_profile: Optional[str],
+        projection_source: str,
+        ownership_source: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Build historical_player_pool rows for a snapshot, column-wise.
+        
+        - player_id: given ID, or "{player_name}_{team}" when missing
+          (DST and players without IDs)
+        - opponent: None when missing or blank
+        - salary (int), projection (float) are required; ceiling, ownership
+          and smart_value are optional floats
+        - a player_id listed twice keeps its last row
+        
+        Raises:
+            ValueError: If salary/projection are missing or values are not numeric
+        """
+        if player_data.empty:
+            return []
+        df = player_data.reset_index(drop=True)
+        n = len(df)
+        
+        fallback_id = df['player_name'].astype(str) + '_' + df['team'].astype(str)
+        if 'player_id' in df.columns:
+            raw_id = df['player_id']
+            missing_id = raw_id.isna() | (raw_id.astype(str).str.lower() == 'nan')
+            player_id = raw_id.astype(str).where(~missing_id, fallback_id)
+        else:
+            player_id = fallback_id
+        
+        if 'opponent' in df.columns:
+            opponent = df['opponent'].where(df['opponent'].notna() & (df['opponent'] != ''))
+        else:
+            opponent = pd.Series(np.nan, index=df.index)
+        
+        salary = pd.to_numeric(df['salary'])
+        projection = pd.to_numeric(df['projection']).astype(float)
+        missing = salary.isna() | projection.isna()
+        if missing.any():
+            names = df.loc[missing, 'player_name'].tolist()
+            raise ValueError(f"Missing salary or projection for: {names}")
+        
+        def optional_float(column: str) -> pd.Series:
+            if column not in df.columns:
+                return pd.Series(np.nan, index=df.index)
+            return pd.to_numeric(df[column]).astype(float)
+        
+        records = pd.DataFrame({
+            'slate_id': slate_id,
+            'player_id': player_id,
+            'player_name': df['player_name'],
+            'position': df['position'],
+            'team': df['team'],
+            'opponent': opponent,
+            'salary': np.trunc(salary.astype(float)).astype(np.int64),
+            'projection': projection,
+            'ceiling': optional_float('ceiling'),
+            'ownership': optional_float('ownership'),
+            'actual_points': np.nan,  # Filled in Monday
+            'smart_value': optional_float('smart_value'),
+            'smart_value_profile': smart_value_profile,
+            'projection_source': projection_source,
+            'ownership_source': ownership_source,
+            'data_source': 'mysportsfeeds_dfs' if 'mysportsfeeds' in projection_source else 'manual_upload',
+        }, index=range(n))
+        records = records.drop_duplicates(subset='player_id', keep='last')
+        
+        # object dtype + None so sqlite receives Python values and NULLs
+        records = records.astype(object).where(records.notna(), None)
+        records['fetched_at'] = datetime.now()
+        columns = list(records.columns)
+        return [dict(zip(columns, values)) for values in records.itertuples(index=False, name=None)]
     
     def update_actual_points(
         self,
@@ -372,28 +544,89 @@ class HistoricalDataManager:
             }
             manager.update_actual_points(slate_id, actuals)
         """
-        # Get all players for this slate
-        players = self.session.query(HistoricalPlayerPool).filter(
+        player_count = self.session.query(HistoricalPlayerPool).filter(
             HistoricalPlayerPool.slate_id == slate_id
-        ).all()
+        ).count()
         
-        if not players:
+        if not player_count:
             raise ValueError(f"No players found for slate {slate_id}")
         
-        # Update actual points
-        updated_count = 0
-        for player in players:
-            if player.player_name in actuals:
-                player.actual_points = actuals[player.player_name]
-                updated_count += 1
+        updated = self.update_actual_points_bulk(pd.DataFrame({
+            'slate_id': slate_id,
+            'player_name': list(actuals.keys()),
+            'actual_points': list(actuals.values())
+        }))
+        return updated.get(slate_id, 0)
+    
+    def update_actual_points_bulk(self, actuals: pd.DataFrame) -> Dict[str, int]:
+        """
+        Update actual fantasy points for any number of slates in one statement.
+        
+        The actuals are loaded into a temp table and applied with a single
+        UPDATE ... FROM join on (slate_id, trimmed player name), so the cost
+        does not depend on how many slates or seasons are captured at once.
+        
+        Args:
+            actuals: DataFrame with slate_id, player_name, actual_points
+                (a player listed twice for a slate keeps the last value)
+            
+        Returns:
+            Dict mapping slate_id to number of players updated (slates with
+            no matching players are omitted)
+        """
+        if actuals.empty:
+            return {}
+        
+        updates = pd.DataFrame({
+            'slate_id': actuals['slate_id'].astype(str),
+            'player_name': actuals['player_name'].astype(str).str.strip(),
+            'actual_points': pd.to_numeric(actuals['actual_points']).astype(float),
+        }).drop_duplicates(subset=['slate_id', 'player_name'], keep='last')
+        updates = updates.astype(object).where(updates.notna(), None)
         
-        # Commit updates
         try:
+            self.session.execute(text("DROP TABLE IF EXISTS temp.actual_points_update"))
+            self.session.execute(text("""
+                CREATE TEMP TABLE actual_points_update (
+                    slate_id TEXT NOT NULL,
+                    player_name TEXT NOT NULL,
+                    actual_points REAL,
+                    PRIMARY KEY (slate_id, player_name)
+                )
+            """))
+            self.session.execute(
+                text("""
+                    INSERT INTO temp.actual_points_update (slate_id, player_name, actual_points)
+                    VALUES (:slate_id, :player_name, :actual_points)
+                """),
+                updates.to_dict('records')
+            )
+            
+            counts = self.session.execute(text("""
+                SELECT h.slate_id, COUNT(*)
+                FROM historical_player_pool h
+                JOIN temp.actual_points_update u
+                  ON u.slate_id = h.slate_id AND u.player_name = TRIM(h.player_name)
+                GROUP BY h.slate_id
+            """)).fetchall()
+            
+            self.session.execute(text("""
+                UPDATE historical_player_pool
+                SET actual_points = u.actual_points
+                FROM temp.actual_points_update u
+                WHERE u.slate_id = historical_player_pool.slate_id
+                  AND u.player_name = TRIM(historical_player_pool.player_name)
+            """))
+            self.session.execute(text("DROP TABLE temp.actual_points_update"))
+            
             self.session.commit()
-            return updated_count
         except Exception as e:
             self.session.rollback()
             raise ValueError(f"Failed to update actual points: {e}")
+        
+        counts = {slate_id: count for slate_id, count in counts}
+        self._refresh_parquet_mirror(self._slate_partitions(counts))
+        return counts
     
     def load_historical_snapshot(
         self,
@@ -416,41 +649,156 @@ class HistoricalDataManager:
         Raises:
             ValueError: If slate not found
         """
-        # Query players for this slate
-        players = self.session.query(HistoricalPlayerPool).filter(
-            HistoricalPlayerPool.slate_id == slate_id
-        ).all()
+        columns = SNAPSHOT_COLUMNS + (('actual_points',) if include_actuals else ())
+        df = pd.read_sql(
+            f"SELECT {', '.join(columns)} FROM historical_player_pool WHERE slate_id = ?",
+            self._dbapi_connection(),
+            params=(slate_id,)
+        )
         
-        if not players:
+        if df.empty:
             raise ValueError(f"No data found for slate {slate_id}")
         
-        # Convert to DataFrame
-        data = []
-        for player in players:
-            record = {
-                'player_id': player.player_id,
-                'player_name': player.player_name,
-                'position': player.position,
-                'team': player.team,
-                'opponent': player.opponent,
-                'salary': player.salary,
-                'projection': player.projection,
-                'ceiling': player.ceiling,
-                'ownership': player.ownership,
-                'smart_value': player.smart_value,
-                'smart_value_profile': player.smart_value_profile,
-                'projection_source': player.projection_source,
-                'ownership_source': player.ownership_source,
-                'data_source': player.data_source
-            }
-            
-            if include_actuals:
-                record['actual_points'] = player.actual_points
+        return df
+    
+    def load_historical_snapshots(
+        self,
+        season: Optional[int] = None,
+        weeks: Optional[Iterable[int]] = None,
+        site: Optional[str] = None,
+        slate_ids: Optional[Iterable[str]] = None,
+        include_actuals: bool = True
+    ) -> pd.DataFrame:
+        """
+        Load many slate snapshots (e.g. a full season for a backtest) in one pass.
+        
+        Args:
+            season: Optional season filter
+            weeks: Optional week filter
+            site: Optional site filter ('DraftKings', 'FanDuel')
+            slate_ids: Optional slate filter
+            include_actuals: Whether to include actual_points column
             
-            data.append(record)
+        Returns:
+            DataFrame with slate_id, season, week, site, contest_type followed by
+            the snapshot columns, ordered by season, week and slate (empty if
+            nothing matches)
+        """
+        conditions = []
+        params: List[Any] = []
+        for column, value in (('season', season), ('site', site)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        for column, values in (('week', weeks), ('slate_id', slate_ids)):
+            if values is not None:
+                values = list(values)
+                conditions.append(f"{column} IN ({', '.join('?' * len(values)) or 'NULL'})")
+                params.extend(values)
+        
+        conn = self._dbapi_connection()
+        slates = pd.read_sql(
+            "SELECT slate_id, season, week, site, contest_type FROM slates"
+            + (" WHERE " + " AND ".join(conditions) if conditions else "")
+            + " ORDER BY season, week, slate_id",
+            conn,
+            params=params
+        )
         
-        df = pd.DataFrame(data)
-        return df
+        # Player rows come straight off the primary key index (no sort); the
+        # slate metadata is joined on in pandas
+        columns = SNAPSHOT_COLUMNS + (('actual_points',) if include_actuals else ())
+        slate_ids = slates['slate_id'].tolist()
+        players = pd.read_sql(
+            f"SELECT slate_id, {', '.join(columns)} FROM historical_player_pool "
+            f"WHERE slate_id IN ({', '.join('?' * len(slate_ids)) or 'NULL'}) "
+            "ORDER BY slate_id, player_id",
+            conn,
+            params=slate_ids
+        )
+        return slates.merge(players, on='slate_id')
+    
+    def _dbapi_connection(self):
+        """Raw sqlite3 connection behind the session (pd.read_sql is fastest on it)."""
+        return self.session.connection().connection.driver_connection
+    
+    def export_parquet_mirror(
+        self,
+        root: Optional[str] = None,
+        season: Optional[int] = None,
+        weeks: Optional[Iterable[int]] = None,
+        site: Optional[str] = None
+    ) -> int:
+        """
+        Write historical_player_pool to a Parquet dataset partitioned by season/week/site.
+        
+        Every (season, week, site) partition covered by the filters is
+        rewritten from the database; partitions with no rows left are removed.
+        Read it back with read_parquet_mirror.
+        
+        Args:
+            root: Dataset directory (default: the manager's parquet_dir)
+            season: Optional season filter
+            weeks: Optional week filter
+            site: Optional site filter
+            
+        Returns:
+            int: Number of player rows written
+            
+        Raises:
+            ImportError: If pyarrow is not installed
+            ValueError: If no root is given and the manager has no parquet_dir
+        """
+        if not ARROW_AVAILABLE:
+            raise ImportError("pyarrow is required for the Parquet mirror")
+        root = root or self.parquet_dir
+        if not root:
+            raise ValueError("No Parquet mirror directory given")
+        if weeks is not None:
+            weeks = list(weeks)
+        
+        query = self.session.query(Slate.season, Slate.week, Slate.site)
+        if season is not None:
+            query = query.filter(Slate.season == season)
+        if weeks is not None:
+            query = query.filter(Slate.week.in_(list(weeks)))
+        if site is not None:
+            query = query.filter(Slate.site == site)
+        partitions = set(query.distinct().all())
+        
+        df = self.load_historical_snapshots(season=season, weeks=weeks, site=site)
+        for partition in partitions:
+            path = _partition_path(root, *partition)
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+        if df.empty:
+            return 0
+        
+        pa_dataset.write_dataset(
+            pa.Table.from_pandas(df, preserve_index=False),
+            root,
+            format='parquet',
+            partitioning=_parquet_partitioning(),
+            existing_data_behavior='overwrite_or_ignore'
+        )
+        return len(df)
+    
+    def _slate_partitions(self, slate_ids: Iterable[str]) -> List[tuple]:
+        """Distinct (season, week, site) mirror partitions holding these slates."""
+        return self.session.query(Slate.season, Slate.week, Slate.site).filter(
+            Slate.slate_id.in_(list(slate_ids))
+        ).distinct().all()
+    
+    def _refresh_parquet_mirror(self, partitions: Iterable[tuple]):
+        """Re-export mirror partitions after a write (if a mirror is configured)."""
+        if not self.parquet_dir or not ARROW_AVAILABLE:
+            return
+        for season, week, site in partitions:
+            # Also clears partitions whose last slate was just deleted
+            path = _partition_path(self.parquet_dir, season, week, site)
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            self.export_parquet_mirror(season=season, weeks=[week], site=site)
     
     def get_available_weeks(
         self,
@@ -542,6 +890,8 @@ class HistoricalDataManager:
         Returns:
             bool: True if deleted, False if not found
         """
+        partitions = self._slate_partitions([slate_id]) if self.parquet_dir else []
+        
         # Delete players first (foreign key constraint)
         self.session.query(HistoricalPlayerPool).filter(
             HistoricalPlayerPool.slate_id == slate_id
@@ -554,10 +904,12 @@ class HistoricalDataManager:
         
         try:
             self.session.commit()
-            return result > 0
         except Exception as e:
             self.session.rollback()
             raise ValueError(f"Failed to delete slate: {e}")
+        
+        self._refresh_parquet_mirror(partitions)
+        return result > 0
     
     def _generate_slate_id(
         self,
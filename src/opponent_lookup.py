@@ -7,10 +7,14 @@ for a given week. This provides clean opponent data without parsing messy CSV co
 The lookup is built once when data is loaded and cached for the session.
 """
 
-import sqlite3
 from typing import Dict, Optional
 from pathlib import Path
 
+try:
+    from .db_access import db_connection
+except ImportError:
+    from db_access import db_connection
+
 
 # NFL team abbreviation to full name mapping
 TEAM_NAME_TO_ABBR = {
@@ -85,20 +89,19 @@ def build_opponent_lookup(
     opponent_map = {}
     
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        # Query Vegas lines for the specified week
-        query = """
-        SELECT home_team, away_team
-        FROM vegas_lines
-        WHERE week = ?
-        ORDER BY game_id
-        """
-        
-        cursor.execute(query, (week,))
-        rows = cursor.fetchall()
-        conn.close()
+        with db_connection(db_path) as conn:
+            cursor = conn.cursor()
+            
+            # Query Vegas lines for the specified week
+            query = """
+            SELECT home_team, away_team
+            FROM vegas_lines
+            WHERE week = ?
+            ORDER BY game_id
+            """
+            
+            cursor.execute(query, (week,))
+            rows = cursor.fetchall()
         
         if not rows:
             print(f"⚠️ No Vegas lines found for Week {week}")
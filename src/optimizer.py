@@ -12,6 +12,7 @@ import math
 from typing import List, Tuple, Optional
 
 from models import Player, Lineup, PlayerSelection
+from portfolio_index import PortfolioIndex
 
 
 def generate_lineups(
@@ -88,6 +89,9 @@ def generate_lineups(
     # Track player exposure across all lineups
     player_exposure_count = {}
     
+    # Bitset index of generated lineups (used to prune redundant uniqueness cuts)
+    portfolio_index = PortfolioIndex(player_pool_df['name'])
+    
     lineups = []
     
     for i in range(lineup_count):
@@ -103,7 +107,8 @@ def generate_lineups(
             player_exposure_count=player_exposure_count,
             max_lineups_per_player=max_lineups_per_player,
             max_high_own_wrs_enabled=max_high_own_wrs_enabled,
-            max_high_own_wrs=max_high_own_wrs
+            max_high_own_wrs=max_high_own_wrs,
+            portfolio_index=portfolio_index
         )
         
         if error:
@@ -111,6 +116,7 @@ def generate_lineups(
             return lineups, f"Could not generate lineup {i+1}: {error}"
         
         lineups.append(lineup)
+        portfolio_index.add_lineup(lineup)
         
         # Update player exposure counts
         for player in lineup.players:
@@ -140,7 +146,8 @@ def _generate_single_lineup(
     player_exposure_count: dict = None,
     max_lineups_per_player: int = None,
     max_high_own_wrs_enabled: bool = False,
-    max_high_own_wrs: int = 1
+    max_high_own_wrs: int = 1,
+    portfolio_index: Optional[PortfolioIndex] = None
 ) -> Tuple[Optional[Lineup], Optional[str]]:
     """
     Generate a single lineup using PuLP linear programming.
@@ -157,6 +164,7 @@ def _generate_single_lineup(
         max_ownership_pct: Maximum ownership (0-1.0) if enabled
         lineup_number: Lineup ID for this lineup
         stacking_enabled: Whether to enforce QB + WR/TE same team constraint
+        portfolio_index: Bitset index of previous_lineups (built on the fly if omitted)
     
     Returns:
         Tuple of (Lineup object or None, Error message or None)
@@ -283,9 +291,24 @@ def _generate_single_lineup(
             ]) <= max_high_own_wrs, "Max_High_Ownership_WRs"
 
     # Constraint 5: Uniqueness (relative to all previous lineups)
-    for prev_idx, prev_lineup in enumerate(previous_lineups):
-        # Get names of players in previous lineup
-        prev_player_names = set(p.name for p in prev_lineup.players)
+    # Only cuts that can still bind are added: lineups whose remaining selectable
+    # players are <= max_shared (or a subset of another cut) are implied already
+    if portfolio_index is None:
+        portfolio_index = PortfolioIndex(p.name for p in players)
+        for prev_lineup in previous_lineups:
+            portfolio_index.add_lineup(prev_lineup)
+    
+    exposure_capped_names = []
+    if player_exposure_count is not None and max_lineups_per_player is not None:
+        exposure_capped_names = [
+            name for name, count in player_exposure_count.items()
+            if count >= max_lineups_per_player
+        ]
+    
+    for prev_idx, effective_mask in portfolio_index.binding_uniqueness_masks(
+        max_shared, unavailable_names=exposure_capped_names
+    ):
+        prev_player_names = set(portfolio_index.names_for_mask(effective_mask))
         
         # Sum of shared players must be <= max_shared
         prob += pulp.lpSum([
@@ -11,6 +11,10 @@ from typing import Dict, Any, Optional, Tuple
 from pathlib import Path
 
 
+# Rows read to detect the header row of Excel uploads
+EXCEL_HEADER_SNIFF_ROWS = 20
+
+
 def detect_and_standardize_data_source(df: pd.DataFrame) -> Tuple[pd.DataFrame, str]:
     """
     Detect data source format and standardize to internal format.
@@ -192,20 +196,10 @@ def parse_file(uploaded_file: Any) -> pd.DataFrame:
     if file_extension == '.csv':
         df = pd.read_csv(uploaded_file)
     elif file_extension in ['.xlsx', '.xls']:
-        # Try reading with default header first
-        df = pd.read_excel(uploaded_file)
-        
-        # Check for problematic column headers:
-        # 1. Mostly "Unnamed" columns (original logic)
-        # 2. Duplicate column names (new fix for this error)
-        unnamed_count = sum(1 for col in df.columns if str(col).startswith('Unnamed'))
-        has_duplicate_cols = df.columns.duplicated().any()
-        
-        if unnamed_count > len(df.columns) * 0.5 or has_duplicate_cols:
-            # Seek back to beginning before re-reading
-            if hasattr(uploaded_file, 'seek'):
-                uploaded_file.seek(0)
-            df = pd.read_excel(uploaded_file, header=1)
+        # Sniff the header row from the first rows, then parse the file once
+        header_row = sniff_excel_header_row(uploaded_file)
+        df = pd.read_excel(uploaded_file, header=header_row)
+        if header_row != 0:
             # Reset index to avoid alignment issues
             df = df.reset_index(drop=True)
     else:
@@ -234,6 +228,36 @@ def parse_file(uploaded_file: Any) -> pd.DataFrame:
     return df
 
 
+def sniff_excel_header_row(uploaded_file: Any) -> int:
+    """
+    Detect which row holds the column headers of an Excel file.
+    
+    Reads only the first EXCEL_HEADER_SNIFF_ROWS rows. Files whose first row
+    is a title/banner (LineStar, some DraftKings exports) have mostly
+    "Unnamed" or duplicate columns when read with the default header, so
+    their headers are on the second row.
+    
+    Args:
+        uploaded_file: Streamlit UploadedFile object, file-like object or path
+        
+    Returns:
+        int: 0 for the first row, 1 for the second (file position is reset)
+    """
+    preview = pd.read_excel(uploaded_file, nrows=EXCEL_HEADER_SNIFF_ROWS)
+    if hasattr(uploaded_file, 'seek'):
+        uploaded_file.seek(0)
+    
+    # Check for problematic column headers:
+    # 1. Mostly "Unnamed" columns (original logic)
+    # 2. Duplicate column names (new fix for this error)
+    unnamed_count = sum(1 for col in preview.columns if str(col).startswith('Unnamed'))
+    has_duplicate_cols = preview.columns.duplicated().any()
+    
+    if unnamed_count > len(preview.columns) * 0.5 or has_duplicate_cols:
+        return 1
+    return 0
+
+
 def get_file_extension(filename: str) -> str:
     """
     Extract file extension from filename.
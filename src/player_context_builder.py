@@ -12,12 +12,20 @@ Usage:
     enriched_players = builder.enrich_players(player_df)
 """
 
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
+import numpy as np
 import pandas as pd
 from datetime import datetime
+from fuzzywuzzy import fuzz
 
 from .rules_engine import SmartRulesEngine
 from .database_models import VegasLine, InjuryReport, create_session
+from .player_identity import PlayerIdentityIndex
+from .point_in_time import load_as_of
+from .player_name_mapper import normalize_name
+
+# Minimum fuzzy score to link a DK name to an injury report name
+INJURY_NAME_MATCH_THRESHOLD = 90
 
 
 class PlayerContextBuilder:
@@ -31,24 +39,49 @@ class PlayerContextBuilder:
     - Prior week points (for 80/20 rule)
     """
     
-    def __init__(self, week: int = 1, db_path: str = "dfs_optimizer.db"):
+    def __init__(self, week: int = 1, db_path: str = "dfs_optimizer.db", as_of: Optional[datetime] = None):
         """
         Initialize Player Context Builder.
         
         Args:
             week: NFL week number
             db_path: Path to SQLite database
+            as_of: Optional point in time; Vegas lines and injury reports are
+                read as they stood then (backtests, late swap)
         """
         self.week = week
         self.db_path = db_path
+        self.as_of = as_of
         self.session = create_session(db_path)
-        self.rules_engine = SmartRulesEngine(db_path=db_path, week=week)
+        self.rules_engine = SmartRulesEngine(db_path=db_path, week=week, as_of=as_of)
+        
+        # Every week's rows from one point-in-time snapshot (injuries are
+        # looked up across weeks)
+        self._as_of_view = load_as_of(None, as_of, db_path) if as_of is not None else None
         
         # Load Vegas lines into memory
         self.vegas_lines_cache = self._load_vegas_lines()
         
-        # Load injury reports into memory
+        # Load injury reports into memory and index them once
         self.injury_reports_cache = self._load_injury_reports()
+        self._build_injury_indexes()
+        self._injury_match_memo: Dict[tuple, Optional[Dict[str, Any]]] = {}
+        
+        # Persistent DK ↔ injury report name matches
+        self.identity_index = self._load_identity_index()
+    
+    def _load_identity_index(self) -> Optional[PlayerIdentityIndex]:
+        """
+        Open the persistent player identity index.
+        
+        Returns:
+            PlayerIdentityIndex, or None if it cannot be opened
+        """
+        try:
+            return PlayerIdentityIndex(db_path=self.db_path)
+        except Exception as e:
+            print(f"Warning: Could not load player identity index: {e}")
+            return None
     
     def _load_vegas_lines(self) -> Dict[str, Dict[str, Any]]:
         """
@@ -59,7 +92,11 @@ class PlayerContextBuilder:
         """
         vegas_cache = {}
         try:
-            lines = self.session.query(VegasLine).filter_by(week=self.week).all()
+            if self._as_of_view is not None:
+                frame = self._as_of_view['vegas_lines']
+                lines = [VegasLine(**row) for row in frame[frame['week'] == self.week].to_dict('records')]
+            else:
+                lines = self.session.query(VegasLine).filter_by(week=self.week).all()
             for line in lines:
                 # Map both home and away teams
                 vegas_cache[line.home_team] = {
@@ -93,21 +130,27 @@ class PlayerContextBuilder:
         try:
             from sqlalchemy import func
             
-            # Get the most recent injury report for each (player_name, team) combination
-            # This subquery finds the max updated_at for each player
-            subquery = self.session.query(
-                InjuryReport.player_name,
-                InjuryReport.team,
-                func.max(InjuryReport.updated_at).label('max_updated')
-            ).group_by(InjuryReport.player_name, InjuryReport.team).subquery()
-            
-            # Join to get the full report for the most recent update
-            reports = self.session.query(InjuryReport).join(
-                subquery,
-                (InjuryReport.player_name == subquery.c.player_name) &
-                (InjuryReport.team == subquery.c.team) &
-                (InjuryReport.updated_at == subquery.c.max_updated)
-            ).all()
+            if self._as_of_view is not None:
+                # Latest report per player as of the snapshot
+                frame = self._as_of_view['injury_reports'].sort_values('updated_at', kind='stable')
+                frame = frame.drop_duplicates(['player_name', 'team'], keep='last')
+                reports = [InjuryReport(**row) for row in frame.to_dict('records')]
+            else:
+                # Get the most recent injury report for each (player_name, team) combination
+                # This subquery finds the max updated_at for each player
+                subquery = self.session.query(
+                    InjuryReport.player_name,
+                    InjuryReport.team,
+                    func.max(InjuryReport.updated_at).label('max_updated')
+                ).group_by(InjuryReport.player_name, InjuryReport.team).subquery()
+                
+                # Join to get the full report for the most recent update
+                reports = self.session.query(InjuryReport).join(
+                    subquery,
+                    (InjuryReport.player_name == subquery.c.player_name) &
+                    (InjuryReport.team == subquery.c.team) &
+                    (InjuryReport.updated_at == subquery.c.max_updated)
+                ).all()
             
             for report in reports:
                 key = (report.player_name, report.team)
@@ -126,6 +169,43 @@ class PlayerContextBuilder:
             print(f"Warning: Could not load injury reports: {e}")
             return {}
     
+    def _build_injury_indexes(self):
+        """
+        Build hash indexes over the injury report cache.
+        
+        - (lower name, upper team) → report (case-insensitive name + team)
+        - lower name → report (name only, for traded players)
+        - upper team → [(name, team)] (fuzzy matching block)
+        - injury_reports_df: one row per report for vectorized merges
+        
+        When several reports collide on a key the first one loaded wins,
+        matching the order of the original linear scans.
+        """
+        self._injury_by_name_team: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._injury_by_name: Dict[str, Dict[str, Any]] = {}
+        self._injury_keys_by_team: Dict[str, List[tuple]] = {}
+        
+        records = []
+        for (cached_name, cached_team), report in self.injury_reports_cache.items():
+            name_key = cached_name.lower().strip()
+            team_key = cached_team.upper().strip()
+            self._injury_by_name_team.setdefault((name_key, team_key), report)
+            self._injury_by_name.setdefault(name_key, report)
+            self._injury_keys_by_team.setdefault(team_key, []).append((cached_name, cached_team))
+            records.append({
+                'name': cached_name,
+                'team': cached_team,
+                'name_key': name_key,
+                'team_key': team_key,
+                'injury_status': report['status'],
+                'injury_details': self._format_injury_details(report)
+            })
+        
+        self.injury_reports_df = pd.DataFrame(
+            records,
+            columns=['name', 'team', 'name_key', 'team_key', 'injury_status', 'injury_details']
+        )
+    
     def enrich_players(
         self,
         player_df: pd.DataFrame,
@@ -143,83 +223,125 @@ class PlayerContextBuilder:
         """
         # Make a copy to avoid modifying original
         enriched_df = player_df.copy()
+        names = self._column(enriched_df, 'Name', 'name')
+        teams = self._column(enriched_df, 'Team', 'team')
         
-        # Add ITT column
-        enriched_df['itt'] = enriched_df.apply(
-            lambda row: self._get_itt(row.get('Team', row.get('team'))),
-            axis=1
-        )
-        
-        # Add opponent column
-        enriched_df['opponent'] = enriched_df.apply(
-            lambda row: self._get_opponent(row.get('Team', row.get('team'))),
-            axis=1
-        )
+        # Add ITT and opponent columns (team lookups)
+        itt_by_team = {team: line['itt'] for team, line in self.vegas_lines_cache.items()}
+        opponent_by_team = {team: line['opponent'] for team, line in self.vegas_lines_cache.items()}
+        enriched_df['itt'] = pd.to_numeric(teams.map(itt_by_team), errors='coerce')
+        opponents = teams.map(opponent_by_team)
+        enriched_df['opponent'] = opponents.astype(object).where(opponents.notna(), None)
         
         # Add injury status columns
-        enriched_df['injury_status'] = enriched_df.apply(
-            lambda row: self._get_injury_status(
-                row.get('Name', row.get('name')),
-                row.get('Team', row.get('team'))
-            ),
-            axis=1
-        )
+        injuries = self._merge_injury_reports(names, teams)
+        enriched_df['injury_status'] = injuries['injury_status'].to_numpy()
+        enriched_df['injury_details'] = injuries['injury_details'].to_numpy()
         
-        enriched_df['injury_details'] = enriched_df.apply(
-            lambda row: self._get_injury_details(
-                row.get('Name', row.get('name')),
-                row.get('Team', row.get('team'))
-            ),
-            axis=1
-        )
+        # Persist any new DK ↔ injury report name matches
+        if self.identity_index is not None:
+            self.identity_index.commit()
         
         # Add prior week points (for 80/20 rule)
         if prior_week_df is not None:
-            enriched_df['last_week_points'] = enriched_df.apply(
-                lambda row: self._get_prior_week_points(
-                    row.get('Name', row.get('name')),
-                    prior_week_df
-                ),
-                axis=1
-            )
+            enriched_df['last_week_points'] = self._map_prior_week_points(names, prior_week_df)
         else:
             enriched_df['last_week_points'] = None
         
-        # Generate flags using smart rules engine
-        enriched_df['flags'] = enriched_df.apply(
-            lambda row: self._evaluate_player(row),
-            axis=1
-        )
+        # Generate flags and severity counts for the whole pool in one pass
+        flags, counts = self.rules_engine.evaluate_players(self._rules_input_frame(enriched_df))
+        player_flags = [[] for _ in range(len(enriched_df))]
+        for row, flag in zip(
+            flags['row'].tolist(),
+            flags[['flag_category', 'message', 'severity']].to_dict('records')
+        ):
+            player_flags[row].append(flag)
+        enriched_df['flags'] = pd.Series(player_flags, index=enriched_df.index, dtype=object)
         
-        # Add flag count (for sorting/filtering)
-        enriched_df['flag_count'] = enriched_df['flags'].apply(len)
-        
-        # Add severity counts
-        enriched_df['red_flags'] = enriched_df['flags'].apply(
-            lambda flags: sum(1 for f in flags if f.get('severity') == 'red')
-        )
-        enriched_df['yellow_flags'] = enriched_df['flags'].apply(
-            lambda flags: sum(1 for f in flags if f.get('severity') == 'yellow')
-        )
-        enriched_df['green_flags'] = enriched_df['flags'].apply(
-            lambda flags: sum(1 for f in flags if f.get('severity') == 'green')
-        )
+        # Add flag count (for sorting/filtering) and severity counts
+        for column in ['flag_count', 'red_flags', 'yellow_flags', 'green_flags']:
+            enriched_df[column] = counts[column]
         
         # Add overall player score (for color coding)
         # 0 red flags + 0-1 yellow = green
         # 1+ red flags or 2+ yellow = red
         # Everything else = yellow
-        enriched_df['player_score'] = enriched_df.apply(
-            lambda row: self._calculate_player_score(
-                row['red_flags'],
-                row['yellow_flags'],
-                row['green_flags']
-            ),
-            axis=1
+        enriched_df['player_score'] = self._calculate_player_scores(
+            enriched_df['red_flags'],
+            enriched_df['yellow_flags'],
+            enriched_df['green_flags']
         )
         
         return enriched_df
     
+    @staticmethod
+    def _column(df: pd.DataFrame, upper: str, lower: str) -> pd.Series:
+        """Column by its upper- or lowercase name (None if neither exists)."""
+        if upper in df.columns:
+            return df[upper]
+        if lower in df.columns:
+            return df[lower]
+        return pd.Series(None, index=df.index, dtype=object)
+    
+    def _merge_injury_reports(self, names: pd.Series, teams: pd.Series) -> pd.DataFrame:
+        """
+        Attach injury status/details to players with vectorized merges.
+        
+        Order per player: exact (name, team) → case-insensitive (name, team) →
+        name only. Players still unmatched go through the identity index and
+        same-team fuzzy fallback (once per unique name/team).
+        
+        Returns:
+            DataFrame with 'injury_status' and 'injury_details', aligned
+            positionally with names
+        """
+        players = pd.DataFrame({'name': names.to_numpy(), 'team': teams.to_numpy()})
+        result = pd.DataFrame({'injury_status': [None] * len(players), 'injury_details': [None] * len(players)}, dtype=object)
+        if len(players) == 0:
+            return result
+        
+        valid_name = players['name'].map(lambda name: isinstance(name, str) and name != '')
+        valid_team = players['team'].map(lambda team: isinstance(team, str) and team != '')
+        players['name_key'] = players['name'].where(valid_name, '').astype(str).str.lower().str.strip()
+        players['team_key'] = players['team'].where(valid_team, '').astype(str).str.upper().str.strip()
+        
+        reports = self.injury_reports_df
+        value_cols = ['injury_status', 'injury_details']
+        stages = [
+            (['name', 'team'], reports, valid_name & valid_team),
+            (['name_key', 'team_key'], reports.drop_duplicates(['name_key', 'team_key']), valid_name & valid_team),
+            (['name_key'], reports.drop_duplicates(['name_key']), valid_name),
+        ]
+        
+        matched = pd.Series(False, index=players.index)
+        for keys, table, eligible in stages:
+            merged = players[keys].merge(table[keys + value_cols], on=keys, how='left', indicator=True)
+            hit = ((merged['_merge'] == 'both') & eligible & ~matched).to_numpy()
+            result.loc[hit, value_cols] = merged.loc[hit, value_cols].to_numpy()
+            matched |= hit
+        
+        # Identity index / fuzzy fallback for the remaining players
+        if self.identity_index is not None:
+            remaining = players[~matched & valid_name]
+            for (name, team), group in remaining.groupby(['name', 'team'], dropna=False, sort=False).groups.items():
+                report = self._find_injury_report(name, team if isinstance(team, str) else None)
+                if report:
+                    result.loc[group, 'injury_status'] = report['status']
+                    result.loc[group, 'injury_details'] = self._format_injury_details(report)
+        
+        return result
+    
+    @staticmethod
+    def _map_prior_week_points(names: pd.Series, prior_week_df: pd.DataFrame) -> pd.Series:
+        """Map prior week fantasy points by case-insensitive name (first match wins)."""
+        if 'FantasyPoints' not in prior_week_df.columns:
+            return pd.Series(None, index=names.index, dtype=object)
+        
+        prior = prior_week_df[['Name', 'FantasyPoints']].dropna(subset=['Name'])
+        points_by_name = dict(zip(prior['Name'].str.lower()[::-1], prior['FantasyPoints'][::-1]))
+        name_keys = names.map(lambda name: name.lower() if isinstance(name, str) and name else None)
+        return name_keys.map(points_by_name)
+    
     def _get_itt(self, team: str) -> Optional[float]:
         """Get ITT for a team."""
         if not team or team not in self.vegas_lines_cache:
@@ -234,66 +356,93 @@ class PlayerContextBuilder:
     
     def _get_injury_status(self, player_name: str, team: str) -> Optional[str]:
         """Get injury status for a player."""
+        report = self._find_injury_report(player_name, team)
+        return report['status'] if report else None
+    
+    def _get_injury_details(self, player_name: str, team: str) -> Optional[str]:
+        """Get injury details for a player."""
+        return self._format_injury_details(self._find_injury_report(player_name, team))
+    
+    @staticmethod
+    def _format_injury_details(report: Optional[Dict[str, Any]]) -> Optional[str]:
+        """Format an injury report as 'status - body part (practice practice)'."""
+        if report:
+            status = report['status'] or 'Unknown'
+            body_part = report['body_part'] or 'Unknown'
+            practice = report['practice_status'] or 'Unknown'
+            return f"{status} - {body_part} ({practice} practice)"
+        return None
+    
+    def _find_injury_report(self, player_name: str, team: str) -> Optional[Dict[str, Any]]:
+        """
+        Find the injury report for a DK player.
+        
+        Order: exact (name, team) → case-insensitive (name, team) → name only →
+        persisted identity (ESPN name) → fuzzy match within the team, which is
+        then persisted so later weeks resolve it directly.
+        """
         if not player_name:
             return None
         
+        memo_key = (player_name, team)
+        if memo_key in self._injury_match_memo:
+            return self._injury_match_memo[memo_key]
+        
+        report = self._match_injury_report_by_name(player_name, team)
+        
+        if not report and self.identity_index is not None:
+            espn_name = self.identity_index.source_name(player_name, 'espn', team)
+            if espn_name:
+                report = self._match_injury_report_by_name(espn_name, team)
+            else:
+                report = self._fuzzy_match_injury_report(player_name, team)
+        
+        self._injury_match_memo[memo_key] = report
+        return report
+    
+    def _match_injury_report_by_name(self, player_name: str, team: str) -> Optional[Dict[str, Any]]:
+        """Exact, then case-insensitive, then name-only injury report lookup."""
         # Try exact match first (name + team)
         if team:
             key = (player_name, team)
             if key in self.injury_reports_cache:
-                return self.injury_reports_cache[key]['status']
+                return self.injury_reports_cache[key]
         
         # Try case-insensitive match (name + team)
         player_name_lower = player_name.lower().strip()
         if team:
-            team_upper = team.upper().strip()
-            for (cached_name, cached_team), report in self.injury_reports_cache.items():
-                if cached_name.lower().strip() == player_name_lower and cached_team.upper().strip() == team_upper:
-                    return report['status']
+            report = self._injury_by_name_team.get((player_name_lower, team.upper().strip()))
+            if report:
+                return report
         
         # Fallback: Try name-only match (for traded players or team mismatches)
-        for (cached_name, cached_team), report in self.injury_reports_cache.items():
-            if cached_name.lower().strip() == player_name_lower:
-                return report['status']
-        
-        return None
+        return self._injury_by_name.get(player_name_lower)
     
-    def _get_injury_details(self, player_name: str, team: str) -> Optional[str]:
-        """Get injury details for a player."""
-        if not player_name:
+    def _fuzzy_match_injury_report(self, player_name: str, team: str) -> Optional[Dict[str, Any]]:
+        """
+        Fuzzy match a new DK name against injury reports for the same team.
+        
+        Successful matches are linked in the identity index as the player's
+        ESPN name.
+        """
+        if not team:
             return None
         
-        report = None
+        normalized = normalize_name(player_name)
+        team_upper = team.upper().strip()
         
-        # Try exact match first (name + team)
-        if team:
-            key = (player_name, team)
-            if key in self.injury_reports_cache:
-                report = self.injury_reports_cache[key]
+        best_key, best_score = None, 0
+        for (cached_name, cached_team) in self._injury_keys_by_team.get(team_upper, []):
+            score = fuzz.ratio(normalized, normalize_name(cached_name))
+            if score > best_score:
+                best_key, best_score = (cached_name, cached_team), score
         
-        # Try case-insensitive match (name + team)
-        if not report and team:
-            player_name_lower = player_name.lower().strip()
-            team_upper = team.upper().strip()
-            for (cached_name, cached_team), cached_report in self.injury_reports_cache.items():
-                if cached_name.lower().strip() == player_name_lower and cached_team.upper().strip() == team_upper:
-                    report = cached_report
-                    break
-        
-        # Fallback: Try name-only match (for traded players or team mismatches)
-        if not report:
-            player_name_lower = player_name.lower().strip()
-            for (cached_name, cached_team), cached_report in self.injury_reports_cache.items():
-                if cached_name.lower().strip() == player_name_lower:
-                    report = cached_report
-                    break
+        if best_key is None or best_score < INJURY_NAME_MATCH_THRESHOLD:
+            return None
         
-        if report:
-            status = report['status'] or 'Unknown'
-            body_part = report['body_part'] or 'Unknown'
-            practice = report['practice_status'] or 'Unknown'
-            return f"{status} - {body_part} ({practice} practice)"
-        return None
+        identity = self.identity_index.get_or_create(player_name, team)
+        self.identity_index.link(identity, 'espn', best_key[0], team=best_key[1], match_score=best_score)
+        return self.injury_reports_cache[best_key]
     
     def _get_prior_week_points(
         self,
@@ -313,39 +462,29 @@ class PlayerContextBuilder:
             return matches.iloc[0].get('FantasyPoints', None)
         return None
     
-    def _evaluate_player(self, row: pd.Series) -> List[Dict[str, Any]]:
+    def _rules_input_frame(self, df: pd.DataFrame) -> pd.DataFrame:
         """
-        Evaluate player using smart rules engine.
-        
-        Returns:
-            List of flag dictionaries
+        Map player columns (uppercase or lowercase) to the rules engine's
+        batch columns.
         """
-        try:
-            # Normalize column names (handle both uppercase and lowercase)
-            player_data = {
-                'player_name': row.get('Name', row.get('name')),
-                'team': row.get('Team', row.get('team')),
-                'position': row.get('Position', row.get('position')),
-                'salary': float(row.get('Salary', row.get('salary', 0))),
-                'projected_points': float(row.get('AvgPointsPerGame', row.get('avg_points_per_game', 0))),
-                'projected_ceiling': row.get('Ceiling', row.get('ceiling')),
-                'last_week_points': row.get('last_week_points'),
-                'attempts': row.get('Attempts', row.get('attempts')),
-                'snaps': row.get('Snaps', row.get('snaps')),
-                'routes': row.get('Routes', row.get('routes')),
-                'projected_ownership': row.get('Ownership', row.get('ownership'))
-            }
-            
-            # Remove None values
-            player_data = {k: v for k, v in player_data.items() if v is not None}
-            
-            # Evaluate player
-            flags = self.rules_engine.evaluate_player(**player_data)
-            return flags
-            
-        except Exception as e:
-            print(f"Error evaluating player {row.get('Name', 'unknown')}: {e}")
-            return []
+        def column_or_default(upper: str, lower: str, default) -> pd.Series:
+            if upper in df.columns or lower in df.columns:
+                return self._column(df, upper, lower)
+            return pd.Series(default, index=df.index)
+        
+        return pd.DataFrame({
+            'player_name': self._column(df, 'Name', 'name'),
+            'team': self._column(df, 'Team', 'team'),
+            'position': self._column(df, 'Position', 'position'),
+            'salary': column_or_default('Salary', 'salary', 0),
+            'projected_points': column_or_default('AvgPointsPerGame', 'avg_points_per_game', 0),
+            'projected_ceiling': self._column(df, 'Ceiling', 'ceiling'),
+            'last_week_points': df['last_week_points'] if 'last_week_points' in df.columns else None,
+            'attempts': self._column(df, 'Attempts', 'attempts'),
+            'snaps': self._column(df, 'Snaps', 'snaps'),
+            'routes': self._column(df, 'Routes', 'routes'),
+            'projected_ownership': self._column(df, 'Ownership', 'ownership')
+        }, index=df.index)
     
     def _calculate_player_score(
         self,
@@ -372,6 +511,23 @@ class PlayerContextBuilder:
         # Yellow for everything else
         return 'yellow'
     
+    @staticmethod
+    def _calculate_player_scores(
+        red_counts: pd.Series,
+        yellow_counts: pd.Series,
+        green_counts: pd.Series
+    ) -> np.ndarray:
+        """Vectorized _calculate_player_score over flag count columns."""
+        return np.select(
+            [
+                red_counts > 0,
+                yellow_counts == 0,
+                (yellow_counts == 1) & (green_counts > 0)
+            ],
+            ['red', 'green', 'green'],
+            default='yellow'
+        )
+    
     def get_enrichment_stats(self) -> Dict[str, Any]:
         """
         Get statistics about available enrichment data.
@@ -392,6 +548,8 @@ class PlayerContextBuilder:
         try:
             self.session.close()
             self.rules_engine.close()
+            if self.identity_index is not None:
+                self.identity_index.close()
         except Exception as e:
             print(f"Error closing connections: {e}")
 
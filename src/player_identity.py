@@ -0,0 +1,353 @@
+"""
+Player Identity Module
+
+Persistent, cross-week player identity index backed by SQLite.
+
+Every name-matching path (season stats files, injury reports, contest results)
+used to redo fuzzy matching from scratch on every upload. This module stores a
+canonical identity per player (DraftKings name is canonical) together with the
+name each data source uses for that player, so matching is a dictionary lookup
+after the first week and fuzzy matching is only needed for genuinely new names.
+
+Tables (see migrations/009_add_player_identity_tables.sql):
+- player_identities: DK id, MySportsFeeds id, ESPN name, season-file name
+- player_aliases: normalized name as seen in a source → identity
+
+Usage:
+    index = PlayerIdentityIndex(db_path="dfs_optimizer.db")
+    identity = index.get_or_create("Patrick Mahomes", team="KC", position="QB")
+    index.link(identity, 'season', "Patrick Mahomes II", match_score=94.0)
+    index.commit()
+
+    index.source_name("Patrick Mahomes", 'season', team="KC")  # "Patrick Mahomes II"
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from .db_access import db_connection
+    from .player_name_mapper import normalize_name
+    from .schema_migrations import ensure_schema
+except ImportError:
+    from db_access import db_connection
+    from player_name_mapper import normalize_name
+    from schema_migrations import ensure_schema
+
+logger = logging.getLogger(__name__)
+
+# Source → player_identities column holding that source's name/ID
+SOURCE_COLUMNS = {
+    'season': 'season_file_name',
+    'espn': 'espn_name',
+    'msf': 'msf_id',
+    'dk': 'dk_id',
+}
+
+
+def _team_key(team) -> str:
+    """Alias team key: '' for missing teams (None, NaN, blank)."""
+    if team is None or team != team:
+        return ''
+    return str(team).strip()
+
+
+@dataclass
+class PlayerIdentity:
+    """Canonical player identity with per-source names."""
+    identity_id: int
+    canonical_name: str
+    normalized_name: str
+    team: Optional[str] = None
+    position: Optional[str] = None
+    dk_id: Optional[str] = None
+    msf_id: Optional[str] = None
+    espn_name: Optional[str] = None
+    season_file_name: Optional[str] = None
+    season_match_score: Optional[float] = None
+
+
+class PlayerIdentityIndex:
+    """
+    SQLite-backed index of canonical player identities and their aliases.
+
+    All identities and aliases are loaded into memory on construction, so
+    lookups never touch the database. Writes are buffered in memory and
+    flushed by commit() in one short transaction, so no write lock is held
+    while callers fuzzy-match. New identities carry a provisional negative
+    identity_id until then.
+    """
+
+    def __init__(self, db_path: str = "dfs_optimizer.db"):
+        """
+        Initialize the index, creating its tables if needed.
+
+        Args:
+            db_path: Path to SQLite database
+        """
+        self.db_path = db_path
+        # Identity tables come from migration 009
+        ensure_schema(db_path)
+        self.hits = 0
+        self.misses = 0
+
+        self._identities: Dict[int, PlayerIdentity] = {}
+        # (source, alias, team) → identity_id
+        self._aliases: Dict[Tuple[str, str, str], int] = {}
+        # (source, alias) → identity_ids seen under any team
+        self._aliases_any_team: Dict[Tuple[str, str], List[int]] = {}
+
+        # Writes pending until commit()
+        self._new_identities: List[PlayerIdentity] = []
+        self._changed_identities: Dict[int, PlayerIdentity] = {}
+        # (source, alias, team) → (identity, source_name, match_score)
+        self._pending_aliases: Dict[Tuple[str, str, str], Tuple[PlayerIdentity, str, float]] = {}
+        self._next_provisional_id = -1
+
+        self._load()
+
+    def _load(self):
+        """Load all identities and aliases into memory."""
+        with db_connection(self.db_path) as conn:
+            identities = conn.execute("""
+                SELECT identity_id, canonical_name, normalized_name, team, position,
+                       dk_id, msf_id, espn_name, season_file_name, season_match_score
+                FROM player_identities
+            """).fetchall()
+            aliases = conn.execute("SELECT source, alias, team, identity_id FROM player_aliases").fetchall()
+
+        for row in identities:
+            self._identities[row[0]] = PlayerIdentity(*row)
+        for source, alias, team, identity_id in aliases:
+            self._remember_alias(source, alias, team, identity_id)
+
+        logger.info(f"Loaded {len(self._identities)} player identities, {len(self._aliases)} aliases")
+
+    def _remember_alias(self, source: str, alias: str, team: str, identity_id: int):
+        """Add an alias to the in-memory maps."""
+        self._aliases[(source, alias, team)] = identity_id
+        ids = self._aliases_any_team.setdefault((source, alias), [])
+        if identity_id not in ids:
+            ids.append(identity_id)
+
+    def __len__(self) -> int:
+        return len(self._identities)
+
+    def lookup(self, name: str, team: Optional[str] = None, source: str = 'dk') -> Optional[PlayerIdentity]:
+        """
+        Find the identity for a name as it appears in a source.
+
+        Tries (name, team) first, then the name alone when it maps to exactly
+        one identity (players without a team, or traded players).
+
+        Args:
+            name: Raw player name
+            team: Team abbreviation, if the source has one
+            source: Source the name comes from ('dk', 'season', 'espn', 'msf', 'results')
+
+        Returns:
+            PlayerIdentity or None if the name has not been seen before
+        """
+        alias = normalize_name(name)
+        if not alias:
+            return None
+
+        identity_id = self._aliases.get((source, alias, _team_key(team)))
+        if identity_id is None:
+            candidates = self._aliases_any_team.get((source, alias), [])
+            if len(candidates) == 1:
+                identity_id = candidates[0]
+
+        if identity_id is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return self._identities[identity_id]
+
+    def source_name(self, name: str, target_source: str, team: Optional[str] = None,
+                    source: str = 'dk') -> Optional[str]:
+        """
+        Translate a player name from one source to another.
+
+        Args:
+            name: Raw player name in `source`
+            target_source: 'season' or 'espn'
+            team: Team abbreviation
+            source: Source of `name` (default DraftKings)
+
+        Returns:
+            Name used by target_source, or None if unknown
+        """
+        identity = self.lookup(name, team, source)
+        if identity is None:
+            return None
+        return getattr(identity, SOURCE_COLUMNS[target_source], None)
+
+    def get_or_create(
+        self,
+        name: str,
+        team: Optional[str] = None,
+        position: Optional[str] = None,
+        dk_id: Optional[str] = None
+    ) -> PlayerIdentity:
+        """
+        Get the identity for a DraftKings player, creating it on first sight.
+
+        Args:
+            name: DraftKings player name (canonical)
+            team: Team abbreviation
+            position: Position
+            dk_id: DraftKings player ID
+
+        Returns:
+            PlayerIdentity
+        """
+        identity = self.lookup(name, team, 'dk')
+        if identity is not None and not self._same_player(identity, team, position):
+            identity = None
+
+        if identity is not None:
+            if _team_key(team) and _team_key(team) != _team_key(identity.team):
+                # Traded player: remember the new team as well
+                self._insert_alias('dk', name, team, identity, 100.0)
+                self._update_identity(identity, team=_team_key(team))
+            if dk_id and not identity.dk_id:
+                self._update_identity(identity, dk_id=str(dk_id))
+            return identity
+
+        identity = PlayerIdentity(
+            identity_id=self._next_provisional_id,
+            canonical_name=name,
+            normalized_name=normalize_name(name),
+            team=_team_key(team) or None,
+            position=position,
+            dk_id=str(dk_id) if dk_id else None
+        )
+        self._next_provisional_id -= 1
+        self._new_identities.append(identity)
+        self._identities[identity.identity_id] = identity
+        self._insert_alias('dk', name, identity.team, identity, 100.0)
+        return identity
+
+    @staticmethod
+    def _same_player(identity: PlayerIdentity, team: Optional[str], position: Optional[str]) -> bool:
+        """
+        Whether a name match found under another team is the same player.
+
+        Same-team matches always are. Across teams (trades), positions must
+        not conflict, so two different players sharing a name stay separate.
+        """
+        if _team_key(team) == _team_key(identity.team) or not _team_key(team):
+            return True
+        if not position or position != position or not identity.position:
+            return True
+        return position == identity.position
+
+    def link(
+        self,
+        identity: PlayerIdentity,
+        source: str,
+        source_name: str,
+        team: Optional[str] = None,
+        match_score: float = 100.0,
+        source_id: Optional[str] = None
+    ):
+        """
+        Record the name (and optionally ID) a source uses for an identity.
+
+        Args:
+            identity: Identity to link
+            source: 'season', 'espn', 'msf' or 'results'
+            source_name: Raw name as it appears in the source
+            team: Team abbreviation in the source ('' / None if the source has none)
+            match_score: Fuzzy match score (100 for exact)
+            source_id: Source-specific player ID (MySportsFeeds)
+        """
+        self._insert_alias(source, source_name, team, identity, match_score)
+
+        if source == 'season':
+            self._update_identity(identity, season_file_name=source_name, season_match_score=match_score)
+        elif source == 'espn':
+            self._update_identity(identity, espn_name=source_name)
+        elif source == 'msf' and source_id:
+            self._update_identity(identity, msf_id=str(source_id))
+
+    def _insert_alias(self, source: str, source_name: str, team: Optional[str],
+                      identity: PlayerIdentity, match_score: float):
+        """Queue an alias for commit() and add it to the in-memory maps."""
+        alias = normalize_name(source_name)
+        self._pending_aliases[(source, alias, _team_key(team))] = (identity, source_name, match_score)
+        self._remember_alias(source, alias, _team_key(team), identity.identity_id)
+
+    def _update_identity(self, identity: PlayerIdentity, **fields):
+        """Update identity columns in memory and queue the row for commit()."""
+        for column, value in fields.items():
+            setattr(identity, column, value)
+        if identity.identity_id > 0:
+            self._changed_identities[identity.identity_id] = identity
+
+    def commit(self):
+        """Write pending identities and aliases in one transaction."""
+        if not (self._new_identities or self._changed_identities or self._pending_aliases):
+            return
+
+        # Provisional → real identity_id
+        assigned = {}
+        with db_connection(self.db_path) as conn:
+            for identity in self._new_identities:
+                cursor = conn.execute(
+                    """
+                    INSERT INTO player_identities
+                        (canonical_name, normalized_name, team, position,
+                         dk_id, msf_id, espn_name, season_file_name, season_match_score)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (identity.canonical_name, identity.normalized_name, identity.team, identity.position,
+                     identity.dk_id, identity.msf_id, identity.espn_name,
+                     identity.season_file_name, identity.season_match_score)
+                )
+                assigned[identity.identity_id] = cursor.lastrowid
+
+            conn.executemany(
+                """
+                UPDATE player_identities
+                SET team = ?, dk_id = ?, msf_id = ?, espn_name = ?, season_file_name = ?,
+                    season_match_score = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE identity_id = ?
+                """,
+                [(identity.team, identity.dk_id, identity.msf_id, identity.espn_name,
+                  identity.season_file_name, identity.season_match_score, identity.identity_id)
+                 for identity in self._changed_identities.values()]
+            )
+
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO player_aliases (source, alias, team, identity_id, source_name, match_score)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                [(source, alias, team, assigned.get(identity.identity_id, identity.identity_id), source_name, score)
+                 for (source, alias, team), (identity, source_name, score) in self._pending_aliases.items()]
+            )
+
+        if assigned:
+            self._assign_ids(assigned)
+        self._new_identities = []
+        self._changed_identities = {}
+        self._pending_aliases = {}
+
+    def _assign_ids(self, assigned: Dict[int, int]):
+        """Replace provisional identity_ids in memory with the stored ones."""
+        for identity in self._new_identities:
+            identity.identity_id = assigned[identity.identity_id]
+        self._identities = {identity.identity_id: identity for identity in self._identities.values()}
+        self._aliases = {key: assigned.get(value, value) for key, value in self._aliases.items()}
+        self._aliases_any_team = {
+            key: [assigned.get(value, value) for value in ids]
+            for key, ids in self._aliases_any_team.items()
+        }
+
+    def close(self):
+        """Write any pending identities and aliases."""
+        self.commit()
@@ -7,8 +7,12 @@ Part of Phase 1 Infrastructure (2025-10-18).
 This module provides:
 - PlayerNameMapper: One-time fuzzy matching with caching for performance
 - Bulk DataFrame operations (NO iterrows for performance)
+- Blocked matching: one multi-threaded RapidFuzz cdist call per
+  (team, position) block instead of a Python loop per player
 - Name normalization with suffix handling
 - Position and team-aware matching
+- Optional persistent identity index (see player_identity.py) so players
+  matched in earlier weeks skip fuzzy matching entirely
 
 Performance Target: <2 seconds for 500 players across 4 files
 """
@@ -18,7 +22,7 @@ import numpy as np
 import logging
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple, Set
-from fuzzywuzzy import fuzz, process
+from rapidfuzz import fuzz, process
 import time
 
 # Configure logging
@@ -133,16 +137,20 @@ class PlayerNameMapper:
     Performance: <2 seconds for 500 players across 4 files
     """
 
-    def __init__(self, threshold: int = 85):
+    def __init__(self, threshold: int = 85, identity_index=None):
         """
         Initialize PlayerNameMapper.
 
         Args:
             threshold: Minimum fuzzy match score (0-100) to accept a match
+            identity_index: Optional PlayerIdentityIndex. Known players are
+                resolved from it; new fuzzy matches are persisted to it.
         """
         self.threshold = threshold
+        self.identity_index = identity_index
         self.mappings: Dict[str, PlayerMapping] = {}
         self._match_cache: Dict[str, Dict] = {}  # Cache for performance
+        self.identity_hits = 0
 
     def create_mappings(
         self,
@@ -172,11 +180,10 @@ class PlayerNameMapper:
         # Batch process all players (vectorized where possible)
         unique_players = player_df[['name', 'position', 'team']].drop_duplicates()
 
-        for idx, row in unique_players.iterrows():
-            player_name = row.get('name', '')
-            player_team = row.get('team', '')
-            player_position = row.get('position', '')
+        # Players that need fuzzy matching: (mapping, identity) pairs
+        pending: List[Tuple[PlayerMapping, object]] = []
 
+        for player_name, player_position, player_team in unique_players.itertuples(index=False, name=None):
             if not player_name or pd.isna(player_name):
                 continue
 
@@ -188,20 +195,48 @@ class PlayerNameMapper:
                 team=player_team
             )
 
-            # Match against each preprocessed file
+            identity = None
+            if self.identity_index is not None:
+                identity = self.identity_index.get_or_create(player_name, player_team, player_position)
+
+            if identity is not None and identity.season_file_name:
+                # Known player: exact lookup of the persisted season-file name
+                self._apply_known_identity(mapping, identity, processed_files)
+                self.identity_hits += 1
+            else:
+                pending.append((mapping, identity))
+
+            self.mappings[player_name] = mapping
+
+        # Blocked fuzzy matching for all new players, one file at a time
+        if pending:
+            pending_df = pd.DataFrame({
+                'name': [m.original_name for m, _ in pending],
+                'team': [m.team for m, _ in pending],
+                'position': [m.position for m, _ in pending],
+                'normalized_name': [m.normalized_name for m, _ in pending]
+            })
+
             for file_key, file_data in processed_files.items():
                 if file_data is None:
                     continue
 
-                matched_name, match_score = self._fuzzy_match_optimized(
-                    player_name, player_team, player_position, file_data, file_key
-                )
-
-                # Store match results
-                setattr(mapping, f'matched_name_{file_key}', matched_name)
-                setattr(mapping, f'match_score_{file_key}', match_score)
-
-            self.mappings[player_name] = mapping
+                file_results = self._match_file_blocked(pending_df, file_data, file_key)
+                for (mapping, _), (matched_name, match_score) in zip(pending, file_results):
+                    # Store match results
+                    setattr(mapping, f'matched_name_{file_key}', matched_name)
+                    setattr(mapping, f'match_score_{file_key}', match_score)
+
+            if self.identity_index is not None:
+                for mapping, identity in pending:
+                    self._persist_best_match(mapping, identity, mapping.team)
+
+        if self.identity_index is not None:
+            self.identity_index.commit()
+            logger.info(
+                f"Identity index resolved {self.identity_hits}/{len(self.mappings)} players "
+                f"without fuzzy matching"
+            )
 
         elapsed = time.time() - start_time
         logger.info(f"Created mappings for {len(self.mappings)} players in {elapsed:.2f} seconds")
@@ -248,11 +283,53 @@ class PlayerNameMapper:
                 'df': df_copy,
                 'team_groups': team_groups,
                 'pos_groups': pos_groups,
-                'all_names': df_copy[['Name', '_normalized_name']].drop_duplicates().to_dict('records')
+                'all_names': df_copy[['Name', '_normalized_name']].drop_duplicates().to_dict('records'),
+                'name_set': set(df_copy['Name'].dropna())
             }
 
         return processed
 
+    def _apply_known_identity(self, mapping: PlayerMapping, identity, processed_files: Dict):
+        """
+        Fill a mapping from a persisted identity (no fuzzy matching).
+
+        The season-file name is shared by all four files, so a player missing
+        from a file (e.g. a QB in the receiving file) simply has no match there.
+
+        Args:
+            mapping: PlayerMapping to fill
+            identity: PlayerIdentity with season_file_name set
+            processed_files: Preprocessed file data
+        """
+        score = identity.season_match_score if identity.season_match_score is not None else 100.0
+
+        for file_key, file_data in processed_files.items():
+            if file_data is None:
+                continue
+
+            if identity.season_file_name in file_data['name_set']:
+                setattr(mapping, f'matched_name_{file_key}', identity.season_file_name)
+                setattr(mapping, f'match_score_{file_key}', score)
+
+    def _persist_best_match(self, mapping: PlayerMapping, identity, player_team: str):
+        """
+        Persist the best above-threshold season-file match for a new player.
+
+        Args:
+            mapping: Freshly fuzzy-matched PlayerMapping
+            identity: PlayerIdentity to link
+            player_team: Player team (season files use the same abbreviations)
+        """
+        best_name, best_score = None, 0.0
+        for file_key in ['pass', 'rush', 'receiving', 'snaps']:
+            matched_name = getattr(mapping, f'matched_name_{file_key}')
+            match_score = getattr(mapping, f'match_score_{file_key}')
+            if matched_name and match_score > best_score:
+                best_name, best_score = matched_name, match_score
+
+        if best_name and best_score >= self.threshold:
+            self.identity_index.link(identity, 'season', best_name, team=player_team, match_score=best_score)
+
     def _fuzzy_match_optimized(
         self,
         player_name: str,
@@ -262,10 +339,9 @@ class PlayerNameMapper:
         file_key: str
     ) -> Tuple[Optional[str], float]:
         """
-        Optimized fuzzy matching using preprocessed data.
+        Optimized fuzzy matching of a single player using preprocessed data.
 
-        Uses team and position filtering to reduce search space, then applies
-        fuzzy matching only on the filtered subset.
+        Thin wrapper over _match_file_blocked for one-off lookups.
 
         Args:
             player_name: Name to match
@@ -282,112 +358,150 @@ class PlayerNameMapper:
         if cache_key in self._match_cache:
             return self._match_cache[cache_key]
 
-        normalized_search = normalize_name(player_name)
-        df = file_data['df']
+        players = pd.DataFrame({
+            'name': [player_name],
+            'team': [player_team],
+            'position': [player_position],
+            'normalized_name': [normalize_name(player_name)]
+        })
+        return self._match_file_blocked(players, file_data, file_key)[0]
 
-        # Strategy 1: Try exact team + position match first
-        candidates = df
-        if player_team and 'Team' in df.columns:
-            team_candidates = df[df['Team'] == player_team]
-            if not team_candidates.empty:
-                candidates = team_candidates
-
-        # Further filter by position if available
-        if player_position and 'POS' in candidates.columns:
-            # Handle multi-position players (e.g., "RB/WR")
-            pos_candidates = candidates[
-                candidates['POS'].str.contains(player_position, na=False, regex=False)
-            ]
-            if not pos_candidates.empty:
-                candidates = pos_candidates
-
-        if candidates.empty:
-            result = (None, 0.0)
-            self._match_cache[cache_key] = result
-            return result
-
-        # Get unique names from filtered candidates
-        candidate_records = candidates[['Name', '_normalized_name']].drop_duplicates().to_dict('records')
-
-        if not candidate_records:
-            result = (None, 0.0)
-            self._match_cache[cache_key] = result
-            return result
-
-        # Perform fuzzy matching on filtered set
-        best_match = None
-        best_score = 0.0
-
-        for record in candidate_records:
-            score = fuzz.ratio(normalized_search, record['_normalized_name'])
-            if score > best_score:
-                best_score = score
-                best_match = record['Name']
-
-        # Apply threshold
-        if best_score >= self.threshold:
-            result = (best_match, best_score)
-        else:
-            # Strategy 2: If no good match with filters, try without position filter
-            if player_position and 'POS' in df.columns:
-                # Try again without position filter
-                return self._fuzzy_match_fallback(player_name, player_team, file_data, file_key)
-            result = (None, best_score)
-
-        self._match_cache[cache_key] = result
-        return result
-
-    def _fuzzy_match_fallback(
+    def _match_file_blocked(
         self,
-        player_name: str,
-        player_team: str,
+        players: pd.DataFrame,
         file_data: Dict,
         file_key: str
-    ) -> Tuple[Optional[str], float]:
+    ) -> List[Tuple[Optional[str], float]]:
         """
-        Fallback matching when position-filtered matching fails.
+        Fuzzy match many players against one file with blocked cdist calls.
+
+        Pass 1 scores every player in a (team, position) block against that
+        block's candidates in a single RapidFuzz cdist call. Players still
+        below threshold fall back to a team-only pass (useful for players who
+        changed positions or have different position listings across files).
 
-        Tries matching with team filter only, useful for players who changed
-        positions or have different position listings across files.
+        Scores are rounded to integers like fuzzywuzzy's ratio, so thresholds
+        behave exactly as before.
 
         Args:
-            player_name: Name to match
-            player_team: Team for filtering
+            players: DataFrame with 'name', 'team', 'position', 'normalized_name'
             file_data: Preprocessed file data
-            file_key: File identifier
+            file_key: File identifier for caching
 
         Returns:
-            (best_match_name, match_score)
+            List of (best_match_name, match_score), aligned with players rows
         """
-        normalized_search = normalize_name(player_name)
         df = file_data['df']
+        has_position = 'POS' in df.columns
+        players = players.reset_index(drop=True)
+        results: List[Tuple[Optional[str], float]] = [(None, 0.0)] * len(players)
+        fallback_rows = []
+
+        # Pass 1: team + position blocks
+        block_keys = [players['team'].map(self._block_key), players['position'].map(self._block_key)]
+        for (team, position), block in players.groupby(block_keys, sort=False):
+            names, scores = self._score_block(
+                block['normalized_name'].tolist(), self._block_candidates(file_data, team, position)
+            )
+            for row, name, score in zip(block.index, names, scores):
+                if score >= self.threshold:
+                    results[row] = (name, score)
+                elif position and has_position:
+                    # Strategy 2: retry without the position filter
+                    fallback_rows.append(row)
+                else:
+                    results[row] = (None, score)
+
+        # Pass 2: team-only blocks for players that missed
+        if fallback_rows:
+            fallback = players.loc[fallback_rows]
+            for team, block in fallback.groupby(fallback['team'].map(self._block_key), sort=False):
+                names, scores = self._score_block(
+                    block['normalized_name'].tolist(), self._block_candidates(file_data, team, '')
+                )
+                for row, name, score in zip(block.index, names, scores):
+                    results[row] = (name, score) if score >= self.threshold else (None, score)
 
-        # Try with team filter only
-        candidates = df
-        if player_team and 'Team' in df.columns:
-            team_candidates = df[df['Team'] == player_team]
-            if not team_candidates.empty:
-                candidates = team_candidates
+        for name, team, position, result in zip(players['name'], players['team'], players['position'], results):
+            self._match_cache[f"{file_key}_{name}_{team}_{position}"] = result
 
-        if candidates.empty:
-            return (None, 0.0)
+        return results
 
-        # Get unique names
-        candidate_records = candidates[['Name', '_normalized_name']].drop_duplicates().to_dict('records')
+    @staticmethod
+    def _block_key(value) -> str:
+        """Block key for a team/position value ('' when missing)."""
+        if value is None or pd.isna(value):
+            return ''
+        return str(value)
 
-        best_match = None
-        best_score = 0.0
+    def _block_candidates(self, file_data: Dict, team: str, position: str) -> Tuple[List[str], List[str]]:
+        """
+        Candidate (names, normalized names) for a (team, position) block.
 
-        for record in candidate_records:
-            score = fuzz.ratio(normalized_search, record['_normalized_name'])
-            if score > best_score:
-                best_score = score
-                best_match = record['Name']
+        Blocks are built once per file and reused across players.
 
-        if best_score >= self.threshold:
-            return (best_match, best_score)
+        Args:
+            file_data: Preprocessed file data
+            team: Team filter ('' for none)
+            position: Position filter ('' for none)
 
-        return (None, best_score)
+        Returns:
+            (candidate names, candidate normalized names)
+        """
+        blocks = file_data.setdefault('blocks', {})
+        if (team, position) in blocks:
+            return blocks[(team, position)]
+
+        df = file_data['df']
+
+        # Strategy 1: Try exact team + position match first
+        candidates = df
+        if team and team in file_data['team_groups']:
+            candidates = file_data['team_groups'][team]
+
+        # Further filter by position if available
+        if position and 'POS' in candidates.columns:
+            # Handle multi-position players (e.g., "RB/WR")
+            pos_candidates = candidates[
+                candidates['POS'].str.contains(position, na=False, regex=False)
+            ]
+            if not pos_candidates.empty:
+                candidates = pos_candidates
+
+        records = candidates[['Name', '_normalized_name']].drop_duplicates()
+        blocks[(team, position)] = (records['Name'].tolist(), records['_normalized_name'].tolist())
+        return blocks[(team, position)]
+
+    @staticmethod
+    def _score_block(
+        queries: List[str],
+        candidates: Tuple[List[str], List[str]]
+    ) -> Tuple[List[Optional[str]], np.ndarray]:
+        """
+        Best candidate per query with one multi-threaded cdist call.
+
+        Args:
+            queries: Normalized player names
+            candidates: (candidate names, candidate normalized names)
+
+        Returns:
+            (best candidate name per query, best score per query). Ties go to
+            the first candidate; a best score of 0 has no candidate.
+        """
+        candidate_names, candidate_normalized = candidates
+        if not candidate_normalized:
+            return [None] * len(queries), np.zeros(len(queries))
+
+        scores = np.rint(process.cdist(
+            queries, candidate_normalized, scorer=fuzz.ratio, dtype=np.float64, workers=-1
+        ))
+        best_idx = scores.argmax(axis=1)
+        best_scores = scores[np.arange(len(queries)), best_idx]
+        best_names = [
+            candidate_names[idx] if score > 0 else None
+            for idx, score in zip(best_idx, best_scores)
+        ]
+        return best_names, best_scores
 
     def fuzzy_match_player(
         self,
@@ -415,13 +529,7 @@ class PlayerNameMapper:
             return None, 0.0
 
         # Use the optimized version
-        file_data = {
-            'df': stats_df.copy(),
-            'team_groups': {},
-            'pos_groups': {},
-            'all_names': []
-        }
-        file_data['df']['_normalized_name'] = file_data['df']['Name'].apply(normalize_name)
+        file_data = self._preprocess_files({'single': stats_df})['single']
 
         return self._fuzzy_match_optimized(
             player_name, player_team, player_position, file_data, 'single'
@@ -0,0 +1,272 @@
+"""
+Point-in-Time Module
+
+Append-only history of vegas_lines and injury_reports, and "as of" reads.
+
+vegas_lines and injury_reports hold the current state. Triggers from
+migration 013 append a delta-encoded version to vegas_line_versions /
+injury_report_versions on every change:
+- only the changed columns are stored, flagged in change_mask
+- a write that changes nothing appends nothing
+- change_mask = 0 marks a deleted row
+
+valid_from is the UTC time the version was written, never earlier than the
+key's previous version, so a key's history is in write order even when a
+writer replays older data (e.g. a cache restore). The writer's fetched_at /
+updated_at is kept as data (observed_at) and returned in those columns.
+Writers stamp fetched_at/updated_at in UTC.
+
+Writers should use sync_vegas_lines()/sync_injury_reports(), which update
+only changed rows and delete only rows that disappeared, rather than
+delete-and-reinsert. A reinserted row is stored as a delete plus a full
+version, so a poll that changed nothing would still add two versions per row.
+
+as-of reads rebuild each row from its latest version written at or before
+the (UTC) timestamp, taking every column from the latest version that
+changed it. load_as_of() reads both tables in one transaction, so backtests
+and late swap see a consistent view.
+
+Usage:
+    with db_connection("dfs_optimizer.db") as conn:
+        sync_vegas_lines(conn, week=7, rows=lines)
+
+    lines = vegas_lines_as_of(7, "2025-10-18 23:00:00")
+    view = load_as_of(7, "2025-10-18 23:00:00")    # both tables, one snapshot
+"""
+
+import sqlite3
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+import pandas as pd
+
+try:
+    from .db_access import db_connection
+except ImportError:
+    from db_access import db_connection
+
+# (versions table, key columns, tracked columns in change_mask bit order,
+#  timestamp column of the live table)
+VEGAS_LINES = (
+    'vegas_line_versions',
+    ('week', 'game_id'),
+    ('home_team', 'away_team', 'home_spread', 'away_spread', 'total', 'home_itt', 'away_itt'),
+    'fetched_at',
+)
+INJURY_REPORTS = (
+    'injury_report_versions',
+    ('week', 'player_name', 'team'),
+    ('position', 'injury_status', 'practice_status', 'body_part', 'description'),
+    'updated_at',
+)
+
+Timestamp = Union[str, datetime, pd.Timestamp]
+
+
+def normalize_timestamp(value: Timestamp) -> str:
+    """
+    UTC timestamp in the versions tables' format ('YYYY-MM-DD HH:MM:SS.SSS').
+
+    Naive values are taken to be UTC; aware values are converted.
+    """
+    value = pd.Timestamp(value)
+    if value.tzinfo is not None:
+        value = value.tz_convert('UTC').tz_localize(None)
+    return value.strftime('%Y-%m-%d %H:%M:%S.%f')[:23]
+
+
+def _sync(
+    conn: sqlite3.Connection,
+    table: str,
+    spec: tuple,
+    week: int,
+    rows: Iterable[Dict[str, Any]]
+) -> Dict[str, int]:
+    """Make a week of table equal rows, touching only what changed."""
+    _, key, columns, timestamp_column = spec
+    rows = list(rows)
+    row_columns = list(key) + list(columns) + [timestamp_column]
+    changed = ' OR '.join(f"{col} IS NOT excluded.{col}" for col in columns)
+    upsert = f"""
+        INSERT INTO {table} ({', '.join(row_columns)})
+        VALUES ({', '.join('?' for _ in row_columns)})
+        ON CONFLICT({', '.join(key)}) DO UPDATE SET
+        {', '.join(f"{col} = excluded.{col}" for col in list(columns) + [timestamp_column])}
+        WHERE {changed}
+    """
+
+    written = conn.executemany(upsert, [
+        tuple(week if col == 'week' else row.get(col) for col in row_columns[:-1])
+        + (row.get(timestamp_column) or datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S.%f'),)
+        for row in rows
+    ]).rowcount
+
+    # Rows no longer reported (e.g. a player removed from the injury report)
+    keys_table = f"temp.sync_{table}_keys"
+    conn.execute(f"CREATE TABLE IF NOT EXISTS {keys_table} ({', '.join(key[1:])})")
+    conn.execute(f"DELETE FROM {keys_table}")
+    conn.executemany(
+        f"INSERT INTO {keys_table} VALUES ({', '.join('?' for _ in key[1:])})",
+        [tuple(row.get(col) for col in key[1:]) for row in rows]
+    )
+    deleted = conn.execute(f"""
+        DELETE FROM {table}
+        WHERE week = ?
+          AND ({', '.join(key[1:])}) NOT IN (SELECT {', '.join(key[1:])} FROM {keys_table})
+    """, (week,)).rowcount
+    conn.execute(f"DELETE FROM {keys_table}")
+
+    return {'written': written, 'deleted': deleted}
+
+
+def sync_vegas_lines(conn: sqlite3.Connection, week: int, rows: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Replace a week's Vegas lines, writing only what changed.
+
+    Args:
+        conn: sqlite3 connection (caller commits)
+        week: NFL week number
+        rows: Dicts with game_id, home_team, away_team, home_spread,
+            away_spread, total, home_itt, away_itt and optional fetched_at
+
+    Returns:
+        Dict with rows written (inserted or changed) and deleted
+    """
+    return _sync(conn, 'vegas_lines', VEGAS_LINES, week, rows)
+
+
+def sync_injury_reports(conn: sqlite3.Connection, week: int, rows: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Replace a week's injury reports, writing only what changed.
+
+    Players missing from rows are deleted (recorded as removed from the
+    report as of now).
+
+    Args:
+        conn: sqlite3 connection (caller commits)
+        week: NFL week number
+        rows: Dicts with player_name, team, position, injury_status,
+            practice_status, body_part, description and optional updated_at
+
+    Returns:
+        Dict with rows written (inserted or changed) and deleted
+    """
+    return _sync(conn, 'injury_reports', INJURY_REPORTS, week, rows)
+
+
+def _versions(
+    conn: sqlite3.Connection,
+    spec: tuple,
+    weeks: Optional[List[int]],
+    as_of: str
+) -> pd.DataFrame:
+    table, key, columns, _ = spec
+    conditions, params = ["valid_from <= ?"], [as_of]
+    if weeks is not None:
+        conditions.append(f"week IN ({', '.join('?' * len(weeks)) or 'NULL'})")
+        params.extend(weeks)
+    return pd.read_sql(
+        f"SELECT {', '.join(key)}, valid_from, change_mask, "
+        f"COALESCE(observed_at, valid_from) AS observed_at, {', '.join(columns)} FROM {table} "
+        f"WHERE {' AND '.join(conditions)} ORDER BY valid_from, version_id",
+        conn,
+        params=params
+    )
+
+
+def rebuild_state(versions: pd.DataFrame, spec: tuple) -> pd.DataFrame:
+    """
+    Rows as of the last version in versions (ordered by valid_from).
+
+    Returns:
+        One row per live key with the key, tracked columns and the
+        timestamp column (observed_at of the row's latest version)
+    """
+    _, key, columns, timestamp_column = spec
+    key = list(key)
+    latest = versions.drop_duplicates(key, keep='last')
+    state = latest.loc[latest['change_mask'] != 0, key + ['observed_at']]
+
+    for bit, column in enumerate(columns):
+        # Each column comes from the latest version that changed it
+        changed = versions[(versions['change_mask'] & (1 << bit)) != 0]
+        values = changed.drop_duplicates(key, keep='last')[key + [column]]
+        state = state.merge(values, on=key, how='left')
+
+    state = state.rename(columns={'observed_at': timestamp_column})
+    state = state[key + list(columns) + [timestamp_column]]
+    state = state.astype(object).where(state.notna(), None)
+    return state.sort_values(key).reset_index(drop=True)
+
+
+def _weeks(week: Optional[Union[int, Iterable[int]]]) -> Optional[List[int]]:
+    if week is None:
+        return None
+    if isinstance(week, int):
+        return [week]
+    return [int(w) for w in week]
+
+
+def vegas_lines_as_of(
+    week: Optional[Union[int, Iterable[int]]],
+    as_of: Timestamp,
+    db_path: str = "dfs_optimizer.db"
+) -> pd.DataFrame:
+    """
+    Vegas lines as they stood at as_of.
+
+    Args:
+        week: Week, iterable of weeks, or None for all weeks
+        as_of: Point in time, UTC unless tz-aware (str, datetime or Timestamp)
+        db_path: Path to SQLite database
+
+    Returns:
+        DataFrame with the vegas_lines columns (fetched_at as written with
+        the row's latest change), ordered by week, game_id
+    """
+    with db_connection(db_path) as conn:
+        return rebuild_state(_versions(conn, VEGAS_LINES, _weeks(week), normalize_timestamp(as_of)), VEGAS_LINES)
+
+
+def injury_reports_as_of(
+    week: Optional[Union[int, Iterable[int]]],
+    as_of: Timestamp,
+    db_path: str = "dfs_optimizer.db"
+) -> pd.DataFrame:
+    """
+    Injury reports as they stood at as_of.
+
+    Args:
+        week: Week, iterable of weeks, or None for all weeks
+        as_of: Point in time, UTC unless tz-aware (str, datetime or Timestamp)
+        db_path: Path to SQLite database
+
+    Returns:
+        DataFrame with the injury_reports columns (updated_at as written
+        with the row's latest change), ordered by week, player, team
+    """
+    with db_connection(db_path) as conn:
+        return rebuild_state(
+            _versions(conn, INJURY_REPORTS, _weeks(week), normalize_timestamp(as_of)), INJURY_REPORTS
+        )
+
+
+def load_as_of(
+    week: Optional[Union[int, Iterable[int]]],
+    as_of: Timestamp,
+    db_path: str = "dfs_optimizer.db"
+) -> Dict[str, pd.DataFrame]:
+    """
+    Vegas lines and injury reports as of one timestamp, read in a single
+    transaction (a concurrent poll cannot land between the two reads).
+
+    Returns:
+        Dict with 'vegas_lines' and 'injury_reports' DataFrames
+    """
+    weeks, as_of = _weeks(week), normalize_timestamp(as_of)
+    with db_connection(db_path) as conn:
+        conn.execute("BEGIN")
+        return {
+            'vegas_lines': rebuild_state(_versions(conn, VEGAS_LINES, weeks, as_of), VEGAS_LINES),
+            'injury_reports': rebuild_state(_versions(conn, INJURY_REPORTS, weeks, as_of), INJURY_REPORTS),
+        }
@@ -0,0 +1,271 @@
+"""
+Portfolio Index Module
+
+This module provides a bitset-based index over a portfolio of lineups. Each
+lineup is stored as a single integer bitmask over player indices, so the
+overlap between any two lineups is one AND plus a popcount.
+
+The index is used in two places:
+- The optimizer, to prune uniqueness constraints that can no longer bind
+  (keeps the LP model size flat as portfolios grow to hundreds of lineups)
+- Post-generation dedup and diversity reporting
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    from .models import Lineup
+except ImportError:
+    from models import Lineup
+
+
+class PortfolioIndex:
+    """
+    Bitset index of lineups keyed by player name.
+
+    Player names are assigned bit positions on first sight, so the index can
+    grow incrementally as the optimizer produces lineups.
+
+    Example:
+        >>> index = PortfolioIndex()
+        >>> index.add_lineup(lineup1)
+        0
+        >>> index.lineups_sharing_at_least(lineup2, 5)
+        [0]
+    """
+
+    def __init__(self, player_names: Optional[Iterable[str]] = None):
+        """
+        Initialize an empty index.
+
+        Args:
+            player_names: Optional player universe to pre-assign bit positions
+                (e.g. the full player pool in DataFrame order)
+        """
+        self._bit_positions: Dict[str, int] = {}
+        self._player_names: List[str] = []
+        self._masks: List[int] = []
+        self._lineups: List[Lineup] = []
+
+        if player_names is not None:
+            for name in player_names:
+                self._bit_for(name)
+
+    def __len__(self) -> int:
+        return len(self._masks)
+
+    @property
+    def masks(self) -> List[int]:
+        """Bitmasks of all indexed lineups, in insertion order."""
+        return list(self._masks)
+
+    def _bit_for(self, name: str) -> int:
+        """Return the bit position for a player, assigning one if new."""
+        bit = self._bit_positions.get(name)
+        if bit is None:
+            bit = len(self._player_names)
+            self._bit_positions[name] = bit
+            self._player_names.append(name)
+        return bit
+
+    def mask_for_names(self, names: Iterable[str]) -> int:
+        """
+        Build a bitmask for a set of player names.
+
+        Args:
+            names: Player names
+
+        Returns:
+            int: Bitmask with one bit set per player
+        """
+        mask = 0
+        for name in names:
+            mask |= 1 << self._bit_for(name)
+        return mask
+
+    def mask_for_lineup(self, lineup: Lineup) -> int:
+        """Build the bitmask for a lineup's nine players."""
+        return self.mask_for_names(p.name for p in lineup.players)
+
+    def names_for_mask(self, mask: int) -> List[str]:
+        """
+        Decode a bitmask back into player names.
+
+        Args:
+            mask: Bitmask produced by this index
+
+        Returns:
+            List of player names in bit order
+        """
+        names = []
+        bit = 0
+        while mask:
+            if mask & 1:
+                names.append(self._player_names[bit])
+            mask >>= 1
+            bit += 1
+        return names
+
+    def add_lineup(self, lineup: Lineup) -> int:
+        """
+        Add a lineup to the index.
+
+        Args:
+            lineup: Lineup to index
+
+        Returns:
+            int: Position of the lineup within the index
+        """
+        self._masks.append(self.mask_for_lineup(lineup))
+        self._lineups.append(lineup)
+        return len(self._masks) - 1
+
+    def overlap(self, mask_a: int, mask_b: int) -> int:
+        """Number of players shared by two bitmasks."""
+        return (mask_a & mask_b).bit_count()
+
+    def overlaps_with(self, lineup: Lineup) -> List[int]:
+        """
+        Shared-player counts between a lineup and every indexed lineup.
+
+        Args:
+            lineup: Lineup to compare (does not need to be indexed)
+
+        Returns:
+            List of overlap counts, one per indexed lineup
+        """
+        mask = self.mask_for_lineup(lineup)
+        return [(mask & other).bit_count() for other in self._masks]
+
+    def lineups_sharing_at_least(self, lineup: Lineup, min_shared: int) -> List[int]:
+        """
+        Find indexed lineups that share at least `min_shared` players with a lineup.
+
+        Args:
+            lineup: Lineup to compare
+            min_shared: Minimum number of shared players
+
+        Returns:
+            List of indexed lineup positions
+        """
+        mask = self.mask_for_lineup(lineup)
+        return [
+            idx for idx, other in enumerate(self._masks)
+            if (mask & other).bit_count() >= min_shared
+        ]
+
+    def binding_uniqueness_masks(
+        self,
+        max_shared: int,
+        unavailable_names: Optional[Iterable[str]] = None
+    ) -> List[Tuple[int, int]]:
+        """
+        Return the uniqueness cuts that can still bind for the next lineup.
+
+        A cut "at most `max_shared` players from lineup L" is dropped when:
+        - Fewer than `max_shared + 1` of L's players are still selectable
+          (e.g. the rest have hit their max exposure), so it can never bind
+        - L's selectable players are identical to, or a subset of, another
+          kept cut's players, so the larger cut already implies it
+
+        Args:
+            max_shared: Maximum players the next lineup may share with any
+                previous lineup
+            unavailable_names: Players that cannot be selected in the next lineup
+
+        Returns:
+            List of (lineup position, effective mask) pairs to add as constraints
+        """
+        blocked = self.mask_for_names(unavailable_names or [])
+
+        candidates = []
+        for idx, mask in enumerate(self._masks):
+            effective = mask & ~blocked
+            if effective.bit_count() > max_shared:
+                candidates.append((idx, effective))
+
+        # Largest masks first so subsets are checked against their supersets
+        candidates.sort(key=lambda item: item[1].bit_count(), reverse=True)
+
+        kept: List[Tuple[int, int]] = []
+        for idx, effective in candidates:
+            if any(effective & other == effective for _, other in kept):
+                continue
+            kept.append((idx, effective))
+
+        kept.sort(key=lambda item: item[0])
+        return kept
+
+    def find_duplicates(self) -> List[Tuple[int, int]]:
+        """
+        Find pairs of indexed lineups with identical rosters.
+
+        Returns:
+            List of (first position, duplicate position) pairs
+        """
+        seen: Dict[int, int] = {}
+        duplicates = []
+        for idx, mask in enumerate(self._masks):
+            if mask in seen:
+                duplicates.append((seen[mask], idx))
+            else:
+                seen[mask] = idx
+        return duplicates
+
+    def diversity_report(self) -> Dict[str, object]:
+        """
+        Summarize pairwise overlap across the portfolio.
+
+        Returns:
+            Dict with:
+            - lineup_count: Number of indexed lineups
+            - unique_players: Number of distinct players used
+            - avg_overlap: Mean shared players across all lineup pairs
+            - max_overlap: Largest shared-player count across all pairs
+            - overlap_histogram: {shared players: pair count}
+            - duplicate_pairs: Pairs of identical lineups
+        """
+        masks = self._masks
+        histogram: Dict[int, int] = {}
+        total = 0
+        pairs = 0
+        max_overlap = 0
+
+        for i in range(len(masks)):
+            mask_i = masks[i]
+            for j in range(i + 1, len(masks)):
+                shared = (mask_i & masks[j]).bit_count()
+                histogram[shared] = histogram.get(shared, 0) + 1
+                total += shared
+                pairs += 1
+                if shared > max_overlap:
+                    max_overlap = shared
+
+        union = 0
+        for mask in masks:
+            union |= mask
+
+        return {
+            'lineup_count': len(masks),
+            'unique_players': union.bit_count(),
+            'avg_overlap': total / pairs if pairs else 0.0,
+            'max_overlap': max_overlap,
+            'overlap_histogram': dict(sorted(histogram.items())),
+            'duplicate_pairs': self.find_duplicates(),
+        }
+
+
+def build_portfolio_index(lineups: Iterable[Lineup]) -> PortfolioIndex:
+    """
+    Build a PortfolioIndex from a list of lineups.
+
+    Args:
+        lineups: Generated lineups
+
+    Returns:
+        PortfolioIndex containing every lineup in order
+    """
+    index = PortfolioIndex()
+    for lineup in lineups:
+        index.add_lineup(lineup)
+    return index
@@ -8,6 +8,11 @@ This module:
 1. Calculates DraftKings fantasy points from raw stats
 2. Queries prior week performance from database
 3. Flags players who scored 20+ points as regression candidates
+
+Weekly points come from the materialized player_week_points table
+(migration 011), which triggers keep in sync with player_game_stats and
+game_boxscores. Lookups by (week, normalized name) and (week, points) are
+index seeks.
 """
 
 from typing import Dict, List, Optional, Tuple
@@ -15,6 +20,67 @@ import sqlite3
 from pathlib import Path
 import pandas as pd
 
+try:
+    from .db_access import db_connection
+    from .schema_migrations import ensure_schema
+except ImportError:
+    from db_access import db_connection
+    from schema_migrations import ensure_schema
+
+
+# Raw stat columns returned alongside weekly points
+RAW_STAT_COLUMNS = (
+    'pass_yards', 'pass_touchdowns', 'pass_interceptions',
+    'rush_yards', 'rush_touchdowns',
+    'receptions', 'receiving_yards', 'receiving_touchdowns',
+    'fantasy_points_draftkings'
+)
+
+
+def normalize_player_name(name: str) -> str:
+    """Name as stored in player_week_points.normalized_name."""
+    return name.strip().lower()
+
+
+def _week_points_query(where: str) -> str:
+    """player_week_points rows (with raw stats) matching a WHERE clause on w."""
+    return f"""
+            SELECT 
+                w.player_name,
+                w.team,
+                w.position,
+                {', '.join(f'p.{col}' for col in RAW_STAT_COLUMNS)},
+                w.dk_points
+            FROM player_week_points w
+            JOIN player_game_stats p ON p.id = w.stat_id
+            WHERE {where}
+            """
+
+
+def get_week_points(week: int, db_path: str = "dfs_optimizer.db") -> Dict[str, float]:
+    """
+    DraftKings points of every player in a week.
+    
+    Args:
+        week: NFL week number
+        db_path: Path to SQLite database
+    
+    Returns:
+        Dict mapping normalized (lowercase) player name to dk_points
+    """
+    if not Path(db_path).exists():
+        return {}
+    
+    # Databases that predate migration 011 get player_week_points here
+    ensure_schema(db_path)
+    with db_connection(db_path) as conn:
+        rows = conn.execute(
+            "SELECT normalized_name, dk_points FROM player_week_points WHERE week = ?",
+            (week,)
+        ).fetchall()
+    
+    return dict(rows)
+
 
 def calculate_dk_fantasy_points(stats: Dict) -> float:
     """
@@ -77,45 +143,21 @@ def get_prior_week_performance(
         return None
     
     try:
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
-        # Use unified player_game_stats table for all weeks (including Week 6)
-        query = """
-        SELECT 
-            p.player_name,
-            p.team,
-            p.position,
-            p.pass_yards,
-            p.pass_touchdowns,
-            p.pass_interceptions,
-            p.rush_yards,
-            p.rush_touchdowns,
-            p.receptions,
-            p.receiving_yards,
-            p.receiving_touchdowns,
-            p.fantasy_points_draftkings
-        FROM player_game_stats p
-        JOIN game_boxscores g ON p.game_id = g.game_id
-        WHERE g.week = ?
-        AND LOWER(p.player_name) = LOWER(?)
-        """
-        
-        cursor.execute(query, (week, player_name))
-        row = cursor.fetchone()
-        conn.close()
+        ensure_schema(db_path)
+        with db_connection(db_path, row_factory=sqlite3.Row) as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(
+                _week_points_query("w.week = ? AND w.normalized_name = ?"),
+                (week, normalize_player_name(player_name))
+            )
+            row = cursor.fetchone()
         
         if not row:
             return None
         
         stats = dict(row)
-        
-        # Use fantasy_points_draftkings if available, otherwise calculate
-        if stats.get('fantasy_points_draftkings') is not None:
-            dk_points = stats['fantasy_points_draftkings']
-        else:
-            dk_points = calculate_dk_fantasy_points(stats)
+        dk_points = stats.pop('dk_points')
         
         return {
             'player_name': stats['player_name'],
@@ -153,55 +195,22 @@ def get_high_scorers_from_prior_week(
         return []
     
     try:
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
-        # Use unified player_game_stats table for all weeks
-        query = """
-        SELECT 
-            p.player_name,
-            p.team,
-            p.position,
-            p.pass_yards,
-            p.pass_touchdowns,
-            p.pass_interceptions,
-            p.rush_yards,
-            p.rush_touchdowns,
-            p.receptions,
-            p.receiving_yards,
-            p.receiving_touchdowns,
-            p.fantasy_points_draftkings
-        FROM player_game_stats p
-        JOIN game_boxscores g ON p.game_id = g.game_id
-        WHERE g.week = ?
-        AND p.fantasy_points_draftkings IS NOT NULL
-        AND p.fantasy_points_draftkings >= ?
-        ORDER BY p.fantasy_points_draftkings DESC
-        """
-        
-        cursor.execute(query, (week, threshold))
-        rows = cursor.fetchall()
-        conn.close()
-        
-        high_scorers = []
-        for row in rows:
-            stats = dict(row)
+        ensure_schema(db_path)
+        with db_connection(db_path, row_factory=sqlite3.Row) as conn:
+            cursor = conn.cursor()
             
-            # Use fantasy_points_draftkings if available, otherwise calculate
-            if stats.get('fantasy_points_draftkings') is not None:
-                dk_points = stats['fantasy_points_draftkings']
-            else:
-                dk_points = calculate_dk_fantasy_points(stats)
-            
-            high_scorers.append({
-                'player_name': stats['player_name'],
-                'team': stats['team'],
-                'position': stats['position'],
-                'dk_points': dk_points
-            })
+            cursor.execute(
+                """
+                SELECT player_name, team, position, dk_points
+                FROM player_week_points
+                WHERE week = ? AND dk_points >= ?
+                ORDER BY dk_points DESC
+                """,
+                (week, threshold)
+            )
+            rows = cursor.fetchall()
         
-        return high_scorers
+        return [dict(row) for row in rows]
     
     except Exception as e:
         print(f"Error querying high scorers: {e}")
@@ -286,40 +295,21 @@ def check_regression_risk_batch(
         return {}
     
     try:
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
-        # Create placeholders for IN clause (?, ?, ?, ...)
-        placeholders = ','.join('?' * len(player_names))
-        
-        # Use unified player_game_stats table for all weeks
-        query = f"""
-        SELECT 
-            p.player_name,
-            p.team,
-            p.position,
-            p.pass_yards,
-            p.pass_touchdowns,
-            p.pass_interceptions,
-            p.rush_yards,
-            p.rush_touchdowns,
-            p.receptions,
-            p.receiving_yards,
-            p.receiving_touchdowns,
-            p.fantasy_points_draftkings
-        FROM player_game_stats p
-        JOIN game_boxscores g ON p.game_id = g.game_id
-        WHERE g.week = ?
-        AND LOWER(p.player_name) IN ({placeholders})
-        """
-        
-        # Lowercase all player names for case-insensitive matching
-        lowercase_names = [name.lower() for name in player_names]
-        
-        cursor.execute(query, [week] + lowercase_names)
-        rows = cursor.fetchall()
-        conn.close()
+        ensure_schema(db_path)
+        with db_connection(db_path, row_factory=sqlite3.Row) as conn:
+            cursor = conn.cursor()
+            
+            # Requested names by normalized name (first spelling wins)
+            requested = {}
+            for name in player_names:
+                requested.setdefault(normalize_player_name(name), name)
+            
+            placeholders = ','.join('?' * len(requested))
+            cursor.execute(
+                _week_points_query(f"w.week = ? AND w.normalized_name IN ({placeholders})"),
+                [week] + list(requested)
+            )
+            rows = cursor.fetchall()
         
         # Build results dictionary
         results = {}
@@ -341,12 +331,7 @@ def check_regression_risk_batch(
                 'receiving_touchdowns': row['receiving_touchdowns'] or 0
             }
             
-            # Use fantasy_points_draftkings if available, otherwise calculate
-            if row['fantasy_points_draftkings'] is not None:
-                dk_points = row['fantasy_points_draftkings']
-            else:
-                dk_points = calculate_dk_fantasy_points(raw_stats)
-            
+            dk_points = row['dk_points']
             is_at_risk = dk_points >= threshold
             
             stats_summary = {
@@ -360,14 +345,7 @@ def check_regression_risk_batch(
                 'rec_td': raw_stats['receiving_touchdowns']
             }
             
-            # Find original name with matching case
-            player_name = row['player_name']
-            original_name = None
-            for name in player_names:
-                if name.lower() == player_name.lower():
-                    original_name = name
-                    break
-            
+            original_name = requested.get(normalize_player_name(row['player_name']))
             if original_name:
                 results[original_name] = (is_at_risk, dk_points, stats_summary)
         
@@ -14,13 +14,13 @@ Generates color-coded flags:
 - Red: Avoid/critical concern
 """
 
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import numpy as np
 import pandas as pd
 
-from .database_models import VegasLine, InjuryReport, NarrativeFlag
+from .database_models import VegasLine, InjuryReport, NarrativeFlag, create_session
+from .point_in_time import load_as_of
 
 
 class SmartRulesEngine:
@@ -71,21 +71,59 @@ class SmartRulesEngine:
         }
     }
     
-    def __init__(self, db_path: str = "dfs_optimizer.db", week: int = 1):
+    # Columns read by evaluate_players (same names as evaluate_player kwargs)
+    BATCH_COLUMNS = [
+        'player_name', 'team', 'position', 'salary', 'projected_points',
+        'projected_ceiling', 'last_week_points', 'attempts', 'snaps', 'routes',
+        'projected_ownership', 'opponent_oline_rank'
+    ]
+    
+    SEVERITIES = ['red', 'yellow', 'green']
+    
+    # narrative_flags.flag_type by severity
+    FLAG_TYPES = {
+        'green': 'optimal',
+        'yellow': 'caution',
+        'red': 'warning'
+    }
+    
+    # Rule flag_category → allowed narrative_flags.flag_category
+    FLAG_CATEGORIES = {
+        'low_itt': 'itt',
+        'moderate_itt': 'itt',
+        'high_itt': 'itt',
+        'low_volume': 'committee',
+        'salary_ceiling_mismatch': 'salary_ceiling',
+        'low_snaps': 'snap_count',
+        'low_routes': 'routes',
+        '80_20_regression': 'regression',
+        'value_play': 'price_floor',
+        'low_salary': 'price_floor',
+        'leverage_play': 'stacking',
+        'blocking_te': 'routes',
+        'weak_oline_matchup': 'matchup',
+        'strong_oline_matchup': 'matchup'
+    }
+    
+    def __init__(self, db_path: str = "dfs_optimizer.db", week: int = 1, as_of: Optional[datetime] = None):
         """
         Initialize Smart Rules Engine.
         
         Args:
             db_path: Path to SQLite database
             week: NFL week number for evaluation
+            as_of: Optional point in time; Vegas lines and injury reports are
+                read as they stood then (backtests, late swap)
         """
         self.db_path = db_path
         self.week = week
+        self.as_of = as_of
+        
+        # Setup database session (shared connection pool)
+        self.session = create_session(db_path)
         
-        # Setup database session
-        engine = create_engine(f'sqlite:///{db_path}')
-        Session = sessionmaker(bind=engine)
-        self.session = Session()
+        # Both tables from one point-in-time snapshot
+        self._as_of_view = load_as_of(week, as_of, db_path) if as_of is not None else None
         
         # Load Vegas lines for ITT lookups
         self.vegas_lines_cache = self._load_vegas_lines()
@@ -102,7 +140,10 @@ class SmartRulesEngine:
         """
         vegas_cache = {}
         try:
-            lines = self.session.query(VegasLine).filter_by(week=self.week).all()
+            if self._as_of_view is not None:
+                lines = [VegasLine(**row) for row in self._as_of_view['vegas_lines'].to_dict('records')]
+            else:
+                lines = self.session.query(VegasLine).filter_by(week=self.week).all()
             for line in lines:
                 # Map both home and away teams
                 vegas_cache[line.home_team] = line
@@ -121,7 +162,10 @@ class SmartRulesEngine:
         """
         injury_cache = {}
         try:
-            reports = self.session.query(InjuryReport).filter_by(week=self.week).all()
+            if self._as_of_view is not None:
+                reports = [InjuryReport(**row) for row in self._as_of_view['injury_reports'].to_dict('records')]
+            else:
+                reports = self.session.query(InjuryReport).filter_by(week=self.week).all()
             for report in reports:
                 key = (report.player_name, report.team)
                 injury_cache[key] = report
@@ -495,6 +539,183 @@ class SmartRulesEngine:
         
         return flags
     
+    def evaluate_players(self, players: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Evaluate a whole player pool at once.
+        
+        Each rule is a boolean mask over the pool's columns; messages are only
+        formatted for the players a rule flags. Produces the same flags, in the
+        same order, as calling evaluate_player once per player. Players missing
+        a name, team or position are skipped (as in evaluate_and_store).
+        
+        Args:
+            players: DataFrame with BATCH_COLUMNS (missing optional columns
+                are treated as unknown)
+            
+        Returns:
+            Tuple of (flags, counts):
+            - flags: long format, one row per flag with columns
+              row (positional row in players), player_name, team, position,
+              flag_category, message, severity
+            - counts: indexed like players with flag_count, red_flags,
+              yellow_flags, green_flags
+        """
+        frame = self._batch_frame(players)
+        rules = self._batch_rules(self._batch_values(frame))
+        
+        pieces = []
+        for order, (category, severity, mask, message) in enumerate(rules):
+            hits = frame[mask.to_numpy(dtype=bool)]
+            if hits.empty:
+                continue
+            pieces.append(pd.DataFrame({
+                'row': hits['row'].to_numpy(),
+                'rule_order': order,
+                'flag_category': category,
+                'message': [message(player) for player in hits.itertuples(index=False)],
+                'severity': severity
+            }))
+        
+        flag_columns = ['row', 'player_name', 'team', 'position', 'flag_category', 'message', 'severity']
+        if pieces:
+            flags = pd.concat(pieces, ignore_index=True).sort_values(['row', 'rule_order'], kind='stable')
+            for column in ['player_name', 'team', 'position']:
+                flags[column] = frame[column].to_numpy()[flags['row'].to_numpy()]
+            flags = flags[flag_columns].reset_index(drop=True)
+        else:
+            flags = pd.DataFrame({column: pd.Series(dtype=object) for column in flag_columns})
+            flags['row'] = flags['row'].astype('int64')
+        
+        severity_counts = (
+            pd.crosstab(flags['row'], flags['severity'])
+            .reindex(index=range(len(frame)), columns=self.SEVERITIES, fill_value=0)
+            .astype('int64')
+        )
+        counts = pd.DataFrame({
+            'flag_count': severity_counts.sum(axis=1).to_numpy(),
+            'red_flags': severity_counts['red'].to_numpy(),
+            'yellow_flags': severity_counts['yellow'].to_numpy(),
+            'green_flags': severity_counts['green'].to_numpy()
+        }, index=players.index)
+        
+        return flags, counts
+    
+    def _batch_frame(self, players: pd.DataFrame) -> pd.DataFrame:
+        """
+        Positional copy of the rule input columns with ITT attached.
+        
+        Values are kept as given so flag messages format exactly like
+        evaluate_player's.
+        """
+        frame = pd.DataFrame({'row': np.arange(len(players))})
+        for column in self.BATCH_COLUMNS:
+            if column in players.columns:
+                frame[column] = players[column].to_numpy()
+            else:
+                frame[column] = None
+        
+        itt_by_team = {team: self.get_team_itt(team) for team in self.vegas_lines_cache}
+        frame['itt'] = pd.to_numeric(frame['team'].map(itt_by_team), errors='coerce')
+        
+        # Players evaluate_and_store would skip
+        identified = pd.Series(True, index=frame.index)
+        for column in ['player_name', 'team', 'position']:
+            identified &= frame[column].notna() & frame[column].ne('')
+        frame['position'] = frame['position'].where(identified, None)
+        return frame
+    
+    def _batch_values(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """Numeric view of the batch frame for building rule masks."""
+        values = frame[['position', 'itt']].copy()
+        for column in self.BATCH_COLUMNS[3:]:
+            values[column] = pd.to_numeric(frame[column], errors='coerce')
+        return values
+    
+    def _batch_rules(self, frame: pd.DataFrame) -> List[Tuple[str, str, pd.Series, Any]]:
+        """
+        Position rules as (flag_category, severity, mask, message) in
+        evaluate_player order, with masks built from the numeric view.
+        Comparisons against NaN are False, so unknown values never trigger
+        a rule.
+        """
+        t = self.THRESHOLDS
+        position = frame['position']
+        itt = frame['itt']
+        salary = frame['salary']
+        ceiling = frame['projected_ceiling']
+        
+        is_qb = position.eq('QB')
+        is_rb = position.eq('RB')
+        is_wr = position.eq('WR')
+        is_te = position.eq('TE')
+        is_dst = position.isin(['DST', 'D'])
+        
+        def salary_ceiling_mismatch(pos: str) -> pd.Series:
+            return (salary >= t[pos]['high_salary']) & (ceiling < salary / 1000 * t[pos]['salary_ceiling_multiplier'])
+        
+        def salary_ceiling_message(pos: str):
+            def message(p) -> str:
+                threshold_ceiling = (p.salary / 1000) * t[pos]['salary_ceiling_multiplier']
+                return f"Salary ${int(p.salary)} needs {threshold_ceiling:.1f}+ ceiling (projected: {p.projected_ceiling:.1f}) - value concern"
+            return message
+        
+        def low_itt_message(pos: str, note: str):
+            return lambda p: f"Team ITT = {p.itt} (threshold: {t[pos]['min_itt']}+) - {note}"
+        
+        # WRs under the salary floor are fine if they return 3x+ per $1K
+        wr_floor = is_wr & (salary < t['wr']['floor_salary'])
+        wr_value = frame['projected_points'] / (salary.where(salary != 0) / 1000) >= 3.0
+        
+        return [
+            # QB
+            ('low_itt', 'red', is_qb & (itt < t['qb']['min_itt']),
+             low_itt_message('qb', 'low scoring environment')),
+            ('moderate_itt', 'yellow', is_qb & (itt >= t['qb']['min_itt']) & (itt < 24),
+             lambda p: f"Team ITT = {p.itt} (moderate scoring environment)"),
+            ('high_itt', 'green', is_qb & (itt >= 24),
+             lambda p: f"Team ITT = {p.itt} (high scoring environment - optimal)"),
+            # RB
+            ('low_itt', 'yellow', is_rb & (itt < t['rb']['min_itt']),
+             low_itt_message('rb', 'lower scoring potential')),
+            ('low_volume', 'red', is_rb & (frame['attempts'] < t['rb']['min_attempts']),
+             lambda p: f"Projected {p.attempts} attempts (threshold: {t['rb']['min_attempts']}+) - committee concern"),
+            ('salary_ceiling_mismatch', 'red', is_rb & salary_ceiling_mismatch('rb'),
+             salary_ceiling_message('rb')),
+            # WR
+            ('low_itt', 'yellow', is_wr & (itt < t['wr']['min_itt']),
+             low_itt_message('wr', 'lower scoring potential')),
+            ('low_snaps', 'red', is_wr & (frame['snaps'] < t['wr']['min_snaps']),
+             lambda p: f"Projected {p.snaps} snaps (threshold: {t['wr']['min_snaps']}+) - limited opportunity"),
+            ('low_routes', 'red', is_wr & (frame['routes'] < t['wr']['min_routes']),
+             lambda p: f"Projected {p.routes} routes (threshold: {t['wr']['min_routes']}+) - limited targets"),
+            ('80_20_regression', 'yellow', is_wr & (frame['last_week_points'] >= t['wr']['regression_threshold']),
+             lambda p: f"Scored {p.last_week_points:.1f} last week - 80% likely to score < {t['wr']['regression_threshold']} this week (regression risk)"),
+            ('salary_ceiling_mismatch', 'red', is_wr & salary_ceiling_mismatch('wr'),
+             salary_ceiling_message('wr')),
+            ('value_play', 'green', wr_floor & wr_value,
+             lambda p: f"Salary ${int(p.salary)} but strong value ({p.projected_points:.1f} pts / ${p.salary/1000:.1f}K = {(p.projected_points / (p.salary / 1000)):.1f}x)"),
+            ('low_salary', 'yellow', wr_floor & ~wr_value,
+             lambda p: f"Salary ${int(p.salary)} below threshold (${t['wr']['floor_salary']}) - limited upside unless extreme value"),
+            ('leverage_play', 'green',
+             is_wr & (frame['projected_ownership'] < t['wr']['leverage_ownership_threshold']) & (ceiling >= t['wr']['leverage_ceiling']),
+             lambda p: f"Low ownership ({p.projected_ownership:.1f}%) + high ceiling ({p.projected_ceiling:.1f}) = elite leverage opportunity"),
+            # TE
+            ('low_itt', 'yellow', is_te & (itt < t['te']['min_itt']),
+             low_itt_message('te', 'lower scoring potential')),
+            ('blocking_te', 'red', is_te & (frame['snaps'] < t['te']['min_snaps']),
+             lambda p: f"Projected {p.snaps} snaps (threshold: {t['te']['min_snaps']}+) - likely blocking TE"),
+            ('low_routes', 'red', is_te & (frame['routes'] < t['te']['min_routes']),
+             lambda p: f"Projected {p.routes} routes (threshold: {t['te']['min_routes']}+) - limited receiving role"),
+            ('low_salary', 'red', is_te & (salary < t['te']['floor_salary']),
+             lambda p: f"Salary ${int(p.salary)} below threshold (${t['te']['floor_salary']}) - avoid"),
+            # DST
+            ('weak_oline_matchup', 'green', is_dst & (frame['opponent_oline_rank'] >= t['dst']['oline_rank_threshold']),
+             lambda p: f"Facing bottom 5 O-line (rank {p.opponent_oline_rank}/32) - sack/pressure opportunity"),
+            ('strong_oline_matchup', 'yellow',
+             is_dst & (frame['opponent_oline_rank'] < t['dst']['oline_rank_threshold']) & (frame['opponent_oline_rank'] <= 10),
+             lambda p: f"Facing top 10 O-line (rank {p.opponent_oline_rank}/32) - difficult matchup"),
+        ]
+    
     def store_flags(self, player_name: str, team: str, position: str, flags: List[Dict[str, Any]]):
         """
         Store generated flags to narrative_flags table.
@@ -506,52 +727,71 @@ class SmartRulesEngine:
             flags: List of flag dictionaries
         """
         try:
-            for flag in flags:
-                # Determine flag_type from severity
-                flag_type_map = {
-                    'green': 'optimal',
-                    'yellow': 'caution',
-                    'red': 'warning'
-                }
-                flag_type = flag_type_map.get(flag['severity'], 'warning')
-                
-                # Map flag_category to allowed values
-                category_map = {
-                    'low_itt': 'itt',
-                    'moderate_itt': 'itt',
-                    'high_itt': 'itt',
-                    'low_volume': 'committee',
-                    'salary_ceiling_mismatch': 'salary_ceiling',
-                    'low_snaps': 'snap_count',
-                    'low_routes': 'routes',
-                    '80_20_regression': 'regression',
-                    'value_play': 'price_floor',
-                    'low_salary': 'price_floor',
-                    'leverage_play': 'stacking',
-                    'blocking_te': 'routes',
-                    'weak_oline_matchup': 'matchup',
-                    'strong_oline_matchup': 'matchup'
-                }
-                flag_category = category_map.get(flag['flag_category'], 'other')
-                
-                narrative_flag = NarrativeFlag(
-                    week=self.week,
-                    player_name=player_name,
-                    team=team,
-                    position=position,
-                    flag_type=flag_type,
-                    flag_category=flag_category,
-                    message=flag['message'],
-                    severity=flag['severity'],
-                    created_at=datetime.now()
-                )
-                self.session.add(narrative_flag)
-            
+            rows = self._flag_rows(pd.DataFrame({
+                'player_name': player_name,
+                'team': team,
+                'position': position,
+                'flag_category': [flag['flag_category'] for flag in flags],
+                'message': [flag['message'] for flag in flags],
+                'severity': [flag['severity'] for flag in flags]
+            }))
+            self._insert_flag_rows(rows)
             self.session.commit()
         except Exception as e:
             print(f"Error storing flags for {player_name}: {e}")
             self.session.rollback()
     
+    def store_week_flags(self, flags: pd.DataFrame) -> int:
+        """
+        Replace all stored flags for the current week in one transaction.
+        
+        Existing narrative_flags rows for the week are deleted and the new
+        flags are inserted with a single executemany, so re-running a week is
+        idempotent and costs one commit regardless of slate size.
+        
+        Args:
+            flags: Long-format flags table from evaluate_players
+            
+        Returns:
+            Number of flags stored (0 if the write failed)
+        """
+        rows = self._flag_rows(flags)
+        
+        try:
+            self.session.query(NarrativeFlag).filter(
+                NarrativeFlag.week == self.week
+            ).delete(synchronize_session=False)
+            self._insert_flag_rows(rows)
+            self.session.commit()
+            return len(rows)
+        except Exception as e:
+            print(f"Error storing flags for week {self.week}: {e}")
+            self.session.rollback()
+            return 0
+    
+    def _flag_rows(self, flags: pd.DataFrame) -> List[Dict[str, Any]]:
+        """Map evaluated flags to narrative_flags rows."""
+        if flags.empty:
+            return []
+        
+        rows = pd.DataFrame({
+            'week': self.week,
+            'player_name': flags['player_name'].to_numpy(),
+            'team': flags['team'].to_numpy(),
+            'position': flags['position'].to_numpy(),
+            'flag_type': flags['severity'].map(self.FLAG_TYPES).fillna('warning').to_numpy(),
+            'flag_category': flags['flag_category'].map(self.FLAG_CATEGORIES).fillna('other').to_numpy(),
+            'message': flags['message'].to_numpy(),
+            'severity': flags['severity'].to_numpy(),
+            'created_at': datetime.now()
+        })
+        return rows.to_dict('records')
+    
+    def _insert_flag_rows(self, rows: List[Dict[str, Any]]):
+        """Insert narrative_flags rows with one executemany (caller commits)."""
+        if rows:
+            self.session.execute(NarrativeFlag.__table__.insert(), rows)
+    
     def evaluate_and_store(
         self,
         players: List[Dict[str, Any]]
@@ -559,28 +799,43 @@ class SmartRulesEngine:
         """
         Evaluate multiple players and store flags.
         
+        All players are evaluated in one batch and the week's flags are
+        replaced in a single transaction (see store_week_flags).
+        
         Args:
             players: List of player dictionaries with required fields
             
         Returns:
             Dictionary mapping player names to their flags
         """
-        results = {}
+        if not players:
+            return {}
         
-        for player in players:
-            player_name = player.get('player_name') or player.get('name')
-            team = player.get('team')
-            position = player.get('position')
-            
+        pool = pd.DataFrame(players)
+        for column in ['player_name', 'team', 'position']:
+            if column not in pool.columns:
+                pool[column] = None
+        if 'name' in pool.columns:
+            pool['player_name'] = pool['player_name'].where(pool['player_name'].notna(), pool['name'])
+        
+        flags, counts = self.evaluate_players(pool)
+        
+        player_flags = {row: [] for row in range(len(pool))}
+        for row, flag in zip(
+            flags['row'].tolist(),
+            flags[['flag_category', 'message', 'severity']].to_dict('records')
+        ):
+            player_flags[row].append(flag)
+        
+        results = {}
+        for row, (player_name, team, position) in enumerate(
+            zip(pool['player_name'], pool['team'], pool['position'])
+        ):
             if not player_name or not team or not position:
                 continue
-            
-            flags = self.evaluate_player(**player)
-            results[player_name] = flags
-            
-            if flags:
-                self.store_flags(player_name, team, position, flags)
+            results[player_name] = player_flags[row]
         
+        self.store_week_flags(flags)
         return results
     
     def close(self):
@@ -0,0 +1,319 @@
+"""
+Schema Migrations Module
+
+Versioned migration engine for the SQLite database.
+
+Migration files live in migrations/ and are named NNN_description.sql; NNN
+is the schema version. Every applied migration is recorded in the
+schema_version table with the SHA-256 checksum of the file that was run, so
+each migration runs exactly once per database. The previous runners
+re-executed every file (table rebuilds included) on each app start.
+
+Each pending migration runs in its own IMMEDIATE transaction together with
+its schema_version row: it is applied completely or not at all, and two
+processes starting at once cannot apply the same migration twice.
+
+ensure_schema() is the startup entry point. After the first call for a
+database file it is a dictionary lookup; the first call costs one read of
+schema_version plus a directory listing. Code that used to issue DDL on hot
+paths can use schema_task_done()/mark_schema_task_done() to do that work
+once per database file per process instead.
+
+Usage:
+    ensure_schema("dfs_optimizer.db")             # app start
+    pending_migrations("dfs_optimizer.db")         # what would run
+    verify_checksums("dfs_optimizer.db")           # edited after being applied?
+
+    python -m src.schema_migrations --db dfs_optimizer.db --status
+"""
+
+import os
+import re
+import time
+import hashlib
+import logging
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from .db_access import file_identity
+except ImportError:
+    from db_access import file_identity
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = Path(__file__).parent.parent / "migrations"
+
+# NNN_description.sql → version NNN
+MIGRATION_FILE_PATTERN = re.compile(r"^(\d{3})_.*\.sql$")
+
+SCHEMA_VERSION_SQL = """
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        checksum TEXT NOT NULL,
+        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        execution_ms INTEGER
+    )
+"""
+
+_lock = threading.Lock()
+# (db key, task) → file identity when the task was done
+_done_tasks: Dict[Tuple[str, str], Tuple[int, int]] = {}
+
+
+class MigrationError(Exception):
+    """A migration failed; its changes were rolled back."""
+    pass
+
+
+@dataclass(frozen=True)
+class Migration:
+    """One migration file."""
+    version: int
+    name: str
+    path: Path
+
+    @property
+    def sql(self) -> str:
+        return self.path.read_text()
+
+    @property
+    def checksum(self) -> str:
+        """SHA-256 of the file with normalized line endings."""
+        return hashlib.sha256(self.sql.replace('\r\n', '\n').encode()).hexdigest()
+
+
+def discover_migrations(migrations_dir: Optional[Path] = None) -> List[Migration]:
+    """
+    Migration files in version order.
+
+    Raises:
+        MigrationError: If two files share a version number
+    """
+    migrations_dir = Path(migrations_dir or MIGRATIONS_DIR)
+    migrations: Dict[int, Migration] = {}
+    for path in sorted(migrations_dir.glob("*.sql")):
+        match = MIGRATION_FILE_PATTERN.match(path.name)
+        if not match:
+            continue
+        version = int(match.group(1))
+        if version in migrations:
+            raise MigrationError(
+                f"Duplicate migration version {version}: {migrations[version].name}, {path.name}"
+            )
+        migrations[version] = Migration(version, path.name, path)
+    return [migrations[version] for version in sorted(migrations)]
+
+
+def split_statements(sql: str) -> List[str]:
+    """
+    Split a script into complete statements (trigger bodies stay whole).
+
+    Lets a migration run statement by statement inside one transaction;
+    executescript() would commit before running.
+    """
+    statements = []
+    buffer = ''
+    for line in sql.splitlines(keepends=True):
+        buffer += line
+        if sqlite3.complete_statement(buffer):
+            statements.append(buffer.strip())
+            buffer = ''
+    if buffer.strip() and sqlite3.complete_statement(buffer + ';'):
+        statements.append(buffer.strip())
+    return statements
+
+
+def _applied(conn: sqlite3.Connection) -> Dict[int, Tuple[str, str]]:
+    """version → (name, checksum) of applied migrations."""
+    return {
+        version: (name, checksum)
+        for version, name, checksum in conn.execute("SELECT version, name, checksum FROM schema_version")
+    }
+
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    # Autocommit mode: transactions are opened explicitly
+    conn = sqlite3.connect(db_path, isolation_level=None, timeout=30)
+    conn.execute(SCHEMA_VERSION_SQL)
+    return conn
+
+
+def get_schema_version(db_path: str = "dfs_optimizer.db") -> Optional[int]:
+    """Highest applied migration version (None if nothing is recorded)."""
+    conn = _connect(db_path)
+    try:
+        return conn.execute("SELECT MAX(version) FROM schema_version").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def pending_migrations(
+    db_path: str = "dfs_optimizer.db",
+    migrations_dir: Optional[Path] = None
+) -> List[Migration]:
+    """Migrations not yet applied to db_path, in version order."""
+    conn = _connect(db_path)
+    try:
+        applied = _applied(conn)
+    finally:
+        conn.close()
+    return [m for m in discover_migrations(migrations_dir) if m.version not in applied]
+
+
+def verify_checksums(
+    db_path: str = "dfs_optimizer.db",
+    migrations_dir: Optional[Path] = None
+) -> List[str]:
+    """
+    Names of applied migrations whose file changed after being applied.
+
+    Changed files are not re-run; schema changes belong in a new migration.
+    """
+    conn = _connect(db_path)
+    try:
+        applied = _applied(conn)
+    finally:
+        conn.close()
+    return [
+        m.name for m in discover_migrations(migrations_dir)
+        if m.version in applied and applied[m.version][1] != m.checksum
+    ]
+
+
+def apply_migration(conn: sqlite3.Connection, migration: Migration) -> bool:
+    """
+    Apply one migration and record it, in a single transaction.
+
+    Args:
+        conn: Connection in autocommit mode (see _connect)
+        migration: Migration to apply
+
+    Returns:
+        True if applied, False if another process applied it first
+
+    Raises:
+        MigrationError: If a statement fails (nothing is kept)
+    """
+    start = time.time()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        if conn.execute("SELECT 1 FROM schema_version WHERE version = ?", (migration.version,)).fetchone():
+            conn.execute("ROLLBACK")
+            return False
+        for statement in split_statements(migration.sql):
+            conn.execute(statement)
+        conn.execute(
+            "INSERT INTO schema_version (version, name, checksum, execution_ms) VALUES (?, ?, ?, ?)",
+            (migration.version, migration.name, migration.checksum, int((time.time() - start) * 1000))
+        )
+        conn.execute("COMMIT")
+        return True
+    except Exception as e:
+        conn.execute("ROLLBACK")
+        raise MigrationError(f"Migration {migration.name} failed: {e}") from e
+
+
+def migrate(
+    db_path: str = "dfs_optimizer.db",
+    migrations_dir: Optional[Path] = None
+) -> List[int]:
+    """
+    Apply every pending migration in version order.
+
+    Stops at the first failure (earlier migrations stay applied).
+
+    Args:
+        db_path: Path to SQLite database
+        migrations_dir: Migration directory (default: migrations/)
+
+    Returns:
+        Versions applied by this call
+
+    Raises:
+        MigrationError: If a migration fails
+    """
+    migrations = discover_migrations(migrations_dir)
+    conn = _connect(db_path)
+    try:
+        applied = _applied(conn)
+        for name in [m.name for m in migrations if m.version in applied and applied[m.version][1] != m.checksum]:
+            logger.warning(f"Migration {name} changed after it was applied to {db_path}")
+
+        newly_applied = []
+        for migration in migrations:
+            if migration.version in applied:
+                continue
+            if apply_migration(conn, migration):
+                logger.info(f"Applied migration {migration.name} to {db_path}")
+                newly_applied.append(migration.version)
+        return newly_applied
+    finally:
+        conn.close()
+
+
+def schema_task_done(db_path: str, task: str) -> bool:
+    """True if task was marked done for this database file in this process."""
+    key = (os.path.abspath(db_path), task)
+    identity = file_identity(key[0])
+    with _lock:
+        return identity is not None and _done_tasks.get(key) == identity
+
+
+def mark_schema_task_done(db_path: str, task: str):
+    """Remember that task was done for this database file (until it is replaced)."""
+    key = (os.path.abspath(db_path), task)
+    identity = file_identity(key[0])
+    if identity is not None:
+        with _lock:
+            _done_tasks[key] = identity
+
+
+def ensure_schema(
+    db_path: str = "dfs_optimizer.db",
+    migrations_dir: Optional[Path] = None
+) -> List[int]:
+    """
+    Bring db_path up to date (cheap once done for this file in this process).
+
+    Returns:
+        Versions applied by this call
+
+    Raises:
+        MigrationError: If a migration fails
+    """
+    task = f"migrations:{Path(migrations_dir or MIGRATIONS_DIR).resolve()}"
+    if schema_task_done(db_path, task):
+        return []
+    applied = migrate(db_path, migrations_dir)
+    mark_schema_task_done(db_path, task)
+    return applied
+
+
+def main():
+    """Show migration status or apply pending migrations."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='DFS Optimizer schema migrations')
+    parser.add_argument('--db', default='dfs_optimizer.db', help='Database file path')
+    parser.add_argument('--status', action='store_true', help='Show version and pending migrations only')
+    args = parser.parse_args()
+
+    if args.status:
+        print(f"Schema version: {get_schema_version(args.db)}")
+        for migration in pending_migrations(args.db):
+            print(f"   pending: {migration.name}")
+        for name in verify_checksums(args.db):
+            print(f"   changed since applied: {name}")
+        return
+
+    applied = migrate(args.db)
+    print(f"Applied {len(applied)} migration(s); schema version {get_schema_version(args.db)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,9 +14,17 @@ import os
 import time
 import logging
 
+try:
+    from .excel_cache import read_excel_cached
+except ImportError:
+    from excel_cache import read_excel_cached
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Weeks used for weekly Snaps base metrics (trend, consistency, momentum, ceiling)
+BASE_METRIC_WEEK_WINDOW = range(1, 6)
+
 # Import Phase 1 infrastructure components
 try:
     # Use advanced_stats_db for database operations (supports separate tables from migration 008)
@@ -53,7 +61,13 @@ def normalize_name_legacy(name: str) -> str:
     return name
 
 
-def fuzzy_match_player(player_name: str, stats_df: pd.DataFrame, threshold: int = 85) -> Optional[pd.Series]:
+def fuzzy_match_player(
+    player_name: str,
+    stats_df: pd.DataFrame,
+    threshold: int = 85,
+    identity_index=None,
+    team: Optional[str] = None
+) -> Optional[pd.Series]:
     """
     Fuzzy match player name against stats DataFrame.
     For datasets with multiple rows per player (one per week), returns the row with the highest W value.
@@ -62,10 +76,20 @@ def fuzzy_match_player(player_name: str, stats_df: pd.DataFrame, threshold: int
         player_name: Player name to match
         stats_df: DataFrame with 'Name' column
         threshold: Minimum fuzzy match score (0-100)
+        identity_index: Optional PlayerIdentityIndex. A persisted season-file
+            name is looked up exactly; new fuzzy matches are persisted.
+        team: Player team (used to disambiguate identities)
 
     Returns:
         Matched row with highest W value (most complete data), or None if no match found
     """
+    identity = None
+    if identity_index is not None:
+        identity = identity_index.get_or_create(player_name, team)
+        if identity.season_file_name:
+            known_rows = [row for _, row in stats_df[stats_df['Name'] == identity.season_file_name].iterrows()]
+            return _select_latest_week_row(known_rows, stats_df) if known_rows else None
+
     # Use new normalize_name if available, otherwise legacy
     if ADVANCED_STATS_AVAILABLE:
         norm_search = normalize_name(player_name)
@@ -93,17 +117,26 @@ def fuzzy_match_player(player_name: str, stats_df: pd.DataFrame, threshold: int
 
     # Filter to only rows with the best score
     best_matches = [match[1] for match in matches if match[0] == best_score]
+    best_match = _select_latest_week_row(best_matches, stats_df)
+
+    if identity is not None:
+        identity_index.link(identity, 'season', best_match['Name'], team=team, match_score=best_score)
+
+    return best_match
 
-    if len(best_matches) == 1:
-        return best_matches[0]
+
+def _select_latest_week_row(rows: List[pd.Series], stats_df: pd.DataFrame) -> pd.Series:
+    """Pick the row with the highest W value (most recent/complete data)."""
+    if len(rows) == 1:
+        return rows[0]
 
     # Multiple rows with same name - select the one with highest W value (most recent/complete data)
     if 'W' in stats_df.columns:
-        max_week_row = max(best_matches, key=lambda x: x.get('W', 0) if pd.notna(x.get('W', 0)) else 0)
+        max_week_row = max(rows, key=lambda x: x.get('W', 0) if pd.notna(x.get('W', 0)) else 0)
         return max_week_row
 
     # If no W column, just return the first match
-    return best_matches[0]
+    return rows[0]
 
 
 # ========================================
@@ -388,10 +421,137 @@ def enrich_with_advanced_stats(
     return enriched_df
 
 
+def _weekly_matrix(file_df: pd.DataFrame, column: str, week_window: range) -> pd.DataFrame:
+    """
+    Pivot one column of a weekly stats file into a (player × week) matrix.
+
+    Uses the first row per (Name, W); weeks a player has no row for (and
+    missing values) are 0.
+
+    Args:
+        file_df: Weekly stats DataFrame with Name and W columns
+        column: Column to pivot (0 everywhere if absent)
+        week_window: Weeks to include, in order
+
+    Returns:
+        DataFrame indexed by Name with one column per week in week_window
+    """
+    names = pd.Index(file_df['Name'].dropna().unique(), name='Name')
+    if column not in file_df.columns:
+        return pd.DataFrame(0.0, index=names, columns=list(week_window))
+
+    weekly = file_df[['Name', 'W', column]].dropna(subset=['Name', 'W'])
+    weekly = weekly.drop_duplicates(subset=['Name', 'W'], keep='first')
+    matrix = weekly.pivot(index='Name', columns='W', values=column)
+    matrix = matrix.reindex(index=names, columns=list(week_window))
+    return matrix.apply(pd.to_numeric, errors='coerce').fillna(0.0)
+
+
+def _snap_base_metrics(snaps_df: pd.DataFrame, week_window: range) -> pd.DataFrame:
+    """
+    Snap-based base metrics for every player in the Snaps file.
+
+    - season_trend: snap % change from first to last week of the window
+    - season_cons: STD of weekly snap % (role stability)
+    - season_mom: recent 3 weeks FP minus early 2 weeks FP (NaN when the
+      window is shorter than 5 weeks)
+    - season_snap: average snap %
+    - season_ceiling: best FP game in the window
+    - season_fpg: mean FP/G across all of the player's rows
+
+    Returns:
+        DataFrame indexed by Name
+    """
+    snaps = _weekly_matrix(snaps_df, 'Snap %', week_window).to_numpy()
+    fp = _weekly_matrix(snaps_df, 'FP', week_window)
+    names = fp.index
+    fp = fp.to_numpy()
+    n_weeks = len(week_window)
+
+    metrics = pd.DataFrame(index=names)
+    if n_weeks == 0:
+        return metrics
+
+    metrics['season_trend'] = snaps[:, -1] - snaps[:, 0]
+    metrics['season_cons'] = np.std(snaps, axis=1) if n_weeks > 1 else 0.0
+    if n_weeks >= 5:
+        metrics['season_mom'] = np.mean(fp[:, -3:], axis=1) - np.mean(fp[:, :2], axis=1)
+    metrics['season_snap'] = np.mean(snaps, axis=1)
+    metrics['season_ceiling'] = np.max(fp, axis=1)
+
+    if 'FP/G' in snaps_df.columns:
+        fpg = pd.to_numeric(snaps_df['FP/G'], errors='coerce').groupby(snaps_df['Name']).mean()
+        metrics['season_fpg'] = fpg.reindex(names).fillna(0.0).to_numpy()
+    else:
+        metrics['season_fpg'] = 0.0
+
+    return metrics
+
+
+def _receiving_base_metrics(receiving_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Receiving-based base metrics for every player in the Receiving file.
+
+    - season_tgt: mean TGT %
+    - season_eztgt: total end-zone targets
+    - season_var: mean FP minus mean RecXFP (NaN when either is missing)
+
+    Returns:
+        DataFrame indexed by Name (only the metrics whose source columns exist)
+    """
+    grouped = receiving_df.groupby('Name')
+    metrics = pd.DataFrame(index=pd.Index(list(grouped.groups), name='Name'))
+
+    def column_stat(column: str, stat: str) -> pd.Series:
+        values = pd.to_numeric(receiving_df[column], errors='coerce')
+        return values.groupby(receiving_df['Name']).agg(stat).reindex(metrics.index)
+
+    if 'TGT %' in receiving_df.columns:
+        metrics['season_tgt'] = column_stat('TGT %', 'mean').fillna(0.0)
+    if 'EZTGT' in receiving_df.columns:
+        metrics['season_eztgt'] = column_stat('EZTGT', 'sum').fillna(0).astype(int)
+    if 'FP' in receiving_df.columns and 'RecXFP' in receiving_df.columns:
+        metrics['season_var'] = column_stat('FP', 'mean') - column_stat('RecXFP', 'mean')
+
+    return metrics
+
+
+def _apply_base_metrics(
+    player_df: pd.DataFrame,
+    mapping_df: pd.DataFrame,
+    metrics: pd.DataFrame,
+    eligible: Optional[pd.Series] = None
+):
+    """
+    Write per-file metrics onto matched players in place.
+
+    Players are joined to metrics through the name-mapping DataFrame
+    (original_name → matched_name). Unmatched players, and metrics that are
+    NaN for a player, keep their current values.
+    """
+    if mapping_df.empty or metrics.empty or 'name' not in player_df.columns:
+        return
+
+    matched_names = player_df['name'].map(
+        mapping_df.drop_duplicates('original_name').set_index('original_name')['matched_name']
+    )
+    player_metrics = metrics.reindex(matched_names.to_numpy())
+    has_metrics = matched_names.isin(metrics.index).to_numpy()
+    if eligible is not None:
+        has_metrics &= eligible.to_numpy()
+
+    for column in metrics.columns:
+        values = player_metrics[column].to_numpy()
+        mask = has_metrics & pd.notna(values)
+        if mask.any():
+            player_df.loc[mask, column] = values[mask]
+
+
 def _enrich_with_base_metrics(
     player_df: pd.DataFrame,
     season_files: Dict[str, Optional[pd.DataFrame]],
-    player_mapper: PlayerNameMapper
+    player_mapper: PlayerNameMapper,
+    week_window: range = BASE_METRIC_WEEK_WINDOW
 ) -> pd.DataFrame:
     """
     Extract original 9 base metrics from the new 4-file system.
@@ -401,10 +561,14 @@ def _enrich_with_base_metrics(
     - season_fpg, season_ceiling: from Snaps file
     - season_var, season_tgt, season_eztgt: from Receiving file (WR/TE only)
 
+    Each file is reduced to one row of metrics per player (the Snaps file via
+    a player × week pivot) and joined onto players through the name mappings.
+
     Args:
         player_df: Player DataFrame to enrich
         season_files: Loaded 4-file system
         player_mapper: Pre-computed name mappings
+        week_window: Weeks used for the weekly Snaps metrics (default W1-W5)
 
     Returns:
         Player DataFrame with original 9 metrics
@@ -430,102 +594,22 @@ def _enrich_with_base_metrics(
 
     # Extract from Snaps file
     snaps_df = season_files.get('snaps')
-    if snaps_df is not None and not snaps_df.empty:
-        # Get mapping for snaps file
-        mapping_df = player_mapper.create_mapping_dataframe('snaps')
-
-        if not mapping_df.empty:
-            # Aggregate snaps data by player (mean across weeks)
-            if 'W' in snaps_df.columns:
-                # Calculate weekly metrics
-                for idx, player_row in player_df.iterrows():
-                    player_name = player_row.get('name', '')
-                    if not player_name:
-                        continue
-
-                    # Find mapped name
-                    mapping = player_mapper.mappings.get(player_name)
-                    if mapping and mapping.matched_name_snaps:
-                        # Get all weeks for this player
-                        player_weeks = snaps_df[snaps_df['Name'] == mapping.matched_name_snaps]
-
-                        if not player_weeks.empty:
-                            # Calculate trend, consistency, momentum from weekly data
-                            weekly_snaps = []
-                            weekly_fp = []
-
-                            for week in range(1, 6):
-                                week_data = player_weeks[player_weeks['W'] == week]
-                                if not week_data.empty:
-                                    snap_pct = week_data.iloc[0].get('Snap %', 0)
-                                    fp = week_data.iloc[0].get('FP', 0)
-                                    weekly_snaps.append(float(snap_pct) if pd.notna(snap_pct) else 0)
-                                    weekly_fp.append(float(fp) if pd.notna(fp) else 0)
-                                else:
-                                    weekly_snaps.append(0)
-                                    weekly_fp.append(0)
-
-                            # Calculate metrics
-                            if weekly_snaps:
-                                # Trend: W1 → W5 change
-                                player_df.at[idx, 'season_trend'] = weekly_snaps[4] - weekly_snaps[0] if len(weekly_snaps) >= 5 else 0
-
-                                # Consistency: STD of snap %
-                                player_df.at[idx, 'season_cons'] = np.std(weekly_snaps) if len(weekly_snaps) > 1 else 0
-
-                                # Momentum: Recent vs Early FP
-                                if weekly_fp and len(weekly_fp) >= 5:
-                                    early_avg = np.mean(weekly_fp[:2])
-                                    recent_avg = np.mean(weekly_fp[2:5])
-                                    player_df.at[idx, 'season_mom'] = recent_avg - early_avg
-
-                                # Average snap %
-                                player_df.at[idx, 'season_snap'] = np.mean(weekly_snaps)
-
-                                # Ceiling (best game)
-                                player_df.at[idx, 'season_ceiling'] = max(weekly_fp) if weekly_fp else 0
-
-                            # FP/G (from aggregated data)
-                            fpg = player_weeks['FP/G'].mean() if 'FP/G' in player_weeks.columns else 0
-                            player_df.at[idx, 'season_fpg'] = float(fpg) if pd.notna(fpg) else 0
+    if snaps_df is not None and not snaps_df.empty and 'W' in snaps_df.columns:
+        _apply_base_metrics(
+            player_df,
+            player_mapper.create_mapping_dataframe('snaps'),
+            _snap_base_metrics(snaps_df, week_window)
+        )
 
     # Extract from Receiving file (WR/TE only)
     receiving_df = season_files.get('receiving')
     if receiving_df is not None and not receiving_df.empty:
-        # Get mapping for receiving file
-        mapping_df = player_mapper.create_mapping_dataframe('receiving')
-
-        if not mapping_df.empty:
-            # Process WR/TE players
-            wr_te_mask = player_df['position'].isin(['WR', 'TE'])
-
-            for idx, player_row in player_df[wr_te_mask].iterrows():
-                player_name = player_row.get('name', '')
-                if not player_name:
-                    continue
-
-                # Find mapped name
-                mapping = player_mapper.mappings.get(player_name)
-                if mapping and mapping.matched_name_receiving:
-                    # Get player data (aggregate if multiple weeks)
-                    player_data = receiving_df[receiving_df['Name'] == mapping.matched_name_receiving]
-
-                    if not player_data.empty:
-                        # Use mean if multiple weeks
-                        if 'TGT %' in player_data.columns:
-                            tgt_pct = player_data['TGT %'].mean()
-                            player_df.at[idx, 'season_tgt'] = float(tgt_pct) if pd.notna(tgt_pct) else 0
-
-                        if 'EZTGT' in player_data.columns:
-                            ez_tgt = player_data['EZTGT'].sum()  # Sum across weeks
-                            player_df.at[idx, 'season_eztgt'] = int(ez_tgt) if pd.notna(ez_tgt) else 0
-
-                        # Calculate XFP variance if available
-                        if 'FP' in player_data.columns and 'RecXFP' in player_data.columns:
-                            actual_fp = player_data['FP'].mean()
-                            expected_fp = player_data['RecXFP'].mean()
-                            if pd.notna(actual_fp) and pd.notna(expected_fp):
-                                player_df.at[idx, 'season_var'] = float(actual_fp) - float(expected_fp)
+        _apply_base_metrics(
+            player_df,
+            player_mapper.create_mapping_dataframe('receiving'),
+            _receiving_base_metrics(receiving_df),
+            eligible=player_df['position'].isin(['WR', 'TE'])
+        )
 
     logger.info(f"Base metrics extracted for {len(player_df)} players")
     return player_df
@@ -533,12 +617,14 @@ def _enrich_with_base_metrics(
 
 def analyze_season_stats_legacy(
     player_df: pd.DataFrame,
-    excel_path: str = "2025 Stats thru week 5.xlsx"
+    excel_path: str = "2025 Stats thru week 5.xlsx",
+    identity_index=None
 ) -> pd.DataFrame:
     """
     Legacy function for analyzing season stats from single file.
 
     Preserved for backward compatibility when new 4-file system is not available.
+    Pass a PlayerIdentityIndex to reuse name matches from earlier weeks.
     """
     # [Original function body preserved exactly as before]
     # Check if file exists
@@ -566,10 +652,9 @@ def analyze_season_stats_legacy(
     print(f"📊 Loading season stats from: {excel_path}")
 
     try:
-        # Load all sheets
-        xls = pd.ExcelFile(excel_path)
-        snaps_df = pd.read_excel(xls, 'Snaps')
-        rec_df = pd.read_excel(xls, 'Rec')
+        # Load all sheets (served from the Arrow cache when unchanged)
+        snaps_df = read_excel_cached(excel_path, 'Snaps')
+        rec_df = read_excel_cached(excel_path, 'Rec')
 
         print(f"   Loaded {len(snaps_df)} snap records, {len(rec_df)} receiving records")
 
@@ -597,7 +682,10 @@ def analyze_season_stats_legacy(
                 continue
 
             # Match to Snaps data
-            snap_match = fuzzy_match_player(player_name, snaps_df, threshold=85)
+            player_team = player_row.get('team')
+            snap_match = fuzzy_match_player(
+                player_name, snaps_df, threshold=85, identity_index=identity_index, team=player_team
+            )
             if snap_match is not None:
                 # Get weekly FP data for production-based momentum
                 weekly_fp = get_weekly_fp_data(player_name, snaps_df)
@@ -659,7 +747,9 @@ def analyze_season_stats_legacy(
             # Match to Receiving data (for WR/TE only)
             player_pos = player_row.get('position', '').upper()
             if player_pos in ['WR', 'TE']:
-                rec_match = fuzzy_match_player(player_name, rec_df, threshold=85)
+                rec_match = fuzzy_match_player(
+                    player_name, rec_df, threshold=85, identity_index=identity_index, team=player_team
+                )
                 if rec_match is not None:
                     # Target share %
                     tgt_pct = rec_match.get('TGT %', 0.0)
@@ -676,6 +766,9 @@ def analyze_season_stats_legacy(
                         variance = float(actual_fp) - float(expected_fp)
                         player_df.at[idx, 'season_var'] = round(variance, 1)
 
+        if identity_index is not None:
+            identity_index.commit()
+
         print(f"✅ Enriched {matched_count}/{len(player_df)} players with season stats")
 
         return player_df
@@ -711,7 +804,8 @@ def analyze_season_stats(
     season_stats_dir: str = "DFS/seasonStats/",
     legacy_file: str = "DFS/2025 Stats thru week 5.xlsx",
     use_advanced_stats: bool = True,
-    week: int = None
+    week: int = None,
+    identity_index=None
 ) -> pd.DataFrame:
     """
     Main entry point - prioritizes database, then files, then legacy fallback.
@@ -722,6 +816,8 @@ def analyze_season_stats(
         legacy_file: Path to legacy single file (last resort fallback)
         use_advanced_stats: Whether to extract advanced metrics (Tier 1 & 2)
         week: Week number for database/file loading (e.g., 8). If None, uses generic names.
+        identity_index: Optional PlayerIdentityIndex; players matched in earlier
+            weeks skip fuzzy matching and new matches are persisted
 
     Returns:
         Enriched player DataFrame with original 9 metrics + advanced metrics
@@ -731,7 +827,7 @@ def analyze_season_stats(
     if not ADVANCED_STATS_AVAILABLE:
         logger.info("Advanced stats modules not available. Using legacy mode.")
         print("⚠️  ADVANCED_STATS_AVAILABLE = False - Using legacy mode")
-        return analyze_season_stats_legacy(player_df, legacy_file)
+        return analyze_season_stats_legacy(player_df, legacy_file, identity_index)
 
     season_files = None
     
@@ -790,7 +886,7 @@ def analyze_season_stats(
             
             # Create player mapper (ONE-TIME fuzzy matching)
             print(f"   Creating player mapper...")
-            player_mapper = create_player_mapper(player_df, season_files)
+            player_mapper = create_player_mapper(player_df, season_files, identity_index=identity_index)
             print(f"   ✅ Player mapper created")
 
             # Extract original 9 metrics
@@ -853,7 +949,7 @@ def analyze_season_stats(
     # PRIORITY 3: Last resort - legacy file (if it exists)
     if os.path.exists(legacy_file):
         logger.warning(f"⚠️  No database or file data found. Using legacy file: {legacy_file}")
-        player_df = analyze_season_stats_legacy(player_df, legacy_file)
+        player_df = analyze_season_stats_legacy(player_df, legacy_file, identity_index)
     else:
         logger.warning("⚠️  No season stats data available (database, files, or legacy)")
         # Return player_df unchanged - app will work without advanced stats
@@ -90,6 +90,116 @@ def get_ceiling_boost_multiplier(position: str, projection: float) -> float:
         return 0.0  # Block ceiling boost - projection too low
 
 
+def get_ceiling_boost_multipliers(positions: pd.Series, projections: pd.Series) -> np.ndarray:
+    """
+    Vectorized get_ceiling_boost_multiplier() over position/projection columns.
+
+    Args:
+        positions: Player positions
+        projections: DFS projections
+
+    Returns:
+        np.ndarray: Multipliers (1.0 = full, 0.5 = half, 0.0 = blocked)
+    """
+    full_gate = positions.map({pos: gates['full'] for pos, gates in PROJECTION_GATES.items()}).fillna(13.0)
+    half_gate = positions.map({pos: gates['half'] for pos, gates in PROJECTION_GATES.items()}).fillna(10.0)
+
+    return np.select(
+        [projections >= full_gate, projections >= half_gate],
+        [1.0, 0.5],
+        default=0.0
+    )
+
+
+def get_value_penalties(value_ratio: pd.Series) -> np.ndarray:
+    """
+    Value ratio penalty tiers (trap chalk defense).
+
+    - Good value: 3.0+ pts/$1K (no penalty)
+    - Mediocre value: 2.5-3.0 pts/$1K (15% penalty)
+    - Poor value: < 2.5 pts/$1K (30% penalty)
+
+    Args:
+        value_ratio: Projection per $1K salary
+
+    Returns:
+        np.ndarray: Penalty multipliers
+    """
+    return np.select(
+        [value_ratio >= 3.0, value_ratio >= 2.5],
+        [1.0, 0.85],
+        default=0.70
+    )
+
+
+def get_leverage_multipliers(ownership: pd.Series) -> np.ndarray:
+    """
+    Leverage multiplier tiers by ownership %.
+
+    <2%: 0.3x (too contrarian)
+    2-5%: 0.7x (low but playable)
+    5-10%: 1.0x (perfect leverage)
+    10-15%: 0.9x (good leverage)
+    15-20%: 0.6x (getting chalky)
+    20-30%: 0.3x (too chalky)
+    >30%: 0.1x (no leverage)
+
+    Args:
+        ownership: Projected ownership percentages
+
+    Returns:
+        np.ndarray: Leverage multipliers (missing ownership gets 0.1x)
+    """
+    return np.select(
+        [ownership < 2, ownership < 5, ownership < 10, ownership < 15, ownership < 20, ownership < 30],
+        [0.3, 0.7, 1.0, 0.9, 0.6, 0.3],
+        default=0.1
+    )
+
+
+def build_team_vegas_table(vegas_lines: pd.DataFrame) -> pd.DataFrame:
+    """
+    Expand game-level Vegas lines into one row per (team, opponent).
+
+    Each game produces a home row and an away row with the spread expressed
+    from that team's perspective (negative = favorite) and the team implied
+    total derived from it. When a matchup appears more than once, the first
+    game line wins.
+
+    Args:
+        vegas_lines: DataFrame with 'home_team', 'away_team', and optionally
+            'total' and 'spread' (home perspective) columns
+
+    Returns:
+        DataFrame with columns team_full, opp_full, game_total, team_spread, team_itt
+    """
+    total = vegas_lines['total'] if 'total' in vegas_lines.columns else pd.Series(45, index=vegas_lines.index)
+    spread = vegas_lines['spread'] if 'spread' in vegas_lines.columns else pd.Series(0, index=vegas_lines.index)
+    order = np.arange(len(vegas_lines))
+
+    home = pd.DataFrame({
+        'team_full': vegas_lines['home_team'].to_numpy(),
+        'opp_full': vegas_lines['away_team'].to_numpy(),
+        'game_total': total.to_numpy(dtype=float),
+        'team_spread': -spread.to_numpy(dtype=float),
+        '_order': order,
+    })
+    away = pd.DataFrame({
+        'team_full': vegas_lines['away_team'].to_numpy(),
+        'opp_full': vegas_lines['home_team'].to_numpy(),
+        'game_total': total.to_numpy(dtype=float),
+        'team_spread': spread.to_numpy(dtype=float),
+        '_order': order,
+    })
+
+    table = pd.concat([home, away], ignore_index=True)
+    table = table.sort_values('_order', kind='stable')
+    table = table.drop_duplicates(subset=['team_full', 'opp_full'], keep='first')
+    table['team_itt'] = (table['game_total'] / 2) - (table['team_spread'] / 2)
+
+    return table.drop(columns=['_order']).reset_index(drop=True)
+
+
 # Weight Profiles
 # NOTE: Default 'balanced' profile optimized for balanced tournament play
 # Custom configuration: Reduced matchup/leverage, increased trends/regression
@@ -136,13 +246,17 @@ def min_max_scale_by_position(df: pd.DataFrame, metric_col: str) -> pd.Series:
     Returns:
         Series with normalized values [0, 1]
     """
-    def scale_group(x):
-        if (x.max() - x.min()) > 0:
-            return (x - x.min()) / (x.max() - x.min())
-        else:
-            return 0.5  # If all values are the same, return middle value
+    grouped = df.groupby('position')[metric_col]
+    group_min = grouped.transform('min')
+    group_range = grouped.transform('max') - group_min
+
+    # If all values in a position are the same, return middle value
+    scaled = pd.Series(
+        np.where(group_range > 0, (df[metric_col] - group_min) / group_range.where(group_range > 0), 0.5),
+        index=df.index
+    )
 
-    return df.groupby('position')[metric_col].transform(scale_group)
+    return scaled.where(df['position'].notna())
 
 
 def calculate_base_score(df: pd.DataFrame, weight: float) -> pd.DataFrame:
@@ -174,15 +288,7 @@ def calculate_base_score(df: pd.DataFrame, weight: float) -> pd.DataFrame:
     # - Good value: 3.0+ pts/$1K (no penalty)
     # - Mediocre value: 2.5-3.0 pts/$1K (15% penalty)
     # - Poor value: < 2.5 pts/$1K (30% penalty)
-    def get_value_penalty(value_ratio):
-        if value_ratio >= 3.0:
-            return 1.0   # No penalty - good value
-        elif value_ratio >= 2.5:
-            return 0.85  # 15% penalty - mediocre value (Puka was 2.80)
-        else:
-            return 0.70  # 30% penalty - poor value
-
-    df['value_penalty'] = df['value_ratio'].apply(get_value_penalty)
+    df['value_penalty'] = get_value_penalties(df['value_ratio'])
     df['base_raw'] = df['base_raw'] * df['value_penalty']
 
     # PHASE 1 IMPROVEMENT: Add ceiling boost for explosion potential
@@ -196,10 +302,7 @@ def calculate_base_score(df: pd.DataFrame, weight: float) -> pd.DataFrame:
         # PHASE 4.6: Calculate projection-based multiplier
         # Blocks ceiling boost for low-projection plays (e.g., Gainwell 9.8 pts)
         # Preserves ceiling boost for tournament-viable plays (e.g., DJ Moore 18.2 pts)
-        df['ceiling_multiplier'] = df.apply(
-            lambda row: get_ceiling_boost_multiplier(row['position'], row['projection']),
-            axis=1
-        )
+        df['ceiling_multiplier'] = get_ceiling_boost_multipliers(df['position'], df['projection'])
 
         # Ceiling boost: 0-50% boost for high ceiling/projection ratios
         # (ceiling_ratio - 1.0) / 2.0 scales it so 3.0x ratio = 1.0 boost (capped at 0.5)
@@ -216,7 +319,38 @@ def calculate_base_score(df: pd.DataFrame, weight: float) -> pd.DataFrame:
     return df
 
 
-def calculate_opportunity_score(df: pd.DataFrame, weight: float, sub_weights: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+def _group_stat(series: pd.Series, groups: Optional[pd.Series], stat: str) -> pd.Series:
+    """
+    Broadcast a group statistic back onto every row.
+
+    Args:
+        series: Values to aggregate
+        groups: Group keys aligned with series, or None for the whole frame
+        stat: Aggregation name ('max', 'any', 'sum', ...)
+
+    Returns:
+        Series aligned with series.index
+    """
+    if groups is None:
+        return pd.Series(getattr(series, stat)(), index=series.index)
+    return series.groupby(groups, dropna=False).transform(stat)
+
+
+def _group_has_values(df: pd.DataFrame, col: str, groups: Optional[pd.Series]) -> pd.Series:
+    """True for rows whose group has at least one non-null value in col."""
+    if col not in df.columns:
+        return pd.Series(False, index=df.index)
+    return _group_stat(df[col].notna(), groups, 'any').astype(bool)
+
+
+def _group_max_or_one(df: pd.DataFrame, col: str, groups: Optional[pd.Series]) -> pd.Series:
+    """Group max of col, replaced by 1 where it is not positive (safe divisor)."""
+    group_max = _group_stat(df[col], groups, 'max')
+    return group_max.where(group_max > 0, 1)
+
+
+def calculate_opportunity_score(df: pd.DataFrame, weight: float, sub_weights: Optional[Dict[str, float]] = None,
+                                by_position: bool = False) -> pd.DataFrame:
     """
     Calculate OPPORTUNITY score component (ENHANCED with advanced metrics).
 
@@ -232,6 +366,8 @@ def calculate_opportunity_score(df: pd.DataFrame, weight: float, sub_weights: Op
         df: Player DataFrame (may include 'adv_*' columns from advanced stats)
         weight: Weight for this component (default 0.30)
         sub_weights: Optional dict with sub-component weights
+        by_position: If True, WR and TE fallbacks/maxima are decided per position
+            instead of jointly (same result as scoring each position separately)
 
     Returns:
         DataFrame with enhanced 'opp_score' column
@@ -263,81 +399,81 @@ def calculate_opportunity_score(df: pd.DataFrame, weight: float, sub_weights: Op
     # Check if advanced metrics are available
     has_advanced_metrics = any(col in df.columns for col in ['adv_tprr', 'adv_yprr', 'adv_rte_pct', 'adv_success_rate'])
 
+    position = df['position']
+    wr_te_mask = position.isin(['WR', 'TE'])
+    rb_mask = position == 'RB'
+    qb_mask = position == 'QB'
+
     if has_advanced_metrics:
         # PHASE 2: Use advanced metrics with graceful fallback
-
-        # Initialize components
-        df['opp_target_quality'] = 0.0
-        df['opp_efficiency'] = 0.0
-        df['opp_snap_quality'] = 0.0
-        df['opp_floor'] = 0.0
-        df['opp_raw'] = 0.0
-
-        # For WR/TE: Use advanced metrics
-        wr_te_mask = df['position'].isin(['WR', 'TE'])
-
-        if wr_te_mask.any():
-            # Target Quality: TPRR if available
-            if 'adv_tprr' in df.columns and df.loc[wr_te_mask, 'adv_tprr'].notna().any():
-                # TPRR is on 0-1 scale, scale to 0-100
-                df.loc[wr_te_mask, 'opp_target_quality'] = df.loc[wr_te_mask, 'adv_tprr'].fillna(0) * 100
-                metrics_used.append('TPRR')
-            elif 'season_tgt' in df.columns:
-                # Fallback to original
-                max_tgt = df.loc[wr_te_mask, 'season_tgt'].max() if df.loc[wr_te_mask, 'season_tgt'].max() > 0 else 1
-                df.loc[wr_te_mask, 'opp_target_quality'] = (df.loc[wr_te_mask, 'season_tgt'].fillna(0) / max_tgt) * 100
-
-            # Efficiency: YPRR if available
-            if 'adv_yprr' in df.columns and df.loc[wr_te_mask, 'adv_yprr'].notna().any():
-                # YPRR typically 0-10, scale to 0-100
-                df.loc[wr_te_mask, 'opp_efficiency'] = (df.loc[wr_te_mask, 'adv_yprr'].fillna(0) / 10) * 100
-                metrics_used.append('YPRR')
-            elif 'season_fpg' in df.columns:
-                # Fallback: use FP/G as efficiency proxy
-                max_fpg = df.loc[wr_te_mask, 'season_fpg'].max() if df.loc[wr_te_mask, 'season_fpg'].max() > 0 else 1
-                df.loc[wr_te_mask, 'opp_efficiency'] = (df.loc[wr_te_mask, 'season_fpg'].fillna(0) / max_fpg) * 100
-
-            # Snap Quality: RTE% if available
-            if 'adv_rte_pct' in df.columns and df.loc[wr_te_mask, 'adv_rte_pct'].notna().any():
-                # RTE% is already in percentage form
-                df.loc[wr_te_mask, 'opp_snap_quality'] = df.loc[wr_te_mask, 'adv_rte_pct'].fillna(0)
-                metrics_used.append('RTE%')
-            elif 'season_snap' in df.columns:
-                # Fallback to season snap %
-                df.loc[wr_te_mask, 'opp_snap_quality'] = df.loc[wr_te_mask, 'season_snap'].fillna(0)
-
-        # For RB: Use advanced metrics
-        rb_mask = df['position'] == 'RB'
-
-        if rb_mask.any():
-            # Primary: Snap % (workload)
-            if 'season_snap' in df.columns:
-                df.loc[rb_mask, 'opp_snap_quality'] = df.loc[rb_mask, 'season_snap'].fillna(0)
-
-            # Floor: Success Rate if available
-            if 'adv_success_rate' in df.columns and df.loc[rb_mask, 'adv_success_rate'].notna().any():
-                df.loc[rb_mask, 'opp_floor'] = df.loc[rb_mask, 'adv_success_rate'].fillna(0)
-                metrics_used.append('Success Rate')
-            elif 'season_cons' in df.columns:
-                # Fallback: use inverted consistency
-                df.loc[rb_mask, 'opp_floor'] = 100 - df.loc[rb_mask, 'season_cons'].fillna(0) * 10
-
-            # RB components
-            df.loc[rb_mask, 'opp_target_quality'] = df.loc[rb_mask, 'opp_snap_quality'] * 0.5
-            max_proj = df.loc[rb_mask, 'projection'].max() if df.loc[rb_mask, 'projection'].max() > 0 else 1
-            df.loc[rb_mask, 'opp_efficiency'] = (df.loc[rb_mask, 'projection'].fillna(0) / max_proj) * 100
-
-        # For QB: Keep existing logic
-        qb_mask = df['position'] == 'QB'
-
-        if qb_mask.any():
-            if 'season_snap' in df.columns:
-                df.loc[qb_mask, 'opp_snap_quality'] = df.loc[qb_mask, 'season_snap'].fillna(0)
-
-            max_proj = df.loc[qb_mask, 'projection'].max() if df.loc[qb_mask, 'projection'].max() > 0 else 1
-            df.loc[qb_mask, 'opp_efficiency'] = (df.loc[qb_mask, 'projection'].fillna(0) / max_proj) * 100
-            df.loc[qb_mask, 'opp_target_quality'] = df.loc[qb_mask, 'opp_efficiency'] * 0.5
-            df.loc[qb_mask, 'opp_floor'] = 50  # QBs have decent floor
+        # Fallback choices and maxima are group-level: WR/TE share one group
+        # unless by_position, RB and QB are always their own group
+        groups = position if by_position else position.where(~wr_te_mask, 'WR/TE')
+
+        target_quality = np.zeros(len(df))
+        efficiency = np.zeros(len(df))
+        snap_quality = np.zeros(len(df))
+        floor = np.zeros(len(df))
+
+        # For WR/TE: Target Quality - TPRR (0-1 scale, scaled to 0-100) if available
+        use_tprr = wr_te_mask & _group_has_values(df, 'adv_tprr', groups)
+        if use_tprr.any():
+            target_quality = np.where(use_tprr, df['adv_tprr'].fillna(0) * 100, target_quality)
+            metrics_used.append('TPRR')
+        if 'season_tgt' in df.columns:
+            # Fallback to original
+            use_tgt = wr_te_mask & ~use_tprr
+            max_tgt = _group_max_or_one(df, 'season_tgt', groups)
+            target_quality = np.where(use_tgt, (df['season_tgt'].fillna(0) / max_tgt) * 100, target_quality)
+
+        # For WR/TE: Efficiency - YPRR (typically 0-10, scaled to 0-100) if available
+        use_yprr = wr_te_mask & _group_has_values(df, 'adv_yprr', groups)
+        if use_yprr.any():
+            efficiency = np.where(use_yprr, (df['adv_yprr'].fillna(0) / 10) * 100, efficiency)
+            metrics_used.append('YPRR')
+        if 'season_fpg' in df.columns:
+            # Fallback: use FP/G as efficiency proxy
+            use_fpg = wr_te_mask & ~use_yprr
+            max_fpg = _group_max_or_one(df, 'season_fpg', groups)
+            efficiency = np.where(use_fpg, (df['season_fpg'].fillna(0) / max_fpg) * 100, efficiency)
+
+        # For WR/TE: Snap Quality - RTE% (already in percentage form) if available
+        use_rte = wr_te_mask & _group_has_values(df, 'adv_rte_pct', groups)
+        if use_rte.any():
+            snap_quality = np.where(use_rte, df['adv_rte_pct'].fillna(0), snap_quality)
+            metrics_used.append('RTE%')
+
+        # Snap %: WR/TE fallback, RB workload, QB snaps
+        if 'season_snap' in df.columns:
+            use_snap = (wr_te_mask & ~use_rte) | rb_mask | qb_mask
+            snap_quality = np.where(use_snap, df['season_snap'].fillna(0), snap_quality)
+
+        # For RB: Floor - Success Rate if available
+        use_success = rb_mask & _group_has_values(df, 'adv_success_rate', groups)
+        if use_success.any():
+            floor = np.where(use_success, df['adv_success_rate'].fillna(0), floor)
+            metrics_used.append('Success Rate')
+        if 'season_cons' in df.columns:
+            # Fallback: use inverted consistency
+            use_cons = rb_mask & ~use_success
+            floor = np.where(use_cons, 100 - df['season_cons'].fillna(0) * 10, floor)
+
+        # RB/QB: projection share of the position max drives efficiency
+        max_proj = _group_max_or_one(df, 'projection', groups)
+        proj_share = (df['projection'].fillna(0) / max_proj) * 100
+        efficiency = np.where(rb_mask | qb_mask, proj_share, efficiency)
+
+        # RB components
+        target_quality = np.where(rb_mask, snap_quality * 0.5, target_quality)
+
+        # For QB: Keep existing logic (QBs have decent floor)
+        target_quality = np.where(qb_mask, efficiency * 0.5, target_quality)
+        floor = np.where(qb_mask, 50, floor)
+
+        df['opp_target_quality'] = target_quality
+        df['opp_efficiency'] = efficiency
+        df['opp_snap_quality'] = snap_quality
+        df['opp_floor'] = floor
 
         # Combine components
         df['opp_raw'] = (
@@ -348,89 +484,65 @@ def calculate_opportunity_score(df: pd.DataFrame, weight: float, sub_weights: Op
         )
 
         # Normalize by position then apply weight
-        for position in df['position'].unique():
-            pos_mask = df['position'] == position
-            if pos_mask.any():
-                pos_min = df.loc[pos_mask, 'opp_raw'].min()
-                pos_max = df.loc[pos_mask, 'opp_raw'].max()
-
-                if pos_max > pos_min:
-                    df.loc[pos_mask, 'opp_score'] = ((df.loc[pos_mask, 'opp_raw'] - pos_min) /
-                                                     (pos_max - pos_min)) * weight
-                else:
-                    df.loc[pos_mask, 'opp_score'] = 0.5 * weight
+        opp_norm = min_max_scale_by_position(df, 'opp_raw')
+        df['opp_score'] = opp_norm.where(position.notna(), 0.0) * weight
 
         # Log metrics used
         if metrics_used:
             logger.info(f"✅ Phase 2: Advanced metrics integrated into OPPORTUNITY score: {', '.join(metrics_used)}")
 
     else:
-        # LEGACY: Original opportunity calculation
+        # LEGACY: Original opportunity calculation (always per position)
 
         # Extract sub-weights for WR/TE
         tgt_weight = sub_weights.get('opp_target_share', 0.60)
         snap_weight = sub_weights.get('opp_snap_pct', 0.30)
         rz_weight = sub_weights.get('opp_rz_targets', 0.10)
 
-        # For each position, calculate opportunity differently
-        for position in df['position'].unique():
-            pos_mask = df['position'] == position
-            pos_df = df[pos_mask].copy()
-
-            if position == 'QB':
-                # QB: Use projection as proxy for opportunity
-                if 'season_snap' in df.columns and pos_df['season_snap'].notna().any():
-                    opp_metric = pos_df['season_snap'] / 100
-                else:
-                    opp_metric = pos_df['projection'] / pos_df['projection'].max() if pos_df['projection'].max() > 0 else 0.5
-
-                df.loc[pos_mask, 'opp_score'] = opp_metric * weight
-
-            elif position == 'RB':
-                # RB: Snap % is king
-                if 'season_snap' in df.columns and pos_df['season_snap'].notna().any():
-                    snap_pct = pos_df['season_snap'] / 100
-                    opp_metric = snap_pct
-                else:
-                    opp_metric = pos_df['projection'] / pos_df['projection'].max() if pos_df['projection'].max() > 0 else 0.5
-
-                df.loc[pos_mask, 'opp_score'] = opp_metric * weight
-
-            elif position in ['WR', 'TE']:
-                # WR/TE: Target Share + Snap % + RZ Targets
-                total_opp = 0.0
-
-                # Target Share component
-                if 'season_tgt' in df.columns and pos_df['season_tgt'].notna().any():
-                    tgt_max = pos_df['season_tgt'].max()
-                    if tgt_max > 0:
-                        tgt_norm = pos_df['season_tgt'] / tgt_max
-                        total_opp += tgt_norm * tgt_weight
-
-                # Snap % component
-                if 'season_snap' in df.columns and pos_df['season_snap'].notna().any():
-                    snap_norm = pos_df['season_snap'] / 100
-                    total_opp += snap_norm * snap_weight
-
-                # Red Zone Targets component
-                if 'season_eztgt' in df.columns and pos_df['season_eztgt'].notna().any():
-                    rz_max = pos_df['season_eztgt'].max()
-                    if rz_max > 0:
-                        rz_norm = pos_df['season_eztgt'] / rz_max
-                        total_opp += rz_norm * rz_weight
-
-                # If no opportunity data available, use projection proxy
-                if isinstance(total_opp, pd.Series) and total_opp.sum() == 0:
-                    total_opp = pos_df['projection'] / pos_df['projection'].max() if pos_df['projection'].max() > 0 else 0.5
-                elif not isinstance(total_opp, pd.Series) and total_opp == 0:
-                    total_opp = pos_df['projection'] / pos_df['projection'].max() if pos_df['projection'].max() > 0 else 0.5
-
-                df.loc[pos_mask, 'opp_score'] = total_opp * weight
+        # Projection proxy when a position has no opportunity data
+        proj_max = _group_stat(df['projection'], position, 'max')
+        proj_proxy = np.where(proj_max > 0, df['projection'] / proj_max.where(proj_max > 0), 0.5)
+
+        # QB: season snap % (or projection proxy); RB: snap % is king
+        snap_pct = df['season_snap'] / 100 if 'season_snap' in df.columns else np.nan
+        use_snap = _group_has_values(df, 'season_snap', position)
+        qb_rb_opp = np.where(use_snap, snap_pct, proj_proxy)
+
+        # WR/TE: Target Share + Snap % + RZ Targets
+        total_opp = np.zeros(len(df))
+
+        # Target Share component
+        if 'season_tgt' in df.columns:
+            tgt_max = _group_stat(df['season_tgt'], position, 'max')
+            use_tgt = _group_has_values(df, 'season_tgt', position) & (tgt_max > 0)
+            total_opp = total_opp + np.where(use_tgt, df['season_tgt'] / tgt_max.where(tgt_max > 0) * tgt_weight, 0.0)
+
+        # Snap % component
+        if 'season_snap' in df.columns:
+            total_opp = total_opp + np.where(use_snap, snap_pct * snap_weight, 0.0)
+
+        # Red Zone Targets component
+        if 'season_eztgt' in df.columns:
+            rz_max = _group_stat(df['season_eztgt'], position, 'max')
+            use_rz = _group_has_values(df, 'season_eztgt', position) & (rz_max > 0)
+            total_opp = total_opp + np.where(use_rz, df['season_eztgt'] / rz_max.where(rz_max > 0) * rz_weight, 0.0)
+
+        # If no opportunity data available, use projection proxy
+        total_opp = pd.Series(total_opp, index=df.index)
+        no_opp_data = _group_stat(total_opp, position, 'sum') == 0
+        wr_te_opp = np.where(no_opp_data, proj_proxy, total_opp)
+
+        df['opp_score'] = np.select(
+            [position.isin(['QB', 'RB']), wr_te_mask],
+            [qb_rb_opp * weight, wr_te_opp * weight],
+            default=0.0
+        )
 
     return df
 
 
-def calculate_trends_score(df: pd.DataFrame, weight: float, sub_weights: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+def calculate_trends_score(df: pd.DataFrame, weight: float, sub_weights: Optional[Dict[str, float]] = None,
+                           by_position: bool = False) -> pd.DataFrame:
     """
     Calculate TRENDS score component (momentum, role trend, recent production) with configurable sub-weights.
 
@@ -444,6 +556,8 @@ def calculate_trends_score(df: pd.DataFrame, weight: float, sub_weights: Optiona
         weight: Weight for this component (default 0.15)
         sub_weights: Optional dict with keys 'trends_momentum', 'trends_role', 'trends_consistency'
                     Defaults to {0.50, 0.30, 0.20} if not provided
+        by_position: If True, momentum/role/consistency maxima are taken per position
+            instead of across the whole pool
 
     Returns:
         DataFrame with 'trends_score' column
@@ -462,39 +576,23 @@ def calculate_trends_score(df: pd.DataFrame, weight: float, sub_weights: Optiona
     cons_weight = sub_weights.get('trends_consistency', 0.20)
 
     df['trends_score'] = 0.0
+    groups = df['position'] if by_position else None
 
     # Component 1: Momentum (recent vs early production)
-    if 'season_mom' in df.columns and df['season_mom'].notna().any():
-        # Normalize momentum to [0, 1] with 0.5 as neutral
-        # Positive momentum (recent > early) gets boost, negative gets penalty
-        mom_max = df['season_mom'].abs().max()
-        if mom_max > 0:
-            df['trends_momentum'] = (df['season_mom'] / mom_max + 1) / 2  # Scale to [0, 1]
-        else:
-            df['trends_momentum'] = 0.5
-    else:
-        df['trends_momentum'] = 0.5
-
-    # Component 2: Role trend (snap % change W1 → W5)
-    if 'season_trend' in df.columns and df['season_trend'].notna().any():
-        # Normalize trend to [0, 1] with 0.5 as neutral
-        trend_max = df['season_trend'].abs().max()
-        if trend_max > 0:
-            df['trends_role'] = (df['season_trend'] / trend_max + 1) / 2  # Scale to [0, 1]
-        else:
-            df['trends_role'] = 0.5
-    else:
-        df['trends_role'] = 0.5
+    # Normalize momentum to [0, 1] with 0.5 as neutral
+    # Positive momentum (recent > early) gets boost, negative gets penalty
+    df['trends_momentum'] = _scale_signed_trend(df, 'season_mom', groups)
+
+    # Component 2: Role trend (snap % change W1 → W5), 0.5 as neutral
+    df['trends_role'] = _scale_signed_trend(df, 'season_trend', groups)
 
     # Component 3: Consistency (lower is better for cash, worse for GPP)
-    if 'season_cons' in df.columns and df['season_cons'].notna().any():
-        # For balanced/GPP: embrace variance (higher consistency = penalty)
-        # Invert consistency: low STD = consistent = lower score (we want variance)
-        cons_max = df['season_cons'].max()
-        if cons_max > 0:
-            df['trends_consistency'] = 1 - (df['season_cons'] / cons_max)  # Invert
-        else:
-            df['trends_consistency'] = 0.5
+    # For balanced/GPP: embrace variance (higher consistency = penalty)
+    # Invert consistency: low STD = consistent = lower score (we want variance)
+    if 'season_cons' in df.columns:
+        cons_max = _group_stat(df['season_cons'], groups, 'max')
+        use_cons = _group_has_values(df, 'season_cons', groups) & (cons_max > 0)
+        df['trends_consistency'] = np.where(use_cons, 1 - (df['season_cons'] / cons_max.where(cons_max > 0)), 0.5)
     else:
         df['trends_consistency'] = 0.5
 
@@ -512,6 +610,16 @@ def calculate_trends_score(df: pd.DataFrame, weight: float, sub_weights: Optiona
     return df
 
 
+def _scale_signed_trend(df: pd.DataFrame, col: str, groups: Optional[pd.Series]):
+    """Scale a signed trend column to [0, 1] around 0.5 by its (group) absolute max."""
+    if col not in df.columns:
+        return 0.5
+
+    abs_max = _group_stat(df[col].abs(), groups, 'max')
+    use_col = _group_has_values(df, col, groups) & (abs_max > 0)
+    return np.where(use_col, (df[col] / abs_max.where(abs_max > 0) + 1) / 2, 0.5)
+
+
 def calculate_risk_score(df: pd.DataFrame, weight: float) -> pd.DataFrame:
     """
     Calculate RISK score component (EMBRACE variance in GPP).
@@ -588,56 +696,29 @@ def calculate_matchup_score(df: pd.DataFrame, weight: float, vegas_lines: Option
         df['matchup_score'] = df['matchup_raw'] * weight
         return df
 
-    # Process Vegas lines for each player
-    for idx, player in df.iterrows():
-        team = player.get('team', '')
-        opponent = player.get('opponent', '')
-
-        if not team or not opponent:
-            df.at[idx, 'matchup_raw'] = 0.5  # Neutral if missing data
-            continue
-
-        # Try to find game in Vegas lines
-        team_full = TEAM_ABBREV_TO_FULL.get(team, team)
-        opp_full = TEAM_ABBREV_TO_FULL.get(opponent, opponent)
-
-        # Look for game in either direction (team as home or away)
-        game_line = vegas_lines[
-            ((vegas_lines['home_team'] == team_full) & (vegas_lines['away_team'] == opp_full)) |
-            ((vegas_lines['home_team'] == opp_full) & (vegas_lines['away_team'] == team_full))
-        ]
-
-        if not game_line.empty:
-            game_line = game_line.iloc[0]
-
-            # Extract key metrics
-            game_total = game_line.get('total', 45)  # Default 45 if missing
-
-            # Determine if player's team is home or away
-            if game_line['home_team'] == team_full:
-                team_spread = -game_line.get('spread', 0)  # Negative spread = favorite
-                team_itt = (game_total / 2) - (team_spread / 2)
-            else:
-                team_spread = game_line.get('spread', 0)
-                team_itt = (game_total / 2) - (team_spread / 2)
-
-            # Calculate matchup score components
-            # 1. Game total factor (higher = better)
-            total_factor = game_total / 50  # Normalize around 50 points
+    if 'team' not in df.columns or 'opponent' not in df.columns:
+        df['matchup_raw'] = 0.5  # Neutral if missing data
+    else:
+        # Look up each player's game (team as home or away) in one merge
+        team_full = df['team'].map(TEAM_ABBREV_TO_FULL).fillna(df['team'])
+        opp_full = df['opponent'].map(TEAM_ABBREV_TO_FULL).fillna(df['opponent'])
+        games = pd.DataFrame({'team_full': team_full.to_numpy(), 'opp_full': opp_full.to_numpy()})
+        games = games.merge(
+            build_team_vegas_table(vegas_lines), on=['team_full', 'opp_full'], how='left', indicator=True
+        )
 
-            # 2. ITT factor (higher = better)
-            itt_factor = team_itt / 25  # Normalize around 25 points
+        # 1. Game total factor (higher = better), normalized around 50 points
+        total_factor = games['game_total'] / 50
+        # 2. ITT factor (higher = better), normalized around 25 points
+        itt_factor = games['team_itt'] / 25
+        # 3. Favorite factor (negative spread = favorite = better): -10 = 1.5x, +10 = 0.5x
+        spread_factor = 1 + (-games['team_spread'] / 20)
 
-            # 3. Favorite factor (negative spread = favorite = better)
-            spread_factor = 1 + (-team_spread / 20)  # -10 spread = 1.5x, +10 = 0.5x
+        matchup_value = total_factor * 0.4 + itt_factor * 0.4 + spread_factor * 0.2
 
-            # Combine factors (weighted)
-            matchup_value = (total_factor * 0.4 + itt_factor * 0.4 + spread_factor * 0.2)
-
-            df.at[idx, 'matchup_raw'] = matchup_value
-        else:
-            # No Vegas data found, use neutral
-            df.at[idx, 'matchup_raw'] = 0.5
+        # No Vegas data found, use neutral
+        matched = (games['_merge'] == 'both').to_numpy()
+        df['matchup_raw'] = np.where(matched, matchup_value.to_numpy(), 0.5)
 
     # Normalize by position and apply weight
     df['matchup_norm'] = min_max_scale_by_position(df, 'matchup_raw')
@@ -671,36 +752,8 @@ def calculate_leverage_score(df: pd.DataFrame, weight: float) -> pd.DataFrame:
             df['leverage_score'] = df['leverage_raw'] * weight
         return df
 
-    # Calculate leverage based on ownership sweet spot
-    def get_leverage_multiplier(ownership):
-        """
-        Get leverage multiplier based on ownership %.
-
-        <2%: 0.3x (too contrarian)
-        2-5%: 0.7x (low but playable)
-        5-10%: 1.0x (perfect leverage)
-        10-15%: 0.9x (good leverage)
-        15-20%: 0.6x (getting chalky)
-        20-30%: 0.3x (too chalky)
-        >30%: 0.1x (no leverage)
-        """
-        if ownership < 2:
-            return 0.3
-        elif ownership < 5:
-            return 0.7
-        elif ownership < 10:
-            return 1.0  # Sweet spot
-        elif ownership < 15:
-            return 0.9  # Still good
-        elif ownership < 20:
-            return 0.6
-        elif ownership < 30:
-            return 0.3
-        else:
-            return 0.1  # Mega chalk
-
-    # Apply leverage multiplier
-    df['leverage_multiplier'] = df['ownership'].apply(get_leverage_multiplier)
+    # Calculate leverage based on ownership sweet spot (see get_leverage_multipliers)
+    df['leverage_multiplier'] = get_leverage_multipliers(df['ownership'])
 
     # Also consider ceiling for leverage plays
     if 'season_ceiling' in df.columns:
@@ -732,33 +785,24 @@ def calculate_regression_score(df: pd.DataFrame, weight: float) -> pd.DataFrame:
     """
     df['regression_score'] = 0.0
 
+    if len(df) == 0:
+        return df
+
     # Identify the elite tier (top 20% by projection within position)
-    for position in df['position'].unique():
-        pos_mask = df['position'] == position
-        pos_df = df[pos_mask].copy()
-
-        if len(pos_df) > 0:
-            # Get 80th percentile projection threshold
-            threshold_80 = pos_df['projection'].quantile(0.8)
-
-            # Players below 80th percentile get regression penalty
-            # The further below, the higher the penalty
-            below_threshold = pos_df['projection'] < threshold_80
-
-            if below_threshold.any():
-                # Calculate penalty: distance from threshold
-                max_proj = pos_df['projection'].max()
-                if max_proj > threshold_80:
-                    penalty = (threshold_80 - pos_df['projection']) / (max_proj - threshold_80)
-                    penalty = penalty.clip(0, 1)  # Cap at 1
-                    df.loc[pos_mask, 'regression_penalty'] = penalty
-                else:
-                    df.loc[pos_mask, 'regression_penalty'] = 0
-            else:
-                df.loc[pos_mask, 'regression_penalty'] = 0
+    grouped = df.groupby('position')['projection']
+    threshold_80 = grouped.transform('quantile', 0.8)
+    max_proj = grouped.transform('max')
+
+    # Players below 80th percentile get regression penalty
+    # The further below, the higher the penalty (distance from threshold, capped at 1)
+    below_threshold = (df['projection'] < threshold_80).groupby(df['position']).transform('any')
+    has_penalty = below_threshold.eq(True) & (max_proj > threshold_80)
+    penalty = ((threshold_80 - df['projection']) / (max_proj - threshold_80).where(has_penalty)).clip(0, 1)
+
+    df['regression_penalty'] = penalty.where(has_penalty, 0.0).where(df['position'].notna())
 
     # Apply regression penalty (this REDUCES score)
-    df['regression_score'] = df.get('regression_penalty', 0) * weight  # This is subtracted later
+    df['regression_score'] = df['regression_penalty'] * weight  # This is subtracted later
 
     return df
 
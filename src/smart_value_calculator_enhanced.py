@@ -10,28 +10,51 @@ To use, rename this file to smart_value_calculator.py or update imports.
 
 import pandas as pd
 import numpy as np
+from collections import OrderedDict
 from typing import Dict, Optional
+import hashlib
 import logging
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 # Copy all the existing constants and helper functions from original
-from .smart_value_calculator import (
-    TEAM_ABBREV_TO_FULL,
-    PROJECTION_GATES,
-    WEIGHT_PROFILES,
-    get_ceiling_boost_multiplier,
-    min_max_scale_by_position,
-    calculate_base_score,
-    calculate_opportunity_score,
-    calculate_trends_score,
-    calculate_risk_score,
-    calculate_matchup_score,
-    calculate_leverage_score,
-    calculate_regression_score,
-    get_available_profiles
-)
+try:
+    from .smart_value_calculator import (
+        TEAM_ABBREV_TO_FULL,
+        PROJECTION_GATES,
+        WEIGHT_PROFILES,
+        get_ceiling_boost_multiplier,
+        get_ceiling_boost_multipliers,
+        get_value_penalties,
+        min_max_scale_by_position,
+        calculate_base_score,
+        calculate_opportunity_score,
+        calculate_trends_score,
+        calculate_risk_score,
+        calculate_matchup_score,
+        calculate_leverage_score,
+        calculate_regression_score,
+        get_available_profiles
+    )
+except ImportError:
+    from smart_value_calculator import (
+        TEAM_ABBREV_TO_FULL,
+        PROJECTION_GATES,
+        WEIGHT_PROFILES,
+        get_ceiling_boost_multiplier,
+        get_ceiling_boost_multipliers,
+        get_value_penalties,
+        min_max_scale_by_position,
+        calculate_base_score,
+        calculate_opportunity_score,
+        calculate_trends_score,
+        calculate_risk_score,
+        calculate_matchup_score,
+        calculate_leverage_score,
+        calculate_regression_score,
+        get_available_profiles
+    )
 
 
 def calculate_anti_chalk_penalty(df: pd.DataFrame) -> pd.DataFrame:
@@ -77,15 +100,7 @@ def calculate_base_score_enhanced(df: pd.DataFrame, weight: float) -> pd.DataFra
     df['base_raw'] = df['value_ratio'].copy()
 
     # Value Ratio Penalty (trap chalk defense)
-    def get_value_penalty(value_ratio):
-        if value_ratio >= 3.0:
-            return 1.0   # No penalty - good value
-        elif value_ratio >= 2.5:
-            return 0.85  # 15% penalty - mediocre value
-        else:
-            return 0.70  # 30% penalty - poor value
-
-    df['value_penalty'] = df['value_ratio'].apply(get_value_penalty)
+    df['value_penalty'] = get_value_penalties(df['value_ratio'])
     df['base_raw'] = df['base_raw'] * df['value_penalty']
 
     # PHASE 2 TIER 1: RB Enhancement with YACO/ATT
@@ -104,10 +119,7 @@ def calculate_base_score_enhanced(df: pd.DataFrame, weight: float) -> pd.DataFra
         df['ceiling_ratio'] = df['ceiling_ratio'].fillna(1.5)
 
         # Calculate projection-based multiplier
-        df['ceiling_multiplier'] = df.apply(
-            lambda row: get_ceiling_boost_multiplier(row['position'], row['projection']),
-            axis=1
-        )
+        df['ceiling_multiplier'] = get_ceiling_boost_multipliers(df['position'], df['projection'])
 
         # Ceiling boost: 0-50% boost for high ceiling/projection ratios
         df['ceiling_boost'] = np.clip((df['ceiling_ratio'] - 1.0) / 2.0, 0, 0.5) * df['ceiling_multiplier']
@@ -124,7 +136,8 @@ def calculate_base_score_enhanced(df: pd.DataFrame, weight: float) -> pd.DataFra
     return df
 
 
-def calculate_opportunity_score_enhanced(df: pd.DataFrame, weight: float, sub_weights: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+def calculate_opportunity_score_enhanced(df: pd.DataFrame, weight: float, sub_weights: Optional[Dict[str, float]] = None,
+                                         by_position: bool = False) -> pd.DataFrame:
     """
     Calculate OPPORTUNITY score - ENHANCED with Tier 1 Advanced Metrics.
 
@@ -138,6 +151,8 @@ def calculate_opportunity_score_enhanced(df: pd.DataFrame, weight: float, sub_we
         df: Player DataFrame
         weight: Weight for this component (default 0.30)
         sub_weights: Optional dict with keys for fine-grained control
+        by_position: Accepted for interface parity; this score is always
+            computed per position
 
     Returns:
         DataFrame with 'opp_score' column
@@ -309,17 +324,13 @@ def calculate_risk_score_enhanced(df: pd.DataFrame, weight: float, sub_weights:
     # XFP Variance bonus/penalty (if available)
     if 'season_var' in df.columns:
         # Negative variance (unlucky) = +0.3, Positive (lucky) = -0.2
-        variance_adjustment = df['season_var'].apply(
-            lambda x: 0.3 if x < -2 else (-0.2 if x > 2 else 0) if pd.notna(x) else 0
-        )
+        variance_adjustment = np.select([df['season_var'] < -2, df['season_var'] > 2], [0.3, -0.2], default=0)
         df['risk_score'] += variance_adjustment * (weight * var_weight)
 
     # Consistency bonus (if available)
     if 'season_cons' in df.columns:
         # Low consistency (<5) = +0.2, High (>10) = -0.2
-        consistency_adjustment = df['season_cons'].apply(
-            lambda x: 0.2 if x < 5 else (-0.2 if x > 10 else 0) if pd.notna(x) else 0
-        )
+        consistency_adjustment = np.select([df['season_cons'] < 5, df['season_cons'] > 10], [0.2, -0.2], default=0)
         df['risk_score'] += consistency_adjustment * (weight * cons_weight)
 
     # PHASE 2 TIER 1: Success Rate floor bonus for RBs
@@ -327,9 +338,8 @@ def calculate_risk_score_enhanced(df: pd.DataFrame, weight: float, sub_weights:
         rb_mask = df['position'] == 'RB'
         # High success rate (>50%) = +0.3 floor bonus
         # Low success rate (<35%) = -0.2 floor penalty
-        success_adjustment = df.loc[rb_mask, 'adv_success_rate'].apply(
-            lambda x: 0.3 if x > 50 else (-0.2 if x < 35 else 0) if pd.notna(x) else 0
-        )
+        rb_success = df.loc[rb_mask, 'adv_success_rate']
+        success_adjustment = np.select([rb_success > 50, rb_success < 35], [0.3, -0.2], default=0)
         df.loc[rb_mask, 'risk_score'] += success_adjustment * (weight * floor_weight)
 
         logger.debug(f"Applied Success Rate floor adjustment to {rb_mask.sum()} RBs")
@@ -337,6 +347,506 @@ def calculate_risk_score_enhanced(df: pd.DataFrame, weight: float, sub_weights:
     return df
 
 
+TOOLTIP_ADVANCED_COLUMNS = ['adv_tprr', 'adv_yprr', 'adv_rte_pct', 'adv_yaco_att', 'adv_success_rate']
+
+TOOLTIP_COMPONENT_COLUMNS = {
+    'base_score': '_tt_base', 'opp_score': '_tt_opp', 'trends_score': '_tt_trend',
+    'risk_score': '_tt_risk', 'matchup_score': '_tt_match', 'leverage_score': '_tt_leverage',
+    'chalk_penalty': '_tt_chalk'
+}
+
+
+def build_enhanced_tooltips(df: pd.DataFrame, weights: Dict[str, float], use_advanced_metrics: bool = True) -> list:
+    """
+    Build Smart Value tooltips for every player.
+
+    Component contributions and the advanced-metric labels are computed as
+    column operations; only the final string formatting runs per player,
+    over plain dicts rather than row Series.
+
+    Args:
+        df: Scored player DataFrame (needs component scores, '_global_min'/'_global_max')
+        weights: Component weights used for the calculation
+        use_advanced_metrics: Whether advanced metrics were used
+
+    Returns:
+        List of tooltip strings aligned with df rows
+    """
+    if df.empty:
+        return []
+
+    global_min = df['_global_min'].iloc[0]
+    global_max = df['_global_max'].iloc[0]
+    scale_factor = 100 / (global_max - global_min) if global_max > global_min else 0
+
+    context = pd.DataFrame(index=df.index)
+    for col, tt_col in TOOLTIP_COMPONENT_COLUMNS.items():
+        context[tt_col] = df[col] * scale_factor if scale_factor else 0.0
+
+    # Show which advanced metrics were used
+    labels = pd.Series('', index=df.index)
+    if use_advanced_metrics:
+        for col in TOOLTIP_ADVANCED_COLUMNS:
+            if col in df.columns:
+                present = df[col].notna() & (df[col] != 0)
+                labels = labels.where(~present, labels + col.replace('adv_', '').upper() + ',')
+    context['_tt_advanced'] = labels
+
+    passthrough = ['smart_value', 'position', 'game_total', 'team_itt', 'season_ceiling', 'ownership'] + TOOLTIP_ADVANCED_COLUMNS
+    for col in passthrough:
+        if col in df.columns:
+            context[col] = df[col]
+
+    return [
+        _format_enhanced_tooltip(row, weights)
+        for row in context.to_dict('records')
+    ]
+
+
+def _format_enhanced_tooltip(row: Dict, weights: Dict[str, float]) -> str:
+    """Format one player's tooltip from precomputed tooltip columns."""
+    advanced_metrics = [label for label in row['_tt_advanced'].split(',') if label]
+
+    base_val = row['_tt_base']
+    opp_val = row['_tt_opp']
+    trend_val = row['_tt_trend']
+    risk_val = row['_tt_risk']
+    match_val = row['_tt_match']
+    leverage_val = row['_tt_leverage']
+    chalk_penalty_val = row['_tt_chalk']
+
+    tooltip = (
+        f"Smart Value: {row['smart_value']:.1f}/100\n"
+    )
+
+    if advanced_metrics:
+        tooltip += (
+            f"━━━━━━━━━━━━━━━━━━━━━━\n"
+            f"🚀 Advanced Metrics: {', '.join(advanced_metrics)}\n"
+        )
+
+    tooltip += (
+        f"━━━━━━━━━━━━━━━━━━━━━━\n"
+        f"💡 Position SV: Best {row.get('position', 'player')} in pool\n"
+        f"💡 Global SV: Best overall (cross-position)\n"
+        f"━━━━━━━━━━━━━━━━━━━━━━\n"
+        f"Component Breakdown:\n\n"
+        f"💰 Base Value: +{base_val:.1f} ({int(weights['base']*100)}% weight)\n"
+    )
+
+    if 'adv_yaco_att' in row and row.get('position') == 'RB' and pd.notna(row['adv_yaco_att']):
+        tooltip += f"  └─ YACO/ATT adjusted: {row['adv_yaco_att']:.2f}\n"
+
+    tooltip += (
+        f"\n📊 Opportunity: +{opp_val:.1f} ({int(weights['opportunity']*100)}% weight)\n"
+    )
+
+    if advanced_metrics:
+        if 'TPRR' in advanced_metrics:
+            tooltip += f"  └─ TPRR: {row.get('adv_tprr', 0):.1%}\n"
+        if 'YPRR' in advanced_metrics:
+            tooltip += f"  └─ YPRR: {row.get('adv_yprr', 0):.2f}\n"
+        if 'RTE_PCT' in advanced_metrics:
+            tooltip += f"  └─ RTE%: {row.get('adv_rte_pct', 0):.1f}%\n"
+        if 'SUCCESS_RATE' in advanced_metrics:
+            tooltip += f"  └─ Success Rate: {row.get('adv_success_rate', 0):.1f}%\n"
+
+    tooltip += (
+        f"\n📈 Trends: {trend_val:+.1f} ({int(weights['trends']*100)}% weight)\n"
+        f"  └─ Momentum, Role Trend, Recent FP\n\n"
+        f"⚠️ Risk Adjust: {risk_val:+.1f} ({int(weights['risk']*100)}% weight)\n"
+    )
+
+    if row.get('position') == 'RB' and 'adv_success_rate' in row and pd.notna(row['adv_success_rate']):
+        tooltip += f"  └─ Floor (Success Rate): {row['adv_success_rate']:.1f}%\n"
+
+    tooltip += (
+        f"\n🎯 Matchup: {match_val:+.1f} ({int(weights['matchup']*100)}% weight)\n"
+        f"  └─ Game Total: {row.get('game_total', 0):.1f}, ITT: {row.get('team_itt', 0):.1f}\n\n"
+        f"💎 Leverage: {leverage_val:+.1f} ({int(weights.get('leverage', 0)*100)}% weight)\n"
+        f"  └─ Ceiling: {row.get('season_ceiling', 0):.1f}, Own: {row.get('ownership', 0):.1f}%\n"
+    )
+
+    if chalk_penalty_val < 0:
+        tooltip += (
+            f"\n❌ Chalk Penalty: {chalk_penalty_val:.1f}\n"
+            f"  └─ High own ({row.get('ownership', 0):.1f}%) + Bad matchup\n"
+        )
+
+    tooltip += (
+        f"━━━━━━━━━━━━━━━━━━━━━━\n"
+        f"Final Score: {row['smart_value']:.1f}/100\n"
+    )
+
+    if advanced_metrics:
+        tooltip += f"\n🔬 Enhanced with {len(advanced_metrics)} advanced metrics"
+
+    return tooltip
+
+
+# Smart Value components in weight-vector order, mapped to their score columns
+SMART_VALUE_COMPONENTS = {
+    'base': 'base_score',
+    'opportunity': 'opp_score',
+    'trends': 'trends_score',
+    'risk': 'risk_score',
+    'matchup': 'matchup_score',
+    'leverage': 'leverage_score',
+    'regression': 'regression_score'
+}
+
+# Defaults for weights that older profiles may omit (same as calculate_smart_value_enhanced)
+OPTIONAL_WEIGHT_DEFAULTS = {'leverage': 0.15, 'regression': 0.05}
+
+
+def _select_component_functions(df: pd.DataFrame, use_advanced_metrics: bool = True):
+    """
+    Pick enhanced or original BASE/OPPORTUNITY/RISK functions.
+
+    Returns:
+        Tuple of (base_func, opp_func, risk_func)
+    """
+    advanced_columns = [col for col in df.columns if col.startswith('adv_')]
+
+    if use_advanced_metrics and advanced_columns:
+        return calculate_base_score_enhanced, calculate_opportunity_score_enhanced, calculate_risk_score_enhanced
+
+    # Use original functions (already imported)
+    return calculate_base_score, calculate_opportunity_score, calculate_risk_score
+
+
+class ComponentScoreCache:
+    """
+    LRU cache of unit-weight component frames.
+
+    Keyed by a fingerprint of the input player data plus everything that
+    shapes the components (sub-weights, week, advanced-metric flag and
+    per-position mode). Main weights are NOT part of the key: a weight
+    slider change hits the cache and only the weighted sum and global
+    scaling are recomputed.
+    """
+
+    def __init__(self, max_size: int = 8):
+        """
+        Initialize component cache.
+
+        Args:
+            max_size: Maximum number of cached frames
+        """
+        self.max_size = max_size
+        self._cache: "OrderedDict[tuple, pd.DataFrame]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple) -> Optional[pd.DataFrame]:
+        """Return the cached frame for a key (or None), marking it recently used."""
+        frame = self._cache.get(key)
+        if frame is None:
+            self.misses += 1
+            return None
+        self._cache.move_to_end(key)
+        self.hits += 1
+        return frame
+
+    def put(self, key: tuple, frame: pd.DataFrame) -> None:
+        """Cache a frame, evicting the least recently used entry if full."""
+        self._cache[key] = frame
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+
+    def clear(self) -> None:
+        """Clear all cached frames."""
+        self._cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+_component_cache = ComponentScoreCache()
+
+
+def clear_component_cache() -> None:
+    """Clear cached component scores (e.g. after code or data reloads)."""
+    _component_cache.clear()
+
+
+def fingerprint_dataframe(df: pd.DataFrame) -> Optional[str]:
+    """
+    Content hash of a DataFrame (values, index and column names).
+
+    Returns:
+        Hex digest, or None if the frame holds unhashable values
+    """
+    try:
+        row_hashes = pd.util.hash_pandas_object(df, index=True).to_numpy()
+    except TypeError:
+        return None
+
+    digest = hashlib.sha1(row_hashes.tobytes())
+    digest.update(repr([(str(col), str(dtype)) for col, dtype in df.dtypes.items()]).encode())
+    return digest.hexdigest()
+
+
+def _compute_unit_component_frame(
+    df: pd.DataFrame,
+    sub_weights: Optional[Dict[str, float]],
+    week: int,
+    use_advanced_metrics: bool,
+    by_position: bool
+) -> pd.DataFrame:
+    """
+    Run every component at weight 1.0.
+
+    Uniform mode normalizes the pool as a whole and keeps all intermediate
+    columns (value_ratio, base_norm, ...). Per-position mode runs the same
+    single pass but takes every fallback decision and maximum within the
+    player's position group, which matches scoring each position on its own,
+    and carries only the score columns back.
+    """
+    base_func, opp_func, risk_func = _select_component_functions(df, use_advanced_metrics)
+
+    scored = base_func(df.copy(), 1.0)
+    scored = opp_func(scored, 1.0, sub_weights, by_position=by_position)
+    scored = calculate_trends_score(scored, 1.0, sub_weights, by_position=by_position)
+    scored = risk_func(scored, 1.0)
+    scored = calculate_matchup_score(scored, 1.0, None, week)
+    scored = calculate_leverage_score(scored, 1.0)
+    scored = calculate_regression_score(scored, 1.0)
+
+    if by_position:
+        # Like the weighted calculation, only the score columns are carried
+        # back; players without a position belong to no group and score zero
+        score_columns = list(SMART_VALUE_COMPONENTS.values())
+        keep = list(df.columns) + [col for col in score_columns if col not in df.columns]
+        scored = scored[keep]
+        scored.loc[scored['position'].isna(), score_columns] = 0.0
+
+    return calculate_anti_chalk_penalty(scored)
+
+
+def get_unit_component_frame(
+    df: pd.DataFrame,
+    sub_weights: Optional[Dict[str, float]] = None,
+    week: int = 6,
+    use_advanced_metrics: bool = True,
+    by_position: bool = False
+) -> pd.DataFrame:
+    """
+    Unit-weight component frame for df, served from cache when possible.
+
+    Args:
+        df: Player DataFrame
+        sub_weights: Optional sub-component weights
+        week: Current week number
+        use_advanced_metrics: If False, falls back to original component logic
+        by_position: Normalize and pick fallbacks within each position group
+
+    Returns:
+        Copy of df with unit-weight '*_score' columns, 'chalk_penalty' and
+        (in uniform mode) the intermediate component columns. Safe to mutate.
+    """
+    fingerprint = fingerprint_dataframe(df)
+    if fingerprint is None:
+        return _compute_unit_component_frame(df, sub_weights, week, use_advanced_metrics, by_position)
+
+    sub_key = tuple(sorted(sub_weights.items())) if sub_weights else ()
+    key = (fingerprint, sub_key, week, use_advanced_metrics, by_position)
+
+    frame = _component_cache.get(key)
+    if frame is None:
+        frame = _compute_unit_component_frame(df, sub_weights, week, use_advanced_metrics, by_position)
+        _component_cache.put(key, frame)
+
+    return frame.copy()
+
+
+def _resolve_row_weights(
+    df: pd.DataFrame,
+    weights: Dict[str, float],
+    position_weights: Optional[Dict[str, Dict[str, float]]] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Per-row weight vectors for each component.
+
+    Rows take the global weight unless their position has an override.
+    """
+    row_weights = {}
+    for component in SMART_VALUE_COMPONENTS:
+        if component in OPTIONAL_WEIGHT_DEFAULTS:
+            default = weights.get(component, OPTIONAL_WEIGHT_DEFAULTS[component])
+        else:
+            default = weights[component]
+        row_weights[component] = np.full(len(df), default, dtype=float)
+
+    if position_weights and 'position' in df.columns:
+        positions = df['position'].to_numpy()
+        for position, overrides in position_weights.items():
+            pos_mask = positions == position
+            for component, value in overrides.items():
+                if component in row_weights:
+                    row_weights[component][pos_mask] = value
+
+    return row_weights
+
+
+def calculate_component_matrix(
+    df: pd.DataFrame,
+    sub_weights: Optional[Dict[str, float]] = None,
+    week: int = 6,
+    use_advanced_metrics: bool = True
+) -> pd.DataFrame:
+    """
+    Calculate the unit-weight Smart Value component matrix.
+
+    Every component is linear in its weight, so scoring each one with
+    weight 1.0 gives a (players x components) matrix that can be combined
+    with any weight vector without recomputing the components.
+
+    Args:
+        df: Player DataFrame
+        sub_weights: Optional sub-component weights (these shape the components
+            themselves, so they are fixed for the matrix)
+        week: Current week number
+        use_advanced_metrics: If False, falls back to original component logic
+
+    Returns:
+        DataFrame indexed like df with one column per SMART_VALUE_COMPONENTS key
+        plus 'chalk_penalty' (unweighted, always added)
+    """
+    scored = get_unit_component_frame(df, sub_weights, week, use_advanced_metrics)
+
+    matrix = pd.DataFrame(
+        {component: scored[col] for component, col in SMART_VALUE_COMPONENTS.items()},
+        index=df.index
+    )
+    matrix['chalk_penalty'] = scored['chalk_penalty']
+
+    return matrix
+
+
+def build_weight_matrix(weight_sets: Dict[str, Dict[str, float]]) -> pd.DataFrame:
+    """
+    Stack weight dictionaries into a (components x K) matrix.
+
+    Args:
+        weight_sets: Mapping of label -> component weights
+
+    Returns:
+        DataFrame indexed by component with one column per label
+
+    Raises:
+        KeyError: If a weight set is missing a required component
+    """
+    columns = {}
+    for label, weights in weight_sets.items():
+        columns[label] = [
+            weights[component] if component not in OPTIONAL_WEIGHT_DEFAULTS
+            else weights.get(component, OPTIONAL_WEIGHT_DEFAULTS[component])
+            for component in SMART_VALUE_COMPONENTS
+        ]
+
+    return pd.DataFrame(columns, index=list(SMART_VALUE_COMPONENTS), dtype=float)
+
+
+def combine_component_matrix(component_matrix: pd.DataFrame, weight_matrix: pd.DataFrame) -> pd.DataFrame:
+    """
+    Produce Smart Value (0-100) for K weight vectors with one matrix product.
+
+    Applies the same GLOBAL min-max scaling and rounding as
+    calculate_smart_value_enhanced, independently per weight vector.
+
+    Args:
+        component_matrix: Output of calculate_component_matrix()
+        weight_matrix: Output of build_weight_matrix()
+
+    Returns:
+        DataFrame indexed like component_matrix with one Smart Value column per label
+    """
+    components = component_matrix[list(SMART_VALUE_COMPONENTS)].to_numpy(dtype=float)
+    chalk = component_matrix['chalk_penalty'].to_numpy(dtype=float)
+
+    raw = components @ weight_matrix.to_numpy(dtype=float) + chalk[:, None]
+
+    # NaN-skipping like Series.min()/max()
+    min_val = np.nanmin(raw, axis=0) if len(raw) else np.zeros(raw.shape[1])
+    max_val = np.nanmax(raw, axis=0) if len(raw) else np.zeros(raw.shape[1])
+    spread = max_val - min_val
+    scaled = np.where(
+        spread > 0,
+        (raw - min_val) / np.where(spread > 0, spread, 1.0) * 100,
+        50.0
+    )
+
+    return pd.DataFrame(scaled, index=component_matrix.index, columns=weight_matrix.columns).round(1)
+
+
+def calculate_smart_value_batch(
+    df: pd.DataFrame,
+    profiles=None,
+    sub_weights: Optional[Dict[str, float]] = None,
+    week: int = 6,
+    use_advanced_metrics: bool = True
+) -> pd.DataFrame:
+    """
+    Calculate Smart Value for several weight profiles in one pass.
+
+    Components are computed once per distinct set of sub-weights, then every
+    profile sharing those sub-weights is scored with a single
+    (players x components) @ (components x K) product.
+
+    Args:
+        df: Player DataFrame
+        profiles: One of:
+            - None: all WEIGHT_PROFILES
+            - List of WEIGHT_PROFILES names
+            - Dict of label -> weights, where weights is either a flat component
+              dict or a profile_manager config ({'main_weights', 'sub_weights', ...})
+        sub_weights: Sub-weights for profiles that don't carry their own
+        week: Current week number
+        use_advanced_metrics: If False, falls back to original component logic
+
+    Returns:
+        DataFrame indexed like df with one Smart Value column per profile label
+
+    Raises:
+        ValueError: If a named profile does not exist
+    """
+    if profiles is None:
+        profiles = list(WEIGHT_PROFILES.keys())
+
+    if not isinstance(profiles, dict):
+        missing = [name for name in profiles if name not in WEIGHT_PROFILES]
+        if missing:
+            raise ValueError(f"Profile(s) {missing} not found. Available: {list(WEIGHT_PROFILES.keys())}")
+        profiles = {name: WEIGHT_PROFILES[name] for name in profiles}
+
+    # Group profiles by the sub-weights that shape their components
+    groups: Dict[str, Dict] = {}
+    for label, config in profiles.items():
+        if 'main_weights' in config:
+            weights = config['main_weights']
+            profile_sub_weights = config.get('sub_weights') or sub_weights
+        else:
+            weights = config
+            profile_sub_weights = sub_weights
+
+        key = repr(sorted(profile_sub_weights.items())) if profile_sub_weights else ''
+        group = groups.setdefault(key, {'sub_weights': profile_sub_weights, 'weights': {}})
+        group['weights'][label] = weights
+
+    results = []
+    for group in groups.values():
+        component_matrix = calculate_component_matrix(
+            df, sub_weights=group['sub_weights'], week=week, use_advanced_metrics=use_advanced_metrics
+        )
+        results.append(combine_component_matrix(component_matrix, build_weight_matrix(group['weights'])))
+
+    return pd.concat(results, axis=1)[list(profiles)]
+
+
 def calculate_smart_value_enhanced(
     df: pd.DataFrame,
     profile: str = 'balanced',
@@ -368,8 +878,6 @@ def calculate_smart_value_enhanced(
             raise ValueError(f"Profile '{profile}' not found. Available: {list(WEIGHT_PROFILES.keys())}")
         weights = WEIGHT_PROFILES[profile]
 
-    df = df.copy()
-
     # Log whether we're using advanced metrics
     advanced_columns = [col for col in df.columns if col.startswith('adv_')]
     if advanced_columns and use_advanced_metrics:
@@ -377,63 +885,15 @@ def calculate_smart_value_enhanced(
     else:
         logger.info("Smart Value using original metrics only")
 
-    # Choose enhanced or original functions based on flag
-    if use_advanced_metrics and advanced_columns:
-        base_func = calculate_base_score_enhanced
-        opp_func = calculate_opportunity_score_enhanced
-        risk_func = calculate_risk_score_enhanced
-    else:
-        # Use original functions (already imported)
-        base_func = calculate_base_score
-        opp_func = calculate_opportunity_score
-        risk_func = calculate_risk_score
+    # Components are cached at unit weight (keyed by input data + sub-weights),
+    # so weight-only changes just rescale the cached scores
+    by_position = bool(position_weights) and 'position' in df.columns
+    df = get_unit_component_frame(df, sub_weights, week, use_advanced_metrics, by_position)
 
-    # If position-specific weights provided, calculate per position
-    if position_weights and 'position' in df.columns:
-        # Initialize score columns
-        df['base_score'] = 0.0
-        df['opp_score'] = 0.0
-        df['trends_score'] = 0.0
-        df['risk_score'] = 0.0
-        df['matchup_score'] = 0.0
-        df['leverage_score'] = 0.0
-        df['regression_score'] = 0.0
-
-        for position in df['position'].unique():
-            pos_mask = df['position'] == position
-            pos_df = df[pos_mask].copy()
-
-            # Use position-specific weights if available
-            if position in position_weights:
-                pos_weights = weights.copy()
-                pos_weights.update(position_weights[position])
-            else:
-                pos_weights = weights
-
-            # Calculate scores for this position
-            pos_df = base_func(pos_df, pos_weights['base'])
-            pos_df = opp_func(pos_df, pos_weights['opportunity'], sub_weights)
-            pos_df = calculate_trends_score(pos_df, pos_weights['trends'], sub_weights)
-            pos_df = risk_func(pos_df, pos_weights['risk'])
-            pos_df = calculate_matchup_score(pos_df, pos_weights['matchup'], None, week)
-            pos_df = calculate_leverage_score(pos_df, pos_weights.get('leverage', 0.15))
-            pos_df = calculate_regression_score(pos_df, pos_weights.get('regression', 0.05))
-
-            # Update the main dataframe for this position
-            for col in ['base_score', 'opp_score', 'trends_score', 'risk_score', 'matchup_score', 'leverage_score', 'regression_score']:
-                df.loc[pos_mask, col] = pos_df[col]
-    else:
-        # Calculate uniformly across all positions
-        df = base_func(df, weights['base'])
-        df = opp_func(df, weights['opportunity'], sub_weights)
-        df = calculate_trends_score(df, weights['trends'], sub_weights)
-        df = risk_func(df, weights['risk'])
-        df = calculate_matchup_score(df, weights['matchup'], None, week)
-        df = calculate_leverage_score(df, weights.get('leverage', 0.15))
-        df = calculate_regression_score(df, weights.get('regression', 0.05))
-
-    # Apply anti-chalk penalty (independent of position)
-    df = calculate_anti_chalk_penalty(df)
+    # Apply per-row weights (position-specific overrides where provided)
+    row_weights = _resolve_row_weights(df, weights, position_weights if by_position else None)
+    for component, col in SMART_VALUE_COMPONENTS.items():
+        df[col] = df[col] * row_weights[component]
 
     # Sum all components (raw score)
     df['smart_value_raw'] = (
@@ -471,98 +931,7 @@ def calculate_smart_value_enhanced(
     df['smart_value_global'] = df['smart_value_global'].round(1)
 
     # Build enhanced tooltip
-    def build_enhanced_tooltip(row):
-        # Show which advanced metrics were used
-        advanced_metrics = []
-        if use_advanced_metrics:
-            for col in ['adv_tprr', 'adv_yprr', 'adv_rte_pct', 'adv_yaco_att', 'adv_success_rate']:
-                if col in row and pd.notna(row[col]) and row[col] != 0:
-                    advanced_metrics.append(col.replace('adv_', '').upper())
-
-        global_min = row['_global_min']
-        global_max = row['_global_max']
-
-        if global_max > global_min:
-            scale_factor = 100 / (global_max - global_min)
-            base_val = row['base_score'] * scale_factor
-            opp_val = row['opp_score'] * scale_factor
-            trend_val = row['trends_score'] * scale_factor
-            risk_val = row['risk_score'] * scale_factor
-            match_val = row['matchup_score'] * scale_factor
-            leverage_val = row['leverage_score'] * scale_factor
-            chalk_penalty_val = row['chalk_penalty'] * scale_factor
-        else:
-            base_val = opp_val = trend_val = risk_val = match_val = leverage_val = chalk_penalty_val = 0
-
-        tooltip = (
-            f"Smart Value: {row['smart_value']:.1f}/100\n"
-        )
-
-        if advanced_metrics:
-            tooltip += (
-                f"━━━━━━━━━━━━━━━━━━━━━━\n"
-                f"🚀 Advanced Metrics: {', '.join(advanced_metrics)}\n"
-            )
-
-        tooltip += (
-            f"━━━━━━━━━━━━━━━━━━━━━━\n"
-            f"💡 Position SV: Best {row.get('position', 'player')} in pool\n"
-            f"💡 Global SV: Best overall (cross-position)\n"
-            f"━━━━━━━━━━━━━━━━━━━━━━\n"
-            f"Component Breakdown:\n\n"
-            f"💰 Base Value: +{base_val:.1f} ({int(weights['base']*100)}% weight)\n"
-        )
-
-        if 'adv_yaco_att' in row and row.get('position') == 'RB' and pd.notna(row['adv_yaco_att']):
-            tooltip += f"  └─ YACO/ATT adjusted: {row['adv_yaco_att']:.2f}\n"
-
-        tooltip += (
-            f"\n📊 Opportunity: +{opp_val:.1f} ({int(weights['opportunity']*100)}% weight)\n"
-        )
-
-        if advanced_metrics:
-            if 'TPRR' in advanced_metrics:
-                tooltip += f"  └─ TPRR: {row.get('adv_tprr', 0):.1%}\n"
-            if 'YPRR' in advanced_metrics:
-                tooltip += f"  └─ YPRR: {row.get('adv_yprr', 0):.2f}\n"
-            if 'RTE_PCT' in advanced_metrics:
-                tooltip += f"  └─ RTE%: {row.get('adv_rte_pct', 0):.1f}%\n"
-            if 'SUCCESS_RATE' in advanced_metrics:
-                tooltip += f"  └─ Success Rate: {row.get('adv_success_rate', 0):.1f}%\n"
-
-        tooltip += (
-            f"\n📈 Trends: {trend_val:+.1f} ({int(weights['trends']*100)}% weight)\n"
-            f"  └─ Momentum, Role Trend, Recent FP\n\n"
-            f"⚠️ Risk Adjust: {risk_val:+.1f} ({int(weights['risk']*100)}% weight)\n"
-        )
-
-        if row.get('position') == 'RB' and 'adv_success_rate' in row and pd.notna(row['adv_success_rate']):
-            tooltip += f"  └─ Floor (Success Rate): {row['adv_success_rate']:.1f}%\n"
-
-        tooltip += (
-            f"\n🎯 Matchup: {match_val:+.1f} ({int(weights['matchup']*100)}% weight)\n"
-            f"  └─ Game Total: {row.get('game_total', 0):.1f}, ITT: {row.get('team_itt', 0):.1f}\n\n"
-            f"💎 Leverage: {leverage_val:+.1f} ({int(weights.get('leverage', 0)*100)}% weight)\n"
-            f"  └─ Ceiling: {row.get('season_ceiling', 0):.1f}, Own: {row.get('ownership', 0):.1f}%\n"
-        )
-
-        if chalk_penalty_val < 0:
-            tooltip += (
-                f"\n❌ Chalk Penalty: {chalk_penalty_val:.1f}\n"
-                f"  └─ High own ({row.get('ownership', 0):.1f}%) + Bad matchup\n"
-            )
-
-        tooltip += (
-            f"━━━━━━━━━━━━━━━━━━━━━━\n"
-            f"Final Score: {row['smart_value']:.1f}/100\n"
-        )
-
-        if advanced_metrics:
-            tooltip += f"\n🔬 Enhanced with {len(advanced_metrics)} advanced metrics"
-
-        return tooltip
-
-    df['smart_value_tooltip'] = df.apply(build_enhanced_tooltip, axis=1)
+    df['smart_value_tooltip'] = build_enhanced_tooltips(df, weights, use_advanced_metrics)
 
     # Clean up helper columns
     df = df.drop(columns=['_pos_min', '_pos_max'], errors='ignore')
@@ -589,9 +958,9 @@ def generate_ab_lineups(df: pd.DataFrame, profile: str = 'balanced', week: int =
     """
     logger.info("Generating A/B test lineups...")
 
-    # Version A: With advanced metrics
+    # Version A: With advanced metrics (calculate_smart_value_enhanced copies its input)
     df_with_advanced = calculate_smart_value_enhanced(
-        df.copy(),
+        df,
         profile=profile,
         week=week,
         use_advanced_metrics=True
@@ -599,7 +968,7 @@ def generate_ab_lineups(df: pd.DataFrame, profile: str = 'balanced', week: int =
 
     # Version B: Without advanced metrics (original)
     df_without_advanced = calculate_smart_value_enhanced(
-        df.copy(),
+        df,
         profile=profile,
         week=week,
         use_advanced_metrics=False
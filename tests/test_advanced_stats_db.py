@@ -0,0 +1,169 @@
+"""
+Unit Tests for Advanced Stats Database Operations
+
+Tests the bulk upsert behind save_advanced_stats_to_database and the
+multi-week query_advanced_stats API.
+"""
+
+import pytest
+import sys
+import os
+import sqlite3
+import tempfile
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+# Add src to path
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from advanced_stats_db import (
+    save_advanced_stats_to_database,
+    load_advanced_stats_from_database,
+    query_advanced_stats,
+    clear_query_cache
+)
+from db_access import dispose_engine
+
+
+@pytest.fixture
+def db_path():
+    """Temporary database file."""
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    yield path
+    dispose_engine(path)
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(path + suffix):
+            os.unlink(path + suffix)
+
+
+@pytest.fixture
+def season_files():
+    """Receiving and (Week 8 format) snap files."""
+    receiving = pd.DataFrame({
+        'Name': ['Travis Kelce', 'Tyreek Hill', None],
+        'Team': ['KC', 'MIA', 'BUF'],
+        'POS': ['TE', 'WR', 'WR'],
+        'TPRR': [0.25, 0.31, 0.2],
+        'TGT': [8, 11, 3],
+        'aDOT': [6.5, np.nan, 9.0],
+    })
+    snaps = pd.DataFrame({
+        'name': ['Travis Kelce', 'Travis Kelce'],
+        'team': ['KC', 'KC'],
+        'position': ['TE', 'TE'],
+        'snaps': [50, 61],
+        'snap_pct': [80.5, 90.0],
+    })
+    return {'pass': None, 'rush': None, 'receiving': receiving, 'snaps': snaps}
+
+
+def _rows(db_path, table):
+    conn = sqlite3.connect(db_path)
+    df = pd.read_sql(f"SELECT * FROM {table} ORDER BY player_name", conn)
+    conn.close()
+    return df
+
+
+class TestSaveAdvancedStats:
+    """Test bulk saves and re-saves."""
+
+    def test_saves_rows_with_nulls(self, db_path, season_files):
+        assert save_advanced_stats_to_database(season_files, 6, db_path)
+
+        receiving = _rows(db_path, 'receiving_stats')
+        assert receiving['player_name'].tolist() == ['Travis Kelce', 'Tyreek Hill']
+        assert receiving['tgt'].tolist() == [8, 11]
+        assert receiving['week'].tolist() == [6, 6]
+        assert receiving['adot'].isna().tolist() == [False, True]
+
+        # Duplicate player rows: the last one wins
+        snaps = _rows(db_path, 'snap_stats')
+        assert snaps[['snaps', 'snap_pct']].values.tolist() == [[61, 90.0]]
+
+    def test_resave_updates_in_place(self, db_path, season_files):
+        save_advanced_stats_to_database(season_files, 6, db_path)
+        first_ids = _rows(db_path, 'receiving_stats')['id'].tolist()
+
+        season_files['receiving'].loc[0, 'TGT'] = 12
+        save_advanced_stats_to_database(season_files, 6, db_path)
+        save_advanced_stats_to_database(season_files, 7, db_path)
+
+        receiving = _rows(db_path, 'receiving_stats')
+        week6 = receiving[receiving['week'] == 6]
+        assert len(receiving) == 4
+        assert week6['id'].tolist() == first_ids
+        assert week6['tgt'].tolist() == [12, 11]
+
+    def test_round_trip(self, db_path, season_files):
+        save_advanced_stats_to_database(season_files, 6, db_path)
+
+        loaded = load_advanced_stats_from_database(6, db_path)
+        assert loaded['pass'] is None
+        assert loaded['receiving']['TPRR'].tolist() == [0.25, 0.31]
+        assert loaded['snaps']['Snap %'].tolist() == [90.0]
+
+    def test_tables_come_from_migrations(self, db_path, season_files):
+        save_advanced_stats_to_database(season_files, 6, db_path)
+
+        conn = sqlite3.connect(db_path)
+        versions = {v for v, in conn.execute("SELECT version FROM schema_version")}
+        indexes = {n for n, in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        conn.close()
+        assert {8, 10} <= versions
+        assert 'idx_receiving_stats_week_player' in indexes
+
+    def test_nothing_to_save(self, db_path):
+        assert not save_advanced_stats_to_database({'pass': pd.DataFrame({'Name': ['X']})}, 6, db_path)
+
+
+@pytest.fixture
+def history_db(db_path, season_files):
+    """Receiving stats saved for weeks 3-5 (TGT grows by one each week)."""
+    for week in (3, 4, 5):
+        files = dict(season_files, receiving=season_files['receiving'].assign(TGT=lambda df: df['TGT'] + week))
+        save_advanced_stats_to_database(files, week, db_path)
+    clear_query_cache()
+    return db_path
+
+
+class TestQueryAdvancedStats:
+    """Test multi-week long/wide reads and the result cache."""
+
+    def test_long_layout(self, history_db):
+        df = query_advanced_stats('receiving', range(3, 6), metrics=['tgt', 'adot'], db_path=history_db)
+
+        assert list(df.columns) == ['player_name', 'team', 'position', 'week', 'metric', 'value']
+        kelce_tgt = df[(df['player_name'] == 'Travis Kelce') & (df['metric'] == 'tgt')]
+        assert kelce_tgt['week'].tolist() == [3, 4, 5]
+        assert kelce_tgt['value'].tolist() == [11, 12, 13]
+        # Null values are not returned
+        assert df[(df['player_name'] == 'Tyreek Hill') & (df['metric'] == 'adot')].empty
+
+    def test_wide_layout(self, history_db):
+        df = query_advanced_stats('receiving', [5, 3], metrics=['tgt'], layout='wide', db_path=history_db)
+
+        assert list(df['tgt'].columns) == [3, 5]
+        assert df.loc[('Tyreek Hill', 'MIA', 'WR'), ('tgt', 5)] == 16
+
+    def test_cache_serves_copies_and_sees_new_saves(self, history_db, season_files):
+        first = query_advanced_stats('receiving', 3, metrics=['tgt'], db_path=history_db)
+        first.loc[:, 'value'] = -1
+        assert query_advanced_stats('receiving', 3, metrics=['tgt'], db_path=history_db)['value'].min() > 0
+
+        season_files['receiving']['TGT'] = 0
+        save_advanced_stats_to_database(season_files, 3, history_db)
+        assert query_advanced_stats('receiving', 3, metrics=['tgt'], db_path=history_db)['value'].max() == 0
+
+    def test_missing_table_is_empty(self, db_path):
+        assert query_advanced_stats('pass', range(1, 4), db_path=db_path).empty
+
+    def test_invalid_arguments(self, history_db):
+        with pytest.raises(ValueError):
+            query_advanced_stats('kicking', 3, db_path=history_db)
+        with pytest.raises(ValueError):
+            query_advanced_stats('receiving', 3, metrics=['tgt; DROP TABLE x'], db_path=history_db)
+        with pytest.raises(ValueError):
+            query_advanced_stats('receiving', [], db_path=history_db)
@@ -12,10 +12,10 @@ import os
 from src.api.base_client import BaseAPIClient, APIError, RateLimitError, TimeoutError
 from src.api.odds_api import OddsAPIClient
 from src.api.mysportsfeeds_api import MySportsFeedsClient
-from src.database_models import Base, VegasLine, InjuryReport, APICallLog
+from src.database_models import Base, VegasLine, InjuryReport, APICallLog, create_session
+from src.db_access import get_engine, dispose_engine
 
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import text
 
 
 # ===== Fixtures =====
@@ -26,18 +26,20 @@ def test_db_path():
     fd, path = tempfile.mkstemp(suffix='.db')
     os.close(fd)  # Close the file descriptor
     yield path
-    # Cleanup
-    try:
-        os.unlink(path)
-    except:
-        pass
+    # Cleanup (close pooled connections first)
+    dispose_engine(path)
+    for suffix in ('', '-wal', '-shm'):
+        try:
+            os.unlink(path + suffix)
+        except:
+            pass
 
 
 @pytest.fixture(scope='function')
 def db_session(test_db_path):
     """Create shared test database with proper schema."""
-    # Use the shared temporary database file
-    engine = create_engine(f'sqlite:///{test_db_path}')
+    # Use the shared temporary database file (same pool as the clients)
+    engine = get_engine(test_db_path)
     
     # Create tables from ORM models
     Base.metadata.create_all(engine)
@@ -113,8 +115,7 @@ def db_session(test_db_path):
         
         conn.commit()
     
-    Session = sessionmaker(bind=engine)
-    session = Session()
+    session = create_session(test_db_path)
     yield session
     session.close()
     Base.metadata.drop_all(engine)
@@ -304,6 +305,15 @@ def test_odds_client_fetch_nfl_odds_success(mock_request, odds_client):
     assert result[0]['itt_away'] == 21.0  # (45.5 / 2) - (3.5 / 2)
 
 
+def test_clients_share_pooled_engine(odds_client, mysportsfeeds_client, test_db_path):
+    """Test API clients use the shared engine for their database file."""
+    engine = get_engine(test_db_path)
+    
+    assert odds_client.db_session.get_bind() is engine
+    assert mysportsfeeds_client.db_session.get_bind() is engine
+    assert odds_client.session.get_bind() is engine
+
+
 def test_odds_client_calculate_itt():
     """Test ITT calculation formula."""
     client = OddsAPIClient(api_key="test")
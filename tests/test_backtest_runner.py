@@ -0,0 +1,170 @@
+"""
+Unit Tests for Backtest Runner
+
+Tests the hindsight optimum and the weeks x profiles x configs grid,
+including the stored BacktestResult rows.
+"""
+
+import pytest
+import sys
+import os
+import json
+import sqlite3
+import tempfile
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+# Add src to path
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from sqlalchemy import create_engine
+
+from backtest_runner import hindsight_optimal_score, run_backtests
+from database_models import Base, BacktestResult, create_session
+from historical_data_manager import HistoricalDataManager
+
+
+def _slate_pool(seed):
+    """Four-team player pool with projections and actual points."""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for team, opponent in (('KC', 'BUF'), ('BUF', 'KC'), ('SF', 'LAR'), ('LAR', 'SF')):
+        for position, count in (('QB', 1), ('RB', 3), ('WR', 4), ('TE', 2), ('DST', 1)):
+            for i in range(count):
+                rows.append({
+                    'player_id': f"{team}_{position}_{i}",
+                    'player_name': f"{team} {position} {i}",
+                    'position': position,
+                    'team': team,
+                    'opponent': opponent,
+                    'salary': int(rng.integers(30, 90)) * 100,
+                    'projection': float(rng.uniform(4, 25)),
+                    'ownership': float(rng.uniform(1, 30)),
+                })
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture
+def backtest_db():
+    """Database with two DraftKings slates (weeks 6 and 7) with actual points."""
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    Base.metadata.create_all(create_engine(f'sqlite:///{path}'))
+
+    manager = HistoricalDataManager(path)
+    for week in (6, 7):
+        slate_id = manager.create_slate(week=week, season=2024, site='DraftKings', contest_type='Classic', games=['KC@BUF', 'SF@LAR'])
+        pool = _slate_pool(week)
+        manager.store_player_pool_snapshot(slate_id, pool)
+        actuals = pool['projection'] * np.random.default_rng(week + 100).uniform(0.2, 1.8, len(pool))
+        manager.update_actual_points(slate_id, dict(zip(pool['player_name'], actuals.round(1))))
+    manager.close()
+
+    yield path
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(path + suffix):
+            os.unlink(path + suffix)
+
+
+class TestHindsightOptimal:
+    """Test the perfect-hindsight lineup."""
+
+    def test_picks_best_legal_roster(self):
+        pool = pd.DataFrame({
+            'position': ['QB', 'RB', 'RB', 'RB', 'WR', 'WR', 'WR', 'WR', 'TE', 'DST', 'QB'],
+            'salary': [9000, 5000, 5000, 9900, 6000, 6000, 6000, 3000, 4000, 3000, 9000],
+            'actual_points': [20, 10, 10, 40, 10, 10, 10, 15, 8, 5, None],
+        })
+        # FLEX takes the cheap WR; the 40-point RB does not fit under the cap
+        assert hindsight_optimal_score(pool) == 98.0
+
+    def test_flex_is_rb_wr_or_te(self):
+        pool = pd.DataFrame({
+            'position': ['QB', 'RB', 'RB', 'WR', 'WR', 'WR', 'TE', 'D/ST', 'K', 'RB'],
+            'salary': [6000, 5000, 5000, 5000, 5000, 5000, 4000, 3000, 2000, 5000],
+            'actual_points': [20, 10, 10, 10, 10, 10, 8, 5, 50, 1],
+        })
+        # The kicker is never picked; D/ST counts as DST
+        assert hindsight_optimal_score(pool) == 84.0
+
+    def test_no_valid_roster(self):
+        pool = pd.DataFrame({'position': ['QB', 'RB'], 'salary': [6000, 5000], 'actual_points': [20, 10]})
+        assert hindsight_optimal_score(pool) is None
+
+
+class TestRunBacktests:
+    """Test the backtest grid and stored results."""
+
+    def test_grid_results_are_stored(self, backtest_db):
+        results = run_backtests(
+            season=2024,
+            profiles=['balanced', 'gpp'],
+            configs={'one': {'lineup_count': 1}, 'two': {'lineup_count': 2, 'stacking_enabled': False}},
+            db_path=backtest_db,
+            max_workers=1
+        )
+
+        assert len(results) == 4
+        assert set(zip(results['profile_name'], results['config'])) == {
+            ('balanced', 'one'), ('balanced', 'two'), ('gpp', 'one'), ('gpp', 'two')
+        }
+        for _, row in results.iterrows():
+            assert row['weeks_tested'] == [6, 7]
+            assert [week['error'] for week in row['week_results']] == [None, None]
+            # No lineup can beat perfect hindsight
+            assert row['overall_top_score'] <= max(week['optimal_score'] for week in row['week_results'])
+            assert row['avg_gap_from_optimal'] >= 0
+        two = results[results['config'] == 'two'].iloc[0]
+        assert [len(week['lineup_scores']) for week in two['week_results']] == [2, 2]
+
+        session = create_session(backtest_db)
+        stored = session.query(BacktestResult).all()
+        assert len(stored) == 4
+        assert json.loads(stored[0].profile_weights)['base'] > 0
+        session.close()
+
+    def test_parallel_matches_sequential(self, backtest_db):
+        kwargs = dict(season=2024, weeks=[7], profiles=['balanced', 'cash'], configs={'one': {'lineup_count': 1}}, db_path=backtest_db)
+        sequential = run_backtests(max_workers=1, **kwargs)
+        parallel = run_backtests(max_workers=2, **kwargs)
+
+        columns = ['profile_name', 'config', 'overall_avg_score', 'overall_optimal_score']
+        pd.testing.assert_frame_equal(sequential[columns], parallel[columns])
+
+    def test_threshold_too_strict_is_reported(self, backtest_db):
+        results = run_backtests(
+            season=2024, weeks=[6], profiles=['balanced'],
+            configs={'strict': {'smart_threshold': 101}}, db_path=backtest_db, max_workers=1
+        )
+
+        week = results.iloc[0]['week_results'][0]
+        assert week['lineup_scores'] == []
+        assert week['error']
+        assert results.iloc[0]['overall_optimal_score'] == week['optimal_score']
+
+    def test_hindsight_uses_full_snapshot(self, backtest_db):
+        # A zero-projection WR is filtered out of the optimizer pool but
+        # still counts for the hindsight optimum
+        conn = sqlite3.connect(backtest_db)
+        conn.execute("""
+            UPDATE historical_player_pool SET projection = 0, actual_points = 1000
+            WHERE player_name = 'KC WR 0' AND slate_id LIKE '%W6%'
+        """)
+        conn.commit()
+        conn.close()
+
+        results = run_backtests(
+            season=2024, weeks=[6], profiles=['balanced'],
+            configs={'one': {'lineup_count': 1}}, db_path=backtest_db, max_workers=1
+        )
+
+        assert results.iloc[0]['overall_optimal_score'] >= 1000
+        assert results.iloc[0]['overall_top_score'] < 1000
+
+    def test_invalid_arguments(self, backtest_db):
+        with pytest.raises(ValueError, match="not found"):
+            run_backtests(season=2024, profiles=['nope'], db_path=backtest_db)
+        with pytest.raises(ValueError, match="No DraftKings Classic slates"):
+            run_backtests(season=2023, db_path=backtest_db)
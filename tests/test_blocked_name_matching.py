@@ -0,0 +1,83 @@
+"""
+Unit Tests for Blocked Player Name Matching
+
+Tests PlayerNameMapper's (team, position) blocked cdist matcher.
+"""
+
+import pytest
+import sys
+import pandas as pd
+from pathlib import Path
+from fuzzywuzzy import fuzz
+
+# Add src to path
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from player_name_mapper import PlayerNameMapper, normalize_name
+
+
+@pytest.fixture
+def snaps_df():
+    """Season snaps file with a position mismatch and a same-name player."""
+    return pd.DataFrame({
+        'Name': ['Travis Kelce', 'Taysom Hill', 'Mike Williams', 'Mike Williams', 'Patrick Mahomes II'],
+        'Team': ['KC', 'NO', 'NYJ', 'LAC', 'KC'],
+        'POS': ['TE', 'QB', 'WR', 'WR', 'QB'],
+    })
+
+
+class TestBlockedMatching:
+    """Test block construction, fallback pass and scoring."""
+
+    def test_scores_match_fuzzywuzzy(self, snaps_df):
+        mapper = PlayerNameMapper(threshold=0)
+        file_data = mapper._preprocess_files({'snaps': snaps_df})['snaps']
+        players = pd.DataFrame({
+            'name': ['Travis Kelsey', 'Pat Mahomes'],
+            'team': ['KC', 'KC'],
+            'position': ['TE', 'QB'],
+        })
+        players['normalized_name'] = players['name'].map(normalize_name)
+
+        results = mapper._match_file_blocked(players, file_data, 'snaps')
+
+        assert results[0] == ('Travis Kelce', fuzz.ratio('travis kelsey', 'travis kelce'))
+        assert results[1] == ('Patrick Mahomes II', fuzz.ratio('pat mahomes', 'patrick mahomes'))
+
+    def test_team_block_separates_same_names(self, snaps_df):
+        mapper = PlayerNameMapper()
+        player_df = pd.DataFrame({'name': ['Mike Williams'], 'position': ['WR'], 'team': ['LAC']})
+        mapper.create_mappings(player_df, {'snaps': snaps_df})
+
+        assert mapper._match_cache['snaps_Mike Williams_LAC_WR'] == ('Mike Williams', 100.0)
+
+    def test_blocks_built_once_per_file(self, snaps_df):
+        mapper = PlayerNameMapper()
+        file_data = mapper._preprocess_files({'snaps': snaps_df})['snaps']
+        first = mapper._block_candidates(file_data, 'KC', 'QB')
+
+        assert first == (['Patrick Mahomes II'], ['patrick mahomes'])
+        assert mapper._block_candidates(file_data, 'KC', 'QB') is first
+
+    def test_position_mismatch_falls_back_to_team_block(self, snaps_df):
+        mapper = PlayerNameMapper()
+        # DK lists Taysom Hill at TE; the season file lists him at QB
+        player_df = pd.DataFrame({'name': ['Taysom Hill'], 'position': ['TE'], 'team': ['NO']})
+        mappings = mapper.create_mappings(player_df, {'snaps': snaps_df})
+
+        assert mappings['Taysom Hill'].matched_name_snaps == 'Taysom Hill'
+        assert mappings['Taysom Hill'].match_score_snaps == 100.0
+
+    def test_below_threshold_keeps_best_score(self, snaps_df):
+        mapper = PlayerNameMapper()
+        player_df = pd.DataFrame({'name': ['Zzz Unknown'], 'position': ['WR'], 'team': ['KC']})
+        mappings = mapper.create_mappings(player_df, {'snaps': snaps_df})
+
+        assert mappings['Zzz Unknown'].matched_name_snaps is None
+        assert mappings['Zzz Unknown'].match_score_snaps < mapper.threshold
+
+    def test_single_player_interface(self, snaps_df):
+        mapper = PlayerNameMapper()
+        assert mapper.fuzzy_match_player('Travis Kelce', 'KC', 'TE', snaps_df) == ('Travis Kelce', 100.0)
+        assert mapper.fuzzy_match_player('Travis Kelce', 'KC', 'TE', pd.DataFrame()) == (None, 0.0)
@@ -0,0 +1,129 @@
+"""
+Unit Tests for Data Cache Module
+
+Tests the binary cache format, header-only status checks and restores.
+"""
+
+import pytest
+import sys
+import json
+import sqlite3
+from pathlib import Path
+
+# Add src to path
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+import data_cache
+from db_access import db_connection, dispose_engine
+from schema_migrations import migrate
+from point_in_time import sync_injury_reports, sync_vegas_lines
+from data_cache import (
+    CACHE_MAGIC,
+    get_cache_file_path,
+    get_cache_status,
+    list_cached_weeks,
+    read_cache_file,
+    save_injury_reports_to_cache,
+    load_injury_reports_from_cache,
+    save_vegas_lines_to_cache,
+    load_vegas_lines_from_cache
+)
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    path = tmp_path / "cache"
+    path.mkdir()
+    monkeypatch.setattr(data_cache, 'CACHE_DIR', path)
+    return path
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Migrated database with one week of injuries and lines."""
+    path = str(tmp_path / "test_dfs.db")
+    migrate(path)
+    with db_connection(path) as conn:
+        sync_injury_reports(conn, 7, [
+            {'player_name': 'A', 'team': 'KC', 'position': 'WR', 'injury_status': 'Q',
+             'practice_status': 'Limited', 'body_part': None, 'description': 'Hamstring',
+             'updated_at': '2025-10-15 09:00:00'},
+            {'player_name': 'B', 'team': 'BUF', 'position': 'RB', 'injury_status': 'O',
+             'practice_status': 'DNP', 'body_part': None, 'description': None,
+             'updated_at': '2025-10-15 09:00:00'},
+        ])
+        sync_vegas_lines(conn, 7, [
+            {'game_id': 'g1', 'home_team': 'KC', 'away_team': 'BUF', 'home_spread': -3.0,
+             'away_spread': 3.0, 'total': 47.5, 'home_itt': 25.25, 'away_itt': 22.25,
+             'fetched_at': '2025-10-15 12:00:00'},
+        ])
+    yield path
+    dispose_engine(path)
+
+
+def _rows(db_path, query):
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute(query).fetchall()
+    conn.close()
+    return rows
+
+
+class TestCacheFormat:
+    """Test the on-disk format."""
+
+    def test_round_trip(self, cache_dir, db_path):
+        assert save_injury_reports_to_cache(7, db_path)
+
+        path = get_cache_file_path('injury_reports', 7)
+        assert path.read_bytes().startswith(CACHE_MAGIC)
+        header, rows = read_cache_file(path)
+        assert header['record_count'] == 2 and header['week'] == 7
+        assert [row['player_name'] for row in rows] == ['B', 'A']
+        assert rows[0]['description'] is None and rows[0]['body_part'] is None
+
+    def test_status_reads_only_header(self, cache_dir, db_path):
+        save_vegas_lines_to_cache(7, db_path)
+        path = get_cache_file_path('vegas_lines', 7)
+        # Corrupt the payload; the header is still readable
+        data = path.read_bytes()
+        path.write_bytes(data[:-16] + b'\0' * 16)
+
+        status = get_cache_status(7)
+        assert status['vegas_lines']['exists'] and status['vegas_lines']['record_count'] == 1
+        assert not status['injury_reports']['exists']
+        assert list_cached_weeks() == [7]
+
+    def test_empty_week_not_cached(self, cache_dir, db_path):
+        assert not save_injury_reports_to_cache(8, db_path)
+        assert list(cache_dir.iterdir()) == []
+
+
+class TestRestore:
+    """Test loading caches into the database."""
+
+    def test_restore_into_fresh_database(self, cache_dir, db_path, tmp_path):
+        save_injury_reports_to_cache(7, db_path)
+        save_vegas_lines_to_cache(7, db_path)
+        fresh = str(tmp_path / "fresh.db")
+        migrate(fresh)
+
+        assert load_injury_reports_from_cache(7, fresh)['record_count'] == 2
+        assert load_vegas_lines_from_cache(7, fresh)['record_count'] == 1
+        query = "SELECT player_name, injury_status, updated_at FROM injury_reports ORDER BY player_name"
+        assert _rows(fresh, query) == _rows(db_path, query)
+        assert _rows(fresh, "SELECT total FROM vegas_lines") == [(47.5,)]
+        dispose_engine(fresh)
+
+    def test_reads_legacy_json(self, cache_dir, db_path):
+        (cache_dir / "injury_reports_week9.json").write_text(json.dumps({
+            'week': 9, 'cached_at': '2025-10-30T10:00:00', 'record_count': 1,
+            'data': [{'player_name': 'C', 'team': 'DAL', 'position': 'TE', 'injury_status': 'D',
+                      'practice_status': '', 'body_part': '', 'description': '',
+                      'updated_at': '2025-10-30 09:00:00'}]
+        }, indent=2))
+
+        assert get_cache_status(9)['injury_reports']['record_count'] == 1
+        assert load_injury_reports_from_cache(9, db_path)['cached_at'] == '2025-10-30T10:00:00'
+        assert _rows(db_path, "SELECT player_name FROM injury_reports WHERE week = 9") == [('C',)]
+        assert list_cached_weeks() == [9]
@@ -0,0 +1,141 @@
+"""
+Unit Tests for Database Access Module
+
+Tests the shared engine pool, connection pragmas and session helpers.
+"""
+
+import pytest
+import sys
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+# Add src to path
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from sqlalchemy import text
+
+from db_access import (
+    get_engine,
+    create_session,
+    get_scoped_session,
+    session_scope,
+    db_connection,
+    dispose_engine
+)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Database file with one table."""
+    path = str(tmp_path / "test_dfs.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE vegas_lines (week INTEGER, game_id TEXT)")
+    conn.commit()
+    conn.close()
+    yield path
+    dispose_engine(path)
+
+
+class TestEngines:
+    """Test engine sharing and connection configuration."""
+
+    def test_one_engine_per_file(self, db_path):
+        assert get_engine(db_path) is get_engine(os.path.join(os.path.dirname(db_path), ".", "test_dfs.db"))
+
+    def test_pragmas(self, db_path):
+        with db_connection(db_path) as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+            assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+
+    def test_replaced_file_gets_new_engine(self, db_path):
+        engine = get_engine(db_path)
+        with db_connection(db_path) as conn:
+            conn.execute("INSERT INTO vegas_lines VALUES (1, 'old')")
+
+        os.remove(db_path)
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE vegas_lines (week INTEGER, game_id TEXT)")
+        conn.execute("INSERT INTO vegas_lines VALUES (2, 'new')")
+        conn.commit()
+        conn.close()
+
+        assert get_engine(db_path) is not engine
+        with db_connection(db_path) as conn:
+            assert conn.execute("SELECT game_id FROM vegas_lines").fetchall() == [('new',)]
+
+    def test_memory_engines_are_private(self):
+        assert get_engine(':memory:') is not get_engine(':memory:')
+
+
+class TestConnections:
+    """Test pooled raw connections."""
+
+    def test_commit_and_rollback(self, db_path):
+        with db_connection(db_path) as conn:
+            conn.execute("INSERT INTO vegas_lines VALUES (1, 'a')")
+
+        with pytest.raises(ValueError):
+            with db_connection(db_path) as conn:
+                conn.execute("INSERT INTO vegas_lines VALUES (1, 'b')")
+                raise ValueError("boom")
+
+        with db_connection(db_path) as conn:
+            assert conn.execute("SELECT game_id FROM vegas_lines").fetchall() == [('a',)]
+
+    def test_row_factory_is_per_checkout(self, db_path):
+        with db_connection(db_path) as conn:
+            conn.execute("INSERT INTO vegas_lines VALUES (1, 'a')")
+
+        with db_connection(db_path, row_factory=sqlite3.Row) as conn:
+            assert conn.execute("SELECT game_id FROM vegas_lines").fetchone()['game_id'] == 'a'
+        with db_connection(db_path) as conn:
+            assert conn.execute("SELECT game_id FROM vegas_lines").fetchone() == ('a',)
+
+    def test_threads_share_the_pool(self, db_path):
+        errors = []
+
+        def write(week):
+            try:
+                with db_connection(db_path) as conn:
+                    conn.execute("INSERT INTO vegas_lines VALUES (?, 'g')", (week,))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=write, args=(week,)) for week in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        with db_connection(db_path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM vegas_lines").fetchone()[0] == 8
+
+
+class TestSessions:
+    """Test ORM session helpers."""
+
+    def test_session_scope_commits(self, db_path):
+        with session_scope(db_path) as session:
+            session.execute(text("INSERT INTO vegas_lines VALUES (3, 'x')"))
+
+        session = create_session(db_path)
+        assert session.execute(text("SELECT COUNT(*) FROM vegas_lines")).scalar() == 1
+        session.close()
+
+    def test_scoped_session_is_thread_local(self, db_path):
+        Session = get_scoped_session(db_path)
+        main_session = Session()
+        other = []
+
+        thread = threading.Thread(target=lambda: other.append(Session()))
+        thread.start()
+        thread.join()
+
+        assert Session() is main_session
+        assert other[0] is not main_session
+        Session.remove()
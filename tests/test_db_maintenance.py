@@ -0,0 +1,118 @@
+"""
+Unit Tests for Database Maintenance Module
+
+Tests the query plan report, pruning and ANALYZE/VACUUM.
+"""
+
+import pytest
+import sys
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+# Add src to path
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from db_access import dispose_engine
+from db_maintenance import (
+    QUERY_REGISTRY,
+    check_query_plans,
+    ensure_indexes,
+    prune_old_rows,
+    optimize_database
+)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Fully migrated empty database."""
+    path = str(tmp_path / "test_dfs.db")
+    ensure_indexes(path)
+    yield path
+    dispose_engine(path)
+
+
+def _log_call(conn, called_at):
+    conn.execute(
+        "INSERT INTO api_call_log (api_name, endpoint, status_code, called_at) VALUES ('the_odds_api', '/odds', 200, ?)",
+        (called_at,)
+    )
+
+
+class TestQueryPlans:
+    """Test EXPLAIN QUERY PLAN reporting."""
+
+    def test_registered_queries_use_indexes(self, db_path):
+        report = check_query_plans(db_path)
+
+        assert [row['name'] for row in report] == list(QUERY_REGISTRY)
+        assert [row['name'] for row in report if row['error']] == []
+        assert [row['name'] for row in report if row['full_scan'] or row['temp_sort']] == []
+
+    def test_trimmed_name_match_uses_expression_index(self, db_path):
+        plan = {row['name']: row['plan'] for row in check_query_plans(db_path)}['actual_points_match']
+        assert any('idx_hpp_slate_trimmed_name' in detail for detail in plan)
+
+    def test_reports_scan_and_missing_table(self, db_path):
+        report = check_query_plans(db_path, {
+            'unindexed': ("SELECT * FROM api_call_log WHERE endpoint = ?", ('/odds',)),
+            'missing': ("SELECT * FROM no_such_table", ()),
+        })
+
+        assert report[0]['full_scan']
+        assert report[1]['error'] and report[1]['plan'] == []
+
+
+class TestPruning:
+    """Test age-based pruning."""
+
+    def test_prunes_and_archives_old_rows(self, db_path, tmp_path):
+        conn = sqlite3.connect(db_path)
+        _log_call(conn, '2025-07-01 12:00:00.000000')
+        _log_call(conn, '2025-10-20 12:00:00.000000')
+        conn.execute(
+            "INSERT INTO narrative_flags (week, player_name, team, position, flag_type, flag_category, "
+            "message, severity, created_at) VALUES (1, 'A', 'KC', 'QB', 'caution', 'itt', 'm', 'yellow', ?)",
+            ('2025-07-02 08:00:00',)
+        )
+        conn.commit()
+        conn.close()
+
+        archive_dir = tmp_path / "archive"
+        deleted = prune_old_rows(db_path, days=60, archive_dir=str(archive_dir), now=datetime(2025, 10, 25))
+
+        assert deleted == {'api_call_log': 1, 'narrative_flags': 1}
+        conn = sqlite3.connect(db_path)
+        assert conn.execute("SELECT called_at FROM api_call_log").fetchall() == [('2025-10-20 12:00:00.000000',)]
+        conn.close()
+
+        archived = pd.read_csv(next(archive_dir.glob("api_call_log_*.csv.gz")))
+        assert archived['called_at'].tolist() == ['2025-07-01 12:00:00.000000']
+        assert len(list(archive_dir.glob("narrative_flags_*.csv.gz"))) == 1
+
+    def test_nothing_to_prune(self, db_path, tmp_path):
+        deleted = prune_old_rows(db_path, days=60, archive_dir=str(tmp_path / "archive"))
+        assert deleted == {'api_call_log': 0, 'narrative_flags': 0}
+        assert not (tmp_path / "archive").exists()
+
+
+class TestOptimize:
+    """Test ANALYZE and VACUUM."""
+
+    def test_analyze_and_vacuum(self, db_path):
+        conn = sqlite3.connect(db_path)
+        for day in range(1, 29):
+            _log_call(conn, f'2025-07-{day:02d} 12:00:00')
+        conn.commit()
+        conn.close()
+        prune_old_rows(db_path, days=30, now=datetime(2025, 10, 1))
+
+        sizes = optimize_database(db_path, vacuum=True)
+
+        assert sizes['size_after'] <= sizes['size_before']
+        conn = sqlite3.connect(db_path)
+        assert conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone()[0] == 1
+        conn.close()
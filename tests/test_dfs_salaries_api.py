@@ -36,8 +36,7 @@ def mock_db_path(tmp_path):
 @pytest.fixture
 def client(mock_api_key, mock_db_path):
     """Create DFS Salaries API client with mocked database."""
-    with patch('src.api.dfs_salaries_api.create_engine'), \
-         patch('src.api.dfs_salaries_api.sessionmaker'):
+    with patch('src.api.dfs_salaries_api.create_session'):
         client = DFSSalariesAPIClient(api_key=mock_api_key, db_path=mock_db_path)
         yield client
         client.close()
@@ -104,8 +103,7 @@ def mock_empty_response():
 
 def test_client_initialization(mock_api_key, mock_db_path):
     """Test DFS client initializes correctly."""
-    with patch('src.api.dfs_salaries_api.create_engine'), \
-         patch('src.api.dfs_salaries_api.sessionmaker'):
+    with patch('src.api.dfs_salaries_api.create_session'):
         client = DFSSalariesAPIClient(api_key=mock_api_key, db_path=mock_db_path)
         
         assert client.api_name == "mysportsfeeds_dfs"
@@ -375,8 +373,7 @@ def test_parse_dfs_response_multiple_sites(client, mock_dfs_response):
 
 def test_fetch_salaries_current_week(mock_api_key, mock_db_path, mock_dfs_response):
     """Test convenience function for current week."""
-    with patch('src.api.dfs_salaries_api.create_engine'), \
-         patch('src.api.dfs_salaries_api.sessionmaker'), \
+    with patch('src.api.dfs_salaries_api.create_session'), \
          patch('src.api.dfs_salaries_api.DFSSalariesAPIClient.fetch_current_week_salaries', return_value=pd.DataFrame()):
         
         df = fetch_salaries(api_key=mock_api_key, site='draftkings', db_path=mock_db_path)
@@ -386,8 +383,7 @@ def test_fetch_salaries_current_week(mock_api_key, mock_db_path, mock_dfs_respon
 
 def test_fetch_salaries_historical_week(mock_api_key, mock_db_path, mock_dfs_response):
     """Test convenience function for historical week."""
-    with patch('src.api.dfs_salaries_api.create_engine'), \
-         patch('src.api.dfs_salaries_api.sessionmaker'), \
+    with patch('src.api.dfs_salaries_api.create_session'), \
          patch('src.api.dfs_salaries_api.DFSSalariesAPIClient.fetch_historical_salaries', return_value=pd.DataFrame()):
         
         df = fetch_salaries(
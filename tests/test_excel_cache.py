@@ -0,0 +1,113 @@
+"""
+Unit Tests for Excel Cache Module
+
+Tests the Arrow cache behind read_excel_cached and batch reads with
+read_excel_many.
+"""
+
+import pytest
+import sys
+import os
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from unittest.mock import patch
+
+# Add src to path
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from excel_cache import read_excel_cached, read_excel_many, cache_path_for
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    """Two-sheet workbook with missing values in text and numeric columns."""
+    path = tmp_path / "Stats thru week 5.xlsx"
+    snaps = pd.DataFrame({
+        'Name': ['Travis Kelce', 'Tyreek Hill', 'Josh Allen'],
+        'Team': ['KC', None, 'BUF'],
+        'W': [1, 1, 2],
+        'Snap %': [80.5, np.nan, 100.0],
+    })
+    rec = pd.DataFrame({'Name': ['Travis Kelce'], 'TGT %': [22.0]})
+    with pd.ExcelWriter(path) as writer:
+        snaps.to_excel(writer, sheet_name='Snaps', index=False)
+        rec.to_excel(writer, sheet_name='Rec', index=False)
+    return str(path)
+
+
+class TestReadExcelCached:
+    """Test cache hits, invalidation and fallback."""
+
+    def test_matches_read_excel(self, workbook):
+        expected = pd.read_excel(workbook, sheet_name='Snaps')
+
+        cold = read_excel_cached(workbook, 'Snaps')
+        warm = read_excel_cached(workbook, 'Snaps')
+
+        pd.testing.assert_frame_equal(cold, expected)
+        pd.testing.assert_frame_equal(warm, expected)
+        # Missing text stays NaN (not None) like read_excel
+        assert isinstance(warm.loc[1, 'Team'], float)
+
+    def test_warm_read_skips_excel(self, workbook):
+        read_excel_cached(workbook, 'Rec')
+        assert os.path.exists(cache_path_for(workbook, 'Rec'))
+
+        with patch('excel_cache.pd.read_excel', side_effect=AssertionError("parsed Excel")):
+            df = read_excel_cached(workbook, 'Rec')
+        assert df['Name'].tolist() == ['Travis Kelce']
+
+    def test_modified_workbook_invalidates_entry(self, workbook):
+        read_excel_cached(workbook, 'Rec')
+        old_entry = cache_path_for(workbook, 'Rec')
+
+        pd.DataFrame({'Name': ['Tyreek Hill', 'Josh Allen'], 'TGT %': [30.0, 1.0]}).to_excel(
+            workbook, sheet_name='Rec', index=False
+        )
+        stat = os.stat(workbook)
+        os.utime(workbook, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        df = read_excel_cached(workbook, 'Rec')
+        assert df['Name'].tolist() == ['Tyreek Hill', 'Josh Allen']
+        assert cache_path_for(workbook, 'Rec') != old_entry
+        assert not os.path.exists(old_entry)
+
+    def test_uncacheable_sheet_falls_back(self, workbook):
+        # header=1 turns the first data row into (partly numeric) column names
+        df = read_excel_cached(workbook, 'Snaps', header=1)
+
+        pd.testing.assert_frame_equal(df, pd.read_excel(workbook, sheet_name='Snaps', header=1))
+        assert not os.path.exists(cache_path_for(workbook, 'Snaps', header=1))
+
+    def test_custom_cache_dir(self, workbook, tmp_path):
+        cache_dir = tmp_path / "cache"
+        read_excel_cached(workbook, 'Rec', cache_dir=str(cache_dir))
+
+        assert len(list(cache_dir.glob('*.feather'))) == 1
+
+
+class TestReadExcelMany:
+    """Test batch reads of paths and uploaded bytes."""
+
+    def test_paths_and_bytes(self, workbook):
+        with open(workbook, 'rb') as f:
+            upload = f.read()
+
+        results = read_excel_many({'path': workbook, 'upload': upload, 'missing': workbook + '.nope'})
+
+        assert list(results) == ['path', 'upload', 'missing']
+        expected = pd.read_excel(workbook)
+        pd.testing.assert_frame_equal(results['path'].df, expected)
+        pd.testing.assert_frame_equal(results['upload'].df, expected)
+        assert results['missing'].df is None
+        assert results['missing'].error
+
+    def test_cached_paths_skip_excel(self, workbook):
+        read_excel_cached(workbook)
+
+        with patch('excel_cache.pd.read_excel', side_effect=AssertionError("parsed Excel")):
+            results = read_excel_many({'snaps': workbook})
+        assert results['snaps'].error is None
+        assert results['snaps'].df['Name'].tolist() == ['Travis Kelce', 'Tyreek Hill', 'Josh Allen']
@@ -16,7 +16,7 @@ from pathlib import Path
 src_path = Path(__file__).parent.parent / "src"
 sys.path.insert(0, str(src_path))
 
-from historical_data_manager import HistoricalDataManager, create_slate_from_dfs_data
+from historical_data_manager import HistoricalDataManager, create_slate_from_dfs_data, read_parquet_mirror
 from database_models import Base, Slate, HistoricalPlayerPool
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
@@ -219,6 +219,78 @@ class TestPlayerPoolSnapshot:
                 player_data=invalid_data
             )
 
+    
+    def test_store_player_pool_restore_is_idempotent(self, manager, sample_player_data):
+        """Test re-storing a slate updates rows and keeps actual points."""
+        slate_id = manager.create_slate(
+            week=6,
+            season=2024,
+            site='DraftKings',
+            contest_type='Classic',
+            games=['KC@BUF']
+        )
+        manager.store_player_pool_snapshot(slate_id, sample_player_data)
+        manager.update_actual_points(slate_id, {'Patrick Mahomes': 28.4})
+        
+        updated = sample_player_data.copy()
+        updated.loc[0, 'projection'] = 26.0
+        count = manager.store_player_pool_snapshot(slate_id, updated)
+        
+        assert count == 3
+        manager.session.expire_all()
+        players = manager.session.query(HistoricalPlayerPool).filter(
+            HistoricalPlayerPool.slate_id == slate_id
+        ).all()
+        assert len(players) == 3
+        mahomes = [p for p in players if p.player_name == 'Patrick Mahomes'][0]
+        assert mahomes.projection == 26.0
+        assert mahomes.actual_points == 28.4
+    
+    def test_store_player_pool_derived_fields(self, manager):
+        """Test generated player IDs, blank opponents and optional columns."""
+        slate_id = manager.create_slate(
+            week=6,
+            season=2024,
+            site='DraftKings',
+            contest_type='Classic',
+            games=['KC@BUF']
+        )
+        player_data = pd.DataFrame({
+            'player_id': ['123', None, 'nan'],
+            'player_name': ['Patrick Mahomes', 'Chiefs', 'Josh Allen'],
+            'position': ['QB', 'DST', 'QB'],
+            'team': ['KC', 'KC', 'BUF'],
+            'opponent': ['BUF', '', None],
+            'salary': [8500.0, 3000.0, 8000.0],
+            'projection': [24.5, 8.0, 22.8],
+        })
+        
+        count = manager.store_player_pool_snapshot(slate_id, player_data, projection_source='mysportsfeeds_dfs')
+        
+        assert count == 3
+        players = {p.player_id: p for p in manager.session.query(HistoricalPlayerPool).all()}
+        assert set(players) == {'123', 'Chiefs_KC', 'Josh Allen_BUF'}
+        assert players['123'].opponent == 'BUF'
+        assert players['Chiefs_KC'].opponent is None
+        assert players['Josh Allen_BUF'].opponent is None
+        assert players['123'].salary == 8500
+        assert players['123'].ceiling is None
+        assert players['123'].data_source == 'mysportsfeeds_dfs'
+    
+    def test_store_player_pool_missing_projection(self, manager, sample_player_data):
+        """Test that a missing projection raises error."""
+        slate_id = manager.create_slate(
+            week=6,
+            season=2024,
+            site='DraftKings',
+            contest_type='Classic',
+            games=['KC@BUF']
+        )
+        sample_player_data.loc[1, 'projection'] = None
+        
+        with pytest.raises(ValueError, match="Travis Kelce"):
+            manager.store_player_pool_snapshot(slate_id, sample_player_data)
+
 
 class TestActualPointsUpdate:
     """Test suite for updating actual fantasy points."""
@@ -278,6 +350,28 @@ class TestActualPointsUpdate:
         count = manager.update_actual_points(slate_id, actuals)
         assert count == 2
     
+    def test_update_actual_points_bulk_across_slates(self, manager, sample_player_data):
+        """Test one bulk update covering several slates."""
+        week6 = manager.create_slate(week=6, season=2024, site='DraftKings', contest_type='Classic', games=['KC@BUF'])
+        week7 = manager.create_slate(week=7, season=2024, site='DraftKings', contest_type='Classic', games=['KC@BUF'])
+        manager.store_player_pool_snapshot(week6, sample_player_data)
+        padded = sample_player_data.assign(player_name=sample_player_data['player_name'] + ' ')
+        manager.store_player_pool_snapshot(week7, padded)
+        
+        actuals = pd.DataFrame({
+            'slate_id': [week6, week6, week7, week7],
+            'player_name': ['Patrick Mahomes', 'Unknown Player', 'Travis Kelce', 'Travis Kelce'],
+            'actual_points': [28.4, 5.0, 9.0, 14.2]
+        })
+        
+        counts = manager.update_actual_points_bulk(actuals)
+        
+        assert counts == {week6: 1, week7: 1}
+        snapshot = manager.load_historical_snapshot(week7)
+        kelce = snapshot[snapshot['player_name'].str.strip() == 'Travis Kelce']
+        assert kelce['actual_points'].tolist() == [14.2]
+        assert snapshot['actual_points'].isna().sum() == 2
+    
     def test_update_actual_points_slate_not_found(self, manager):
         """Test that updating non-existent slate raises error."""
         actuals = {'Patrick Mahomes': 28.4}
@@ -365,6 +459,57 @@ class TestHistoricalSnapshotRetrieval:
         """Test that loading non-existent slate raises error."""
         with pytest.raises(ValueError, match="No data found"):
             manager.load_historical_snapshot('2024-W99-DK-CLASSIC')
+    
+    def test_load_historical_snapshots_for_season(self, manager, sample_player_data):
+        """Test loading several slates in one query."""
+        for week in (6, 7):
+            slate_id = manager.create_slate(week=week, season=2024, site='DraftKings', contest_type='Classic', games=['KC@BUF'])
+            manager.store_player_pool_snapshot(slate_id, sample_player_data)
+        other = manager.create_slate(week=6, season=2024, site='FanDuel', contest_type='Classic', games=['KC@BUF'])
+        manager.store_player_pool_snapshot(other, sample_player_data)
+        
+        df = manager.load_historical_snapshots(season=2024, site='DraftKings')
+        
+        assert len(df) == 6
+        assert df['week'].tolist() == [6, 6, 6, 7, 7, 7]
+        assert df['slate_id'].unique().tolist() == ['2024-W6-DK-CLASSIC', '2024-W7-DK-CLASSIC']
+        assert list(df.columns[:5]) == ['slate_id', 'season', 'week', 'site', 'contest_type']
+        assert manager.load_historical_snapshots(season=2024, weeks=[7], include_actuals=False)['week'].unique().tolist() == [7]
+        assert manager.load_historical_snapshots(weeks=[]).empty
+
+
+class TestParquetMirror:
+    """Test suite for the season/week/site Parquet mirror."""
+    
+    def test_export_and_scan(self, manager, sample_player_data, tmp_path):
+        """Test exporting the mirror and reading partitions back."""
+        for week in (6, 7):
+            slate_id = manager.create_slate(week=week, season=2024, site='DraftKings', contest_type='Classic', games=['KC@BUF'])
+            manager.store_player_pool_snapshot(slate_id, sample_player_data)
+        
+        assert manager.export_parquet_mirror(str(tmp_path), season=2024) == 6
+        assert (tmp_path / 'season=2024' / 'week=6' / 'site=DraftKings').is_dir()
+        
+        df = read_parquet_mirror(str(tmp_path), season=2024, weeks=[7])
+        assert len(df) == 3
+        assert set(df['slate_id']) == {'2024-W7-DK-CLASSIC'}
+        assert df['salary'].tolist() == manager.load_historical_snapshot('2024-W7-DK-CLASSIC')['salary'].tolist()
+        assert read_parquet_mirror(str(tmp_path / 'missing')).empty
+    
+    def test_mirror_follows_writes(self, temp_db, sample_player_data, tmp_path):
+        """Test that a configured mirror tracks snapshots, actuals and deletes."""
+        manager = HistoricalDataManager(db_path=temp_db, parquet_dir=str(tmp_path))
+        slate_id = manager.create_slate(week=6, season=2024, site='DraftKings', contest_type='Classic', games=['KC@BUF'])
+        manager.store_player_pool_snapshot(slate_id, sample_player_data)
+        manager.update_actual_points(slate_id, {'Travis Kelce': 14.2})
+        
+        df = read_parquet_mirror(str(tmp_path), weeks=[6])
+        assert len(df) == 3
+        assert df.loc[df['player_name'] == 'Travis Kelce', 'actual_points'].tolist() == [14.2]
+        
+        manager.delete_slate(slate_id)
+        assert read_parquet_mirror(str(tmp_path)).empty
+        manager.close()
 
 
 class TestQueryAvailableWeeks:
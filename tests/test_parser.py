@@ -6,7 +6,7 @@ Tests file parsing, column detection, and data type conversion.
 
 import pytest
 import pandas as pd
-from io import StringIO
+from io import StringIO, BytesIO
 import sys
 from pathlib import Path
 
@@ -16,6 +16,7 @@ sys.path.insert(0, str(src_path))
 
 from parser import (
     parse_file,
+    sniff_excel_header_row,
     detect_columns,
     convert_data_types,
     get_file_extension,
@@ -200,6 +201,32 @@ class TestParseFile:
         
         assert "projection" in str(excinfo.value).lower()
 
+    
+    def test_parse_excel_with_title_row(self):
+        """Test Excel headers on the second row are detected from a preview."""
+        players = pd.DataFrame({
+            'Name': ['Patrick Mahomes', 'Travis Kelce'],
+            'Position': ['QB', 'TE'],
+            'Salary': [8500, 7000],
+            'Team': ['KC', 'KC'],
+            'Opponent': ['BUF', 'BUF'],
+            'Projection': [24.2, 15.1],
+        })
+        buffer = BytesIO()
+        with pd.ExcelWriter(buffer) as writer:
+            pd.DataFrame([['Week 5 Main Slate']]).to_excel(writer, index=False, header=False)
+            players.to_excel(writer, index=False, startrow=1)
+        buffer.seek(0)
+        buffer.name = "slate.xlsx"
+        
+        assert sniff_excel_header_row(buffer) == 1
+        assert buffer.tell() == 0
+        
+        df = parse_file(buffer)
+        assert len(df) == 2
+        assert df.iloc[1]['name'] == 'Travis Kelce'
+        assert df.iloc[0]['salary'] == 8500
+
 
 class TestLoadAndValidatePlayerData:
     """Test complete data loading and validation pipeline."""
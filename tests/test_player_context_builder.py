@@ -404,6 +404,35 @@ def test_enrich_players_with_prior_week(context_builder, sample_player_df, sampl
     assert pd.isna(mahomes_row['last_week_points'])
 
 
+def test_enrich_players_injury_name_variants(context_builder):
+    """Test case-insensitive, name-only and fuzzy injury matching in the merge."""
+    players = pd.DataFrame([
+        {'Name': 'christian mccaffrey', 'Team': 'sf', 'Position': 'RB', 'Salary': 9500},
+        {'Name': 'Tyreek Hill', 'Team': 'KC', 'Position': 'WR', 'Salary': 8000},  # Traded
+        {'Name': 'Christian McCaffery', 'Team': 'SF', 'Position': 'RB', 'Salary': 9500},  # Typo
+    ])
+    enriched = context_builder.enrich_players(players)
+    
+    assert list(enriched['injury_status']) == ['Q', 'Q', 'Q']
+    assert 'Ankle' in enriched.loc[1, 'injury_details']
+    
+    # Fuzzy match was persisted as the player's ESPN name
+    identity_index = context_builder.identity_index
+    assert identity_index.source_name('Christian McCaffery', 'espn', team='SF') == 'Christian McCaffrey'
+
+
+def test_prior_week_points_case_insensitive(context_builder, sample_player_df):
+    """Test prior week points mapping ignores case and keeps the first match."""
+    prior_week_df = pd.DataFrame([
+        {'Name': 'DEEBO SAMUEL', 'FantasyPoints': 11.0},
+        {'Name': 'Deebo Samuel', 'FantasyPoints': 24.5},
+    ])
+    enriched = context_builder.enrich_players(sample_player_df, prior_week_df=prior_week_df)
+    
+    deebo_row = enriched[enriched['Name'] == 'Deebo Samuel'].iloc[0]
+    assert deebo_row['last_week_points'] == 11.0
+
+
 def test_enrich_players_flags(context_builder, sample_player_df):
     """Test flag generation during enrichment."""
     enriched = context_builder.enrich_players(sample_player_df)
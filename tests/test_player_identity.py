@@ -0,0 +1,164 @@
+"""
+Unit Tests for Player Identity Module
+
+Tests the persistent player identity index and its use by PlayerNameMapper.
+"""
+
+import pytest
+import sys
+import os
+import sqlite3
+import tempfile
+import pandas as pd
+from pathlib import Path
+
+# Add src to path
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from player_identity import PlayerIdentityIndex
+from player_name_mapper import PlayerNameMapper
+from db_access import dispose_engine
+
+MIGRATIONS = Path(__file__).parent.parent / "migrations"
+
+
+@pytest.fixture
+def db_path():
+    """Temporary database with the identity tables (migration 009)."""
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    conn = sqlite3.connect(path)
+    conn.executescript((MIGRATIONS / "009_add_player_identity_tables.sql").read_text())
+    conn.close()
+    yield path
+    dispose_engine(path)
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(path + suffix):
+            os.unlink(path + suffix)
+
+
+@pytest.fixture
+def season_files():
+    """Minimal season stat files sharing provider names."""
+    snaps = pd.DataFrame({
+        'Name': ['Patrick Mahomes II', 'Travis Kelce', 'Josh Allen'],
+        'Team': ['KC', 'KC', 'BUF'],
+        'POS': ['QB', 'TE', 'QB'],
+    })
+    receiving = pd.DataFrame({
+        'Name': ['Travis Kelce'],
+        'Team': ['KC'],
+        'POS': ['TE'],
+    })
+    return {'pass': None, 'rush': None, 'receiving': receiving, 'snaps': snaps}
+
+
+@pytest.fixture
+def player_df():
+    """DraftKings player pool."""
+    return pd.DataFrame({
+        'name': ['Patrick Mahomes', 'Travis Kelce', 'Josh Allen'],
+        'position': ['QB', 'TE', 'QB'],
+        'team': ['KC', 'KC', 'BUF'],
+    })
+
+
+class TestPlayerIdentityIndex:
+    """Test identity creation, linking and persistence."""
+
+    def test_get_or_create_is_idempotent(self, db_path):
+        index = PlayerIdentityIndex(db_path)
+        first = index.get_or_create("Patrick Mahomes", team="KC", position="QB")
+        second = index.get_or_create("patrick mahomes", team="KC")
+
+        assert first.identity_id == second.identity_id
+        assert len(index) == 1
+
+    def test_links_persist_across_instances(self, db_path):
+        index = PlayerIdentityIndex(db_path)
+        identity = index.get_or_create("Patrick Mahomes", team="KC", dk_id=123)
+        index.link(identity, 'season', "Patrick Mahomes II", team="KC", match_score=94.0)
+        index.link(identity, 'espn', "Pat Mahomes", team="KC")
+        index.close()
+
+        reopened = PlayerIdentityIndex(db_path)
+        assert reopened.source_name("Patrick Mahomes", 'season', team="KC") == "Patrick Mahomes II"
+        assert reopened.source_name("Patrick Mahomes", 'espn', team="KC") == "Pat Mahomes"
+        assert reopened.lookup("Pat Mahomes", team="KC", source='espn').dk_id == "123"
+        assert reopened.lookup("Patrick Mahomes", team="KC").season_match_score == 94.0
+
+    def test_name_only_lookup_requires_unique_identity(self, db_path):
+        index = PlayerIdentityIndex(db_path)
+        index.get_or_create("Mike Williams", team="NYJ")
+        index.get_or_create("Josh Allen", team="BUF", position="QB")
+        index.get_or_create("Josh Allen", team="JAX", position="LB")
+
+        assert index.lookup("Mike Williams").canonical_name == "Mike Williams"
+        assert index.lookup("Josh Allen") is None
+        assert index.lookup("Josh Allen", team="JAX").team == "JAX"
+
+    def test_traded_player_keeps_identity(self, db_path):
+        index = PlayerIdentityIndex(db_path)
+        before = index.get_or_create("Amari Cooper", team="CLE", position="WR")
+        after = index.get_or_create("Amari Cooper", team="BUF", position="WR")
+
+        assert after.identity_id == before.identity_id
+        assert after.team == "BUF"
+        assert index.lookup("Amari Cooper", team="CLE").identity_id == before.identity_id
+
+    def test_missing_team_is_blank_key(self, db_path):
+        index = PlayerIdentityIndex(db_path)
+        identity = index.get_or_create("Player One", team=float('nan'))
+        index.link(identity, 'results', "Player One Jr.", team=None)
+        index.commit()
+
+        assert identity.team is None
+        assert index.lookup("Player One Jr.", source='results').identity_id == identity.identity_id
+
+    def test_writes_are_buffered_until_commit(self, db_path):
+        index = PlayerIdentityIndex(db_path)
+        identity = index.get_or_create("Patrick Mahomes", team="KC")
+        index.link(identity, 'season', "Patrick Mahomes II", team="KC")
+
+        # No write transaction is open, so other writers are not blocked
+        other = sqlite3.connect(db_path, timeout=0)
+        other.execute("INSERT INTO player_identities (canonical_name, normalized_name) VALUES ('X', 'x')")
+        other.commit()
+        other.close()
+        assert identity.identity_id < 0
+
+        index.commit()
+        assert identity.identity_id > 0
+        assert index.lookup("Patrick Mahomes II", team="KC", source='season') is identity
+        index.close()
+
+        reopened = PlayerIdentityIndex(db_path)
+        assert reopened.lookup("Patrick Mahomes II", team="KC", source='season').identity_id == identity.identity_id
+
+
+class TestMapperIdentityIntegration:
+    """Test that PlayerNameMapper reuses persisted matches."""
+
+    def test_second_week_skips_fuzzy_matching(self, db_path, player_df, season_files):
+        first = PlayerNameMapper(identity_index=PlayerIdentityIndex(db_path))
+        first_mappings = first.create_mappings(player_df, season_files)
+        assert first.identity_hits == 0
+
+        second = PlayerNameMapper(identity_index=PlayerIdentityIndex(db_path))
+        second_mappings = second.create_mappings(player_df, season_files)
+
+        assert second.identity_hits == 3
+        assert second._match_cache == {}
+        for name, mapping in first_mappings.items():
+            assert second_mappings[name].matched_name_snaps == mapping.matched_name_snaps
+            assert second_mappings[name].matched_name_receiving == mapping.matched_name_receiving
+
+    def test_known_player_absent_from_file_has_no_match(self, db_path, player_df, season_files):
+        PlayerNameMapper(identity_index=PlayerIdentityIndex(db_path)).create_mappings(player_df, season_files)
+
+        mapper = PlayerNameMapper(identity_index=PlayerIdentityIndex(db_path))
+        mappings = mapper.create_mappings(player_df, season_files)
+
+        assert mappings['Patrick Mahomes'].matched_name_snaps == 'Patrick Mahomes II'
+        assert mappings['Patrick Mahomes'].matched_name_receiving is None
@@ -0,0 +1,199 @@
+"""
+Unit Tests for Point-in-Time Module
+
+Tests delta-encoded versioning of Vegas lines and injury reports and the
+as-of reads built on it.
+"""
+
+import pytest
+import sys
+import time
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+# Add src to path
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from db_access import db_connection, dispose_engine
+from schema_migrations import migrate
+from point_in_time import (
+    sync_vegas_lines,
+    sync_injury_reports,
+    vegas_lines_as_of,
+    injury_reports_as_of,
+    load_as_of,
+    normalize_timestamp
+)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Fully migrated empty database."""
+    path = str(tmp_path / "test_dfs.db")
+    migrate(path)
+    yield path
+    dispose_engine(path)
+
+
+def _line(game_id, home_spread, fetched_at, total=45.0):
+    return {
+        'game_id': game_id, 'home_team': 'KC', 'away_team': 'BUF',
+        'home_spread': home_spread, 'away_spread': -home_spread, 'total': total,
+        'home_itt': total / 2 - home_spread / 2, 'away_itt': total / 2 + home_spread / 2,
+        'fetched_at': fetched_at,
+    }
+
+
+def _injury(player_name, status, updated_at, description='Hamstring tightness'):
+    return {
+        'player_name': player_name, 'team': 'KC', 'position': 'WR',
+        'injury_status': status, 'practice_status': 'Limited', 'body_part': 'Hamstring',
+        'description': description, 'updated_at': updated_at,
+    }
+
+
+def _checkpoint():
+    """UTC time strictly between the writes before and after the call."""
+    time.sleep(0.01)
+    as_of = normalize_timestamp(datetime.utcnow())
+    time.sleep(0.01)
+    return as_of
+
+
+def _versions(db_path, table):
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute(f"SELECT change_mask FROM {table} ORDER BY version_id").fetchall()
+    conn.close()
+    return [mask for mask, in rows]
+
+
+class TestVersioning:
+    """Test what the triggers record."""
+
+    def test_unchanged_poll_records_nothing(self, db_path):
+        with db_connection(db_path) as conn:
+            sync_vegas_lines(conn, 7, [_line('g1', -3.0, '2025-10-15 12:00:00')])
+        with db_connection(db_path) as conn:
+            result = sync_vegas_lines(conn, 7, [_line('g1', -3.0, '2025-10-16 12:00:00')])
+
+        assert result == {'written': 0, 'deleted': 0}
+        assert _versions(db_path, 'vegas_line_versions') == [127]
+
+    def test_change_stores_only_changed_columns(self, db_path):
+        with db_connection(db_path) as conn:
+            sync_vegas_lines(conn, 7, [_line('g1', -3.0, '2025-10-15 12:00:00')])
+            sync_vegas_lines(conn, 7, [_line('g1', -3.0, '2025-10-17 12:00:00', total=47.0)])
+
+        conn = sqlite3.connect(db_path)
+        mask, home_spread, total = conn.execute(
+            "SELECT change_mask, home_spread, total FROM vegas_line_versions ORDER BY version_id DESC LIMIT 1"
+        ).fetchone()
+        conn.close()
+        assert mask == 16 | 32 | 64  # total, home_itt, away_itt
+        assert home_spread is None and total == 47.0
+
+    def test_orm_style_update_is_versioned(self, db_path):
+        with db_connection(db_path) as conn:
+            sync_injury_reports(conn, 7, [_injury('A', 'Q', '2025-10-15 09:00:00')])
+            conn.execute(
+                "UPDATE injury_reports SET injury_status = 'O', updated_at = '2025-10-17 16:00:00' "
+                "WHERE player_name = 'A'"
+            )
+
+        assert _versions(db_path, 'injury_report_versions') == [31, 2]
+
+    def test_versions_are_append_only(self, db_path):
+        with db_connection(db_path) as conn:
+            sync_injury_reports(conn, 7, [_injury('A', 'Q', '2025-10-15 09:00:00')])
+
+        conn = sqlite3.connect(db_path)
+        with pytest.raises(sqlite3.IntegrityError):
+            conn.execute("UPDATE injury_report_versions SET injury_status = 'O'")
+        conn.close()
+
+
+class TestAsOf:
+    """Test point-in-time reads."""
+
+    def test_line_move_replay(self, db_path):
+        before_first = _checkpoint()
+        with db_connection(db_path) as conn:
+            sync_vegas_lines(conn, 7, [_line('g1', -3.0, '2025-10-15 12:00:00'), _line('g2', 1.0, '2025-10-15 12:00:00')])
+        between = _checkpoint()
+        with db_connection(db_path) as conn:
+            sync_vegas_lines(conn, 7, [_line('g1', -4.5, '2025-10-18 22:00:00'), _line('g2', 1.0, '2025-10-18 22:00:00')])
+
+        before = vegas_lines_as_of(7, between, db_path)
+        after = vegas_lines_as_of(7, '2100-01-01', db_path)
+
+        assert before['home_spread'].tolist() == [-3.0, 1.0]
+        assert after['home_spread'].tolist() == [-4.5, 1.0]
+        assert after['total'].tolist() == [45.0, 45.0]
+        assert after['fetched_at'].tolist() == ['2025-10-18 22:00:00', '2025-10-15 12:00:00']
+        assert vegas_lines_as_of(7, before_first, db_path).empty
+
+    def test_replayed_older_data_is_latest(self, db_path):
+        # A cache restore writes rows observed before the current ones
+        with db_connection(db_path) as conn:
+            sync_vegas_lines(conn, 7, [_line('g1', -3.0, '2025-10-18 20:00:00')])
+            sync_vegas_lines(conn, 7, [_line('g1', -7.0, '2025-10-17 12:00:00')])
+
+        latest = vegas_lines_as_of(7, '2100-01-01', db_path)
+        assert latest['home_spread'].tolist() == [-7.0]
+        assert latest['fetched_at'].tolist() == ['2025-10-17 12:00:00']
+
+    def test_valid_from_never_goes_back(self, db_path):
+        with db_connection(db_path) as conn:
+            sync_injury_reports(conn, 7, [_injury('A', 'Q', '2025-10-15 09:00:00')])
+            # A version stamped ahead of this clock (e.g. by a skewed writer)
+            conn.execute(
+                "INSERT INTO injury_report_versions (week, player_name, team, valid_from, change_mask, injury_status) "
+                "VALUES (7, 'A', 'KC', '2090-01-01 00:00:00.000', 2, 'D')"
+            )
+            sync_injury_reports(conn, 7, [_injury('A', 'O', '2025-10-17 16:00:00')])
+
+        conn = sqlite3.connect(db_path)
+        valid_from = [v for v, in conn.execute("SELECT valid_from FROM injury_report_versions ORDER BY version_id")]
+        conn.close()
+        assert valid_from[-1] == '2090-01-01 00:00:00.000'
+        assert injury_reports_as_of(7, '2100-01-01', db_path).iloc[0]['injury_status'] == 'O'
+
+    def test_removed_player_and_unchanged_columns(self, db_path):
+        with db_connection(db_path) as conn:
+            sync_injury_reports(conn, 7, [
+                _injury('A', 'Q', '2025-10-15 09:00:00'),
+                _injury('B', 'D', '2025-10-15 09:00:00', description=None),
+            ])
+        between = _checkpoint()
+        with db_connection(db_path) as conn:
+            sync_injury_reports(conn, 7, [_injury('A', 'O', '2025-10-17 16:00:00')])
+
+        latest = injury_reports_as_of(7, '2100-01-01', db_path)
+        assert latest['player_name'].tolist() == ['A']
+        assert latest.iloc[0]['injury_status'] == 'O'
+        assert latest.iloc[0]['description'] == 'Hamstring tightness'
+
+        earlier = injury_reports_as_of(7, between, db_path)
+        assert earlier['player_name'].tolist() == ['A', 'B']
+        assert earlier['injury_status'].tolist() == ['Q', 'D']
+        assert earlier.iloc[1]['description'] is None
+
+    def test_load_as_of_reads_both_tables(self, db_path):
+        with db_connection(db_path) as conn:
+            sync_vegas_lines(conn, 7, [_line('g1', -3.0, '2025-10-15 12:00:00')])
+            sync_injury_reports(conn, 7, [_injury('A', 'Q', '2025-10-15 09:00:00')])
+        between = _checkpoint()
+        with db_connection(db_path) as conn:
+            sync_injury_reports(conn, 8, [_injury('A', 'O', '2025-10-22 09:00:00')])
+
+        view = load_as_of(7, '2100-01-01', db_path)
+        assert len(view['vegas_lines']) == 1
+        assert view['injury_reports']['week'].tolist() == [7]
+
+        assert len(load_as_of(None, between, db_path)['injury_reports']) == 1
+        assert len(load_as_of(None, '2100-01-01', db_path)['injury_reports']) == 2
+
+    def test_aware_as_of_is_converted_to_utc(self):
+        assert normalize_timestamp('2025-10-18 20:00:00-04:00') == '2025-10-19 00:00:00.000'
@@ -0,0 +1,125 @@
+"""
+Unit Tests for Portfolio Index Module
+
+Tests bitset lineup indexing, overlap queries and uniqueness cut pruning.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from models import Player, Lineup
+from portfolio_index import PortfolioIndex, build_portfolio_index
+
+
+def make_lineup(names, lineup_id=1):
+    """Create a lineup from 9 player names in QB, RB, RB, WR, WR, WR, TE, FLEX, DST order."""
+    positions = ['QB', 'RB', 'RB', 'WR', 'WR', 'WR', 'TE', 'WR', 'DST']
+    players = [
+        Player(name=name, position=pos, salary=5000, projection=10.0, team='T', opponent='O')
+        for name, pos in zip(names, positions)
+    ]
+    return Lineup(
+        lineup_id=lineup_id,
+        qb=players[0], rb1=players[1], rb2=players[2],
+        wr1=players[3], wr2=players[4], wr3=players[5],
+        te=players[6], flex=players[7], dst=players[8]
+    )
+
+
+BASE = [f'P{i}' for i in range(9)]
+
+
+class TestMasks:
+    """Test bitmask construction and decoding."""
+
+    def test_mask_round_trip(self):
+        index = PortfolioIndex()
+        mask = index.mask_for_names(['A', 'B', 'C'])
+        assert mask.bit_count() == 3
+        assert index.names_for_mask(mask) == ['A', 'B', 'C']
+
+    def test_preassigned_player_order(self):
+        index = PortfolioIndex(['X', 'Y', 'Z'])
+        assert index.mask_for_names(['Z']) == 0b100
+
+    def test_overlap_counts(self):
+        index = build_portfolio_index([
+            make_lineup(BASE, 1),
+            make_lineup(BASE[:5] + ['Q1', 'Q2', 'Q3', 'Q4'], 2),
+        ])
+        assert len(index) == 2
+        assert index.overlap(index.masks[0], index.masks[1]) == 5
+        assert index.overlaps_with(make_lineup(BASE)) == [9, 5]
+
+
+class TestQueries:
+    """Test overlap queries and reports."""
+
+    def test_lineups_sharing_at_least(self):
+        index = build_portfolio_index([
+            make_lineup(BASE, 1),
+            make_lineup(BASE[:3] + ['Q1', 'Q2', 'Q3', 'Q4', 'Q5', 'Q6'], 2),
+        ])
+        probe = make_lineup(BASE[:6] + ['R1', 'R2', 'R3'])
+        assert index.lineups_sharing_at_least(probe, 5) == [0]
+        assert index.lineups_sharing_at_least(probe, 3) == [0, 1]
+
+    def test_find_duplicates(self):
+        index = build_portfolio_index([
+            make_lineup(BASE, 1),
+            make_lineup(['Q' + str(i) for i in range(9)], 2),
+            make_lineup(BASE, 3),
+        ])
+        assert index.find_duplicates() == [(0, 2)]
+
+    def test_diversity_report(self):
+        index = build_portfolio_index([
+            make_lineup(BASE, 1),
+            make_lineup(BASE[:4] + ['Q1', 'Q2', 'Q3', 'Q4', 'Q5'], 2),
+        ])
+        report = index.diversity_report()
+        assert report['lineup_count'] == 2
+        assert report['unique_players'] == 14
+        assert report['max_overlap'] == 4
+        assert report['avg_overlap'] == 4.0
+        assert report['overlap_histogram'] == {4: 1}
+        assert report['duplicate_pairs'] == []
+
+    def test_empty_report(self):
+        report = PortfolioIndex().diversity_report()
+        assert report['lineup_count'] == 0
+        assert report['avg_overlap'] == 0.0
+
+
+class TestBindingUniquenessMasks:
+    """Test pruning of uniqueness cuts that can no longer bind."""
+
+    def test_all_cuts_kept_without_blocked_players(self):
+        index = build_portfolio_index([
+            make_lineup(BASE, 1),
+            make_lineup(BASE[:4] + ['Q1', 'Q2', 'Q3', 'Q4', 'Q5'], 2),
+        ])
+        kept = index.binding_uniqueness_masks(max_shared=4)
+        assert [idx for idx, _ in kept] == [0, 1]
+
+    def test_duplicate_cuts_collapsed(self):
+        index = build_portfolio_index([make_lineup(BASE, 1), make_lineup(BASE, 2)])
+        kept = index.binding_uniqueness_masks(max_shared=4)
+        assert len(kept) == 1
+
+    def test_cut_dropped_when_too_few_players_selectable(self):
+        index = build_portfolio_index([make_lineup(BASE, 1)])
+        kept = index.binding_uniqueness_masks(max_shared=4, unavailable_names=BASE[:5])
+        assert kept == []
+
+    def test_subset_cut_dropped(self):
+        second = BASE[:8] + ['Q1']
+        index = build_portfolio_index([make_lineup(BASE, 1), make_lineup(second, 2)])
+        # With Q1 blocked, lineup 2's selectable players are a subset of lineup 1's
+        kept = index.binding_uniqueness_masks(max_shared=4, unavailable_names=['Q1'])
+        assert [idx for idx, _ in kept] == [0]
@@ -0,0 +1,159 @@
+"""
+Unit Tests for the 80/20 Regression Analyzer
+
+Tests weekly DraftKings points served from the materialized
+player_week_points table and the triggers that keep it in sync.
+"""
+
+import pytest
+import sys
+import os
+import sqlite3
+import tempfile
+from pathlib import Path
+
+# Add src to path
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from regression_analyzer import (
+    calculate_dk_fantasy_points,
+    get_prior_week_performance,
+    get_high_scorers_from_prior_week,
+    check_regression_risk_batch,
+    get_week_points
+)
+from db_access import dispose_engine
+
+MIGRATIONS = Path(__file__).parent.parent / "migrations"
+
+
+@pytest.fixture
+def db_path():
+    """Boxscore tables with one week 6 game, then migration 011 (which backfills it)."""
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    conn = sqlite3.connect(path)
+    conn.executescript((MIGRATIONS / "003_add_game_boxscore_tables.sql").read_text())
+    conn.execute("""
+        INSERT INTO game_boxscores (game_id, season, week, game_date, home_team, away_team)
+        VALUES ('G1', '2025-regular', 6, '2025-10-12', 'KC', 'BUF')
+    """)
+    conn.executemany("""
+        INSERT INTO player_game_stats
+            (game_id, player_id, player_name, team, position, pass_attempts, pass_completions,
+             pass_yards, pass_touchdowns, targets, receptions, receiving_yards,
+             receiving_touchdowns, fantasy_points_draftkings)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, [
+        ('G1', '101', 'Patrick Mahomes', 'KC', 'QB', 35, 25, 300, 3, 0, 0, 0, 0, None),
+        ('G1', '', 'Travis Kelce ', 'KC', 'TE', 0, 0, 0, 0, 9, 8, 90, 1, None),
+        ('G1', '103', 'Josh Allen', 'BUF', 'QB', 30, 20, 200, 1, 0, 0, 0, 0, 31.5),
+    ])
+    conn.commit()
+    conn.executescript((MIGRATIONS / "011_add_player_week_points.sql").read_text())
+    conn.close()
+    yield path
+    dispose_engine(path)
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(path + suffix):
+            os.unlink(path + suffix)
+
+
+def _points(db_path):
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute("SELECT player_key, normalized_name, week, dk_points FROM player_week_points ORDER BY normalized_name").fetchall()
+    conn.close()
+    return rows
+
+
+class TestWeeklyPoints:
+    """Test lookups served by player_week_points."""
+
+    def test_migration_backfills_existing_stats(self, db_path):
+        assert get_week_points(6, db_path) == {
+            'patrick mahomes': calculate_dk_fantasy_points({'pass_yards': 300, 'pass_touchdowns': 3}),
+            'travis kelce': 23.0,
+            'josh allen': 31.5,
+        }
+        assert [row[0] for row in _points(db_path)] == ['103', '101', 'travis kelce|KC']
+
+    def test_prior_week_performance(self, db_path):
+        performance = get_prior_week_performance('PATRICK MAHOMES', week=6, db_path=db_path)
+
+        assert performance['dk_points'] == 24.0
+        assert performance['raw_stats']['pass_yards'] == 300
+        assert 'dk_points' not in performance['raw_stats']
+        assert get_prior_week_performance('Patrick Mahomes', week=7, db_path=db_path) is None
+
+    def test_high_scorers(self, db_path):
+        scorers = get_high_scorers_from_prior_week(threshold=23.0, week=6, db_path=db_path)
+
+        assert [(p['player_name'], p['dk_points']) for p in scorers] == [
+            ('Josh Allen', 31.5), ('Patrick Mahomes', 24.0), ('Travis Kelce ', 23.0)
+        ]
+
+    def test_batch_keeps_requested_spelling(self, db_path):
+        results = check_regression_risk_batch(['travis kelce', 'Josh Allen', 'Nobody'], week=6, threshold=24.0, db_path=db_path)
+
+        assert results['travis kelce'][:2] == (False, 23.0)
+        assert results['travis kelce'][2]['rec_td'] == 1
+        assert results['Josh Allen'][:2] == (True, 31.5)
+        assert results['Nobody'] == (False, None, None)
+
+
+class TestTriggers:
+    """Test that ingest paths keep player_week_points in sync."""
+
+    @pytest.fixture
+    def conn(self, db_path):
+        conn = sqlite3.connect(db_path)
+        yield conn
+        conn.close()
+
+    def test_insert_or_replace_stats(self, conn, db_path):
+        conn.execute("""
+            INSERT OR REPLACE INTO player_game_stats (game_id, player_id, player_name, team, position, rush_yards)
+            VALUES ('G1', '103', 'Josh Allen', 'BUF', 'QB', 50)
+        """)
+        conn.execute("""
+            INSERT INTO player_game_stats (game_id, player_name, team, position, receptions, targets)
+            VALUES ('G1', 'Xavier Worthy', 'KC', 'WR', 2, 4)
+        """)
+        conn.commit()
+
+        assert get_week_points(6, db_path)['josh allen'] == 5.0
+        assert get_week_points(6, db_path)['xavier worthy'] == 2.0
+
+    def test_stat_and_game_updates(self, conn, db_path):
+        conn.execute("UPDATE player_game_stats SET team = 'KAN' WHERE player_name = 'Patrick Mahomes'")
+        conn.execute("UPDATE game_boxscores SET week = 7 WHERE game_id = 'G1'")
+        conn.commit()
+
+        assert get_week_points(6, db_path) == {}
+        assert len(get_week_points(7, db_path)) == 3
+        assert get_prior_week_performance('Patrick Mahomes', week=7, db_path=db_path)['team'] == 'KAN'
+
+    def test_deletes(self, conn, db_path):
+        conn.execute("DELETE FROM player_game_stats WHERE player_name = 'Josh Allen'")
+        conn.commit()
+        assert len(_points(db_path)) == 2
+
+        conn.execute("DELETE FROM game_boxscores WHERE game_id = 'G1'")
+        conn.commit()
+        assert _points(db_path) == []
+
+    def test_stats_stored_before_game(self, conn, db_path):
+        conn.execute("""
+            INSERT INTO player_game_stats (game_id, player_name, team, position, rush_yards)
+            VALUES ('G2', 'James Cook', 'BUF', 'RB', 100)
+        """)
+        conn.commit()
+        assert get_week_points(8, db_path) == {}
+
+        conn.execute("""
+            INSERT INTO game_boxscores (game_id, season, week, game_date, home_team, away_team)
+            VALUES ('G2', '2025-regular', 8, '2025-10-26', 'BUF', 'CAR')
+        """)
+        conn.commit()
+        assert get_week_points(8, db_path) == {'james cook': 10.0}
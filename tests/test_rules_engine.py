@@ -6,6 +6,7 @@ import pytest
 from datetime import datetime
 import tempfile
 import os
+import pandas as pd
 
 from src.rules_engine import SmartRulesEngine
 from src.database_models import Base, VegasLine, InjuryReport, NarrativeFlag
@@ -508,6 +509,114 @@ def test_store_flags(rules_engine, db_session):
     assert stored_flags[0].week == 1
 
 
+def test_evaluate_and_store_is_idempotent(rules_engine, db_session):
+    """Re-running a week replaces its flags instead of duplicating them."""
+    players = [
+        {'player_name': 'Patrick Mahomes', 'team': 'KC', 'position': 'QB', 'salary': 8500, 'projected_points': 24.0},
+        {'player_name': 'Committee Back', 'team': 'KC', 'position': 'RB', 'salary': 5000,
+         'projected_points': 10.0, 'attempts': 8},
+        {'player_name': 'No Flags', 'team': 'KC', 'position': 'RB', 'salary': 5000, 'projected_points': 10.0},
+    ]
+    
+    first = rules_engine.evaluate_and_store(players)
+    stored = db_session.query(NarrativeFlag).filter_by(week=1).count()
+    second = rules_engine.evaluate_and_store(players)
+    
+    assert first == second
+    assert first['No Flags'] == []
+    assert stored == sum(len(flags) for flags in first.values())
+    assert db_session.query(NarrativeFlag).filter_by(week=1).count() == stored
+
+
+def test_store_week_flags_only_replaces_current_week(rules_engine, db_session):
+    """Flags stored for other weeks are left untouched."""
+    rules_engine.store_flags('Old Week Player', 'KC', 'QB', [
+        {'flag_category': 'low_itt', 'message': 'Week 1 flag', 'severity': 'red'}
+    ])
+    other_week = SmartRulesEngine(db_path=rules_engine.db_path, week=2)
+    other_week.store_flags('Next Week Player', 'KC', 'QB', [
+        {'flag_category': 'high_itt', 'message': 'Week 2 flag', 'severity': 'green'}
+    ])
+    other_week.close()
+    
+    flags, _ = rules_engine.evaluate_players(pd.DataFrame([
+        {'player_name': 'Committee Back', 'team': 'KC', 'position': 'RB', 'salary': 5000,
+         'projected_points': 10.0, 'attempts': 8}
+    ]))
+    assert rules_engine.store_week_flags(flags) == 1
+    
+    week_1 = db_session.query(NarrativeFlag).filter_by(week=1).all()
+    assert [f.player_name for f in week_1] == ['Committee Back']
+    assert week_1[0].flag_category == 'committee'
+    assert week_1[0].flag_type == 'warning'
+    assert db_session.query(NarrativeFlag).filter_by(week=2).count() == 1
+
+
+# ===== Batch Evaluation Tests =====
+
+@pytest.fixture
+def player_pool():
+    """Player pool covering every position's rules."""
+    return pd.DataFrame([
+        {'player_name': 'Patrick Mahomes', 'team': 'KC', 'position': 'QB', 'salary': 8500, 'projected_points': 24.0},
+        {'player_name': 'Caleb Williams', 'team': 'CHI', 'position': 'QB', 'salary': 6000, 'projected_points': 16.0},
+        {'player_name': 'Committee Back', 'team': 'CAR', 'position': 'RB', 'salary': 6000, 'projected_points': 10.0,
+         'projected_ceiling': 15.0, 'attempts': 8},
+        {'player_name': 'Hot Receiver', 'team': 'BUF', 'position': 'WR', 'salary': 7000, 'projected_points': 15.0,
+         'projected_ceiling': 20.0, 'last_week_points': 25.0, 'snaps': 15, 'routes': 18},
+        {'player_name': 'Cheap Receiver', 'team': 'KC', 'position': 'WR', 'salary': 3500, 'projected_points': 12.0,
+         'projected_ceiling': 22.0, 'projected_ownership': 5.0},
+        {'player_name': 'Blocking End', 'team': 'CAR', 'position': 'TE', 'salary': 2800, 'projected_points': 4.0,
+         'snaps': 15, 'routes': 8},
+        {'player_name': 'Bears', 'team': 'CHI', 'position': 'DST', 'salary': 3000, 'projected_points': 8.0,
+         'opponent_oline_rank': 30},
+        {'player_name': 'Free Agent', 'team': None, 'position': 'TE', 'salary': 2500, 'projected_points': 1.0},
+    ])
+
+
+def test_evaluate_players_matches_evaluate_player(rules_engine, player_pool):
+    """Batch flags equal per-player flags, in the same order."""
+    flags, counts = rules_engine.evaluate_players(player_pool)
+    
+    for row, player in enumerate(player_pool.to_dict('records')):
+        player_flags = flags[flags['row'] == row][['flag_category', 'message', 'severity']].to_dict('records')
+        if player['team'] is None:
+            assert player_flags == []
+            continue
+        
+        kwargs = {k: v for k, v in player.items() if v is not None and v == v}
+        assert player_flags == rules_engine.evaluate_player(**kwargs)
+    
+    assert set(flags['player_name']) == set(player_pool['player_name']) - {'Free Agent'}
+
+
+def test_evaluate_players_counts(rules_engine, player_pool):
+    """Severity counts are aligned with the input index."""
+    player_pool.index = [f"p{i}" for i in range(len(player_pool))]
+    flags, counts = rules_engine.evaluate_players(player_pool)
+    
+    assert list(counts.index) == list(player_pool.index)
+    assert list(counts.columns) == ['flag_count', 'red_flags', 'yellow_flags', 'green_flags']
+    assert counts['flag_count'].sum() == len(flags)
+    assert (counts['flag_count'] == counts[['red_flags', 'yellow_flags', 'green_flags']].sum(axis=1)).all()
+    
+    # Committee Back: low volume + salary/ceiling mismatch
+    assert counts.loc['p2'].to_dict() == {'flag_count': 2, 'red_flags': 2, 'yellow_flags': 0, 'green_flags': 0}
+    # Cheap Receiver: value play + leverage play
+    assert counts.loc['p4', 'green_flags'] == 2
+    # Free Agent has no team and is skipped
+    assert counts.loc['p7', 'flag_count'] == 0
+
+
+def test_evaluate_players_empty(rules_engine):
+    """An empty pool yields an empty flags table."""
+    flags, counts = rules_engine.evaluate_players(pd.DataFrame(columns=['player_name', 'team', 'position']))
+    
+    assert flags.empty
+    assert list(flags.columns) == ['row', 'player_name', 'team', 'position', 'flag_category', 'message', 'severity']
+    assert counts.empty
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
 
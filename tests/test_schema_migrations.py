@@ -0,0 +1,157 @@
+"""
+Unit Tests for Schema Migrations Module
+
+Tests version tracking, transactional application and the startup check.
+"""
+
+import pytest
+import sys
+import sqlite3
+from pathlib import Path
+
+# Add src to path
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from schema_migrations import (
+    MigrationError,
+    discover_migrations,
+    split_statements,
+    migrate,
+    ensure_schema,
+    pending_migrations,
+    verify_checksums,
+    get_schema_version,
+    schema_task_done,
+    mark_schema_task_done
+)
+
+
+@pytest.fixture
+def migrations_dir(tmp_path):
+    """Two migrations, the second with a trigger body."""
+    path = tmp_path / "migrations"
+    path.mkdir()
+    (path / "001_create_lines.sql").write_text(
+        "CREATE TABLE lines (week INTEGER, total REAL);\n"
+        "CREATE TABLE line_log (week INTEGER);\n"
+    )
+    (path / "002_add_trigger.sql").write_text(
+        "-- Log every insert\n"
+        "CREATE TRIGGER trg_lines_insert AFTER INSERT ON lines\n"
+        "BEGIN\n"
+        "    INSERT INTO line_log VALUES (NEW.week);\n"
+        "END;\n"
+    )
+    (path / "README.sql").write_text("-- not a migration\n")
+    return path
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "test_dfs.db")
+
+
+def _tables(db_path):
+    conn = sqlite3.connect(db_path)
+    names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')")}
+    conn.close()
+    return names
+
+
+class TestDiscovery:
+    """Test migration file discovery and statement splitting."""
+
+    def test_discovers_numbered_files_in_order(self, migrations_dir):
+        migrations = discover_migrations(migrations_dir)
+        assert [(m.version, m.name) for m in migrations] == [
+            (1, "001_create_lines.sql"), (2, "002_add_trigger.sql")
+        ]
+
+    def test_duplicate_version_rejected(self, migrations_dir):
+        (migrations_dir / "002_other.sql").write_text("SELECT 1;")
+        with pytest.raises(MigrationError):
+            discover_migrations(migrations_dir)
+
+    def test_trigger_body_is_one_statement(self, migrations_dir):
+        statements = split_statements((migrations_dir / "002_add_trigger.sql").read_text())
+        assert len(statements) == 1
+        assert statements[0].endswith("END;")
+
+    def test_repo_migrations_have_unique_versions(self):
+        versions = [m.version for m in discover_migrations()]
+        assert versions == sorted(set(versions))
+
+
+class TestMigrate:
+    """Test applying migrations."""
+
+    def test_applies_pending_once(self, migrations_dir, db_path):
+        assert migrate(db_path, migrations_dir) == [1, 2]
+        assert {"lines", "line_log", "trg_lines_insert", "schema_version"} <= _tables(db_path)
+        assert get_schema_version(db_path) == 2
+
+        assert migrate(db_path, migrations_dir) == []
+        assert pending_migrations(db_path, migrations_dir) == []
+
+    def test_only_new_migration_runs(self, migrations_dir, db_path):
+        migrate(db_path, migrations_dir)
+        (migrations_dir / "003_add_index.sql").write_text("CREATE INDEX idx_lines_week ON lines(week);")
+
+        assert [m.version for m in pending_migrations(db_path, migrations_dir)] == [3]
+        assert migrate(db_path, migrations_dir) == [3]
+
+    def test_failed_migration_rolls_back(self, migrations_dir, db_path):
+        migrate(db_path, migrations_dir)
+        (migrations_dir / "003_broken.sql").write_text(
+            "CREATE TABLE half_done (id INTEGER);\n"
+            "INSERT INTO missing_table VALUES (1);\n"
+        )
+
+        with pytest.raises(MigrationError):
+            migrate(db_path, migrations_dir)
+
+        assert "half_done" not in _tables(db_path)
+        assert get_schema_version(db_path) == 2
+
+    def test_changed_file_reported_not_rerun(self, migrations_dir, db_path):
+        migrate(db_path, migrations_dir)
+        (migrations_dir / "001_create_lines.sql").write_text("CREATE TABLE lines (week INTEGER);\n")
+
+        assert verify_checksums(db_path, migrations_dir) == ["001_create_lines.sql"]
+        assert migrate(db_path, migrations_dir) == []
+
+    def test_repo_migrations_apply_to_empty_database(self, db_path):
+        applied = migrate(db_path)
+        assert applied == [m.version for m in discover_migrations()]
+        assert {"slates", "historical_player_pool", "player_week_points"} <= _tables(db_path)
+
+
+class TestEnsureSchema:
+    """Test the cheap startup check."""
+
+    def test_second_call_skips_database(self, migrations_dir, db_path):
+        assert ensure_schema(db_path, migrations_dir) == [1, 2]
+
+        # Not looked at again in this process, even with a new file present
+        (migrations_dir / "003_add_index.sql").write_text("CREATE INDEX idx_lines_week ON lines(week);")
+        assert ensure_schema(db_path, migrations_dir) == []
+        assert get_schema_version(db_path) == 2
+
+    def test_replaced_file_is_checked_again(self, migrations_dir, db_path):
+        ensure_schema(db_path, migrations_dir)
+        fresh = db_path + ".new"
+        sqlite3.connect(fresh).close()
+        Path(fresh).replace(db_path)
+
+        assert ensure_schema(db_path, migrations_dir) == [1, 2]
+
+    def test_schema_tasks(self, db_path):
+        assert not schema_task_done(db_path, "task")
+        mark_schema_task_done(db_path, "task")
+        assert not schema_task_done(db_path, "task")  # no file yet
+
+        sqlite3.connect(db_path).close()
+        mark_schema_task_done(db_path, "task")
+        assert schema_task_done(db_path, "task")
+        assert not schema_task_done(db_path, "other")
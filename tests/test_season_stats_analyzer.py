@@ -0,0 +1,122 @@
+"""
+Unit Tests for Season Stats Analyzer Base Metrics
+
+Tests the pivot-based extraction of the original 9 base metrics from the
+Snaps and Receiving files.
+"""
+
+import pytest
+import sys
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+# Add src to path
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from player_name_mapper import PlayerNameMapper, PlayerMapping
+from season_stats_analyzer import _enrich_with_base_metrics, _weekly_matrix
+
+
+@pytest.fixture
+def snaps_df():
+    """Weekly Snaps file: Kelce plays W1-W5 (W3 listed twice), Hill misses W2."""
+    return pd.DataFrame({
+        'Name': ['Travis Kelce'] * 6 + ['Tyreek Hill'] * 4,
+        'W': [1, 2, 3, 3, 4, 5, 1, 3, 4, 5],
+        'Snap %': [80, 85, 90, 10, 75, 95, 70, 72, np.nan, 78],
+        'FP': [10, 12, 20, 0, 8, 16, 25, 5, 14, 30],
+        'FP/G': [13.2] * 6 + [18.5] * 4,
+    })
+
+
+@pytest.fixture
+def receiving_df():
+    """Receiving file with two weeks for Kelce."""
+    return pd.DataFrame({
+        'Name': ['Travis Kelce', 'Travis Kelce', 'Tyreek Hill'],
+        'W': [1, 2, 1],
+        'TGT %': [20.0, 30.0, 28.0],
+        'EZTGT': [1, 2, 0],
+        'FP': [10.0, 12.0, 25.0],
+        'RecXFP': [9.0, 9.0, np.nan],
+    })
+
+
+@pytest.fixture
+def mapper():
+    """Name mappings from DraftKings names to season file names."""
+    mapper = PlayerNameMapper()
+    for name, position in [('Travis Kelce', 'TE'), ('Tyreek Hill', 'WR'), ('Josh Allen', 'QB')]:
+        mapping = PlayerMapping(original_name=name, normalized_name=name.lower(), position=position, team='KC')
+        if name != 'Josh Allen':
+            mapping.matched_name_snaps = name
+            mapping.matched_name_receiving = name
+        mapper.mappings[name] = mapping
+    return mapper
+
+
+@pytest.fixture
+def player_df():
+    return pd.DataFrame({
+        'name': ['Travis Kelce', 'Tyreek Hill', 'Josh Allen'],
+        'position': ['TE', 'WR', 'QB'],
+        'team': ['KC', 'MIA', 'BUF'],
+    })
+
+
+class TestWeeklyMatrix:
+    """Test the (player × week) pivot."""
+
+    def test_first_row_per_week_and_missing_weeks_zero(self, snaps_df):
+        matrix = _weekly_matrix(snaps_df, 'Snap %', range(1, 6))
+
+        assert list(matrix.columns) == [1, 2, 3, 4, 5]
+        assert matrix.loc['Travis Kelce'].tolist() == [80, 85, 90, 75, 95]
+        assert matrix.loc['Tyreek Hill'].tolist() == [70, 0, 72, 0, 78]
+
+    def test_missing_column_is_zero(self, snaps_df):
+        matrix = _weekly_matrix(snaps_df, 'Routes', range(1, 3))
+        assert (matrix.to_numpy() == 0).all()
+
+
+class TestBaseMetrics:
+    """Test the base metrics written onto players."""
+
+    def test_snap_metrics(self, player_df, snaps_df, mapper):
+        result = _enrich_with_base_metrics(player_df, {'snaps': snaps_df, 'receiving': None}, mapper)
+        kelce = result.iloc[0]
+
+        assert kelce['season_trend'] == 15
+        assert kelce['season_cons'] == pytest.approx(np.std([80, 85, 90, 75, 95]))
+        assert kelce['season_mom'] == pytest.approx(np.mean([20, 8, 16]) - np.mean([10, 12]))
+        assert kelce['season_snap'] == 85
+        assert kelce['season_ceiling'] == 20
+        assert kelce['season_fpg'] == pytest.approx(13.2)
+
+        # Unmatched player keeps defaults
+        assert result.iloc[2][['season_trend', 'season_snap', 'season_fpg']].tolist() == [0.0, 0.0, 0.0]
+
+    def test_week_window(self, player_df, snaps_df, mapper):
+        result = _enrich_with_base_metrics(
+            player_df, {'snaps': snaps_df, 'receiving': None}, mapper, week_window=range(3, 6)
+        )
+        hill = result.iloc[1]
+
+        assert hill['season_trend'] == 78 - 72
+        assert hill['season_ceiling'] == 30
+        # Momentum needs 2 early + 3 recent weeks
+        assert hill['season_mom'] == 0.0
+
+    def test_receiving_metrics_for_pass_catchers(self, player_df, receiving_df, mapper):
+        player_df['season_var'] = [0.0, 0.0, -1.0]
+        result = _enrich_with_base_metrics(player_df, {'snaps': None, 'receiving': receiving_df}, mapper)
+
+        assert result.iloc[0]['season_tgt'] == 25.0
+        assert result.iloc[0]['season_eztgt'] == 3
+        assert result.iloc[0]['season_var'] == pytest.approx(2.0)
+        # Missing RecXFP leaves season_var untouched
+        assert result.iloc[1]['season_var'] == 0.0
+        assert result.iloc[2]['season_var'] == -1.0
+        assert result['season_eztgt'].dtype.kind == 'i'
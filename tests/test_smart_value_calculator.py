@@ -0,0 +1,253 @@
+"""
+Unit Tests for Smart Value Calculator
+
+Tests the vectorized tier helpers and Vegas matchup lookup.
+"""
+
+import pytest
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.smart_value_calculator import (
+    get_ceiling_boost_multiplier,
+    get_ceiling_boost_multipliers,
+    get_value_penalties,
+    get_leverage_multipliers,
+    build_team_vegas_table,
+    calculate_matchup_score,
+    calculate_trends_score,
+    calculate_regression_score,
+    min_max_scale_by_position
+)
+from src.smart_value_calculator_enhanced import (
+    calculate_smart_value_enhanced,
+    calculate_smart_value_batch,
+    calculate_component_matrix,
+    build_weight_matrix,
+    clear_component_cache,
+    fingerprint_dataframe,
+    _component_cache,
+    SMART_VALUE_COMPONENTS
+)
+
+
+def make_player_pool(n=40, seed=7):
+    """Create a random player pool with season stats."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'name': [f'Player{i}' for i in range(n)],
+        'position': rng.choice(['QB', 'RB', 'WR', 'TE', 'DST'], n),
+        'team': rng.choice(['KC', 'BUF', 'SF', 'DAL'], n),
+        'opponent': rng.choice(['KC', 'BUF', 'SF', 'DAL'], n),
+        'salary': rng.integers(3000, 9500, n),
+        'projection': rng.uniform(4, 28, n),
+        'ownership': rng.uniform(1, 35, n),
+        'season_ceiling': rng.uniform(8, 40, n),
+        'season_snap': rng.uniform(30, 100, n),
+        'season_tgt': rng.uniform(0, 30, n),
+        'season_cons': rng.uniform(1, 12, n),
+        'season_mom': rng.normal(0, 3, n),
+        'season_trend': rng.normal(0, 5, n),
+        'season_var': rng.normal(0, 4, n),
+    })
+
+
+class TestTierHelpers:
+    """Test vectorized tier multipliers."""
+
+    def test_ceiling_multipliers_match_scalar(self):
+        positions = pd.Series(['QB', 'QB', 'RB', 'TE', 'DST', 'K'])
+        projections = pd.Series([18.0, 16.0, 9.0, 10.5, 4.5, 12.0])
+
+        expected = [get_ceiling_boost_multiplier(p, x) for p, x in zip(positions, projections)]
+        assert list(get_ceiling_boost_multipliers(positions, projections)) == expected
+
+    def test_value_penalties(self):
+        ratios = pd.Series([3.5, 3.0, 2.8, 2.5, 1.0, np.nan])
+        assert list(get_value_penalties(ratios)) == [1.0, 1.0, 0.85, 0.85, 0.70, 0.70]
+
+    def test_leverage_multipliers(self):
+        ownership = pd.Series([1, 3, 7, 12, 17, 25, 40, np.nan])
+        assert list(get_leverage_multipliers(ownership)) == [0.3, 0.7, 1.0, 0.9, 0.6, 0.3, 0.1, 0.1]
+
+
+class TestMinMaxScaleByPosition:
+    """Test position-grouped scaling."""
+
+    def test_scales_within_position(self):
+        df = pd.DataFrame({
+            'position': ['QB', 'QB', 'RB', 'RB', 'TE'],
+            'metric': [10.0, 20.0, 5.0, 15.0, 7.0]
+        })
+        scaled = min_max_scale_by_position(df, 'metric')
+        assert list(scaled) == [0.0, 1.0, 0.0, 1.0, 0.5]
+
+
+class TestGroupedComponents:
+    """Test grouped (per-position) component passes."""
+
+    def test_trends_by_position_matches_subset_scoring(self):
+        df = make_player_pool()
+        grouped = calculate_trends_score(df.copy(), 1.0, by_position=True)
+
+        for position in df['position'].unique():
+            subset = calculate_trends_score(df[df['position'] == position].copy(), 1.0)
+            pd.testing.assert_series_equal(
+                grouped.loc[subset.index, 'trends_score'], subset['trends_score']
+            )
+
+    def test_regression_penalty_within_position(self):
+        df = pd.DataFrame({
+            'position': ['QB'] * 5 + ['TE'],
+            'projection': [10.0, 12.0, 14.0, 16.0, 26.0, 8.0]
+        })
+        result = calculate_regression_score(df, 1.0)
+
+        # QB 80th percentile is 18, max 26: distance below threshold over 8, capped at 1
+        assert list(result['regression_penalty'].round(3)) == [1.0, 0.75, 0.5, 0.25, 0.0, 0.0]
+
+    def test_position_weights_ignore_players_without_position(self):
+        df = make_player_pool()
+        df.loc[0, 'position'] = np.nan
+        result = calculate_smart_value_enhanced(df, position_weights={'QB': {'base': 0.9}})
+
+        assert result.loc[0, 'base_score'] == 0.0
+        assert 'base_norm' not in result.columns
+
+
+class TestVegasMatchup:
+    """Test team-level Vegas table and matchup merge."""
+
+    def setup_method(self):
+        self.vegas_lines = pd.DataFrame({
+            'home_team': ['Kansas City Chiefs', 'Kansas City Chiefs'],
+            'away_team': ['Buffalo Bills', 'Buffalo Bills'],
+            'total': [50.0, 40.0],
+            'spread': [-4.0, -1.0]
+        })
+
+    def test_team_table_has_both_sides(self):
+        table = build_team_vegas_table(self.vegas_lines)
+
+        assert len(table) == 2  # Duplicate game line dropped (first wins)
+        home = table[table['team_full'] == 'Kansas City Chiefs'].iloc[0]
+        away = table[table['team_full'] == 'Buffalo Bills'].iloc[0]
+        assert home['team_spread'] == 4.0
+        assert away['team_spread'] == -4.0
+        assert home['team_itt'] == 23.0
+        assert away['team_itt'] == 27.0
+
+    def test_unmatched_players_are_neutral(self):
+        df = pd.DataFrame({
+            'position': ['QB', 'QB', 'QB'],
+            'team': ['KC', 'BUF', 'SF'],
+            'opponent': ['BUF', 'KC', 'DAL'],
+            'projection': [20.0, 20.0, 20.0]
+        })
+        result = calculate_matchup_score(df, weight=1.0, vegas_lines=self.vegas_lines)
+
+        assert result.loc[2, 'matchup_raw'] == 0.5
+        assert result.loc[1, 'matchup_raw'] > result.loc[0, 'matchup_raw']
+
+
+class TestBatchSmartValue:
+    """Test multi-profile Smart Value evaluation."""
+
+    def test_component_matrix_shape(self):
+        df = make_player_pool()
+        matrix = calculate_component_matrix(df)
+
+        assert list(matrix.columns) == list(SMART_VALUE_COMPONENTS) + ['chalk_penalty']
+        assert matrix.index.equals(df.index)
+
+    def test_weight_matrix_defaults_optional_weights(self):
+        weights = build_weight_matrix({'a': {'base': 1, 'opportunity': 0, 'trends': 0, 'risk': 0, 'matchup': 0}})
+        assert weights.loc['leverage', 'a'] == 0.15
+        assert weights.loc['regression', 'a'] == 0.05
+
+    def test_batch_matches_single_profile(self):
+        df = make_player_pool()
+        batch = calculate_smart_value_batch(df, ['balanced', 'gpp'])
+
+        assert list(batch.columns) == ['balanced', 'gpp']
+        for profile in ['balanced', 'gpp']:
+            single = calculate_smart_value_enhanced(df, profile=profile)['smart_value']
+            pd.testing.assert_series_equal(batch[profile], single, check_names=False)
+
+    def test_batch_accepts_profile_manager_configs(self):
+        df = make_player_pool()
+        config = {
+            'main_weights': {'base': 0.4, 'opportunity': 0.2, 'trends': 0.1, 'risk': 0.1, 'matchup': 0.2},
+            'sub_weights': {'trends_momentum': 0.8, 'trends_role': 0.1, 'trends_consistency': 0.1}
+        }
+        batch = calculate_smart_value_batch(df, {'mine': config})
+        single = calculate_smart_value_enhanced(
+            df, custom_weights=config['main_weights'], sub_weights=config['sub_weights']
+        )['smart_value']
+
+        pd.testing.assert_series_equal(batch['mine'], single, check_names=False)
+
+    def test_unknown_profile_raises(self):
+        with pytest.raises(ValueError):
+            calculate_smart_value_batch(make_player_pool(), ['nope'])
+
+
+class TestComponentCache:
+    """Test component caching across weight-only changes."""
+
+    def setup_method(self):
+        clear_component_cache()
+
+    def test_fingerprint_tracks_content(self):
+        df = make_player_pool()
+        assert fingerprint_dataframe(df) == fingerprint_dataframe(df.copy())
+
+        changed = df.copy()
+        changed.loc[0, 'projection'] += 1
+        assert fingerprint_dataframe(df) != fingerprint_dataframe(changed)
+
+    def test_weight_change_hits_cache(self):
+        df = make_player_pool()
+        first = calculate_smart_value_enhanced(df, profile='balanced')
+        second = calculate_smart_value_enhanced(df, profile='gpp')
+
+        assert _component_cache.misses == 1
+        assert _component_cache.hits == 1
+        assert not first['smart_value'].equals(second['smart_value'])
+
+    def test_cached_result_matches_fresh_calculation(self):
+        df = make_player_pool()
+        calculate_smart_value_enhanced(df, profile='balanced')
+        cached = calculate_smart_value_enhanced(df, profile='cash')
+
+        clear_component_cache()
+        fresh = calculate_smart_value_enhanced(df, profile='cash')
+
+        pd.testing.assert_frame_equal(cached, fresh)
+
+    def test_sub_weight_change_misses_cache(self):
+        df = make_player_pool()
+        calculate_smart_value_enhanced(df, sub_weights={'trends_momentum': 0.5})
+        calculate_smart_value_enhanced(df, sub_weights={'trends_momentum': 0.9})
+
+        assert _component_cache.misses == 2
+
+    def test_position_weights_override_rows(self):
+        df = make_player_pool()
+        position_weights = {'QB': {'base': 0.9}}
+        result = calculate_smart_value_enhanced(df, position_weights=position_weights)
+
+        assert result['smart_value'].notna().all()
+        assert len(result) == len(df)
+
+    def test_input_not_mutated(self):
+        df = make_player_pool()
+        before = df.copy()
+        calculate_smart_value_enhanced(df)
+
+        pd.testing.assert_frame_equal(df, before)
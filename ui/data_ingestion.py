@@ -20,6 +20,7 @@ sys.path.insert(0, str(parent_path))
 
 from config import DEFAULT_NFL_WEEK
 from parser import load_and_validate_player_data
+from excel_cache import read_excel_many
 from opponent_lookup import build_opponent_lookup
 from styles import (
     get_base_styles,
@@ -143,7 +144,7 @@ def render_data_ingestion():
         # Check database for season stats records for this week
         def check_season_stats_in_db(week: int) -> Dict[str, bool]:
             """Check which file types have data in the database for given week."""
-            import sqlite3
+            from src.db_access import db_connection
             from config import DEFAULT_DB_PATH
             db_path = Path(DEFAULT_DB_PATH)
             
@@ -153,43 +154,42 @@ def render_data_ingestion():
                 return {file_type: False for file_type in file_types}
             
             try:
-                conn = sqlite3.connect(str(db_path))
-                cursor = conn.cursor()
-                
-                # Check each of the 4 separate tables
-                tables = {
-                    'pass': 'pass_stats',
-                    'rush': 'rush_stats',
-                    'receiving': 'receiving_stats',
-                    'snaps': 'snap_stats'
-                }
-                
-                result = {}
-                
-                for file_type, table_name in tables.items():
-                    # Check if table exists
-                    cursor.execute("""
-                        SELECT name FROM sqlite_master 
-                        WHERE type='table' AND name=?
-                    """, (table_name,))
+                with db_connection(str(db_path)) as conn:
+                    cursor = conn.cursor()
                     
-                    if not cursor.fetchone():
-                        # Table doesn't exist yet
-                        result[file_type] = False
-                        continue
+                    # Check each of the 4 separate tables
+                    tables = {
+                        'pass': 'pass_stats',
+                        'rush': 'rush_stats',
+                        'receiving': 'receiving_stats',
+                        'snaps': 'snap_stats'
+                    }
                     
-                    # Count distinct players for this week
-                    cursor.execute(f"""
-                        SELECT COUNT(DISTINCT player_name) 
-                        FROM {table_name} 
-                        WHERE week = ?
-                    """, (week,))
+                    result = {}
                     
-                    count = cursor.fetchone()[0]
-                    # Require at least 10 players to show checkmark
-                    result[file_type] = count >= 10
+                    for file_type, table_name in tables.items():
+                        # Check if table exists
+                        cursor.execute("""
+                            SELECT name FROM sqlite_master 
+                            WHERE type='table' AND name=?
+                        """, (table_name,))
+                        
+                        if not cursor.fetchone():
+                            # Table doesn't exist yet
+                            result[file_type] = False
+                            continue
+                        
+                        # Count distinct players for this week
+                        cursor.execute(f"""
+                            SELECT COUNT(DISTINCT player_name) 
+                            FROM {table_name} 
+                            WHERE week = ?
+                        """, (week,))
+                        
+                        count = cursor.fetchone()[0]
+                        # Require at least 10 players to show checkmark
+                        result[file_type] = count >= 10
                 
-                conn.close()
                 return result
                 
             except Exception as e:
@@ -277,18 +277,19 @@ def render_data_ingestion():
                             st.error(f"❌ Could not import save_advanced_stats_to_database: {str(import_err)}")
                             raise
                     
-                    # Parse Excel files directly from upload buffer
+                    # Parse Excel files directly from upload buffer (concurrently)
                     season_files = {}
                     parse_errors = []
                     
+                    upload_bytes = {}
                     for file_type, uploaded_file in uploaded_files.items():
-                        try:
-                            uploaded_file.seek(0)  # Reset file pointer
-                            df = pd.read_excel(uploaded_file)
-                            season_files[file_type] = df
-                        except Exception as e:
-                            parse_errors.append(f"{file_type_mapping[file_type]}: {str(e)}")
-                            season_files[file_type] = None
+                        uploaded_file.seek(0)  # Reset file pointer
+                        upload_bytes[file_type] = uploaded_file.read()
+                    
+                    for file_type, result in read_excel_many(upload_bytes).items():
+                        season_files[file_type] = result.df
+                        if result.error is not None:
+                            parse_errors.append(f"{file_type_mapping[file_type]}: {result.error}")
                     
                     # Show parse errors if any
                     if parse_errors:
@@ -301,40 +302,38 @@ def render_data_ingestion():
                     
                     if db_saved:
                         # Verify data was actually written to database
-                        import sqlite3
+                        from src.db_access import db_connection
                         from config import DEFAULT_DB_PATH
                         db_path = Path(DEFAULT_DB_PATH)
                         
                         try:
-                            conn = sqlite3.connect(str(db_path))
-                            cursor = conn.cursor()
-                            
-                            # Check if records exist for this week across the 4 new tables
-                            tables = {
-                                'pass': 'pass_stats',
-                                'rush': 'rush_stats',
-                                'receiving': 'receiving_stats',
-                                'snaps': 'snap_stats'
-                            }
-                            
-                            total_records = 0
-                            for file_type, table_name in tables.items():
-                                # Check if table exists first
-                                cursor.execute("""
-                                    SELECT name FROM sqlite_master 
-                                    WHERE type='table' AND name=?
-                                """, (table_name,))
+                            with db_connection(str(db_path)) as conn:
+                                cursor = conn.cursor()
                                 
-                                if cursor.fetchone():
-                                    # Table exists, count records for this week
-                                    cursor.execute(f"""
-                                        SELECT COUNT(DISTINCT player_name) 
-                                        FROM {table_name} 
-                                        WHERE week = ?
-                                    """, (selected_week,))
-                                    total_records += cursor.fetchone()[0]
-                            
-                            conn.close()
+                                # Check if records exist for this week across the 4 new tables
+                                tables = {
+                                    'pass': 'pass_stats',
+                                    'rush': 'rush_stats',
+                                    'receiving': 'receiving_stats',
+                                    'snaps': 'snap_stats'
+                                }
+                                
+                                total_records = 0
+                                for file_type, table_name in tables.items():
+                                    # Check if table exists first
+                                    cursor.execute("""
+                                        SELECT name FROM sqlite_master 
+                                        WHERE type='table' AND name=?
+                                    """, (table_name,))
+                                    
+                                    if cursor.fetchone():
+                                        # Table exists, count records for this week
+                                        cursor.execute(f"""
+                                            SELECT COUNT(DISTINCT player_name) 
+                                            FROM {table_name} 
+                                            WHERE week = ?
+                                        """, (selected_week,))
+                                        total_records += cursor.fetchone()[0]
                             
                             if total_records > 0:
                                 st.success(f"💾 Saved {total_records} advanced stats records to database for Week {selected_week}")
@@ -400,7 +400,7 @@ def fetch_vegas_lines():
                 })
                 
                 st.session_state.vegas_lines_df = display_df
-                st.session_state.last_vegas_update = datetime.now()
+                st.session_state.last_vegas_update = datetime.utcnow()
                 set_rate_limit('vegas')
                 
                 # Clear enriched player data cache so Player Selection will re-enrich with new data
@@ -451,17 +451,16 @@ def load_vegas_lines_from_db():
                 if lines:
                     st.session_state.last_vegas_update = max(line.fetched_at for line in lines)
             else:
-                # Try loading from JSON cache file as fallback
-                import json
-                cache_file = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "cache", f"vegas_lines_week{query_week}.json")
+                # Try loading from the week's cache file as fallback
+                from src.data_cache import find_cache_file, read_cache_file
+                cache_file = find_cache_file('vegas_lines', query_week)
                 
-                if os.path.exists(cache_file):
-                    with open(cache_file, 'r') as f:
-                        cache_data = json.load(f)
+                if cache_file is not None:
+                    cache_data, cached_games = read_cache_file(cache_file)
                     
                     # Convert cache to DataFrame
                     data = []
-                    for game in cache_data['data']:
+                    for game in cached_games:
                         data.append({
                             'Game': f"{game['away_team']} @ {game['home_team']}",
                             'Home Team': game['home_team'],
@@ -489,9 +488,8 @@ def fetch_injury_reports():
     with st.spinner("Fetching injury reports from ESPN API..."):
         try:
             from src.api.espn_api import ESPNAPIClient
-            from sqlalchemy import create_engine
-            from sqlalchemy.orm import sessionmaker
-            from src.database_models import InjuryReport
+            from src.db_access import db_connection
+            from src.point_in_time import sync_injury_reports
             
             # Fetch from ESPN (no key required)
             espn_client = ESPNAPIClient()
@@ -505,34 +503,21 @@ def fetch_injury_reports():
                     if inj.get('injury_status', '').upper() not in ['IR', 'INJURED RESERVE']
                 ]
                 
-                # Store directly to database
-                engine = create_engine('sqlite:///dfs_optimizer.db')
-                Session = sessionmaker(bind=engine)
-                session = Session()
-                
-                try:
-                    # Clear existing injuries for this week
-                    session.query(InjuryReport).filter_by(
-                        week=st.session_state.current_week
-                    ).delete()
-                    
-                    # Store ESPN injuries
-                    for injury in filtered_injuries:
-                        injury_report = InjuryReport(
-                            week=st.session_state.current_week,
-                            player_name=injury['player_name'],
-                            team=injury['team'],
-                            position=injury.get('position', ''),
-                            injury_status=injury['injury_status'],
-                            practice_status='',  # ESPN doesn't provide this
-                            body_part=injury.get('body_part', ''),
-                            description=injury.get('long_comment') or injury.get('short_comment', '')
-                        )
-                        session.add(injury_report)
-                    
-                    session.commit()
-                finally:
-                    session.close()
+                # Store directly to database (only changed reports are
+                # rewritten; players no longer listed are removed)
+                with db_connection("dfs_optimizer.db") as conn:
+                    sync_injury_reports(conn, st.session_state.current_week, [
+                        {
+                            'player_name': injury['player_name'],
+                            'team': injury['team'],
+                            'position': injury.get('position', ''),
+                            'injury_status': injury['injury_status'],
+                            'practice_status': '',  # ESPN doesn't provide this
+                            'body_part': injury.get('body_part', ''),
+                            'description': injury.get('long_comment') or injury.get('short_comment', '')
+                        }
+                        for injury in filtered_injuries
+                    ])
                 
                 # Store rich ESPN data in session state for display
                 st.session_state.espn_injury_data = injuries  # Full ESPN data with context
@@ -569,7 +554,7 @@ def fetch_injury_reports():
                 filtered_out = total_fetched - len(filtered_injuries)
                 affected_count = len([inj for inj in filtered_injuries if inj.get('affected_players')])
                 
-                st.session_state.last_injury_update = datetime.now()
+                st.session_state.last_injury_update = datetime.utcnow()
                 set_rate_limit('injury')
                 
                 # Clear enriched player data cache so Player Selection will re-enrich with new data
@@ -873,11 +858,11 @@ def get_rate_limit_remaining(api_type):
 
 
 def get_time_ago(timestamp):
-    """Get human-readable time ago string."""
+    """Get human-readable time ago string (timestamp in naive UTC)."""
     if not timestamp:
         return "Never"
     
-    elapsed = datetime.now() - timestamp
+    elapsed = datetime.utcnow() - timestamp
     
     if elapsed < timedelta(minutes=1):
         return "Just now"
@@ -1071,8 +1071,21 @@ Smart Value =
     
     if 'season_stats_enriched' not in st.session_state or force_recalc:
         with st.spinner("📈 Analyzing historical trends..."):
+            # Persistent name matches: only new players are fuzzy matched
+            from config import DEFAULT_DB_PATH
+            try:
+                from src.player_identity import PlayerIdentityIndex
+                identity_index = PlayerIdentityIndex(db_path=DEFAULT_DB_PATH)
+            except Exception as e:
+                print(f"Warning: Player identity index unavailable: {e}")
+                identity_index = None
+
             # Prioritizes database, then files, then legacy fallback
-            df = analyze_season_stats(df, week=current_week)
+            try:
+                df = analyze_season_stats(df, week=current_week, identity_index=identity_index)
+            finally:
+                if identity_index is not None:
+                    identity_index.close()
             st.session_state['season_stats_data'] = df
             st.session_state['season_stats_enriched'] = True
             st.session_state['ceiling_migrated_v2'] = True
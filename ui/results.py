@@ -15,7 +15,7 @@ src_path = Path(__file__).parent.parent / "src"
 sys.path.insert(0, str(src_path))
 
 from models import Lineup
-import sqlite3
+from regression_analyzer import get_week_points
 from datetime import datetime
 from typing import Dict, Optional
 
@@ -65,30 +65,11 @@ def load_historical_player_scores(week: int) -> Optional[Dict[str, float]]:
         except Exception:
             pass  # Continue even if initialization fails
             
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        # Query player game stats for the specified week
-        query = """
-        SELECT player_name, fantasy_points_draftkings
-        FROM player_game_stats pgs
-        JOIN game_boxscores gb ON pgs.game_id = gb.game_id
-        WHERE gb.week = ? AND pgs.fantasy_points_draftkings IS NOT NULL
-        """
-        
-        cursor.execute(query, (week,))
-        rows = cursor.fetchall()
-        conn.close()
-        
-        if not rows:
+        # Keys are lowercase names (case-insensitive matching)
+        historical_scores = get_week_points(week, db_path)
+        if not historical_scores:
             return None
             
-        # Convert to dictionary
-        historical_scores = {}
-        for player_name, dk_points in rows:
-            # Handle potential name variations (case insensitive)
-            historical_scores[player_name.lower()] = dk_points
-            
         return historical_scores
         
     except Exception as e: